@@ -0,0 +1,44 @@
+"""Add content-addressed storage blobs
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-01 00:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reference-counted blobs keyed by SHA-256
+    op.create_table('storage_blobs',
+        sa.Column('hash_sha256', sa.String(length=64), nullable=False),
+        sa.Column('object_name', sa.String(length=500), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('hash_sha256')
+    )
+    
+    # Garbage collection scans for unreferenced blobs
+    op.create_index(
+        'idx_storage_blobs_unreferenced', 'storage_blobs', ['updated_at'],
+        postgresql_where=sa.text('ref_count = 0')
+    )
+    
+    # The same bytes may now back several videos (one tenant or several);
+    # idx_videos_hash keeps lookups by hash indexed.
+    op.drop_constraint('videos_hash_sha256_key', 'videos', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('videos_hash_sha256_key', 'videos', ['hash_sha256'])
+    op.drop_index('idx_storage_blobs_unreferenced', 'storage_blobs')
+    op.drop_table('storage_blobs')
@@ -0,0 +1,47 @@
+"""Maintain per-client storage usage counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-01 00:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 32-bit counters overflow at 2 GiB
+    op.alter_column('clients', 'storage_limit_bytes', type_=sa.BigInteger(), existing_nullable=True)
+    op.alter_column('clients', 'storage_used_bytes', type_=sa.BigInteger(), existing_nullable=True)
+    
+    # Backfill from the videos table; the counter is kept up to date from now on
+    op.execute("""
+        UPDATE clients c
+        SET storage_used_bytes = COALESCE(v.total, 0)
+        FROM (
+            SELECT cl.client_id, SUM(vi.file_size_bytes) AS total
+            FROM clients cl
+            LEFT JOIN videos vi ON vi.client_id = cl.client_id
+            GROUP BY cl.client_id
+        ) v
+        WHERE c.client_id = v.client_id;
+    """)
+    op.alter_column(
+        'clients', 'storage_used_bytes',
+        existing_type=sa.BigInteger(), nullable=False, server_default='0'
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'clients', 'storage_used_bytes',
+        existing_type=sa.BigInteger(), nullable=True, server_default=None
+    )
+    op.alter_column('clients', 'storage_used_bytes', type_=sa.Integer(), existing_nullable=True)
+    op.alter_column('clients', 'storage_limit_bytes', type_=sa.Integer(), existing_nullable=True)
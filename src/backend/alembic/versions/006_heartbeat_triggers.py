@@ -0,0 +1,55 @@
+"""Keep heartbeat-only updates from touching updated_at
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-01 00:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fire only when a column other than the heartbeat ones is in the SET list,
+    # so batched heartbeat flushes don't rewrite updated_at
+    op.execute("DROP TRIGGER IF EXISTS update_screens_updated_at ON screens;")
+    op.execute("""
+        CREATE TRIGGER update_screens_updated_at
+            BEFORE UPDATE OF name, location, screen_code, status, client_id ON screens
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+    """)
+    
+    op.execute("DROP TRIGGER IF EXISTS update_player_sync_status_updated_at ON player_sync_status;")
+    op.execute("""
+        CREATE TRIGGER update_player_sync_status_updated_at
+            BEFORE UPDATE OF screen_code, desired_state_version, applied_state_version,
+                last_sync_attempt, last_successful_sync, sync_status, error_message
+            ON player_sync_status
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS update_player_sync_status_updated_at ON player_sync_status;")
+    op.execute("""
+        CREATE TRIGGER update_player_sync_status_updated_at
+            BEFORE UPDATE ON player_sync_status
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+    """)
+    
+    op.execute("DROP TRIGGER IF EXISTS update_screens_updated_at ON screens;")
+    op.execute("""
+        CREATE TRIGGER update_screens_updated_at
+            BEFORE UPDATE ON screens
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+    """)
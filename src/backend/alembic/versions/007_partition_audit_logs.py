@@ -0,0 +1,125 @@
+"""Partition audit_logs by month
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-01-01 00:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Move the old table aside; its rows are copied into the partitions below
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy;")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_legacy_pkey;")
+    op.drop_index('idx_audit_logs_created_at', 'audit_logs_legacy')
+    op.drop_index('idx_audit_logs_table_name', 'audit_logs_legacy')
+    op.drop_index('idx_audit_logs_action', 'audit_logs_legacy')
+    op.drop_index('idx_audit_logs_user_id', 'audit_logs_legacy')
+    
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_logs (
+            log_id UUID NOT NULL,
+            user_id UUID REFERENCES users (user_id),
+            action VARCHAR(100) NOT NULL,
+            table_name VARCHAR(100) NOT NULL,
+            record_id VARCHAR(100) NOT NULL,
+            old_values JSON,
+            new_values JSON,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (log_id, created_at)
+        ) PARTITION BY RANGE (created_at);
+    """)
+    
+    # Fewer indexes than before: rows arrive in time order, so BRIN covers
+    # created_at at a fraction of the write cost, and action is not selective
+    op.create_index('idx_audit_logs_user_id', 'audit_logs', ['user_id'])
+    op.create_index('idx_audit_logs_record', 'audit_logs', ['table_name', 'record_id'])
+    op.create_index('idx_audit_logs_created_at', 'audit_logs', ['created_at'], postgresql_using='brin')
+    
+    # One partition per month, named audit_logs_YYYY_MM; idempotent so the
+    # application can call it on every maintenance pass
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_logs_ensure_partitions(from_month DATE, to_month DATE)
+        RETURNS INTEGER AS $$
+        DECLARE
+            month DATE := date_trunc('month', from_month);
+            partition TEXT;
+            created INTEGER := 0;
+        BEGIN
+            WHILE month <= to_month LOOP
+                partition := 'audit_logs_' || to_char(month, 'YYYY_MM');
+                IF to_regclass(partition) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                        partition, month, month + INTERVAL '1 month'
+                    );
+                    created := created + 1;
+                END IF;
+                month := month + INTERVAL '1 month';
+            END LOOP;
+            RETURN created;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        SELECT audit_logs_ensure_partitions(
+            COALESCE((SELECT min(created_at) FROM audit_logs_legacy)::date, CURRENT_DATE),
+            (CURRENT_DATE + INTERVAL '2 months')::date
+        );
+    """)
+    
+    op.execute("""
+        INSERT INTO audit_logs (
+            log_id, user_id, action, table_name, record_id,
+            old_values, new_values, ip_address, user_agent, created_at
+        )
+        SELECT
+            log_id, user_id, action, table_name, record_id,
+            old_values, new_values, ip_address, user_agent,
+            COALESCE(created_at, now() AT TIME ZONE 'utc')
+        FROM audit_logs_legacy;
+    """)
+    op.drop_table('audit_logs_legacy')
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned;")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_partitioned_pkey;")
+    op.drop_index('idx_audit_logs_created_at', 'audit_logs_partitioned')
+    op.drop_index('idx_audit_logs_record', 'audit_logs_partitioned')
+    op.drop_index('idx_audit_logs_user_id', 'audit_logs_partitioned')
+    
+    op.execute("""
+        CREATE TABLE audit_logs (
+            log_id UUID NOT NULL,
+            user_id UUID REFERENCES users (user_id),
+            action VARCHAR(100) NOT NULL,
+            table_name VARCHAR(100) NOT NULL,
+            record_id VARCHAR(100) NOT NULL,
+            old_values JSON,
+            new_values JSON,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (log_id)
+        );
+    """)
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned;")
+    op.drop_table('audit_logs_partitioned')  # Drops every partition with it
+    op.execute("DROP FUNCTION IF EXISTS audit_logs_ensure_partitions(DATE, DATE);")
+    
+    op.create_index('idx_audit_logs_user_id', 'audit_logs', ['user_id'])
+    op.create_index('idx_audit_logs_action', 'audit_logs', ['action'])
+    op.create_index('idx_audit_logs_table_name', 'audit_logs', ['table_name'])
+    op.create_index('idx_audit_logs_created_at', 'audit_logs', ['created_at'])
@@ -0,0 +1,117 @@
+"""Store time slots as minute-of-week ranges
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-01-01 00:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GiST support for the uuid equality column of the composite index
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist;")
+    
+    op.add_column('time_slots', sa.Column('start_minute', sa.Integer(), nullable=True))
+    op.add_column('time_slots', sa.Column('end_minute', sa.Integer(), nullable=True))
+    
+    # Daily slots (no day_of_week) become one row per day
+    op.execute("""
+        INSERT INTO time_slots (
+            slot_id, day_of_week, start_time, end_time,
+            video_id, screen_id, schedule_rule_id, created_at
+        )
+        SELECT
+            gen_random_uuid(), d.day, t.start_time, t.end_time,
+            t.video_id, t.screen_id, t.schedule_rule_id, t.created_at
+        FROM time_slots t
+        CROSS JOIN generate_series(1, 6) AS d(day)
+        WHERE t.day_of_week IS NULL;
+    """)
+    op.execute("UPDATE time_slots SET day_of_week = 0 WHERE day_of_week IS NULL;")
+    
+    # "HH:MM" to minutes since midnight, then since Monday 00:00. Compared
+    # as minutes, not text: unpadded hours ("9:00" > "10:00") sort wrong.
+    # An end at or before the start runs past midnight into the next day.
+    op.execute("""
+        UPDATE time_slots SET
+            start_minute = split_part(start_time, ':', 1)::int * 60 + split_part(start_time, ':', 2)::int,
+            end_minute = split_part(end_time, ':', 1)::int * 60 + split_part(end_time, ':', 2)::int;
+    """)
+    op.execute("""
+        UPDATE time_slots SET
+            start_minute = day_of_week * 1440 + start_minute,
+            end_minute = day_of_week * 1440 + end_minute
+                + CASE WHEN end_minute <= start_minute THEN 1440 ELSE 0 END;
+    """)
+    
+    # Sunday slots running past midnight wrap to Monday: split them in two
+    op.execute("""
+        INSERT INTO time_slots (
+            slot_id, start_minute, end_minute, day_of_week, start_time, end_time,
+            video_id, screen_id, schedule_rule_id, created_at
+        )
+        SELECT
+            gen_random_uuid(), 0, end_minute - 10080, 0, start_time, end_time,
+            video_id, screen_id, schedule_rule_id, created_at
+        FROM time_slots
+        WHERE end_minute > 10080;
+    """)
+    op.execute("UPDATE time_slots SET end_minute = 10080 WHERE end_minute > 10080;")
+    
+    op.alter_column('time_slots', 'start_minute', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('time_slots', 'end_minute', existing_type=sa.Integer(), nullable=False)
+    op.create_check_constraint(
+        'ck_time_slots_minutes', 'time_slots',
+        'start_minute >= 0 AND start_minute < end_minute AND end_minute <= 10080'
+    )
+    op.add_column('time_slots', sa.Column(
+        'minutes', postgresql.INT4RANGE(),
+        sa.Computed('int4range(start_minute, end_minute)', persisted=True)
+    ))
+    
+    op.drop_index('idx_time_slots_start_time', 'time_slots')
+    op.drop_index('idx_time_slots_day_of_week', 'time_slots')
+    op.drop_column('time_slots', 'start_time')
+    op.drop_column('time_slots', 'end_time')
+    op.drop_column('time_slots', 'day_of_week')
+    
+    # "What plays on screen X at minute M" (@>) and overlap checks (&&)
+    op.create_index(
+        'idx_time_slots_screen_minutes', 'time_slots', ['screen_id', 'minutes'],
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_time_slots_screen_minutes', 'time_slots')
+    
+    op.add_column('time_slots', sa.Column('day_of_week', sa.Integer(), nullable=True))
+    op.add_column('time_slots', sa.Column('start_time', sa.String(length=5), nullable=True))
+    op.add_column('time_slots', sa.Column('end_time', sa.String(length=5), nullable=True))
+    
+    # Expanded daily slots and split wrap-arounds stay as separate rows
+    op.execute("""
+        UPDATE time_slots SET
+            day_of_week = start_minute / 1440,
+            start_time = to_char(make_interval(mins => start_minute % 1440), 'HH24:MI'),
+            end_time = to_char(make_interval(mins => (end_minute - (start_minute / 1440) * 1440) % 1440), 'HH24:MI');
+    """)
+    op.alter_column('time_slots', 'start_time', existing_type=sa.String(length=5), nullable=False)
+    op.alter_column('time_slots', 'end_time', existing_type=sa.String(length=5), nullable=False)
+    
+    op.drop_column('time_slots', 'minutes')
+    op.drop_constraint('ck_time_slots_minutes', 'time_slots', type_='check')
+    op.drop_column('time_slots', 'end_minute')
+    op.drop_column('time_slots', 'start_minute')
+    
+    op.create_index('idx_time_slots_day_of_week', 'time_slots', ['day_of_week'])
+    op.create_index('idx_time_slots_start_time', 'time_slots', ['start_time'])
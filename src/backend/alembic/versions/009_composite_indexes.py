@@ -0,0 +1,69 @@
+"""Replace redundant single-column indexes with composites
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-01-01 00:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns) of the indexes for the real access paths
+COMPOSITE_INDEXES = [
+    # Keyset pagination: WHERE client_id = ? ORDER BY created_at DESC, id DESC
+    ('idx_videos_client_created', 'videos', ['client_id', 'created_at', 'video_id']),
+    ('idx_screens_client_created', 'screens', ['client_id', 'created_at', 'screen_id']),
+    ('idx_schedule_rules_client_created', 'schedule_rules', ['client_id', 'created_at', 'rule_id']),
+    # Offline sweep and sync monitoring
+    ('idx_screens_status_heartbeat', 'screens', ['status', 'last_heartbeat']),
+    ('idx_player_sync_status_heartbeat', 'player_sync_status', ['sync_status', 'last_heartbeat']),
+]
+
+# Indexes removed by this migration, as created by 002
+REDUNDANT_INDEXES = [
+    # Duplicates of unique constraints
+    ('idx_clients_email', 'clients', ['contact_email']),
+    ('idx_clients_api_key', 'clients', ['api_key']),
+    ('idx_users_username', 'users', ['username']),
+    ('idx_users_email', 'users', ['email']),
+    ('idx_screens_code', 'screens', ['screen_code']),
+    ('idx_player_sync_screen_code', 'player_sync_status', ['screen_code']),
+    # Prefixes of (or replaced by) the composites above
+    ('idx_videos_client_id', 'videos', ['client_id']),
+    ('idx_videos_created_at', 'videos', ['created_at']),
+    ('idx_screens_client_id', 'screens', ['client_id']),
+    ('idx_screens_status', 'screens', ['status']),
+    ('idx_screens_heartbeat', 'screens', ['last_heartbeat']),
+    ('idx_schedule_rules_client_id', 'schedule_rules', ['client_id']),
+    ('idx_player_sync_status', 'player_sync_status', ['sync_status']),
+    ('idx_player_sync_heartbeat', 'player_sync_status', ['last_heartbeat']),
+    # Covered by the (screen_id, minutes) GiST index from 008
+    ('idx_time_slots_screen_id', 'time_slots', ['screen_id']),
+    # Low-selectivity filters only ever applied within one client
+    ('idx_videos_status', 'videos', ['status']),
+    ('idx_schedule_rules_type', 'schedule_rules', ['rule_type']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction. New indexes are built
+    # before the old ones go, so no query loses its access path midway.
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in COMPOSITE_INDEXES:
+            op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,74 @@
+"""Full-text and trigram search over videos
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-01-01 00:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Title words weigh more than description words. The 'simple' configuration
+# (lowercase, no stemming, no stop words) works for any language the
+# clients title their content in, and keeps prefix queries predictable.
+# VideoRepository.search_query must use the same configuration.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce({row}title, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')
+"""
+
+# (name, table, columns with operator class) of the search indexes. The
+# leading client_id (btree_gin) keeps each lookup inside one tenant.
+SEARCH_INDEXES = [
+    ('idx_videos_search', 'videos', 'client_id, search_vector'),
+    ('idx_videos_title_trgm', 'videos', 'client_id, title gin_trgm_ops'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin;")
+
+    op.add_column('videos', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION update_videos_search_vector()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+    """)
+    op.execute("""
+        CREATE TRIGGER update_videos_search_vector
+            BEFORE INSERT OR UPDATE OF title, description ON videos
+            FOR EACH ROW
+            EXECUTE FUNCTION update_videos_search_vector();
+    """)
+
+    # Backfill without bumping every video's updated_at
+    op.execute("ALTER TABLE videos DISABLE TRIGGER update_videos_updated_at;")
+    op.execute(f"UPDATE videos SET search_vector = {SEARCH_VECTOR.format(row='')};")
+    op.execute("ALTER TABLE videos ENABLE TRIGGER update_videos_updated_at;")
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in SEARCH_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({columns});")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in SEARCH_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+
+    op.execute("DROP TRIGGER IF EXISTS update_videos_search_vector ON videos;")
+    op.execute("DROP FUNCTION IF EXISTS update_videos_search_vector();")
+    op.drop_column('videos', 'search_vector')
@@ -0,0 +1,28 @@
+"""Add a priority to schedule rules
+
+Revision ID: 011
+Revises: 010
+Create Date: 2024-01-01 00:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Where rules overlap on a screen, the higher priority plays. A constant
+    # default is a metadata-only change, so the table is not rewritten.
+    op.add_column(
+        'schedule_rules',
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('schedule_rules', 'priority')
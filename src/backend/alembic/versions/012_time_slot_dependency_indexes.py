@@ -0,0 +1,45 @@
+"""Index the screens each rule and video is scheduled on
+
+Revision ID: 012
+Revises: 011
+Create Date: 2024-01-01 00:11:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns) of the dependency indexes: the screens affected by a
+# change to a rule or a video come from an index-only scan, without visiting
+# the slots themselves (see TimeSlotRepository.get_screen_ids_for_rules).
+DEPENDENCY_INDEXES = [
+    ('idx_time_slots_rule_screen', 'time_slots', ['schedule_rule_id', 'screen_id']),
+    ('idx_time_slots_video_screen', 'time_slots', ['video_id', 'screen_id']),
+]
+
+# Prefixes of the indexes above, as created by 002
+REPLACED_INDEXES = [
+    ('idx_time_slots_schedule_rule_id', 'time_slots', ['schedule_rule_id']),
+    ('idx_time_slots_video_id', 'time_slots', ['video_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in DEPENDENCY_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in REPLACED_INDEXES:
+            op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in DEPENDENCY_INDEXES:
+            op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
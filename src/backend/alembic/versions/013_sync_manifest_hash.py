@@ -0,0 +1,29 @@
+"""Store the manifest hash behind each player's desired state version
+
+Revision ID: 013
+Revises: 012
+Create Date: 2024-01-01 00:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SHA-256 of the manifest desired_state_version points at: a recomputed
+    # state only moves the version when its hash differs (see
+    # sync/state_manager.py). Nullable, so adding it does not rewrite the table.
+    op.add_column(
+        'player_sync_status',
+        sa.Column('desired_manifest_hash', sa.String(64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('player_sync_status', 'desired_manifest_hash')
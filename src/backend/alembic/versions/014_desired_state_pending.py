@@ -0,0 +1,36 @@
+"""Queue screens whose desired state must be recomputed
+
+Revision ID: 014
+Revises: 013
+Create Date: 2024-01-01 00:13:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Written in the transaction of a schedule change and removed by the
+    # recomputation that follows it: a recomputation that fails after the
+    # change commits leaves its screens here for the catch-up worker (see
+    # sync/state_manager.py).
+    op.create_table('desired_state_pending',
+        sa.Column('screen_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('queued_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['screen_id'], ['screens.screen_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('screen_id')
+    )
+    # The catch-up worker claims the oldest screens first
+    op.create_index('idx_desired_state_pending_queued', 'desired_state_pending', ['queued_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_desired_state_pending_queued', 'desired_state_pending')
+    op.drop_table('desired_state_pending')
@@ -0,0 +1,52 @@
+"""
+AVTech Platform - Request Auditing
+==================================
+
+Audit trail entries for mutating requests. Entries go to the in-process
+queue of ``monitoring.audit.audit_writer`` and are written in batches off
+the request path, with the caller's address and user agent.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+
+from src.backend.monitoring.audit import AuditLogWriter, audit_writer
+
+
+class RequestAudit:
+    """Records audit entries on behalf of one request."""
+
+    def __init__(self, request: Request, writer: AuditLogWriter = audit_writer):
+        self.writer = writer
+        self.ip_address = request.client.host if request.client else None
+        self.user_agent = request.headers.get("user-agent")
+
+    async def record(
+        self,
+        action: str,
+        table_name: str,
+        record_id: Any,
+        old_values: Optional[Dict[str, Any]] = None,
+        new_values: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue one entry (see AuditLogWriter.record).
+
+        Call it once the change is committed, so rejected requests leave no
+        entries.
+        """
+        await self.writer.record(
+            action,
+            table_name,
+            record_id,
+            old_values=old_values,
+            new_values=new_values,
+            ip_address=self.ip_address,
+            user_agent=self.user_agent,
+        )
+
+
+def get_request_audit(request: Request) -> RequestAudit:
+    """Dependency: audit trail of the current request."""
+    return RequestAudit(request)
@@ -0,0 +1,22 @@
+"""
+AVTech Platform - API Dependencies
+==================================
+
+Shared FastAPI dependencies for the v1 routers.
+"""
+
+from functools import lru_cache
+
+from src.backend.database.session import get_read_session, get_session as get_db_session
+from src.backend.storage.storage_service import StorageService
+
+
+@lru_cache()
+def get_storage_service() -> StorageService:
+    """
+    Get the process-wide storage service.
+    
+    Its clients share the HTTP pool, executor and presigned URL cache, so a
+    single instance serves every request.
+    """
+    return StorageService()
@@ -0,0 +1,77 @@
+"""
+AVTech Platform - Media Responses
+=================================
+
+Builds conditional / ranged streaming responses for media endpoints.
+"""
+
+from datetime import datetime
+from typing import Dict
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from src.backend.exceptions.storage_exceptions import RangeNotSatisfiableException
+from src.backend.storage.media import etag_matches, http_date, if_range_allows, parse_range
+from src.backend.storage.storage_service import StorageService
+
+
+def media_response(
+    request: Request,
+    storage: StorageService,
+    object_name: str,
+    size: int,
+    etag: str,
+    last_modified: datetime,
+    media_type: str,
+    headers: Dict[str, str],
+) -> Response:
+    """
+    Answer a GET/HEAD for an object, honouring Range, If-Range and If-None-Match.
+    
+    Args:
+        request: Incoming request
+        storage: Storage service to stream the object from
+        object_name: Object name in storage
+        size: Object size in bytes
+        etag: Strong ETag of the object
+        last_modified: Modification time of the object
+        media_type: Content type
+        headers: Extra response headers (e.g. Cache-Control)
+        
+    Returns:
+        200/206 streaming response, 304, or 416
+    """
+    headers = {
+        **headers,
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    byte_range = None
+    if if_range_allows(request.headers.get("if-range"), etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiableException:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+    
+    if byte_range is None:
+        status_code, offset, length = 200, 0, size
+    else:
+        status_code, offset, length = 206, byte_range.start, byte_range.length
+        headers["Content-Range"] = byte_range.content_range(size)
+    headers["Content-Length"] = str(length)
+    
+    if request.method == "HEAD" or length == 0:
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        storage.stream_file(object_name, offset=offset, length=length),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
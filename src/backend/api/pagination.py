@@ -0,0 +1,107 @@
+"""
+AVTech Platform - Pagination
+============================
+
+Opaque continuation tokens for cursor-paginated endpoints.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """
+    Encode a listing position as an opaque, URL-safe cursor.
+    
+    Args:
+        position: JSON-serializable position (e.g. the last key returned)
+        
+    Returns:
+        Cursor string
+    """
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string, or None for the first page
+        
+    Returns:
+        Listing position, or None for the first page
+        
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def encode_keyset_cursor(position: Optional[Tuple[datetime, Any]]) -> Optional[str]:
+    """
+    Encode a (created_at, id) keyset position, or None when there are no
+    more pages.
+    """
+    if position is None:
+        return None
+    created_at, id_ = position
+    return encode_cursor({"created_at": created_at.isoformat(), "id": str(id_)})
+
+
+def decode_keyset_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, uuid.UUID]]:
+    """
+    Decode a cursor produced by encode_keyset_cursor.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+    try:
+        return datetime.fromisoformat(position["created_at"]), uuid.UUID(position["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_search_cursor(position: Optional[Tuple[float, datetime, Any]]) -> Optional[str]:
+    """
+    Encode a (score, created_at, id) search position, or None when there are
+    no more pages.
+    """
+    if position is None:
+        return None
+    score, created_at, id_ = position
+    return encode_cursor({"score": score, "created_at": created_at.isoformat(), "id": str(id_)})
+
+
+def decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, datetime, uuid.UUID]]:
+    """
+    Decode a cursor produced by encode_search_cursor.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    position = decode_cursor(cursor)
+    if position is None:
+        return None
+    try:
+        return float(position["score"]), datetime.fromisoformat(position["created_at"]), uuid.UUID(position["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
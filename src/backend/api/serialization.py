@@ -0,0 +1,131 @@
+"""
+AVTech Platform - Response Serialization
+========================================
+
+Fast path from ORM rows to JSON bytes.
+
+* ``ORMModel`` is the base of every response schema built from ORM objects:
+  ``Schema.model_validate(row)`` reads attributes directly
+  (``from_attributes``), with no intermediate dict or field-by-field copy,
+  and ``Schema.from_orm_list(rows)`` validates a whole list in one
+  pydantic-core call.
+* ``json_response`` turns an already validated model into a response whose
+  body pydantic-core serializes straight to bytes. FastAPI skips its own
+  response_model validation and ``jsonable_encoder`` pass for a returned
+  Response, so large listings are validated once and encoded once.
+  Keep ``response_model`` on the route for the OpenAPI schema.
+* ``dump_rows_json`` is the fastest path for big listings of flat schemas:
+  it reads the schema's fields off the ORM rows and encodes them with orjson
+  without building models at all. The output is identical to validating and
+  dumping the models. Rows come from typed columns, so nothing needs
+  validation.
+* Everything else goes through ``ORJSONResponse``, the application's default
+  response class (see ``create_app``).
+"""
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union, get_args
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Default response class of the application
+DefaultResponse = ORJSONResponse
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    """TypeAdapter per type; building one compiles a validator and serializer."""
+    return TypeAdapter(annotation)
+
+
+class ORMModel(BaseModel):
+    """Schema that can be validated straight from ORM objects."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_list(cls: Type[ModelT], objects: Iterable[Any]) -> List[ModelT]:
+        """Validate many ORM objects in a single call."""
+        return _adapter(List[cls]).validate_python(list(objects), from_attributes=True)
+
+
+def dump_json(model: BaseModel) -> bytes:
+    """JSON bytes of a validated model."""
+    return _adapter(type(model)).dump_json(model)
+
+
+def _is_nested(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_is_nested(arg) for arg in get_args(annotation))
+
+
+@lru_cache(maxsize=None)
+def _row_reader(schema: Type[BaseModel]) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]:
+    """Field names of a flat schema and a getter reading them all at once."""
+    fields = tuple(schema.model_fields)
+    if any(_is_nested(field.annotation) for field in schema.model_fields.values()):
+        raise TypeError(f"{schema.__name__} has nested models; validate it with from_orm_list instead")
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return fields, lambda obj: (getter(obj),)
+    return fields, getter
+
+
+def _default(value: Any) -> Any:
+    """Types orjson leaves to us: asyncpg returns its own UUID subclass."""
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_rows_json(schema: Type[BaseModel], objects: Iterable[Any], **extra: Any) -> bytes:
+    """
+    JSON bytes of ``{"items": [...], **extra}`` with each object shaped as
+    `schema`, without building models.
+
+    Only for flat schemas (no nested models) whose fields map to typed
+    columns of the objects: values are not validated.
+
+    Args:
+        schema: Response schema giving the fields and their order
+        objects: ORM objects (or any objects with those attributes)
+        **extra: Other top-level keys, e.g. next_cursor
+
+    Raises:
+        TypeError: If the schema has nested models
+    """
+    fields, read = _row_reader(schema)
+    return orjson.dumps({"items": [dict(zip(fields, read(obj))) for obj in objects], **extra}, default=_default)
+
+
+def json_response(
+    content: Union[BaseModel, bytes],
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Response whose body is already JSON bytes.
+
+    Args:
+        content: Validated response model (serialized here) or JSON bytes
+            from dump_rows_json
+        status_code: HTTP status
+        headers: Extra response headers
+
+    Returns:
+        Response ready to be returned from a route
+    """
+    return Response(
+        content=content if isinstance(content, bytes) else dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,56 @@
+"""
+AVTech Platform - Admin API Routes
+==================================
+
+Administrative endpoints (exports, maintenance). Every route requires the
+admin API key (X-Admin-Key).
+"""
+
+import json
+from typing import AsyncIterator, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from src.backend.api.dependencies import get_storage_service
+from src.backend.api.v1.auth.dependencies import require_admin
+from src.backend.monitoring.logger import get_logger
+from src.backend.storage.storage_service import StorageService
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+async def _ndjson_lines(files: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Serialize files as newline-delimited JSON, one line per object."""
+    try:
+        async for file in files:
+            yield json.dumps(file, default=str).encode() + b"\n"
+    except Exception as e:
+        # Headers are already sent; the truncated body is the only signal left
+        logger.error(f"File export aborted: {e}")
+        raise
+
+
+@router.get("/clients/{client_id}/files/export")
+async def export_client_files(
+    client_id: UUID,
+    file_type: Optional[Literal["videos", "thumbnails"]] = None,
+    storage: StorageService = Depends(get_storage_service),
+) -> StreamingResponse:
+    """
+    Export every file of a client as NDJSON.
+    
+    Objects are streamed as they are listed, so memory stays constant
+    however many files the client has. Only the client's storage prefix
+    is exported: with STORAGE_CONTENT_ADDRESSED, videos are shared blobs
+    referenced by the ``file_path`` of the client's videos, not part of
+    this export.
+    """
+    return StreamingResponse(
+        _ndjson_lines(storage.iter_client_files(str(client_id), file_type=file_type)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{client_id}-files.ndjson"'},
+    )
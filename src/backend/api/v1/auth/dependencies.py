@@ -0,0 +1,100 @@
+"""
+AVTech Platform - API Authentication
+====================================
+
+API key dependencies shared by the v1 routers.
+
+* ``require_admin``: the admin key (``X-Admin-Key``), for /admin
+* ``get_current_client``: the client owning the ``X-API-Key`` of the
+  request (dashboards and players use their client's key)
+* ``require_client_access``: the caller is the client of the path's
+  ``client_id``
+* ``require_owned``: ids sent by the caller (rules, screens, videos) are
+  its client's; others' look missing
+"""
+
+import hmac
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Security
+from fastapi.security import APIKeyHeader
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.dependencies import get_read_session
+from src.backend.config import settings
+from src.backend.database.repository import BaseRepository, ClientRepository
+
+admin_key_header = APIKeyHeader(name="X-Admin-Key", auto_error=False)
+client_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+# {api_key: (client_id, expiry on the monotonic clock)}; only valid keys, so
+# it holds at most one entry per client
+_client_keys: Dict[str, Tuple[UUID, float]] = {}
+
+
+async def require_admin(key: Optional[str] = Security(admin_key_header)) -> None:
+    """
+    Reject callers without the admin API key.
+
+    With no ADMIN_API_KEY configured every request is rejected: admin
+    endpoints are never open by default.
+    """
+    expected = settings.security.admin_api_key
+    if not expected or key is None or not hmac.compare_digest(key.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Admin API key required", headers={"WWW-Authenticate": "ApiKey"})
+
+
+async def get_current_client(
+    key: Optional[str] = Security(client_key_header),
+    db: AsyncSession = Depends(get_read_session),
+) -> UUID:
+    """
+    Client owning the request's API key.
+
+    Valid keys are remembered for API_KEY_CACHE_TTL seconds, so players
+    sending a heartbeat every few seconds do not query the database each
+    time; a revoked key or deactivated client stops working within that
+    time.
+
+    Raises:
+        HTTPException: 401 without a key, or with an unknown or inactive one
+    """
+    if not key:
+        raise HTTPException(status_code=401, detail="API key required", headers={"WWW-Authenticate": "ApiKey"})
+    now = time.monotonic()
+    cached = _client_keys.get(key)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    client_id = await ClientRepository(db).get_id_by_api_key(key)
+    if client_id is None:
+        _client_keys.pop(key, None)
+        raise HTTPException(status_code=401, detail="Invalid API key", headers={"WWW-Authenticate": "ApiKey"})
+    _client_keys[key] = (client_id, now + settings.security.api_key_cache_ttl)
+    return client_id
+
+
+async def require_client_access(client_id: UUID, caller: UUID = Depends(get_current_client)) -> UUID:
+    """
+    Reject callers that are not the client of the path's ``client_id``.
+
+    Raises:
+        HTTPException: 403 for another client's resources
+    """
+    if client_id != caller:
+        raise HTTPException(status_code=403, detail="Not allowed for this client")
+    return caller
+
+
+async def require_owned(repository: BaseRepository, client_id: UUID, ids: Iterable[Any], detail: str) -> None:
+    """
+    Check that every id exists and belongs to the client, in one query.
+
+    Raises:
+        HTTPException: 404 with `detail` otherwise; another client's rows
+            are reported as missing, not forbidden
+    """
+    wanted = set(ids)
+    if wanted and await repository.get_owned_ids(client_id, list(wanted)) != wanted:
+        raise HTTPException(status_code=404, detail=detail)
@@ -0,0 +1,104 @@
+"""
+AVTech Platform - Content API Routes
+====================================
+
+Endpoints for browsing a client's content. Every route requires the
+client's API key (X-API-Key) and only serves that client.
+"""
+
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.dependencies import get_db_session, get_storage_service
+from src.backend.api.pagination import (
+    decode_cursor,
+    decode_keyset_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_keyset_cursor,
+    encode_search_cursor,
+)
+from src.backend.api.serialization import dump_rows_json, json_response
+from src.backend.api.v1.auth.dependencies import require_client_access
+from src.backend.api.v1.content.schemas import StoredFile, StoredFilePage
+from src.backend.config import settings
+from src.backend.content.schemas import VideoPage, VideoResponse, VideoStatus
+from src.backend.services.content_service import ContentService
+from src.backend.storage.storage_service import StorageService
+
+router = APIRouter(prefix="/content", tags=["content"], dependencies=[Depends(require_client_access)])
+
+
+@router.get("/clients/{client_id}/files", response_model=StoredFilePage)
+async def list_client_files(
+    client_id: UUID,
+    file_type: Optional[Literal["videos", "thumbnails"]] = None,
+    limit: int = Query(settings.server.default_page_size, ge=1, le=settings.server.max_page_size),
+    cursor: Optional[str] = None,
+    storage: StorageService = Depends(get_storage_service),
+) -> StoredFilePage:
+    """
+    List a client's stored files, one page at a time in key order.
+    
+    Only one page is ever held in memory; the cursor resumes the listing
+    right after the last object returned. Content-addressed videos are
+    shared blobs outside the client's prefix and are not listed here;
+    /clients/{client_id}/videos lists them with their file_path.
+    """
+    position = decode_cursor(cursor)
+    files, last_key = await storage.list_client_files_page(
+        str(client_id),
+        file_type=file_type,
+        limit=limit,
+        start_after=position.get("after") if position else None,
+    )
+    return StoredFilePage(
+        items=[StoredFile(**f) for f in files],
+        next_cursor=encode_cursor({"after": last_key}) if last_key else None,
+    )
+
+
+@router.get("/clients/{client_id}/videos", response_model=VideoPage)
+async def list_client_videos(
+    client_id: UUID,
+    status: Optional[VideoStatus] = None,
+    limit: int = Query(settings.server.default_page_size, ge=1, le=settings.server.max_page_size),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
+    """
+    List a client's videos, newest first, one page at a time.
+    
+    Rows are written straight to JSON bytes, without building a model
+    per row.
+    """
+    videos, next_after = await ContentService(db, storage).list_video_rows(
+        str(client_id), limit, decode_keyset_cursor(cursor), status.value if status else None
+    )
+    return json_response(dump_rows_json(VideoResponse, videos, next_cursor=encode_keyset_cursor(next_after)))
+
+
+@router.get("/clients/{client_id}/videos/search", response_model=VideoPage)
+async def search_client_videos(
+    client_id: UUID,
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[VideoStatus] = None,
+    limit: int = Query(settings.server.default_page_size, ge=1, le=settings.server.max_page_size),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
+    """
+    Search a client's videos by title and description, best match first.
+    
+    Every word of `q` matches as a word prefix, and titles also match with
+    small typos. Only the requested page leaves the database.
+    """
+    videos, next_after = await ContentService(db, storage).search_video_rows(
+        str(client_id), q, limit, decode_search_cursor(cursor), status.value if status else None
+    )
+    return json_response(dump_rows_json(VideoResponse, videos, next_cursor=encode_search_cursor(next_after)))
@@ -0,0 +1,25 @@
+"""
+AVTech Platform - Content API Schemas
+=====================================
+
+Request and response models for the content API.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class StoredFile(BaseModel):
+    """One object in a client's storage prefix."""
+    object_name: str
+    size: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+class StoredFilePage(BaseModel):
+    """One page of a client's files; pass next_cursor to get the next one."""
+    items: List[StoredFile]
+    next_cursor: Optional[str] = None
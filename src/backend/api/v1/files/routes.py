@@ -0,0 +1,49 @@
+"""
+AVTech Platform - Files API Routes
+==================================
+
+Serves the signed download URLs issued by the local filesystem backend
+(the MinIO backend's URLs point at MinIO itself).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from src.backend.api.dependencies import get_storage_service
+from src.backend.api.media import media_response
+from src.backend.storage.local_backend import LocalFilesystemBackend
+from src.backend.storage.storage_service import StorageService
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+# HEAD is its own route: one GET+HEAD route gives both the same operation id
+@router.get("/{object_name:path}")
+@router.head("/{object_name:path}", name="serve_file_head")
+async def serve_file(
+    object_name: str,
+    expires: int,
+    signature: str,
+    request: Request,
+    storage: StorageService = Depends(get_storage_service),
+) -> Response:
+    """Serve an object through a signed URL, with Range support."""
+    backend = storage.backend
+    if not isinstance(backend, LocalFilesystemBackend):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not backend.verify_signature(object_name, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+    
+    info = await storage.get_file_info(object_name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    return media_response(
+        request,
+        storage,
+        object_name,
+        size=info["size"],
+        etag=f'"{info["etag"]}"',
+        last_modified=info["last_modified"],
+        media_type=info["content_type"],
+        headers={"Cache-Control": "private, max-age=3600"},
+    )
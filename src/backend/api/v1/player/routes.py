@@ -0,0 +1,111 @@
+"""
+AVTech Platform - Player API Routes
+===================================
+
+Endpoints used by players during synchronization. Players authenticate
+with their client's API key (X-API-Key) and only reach that client's
+screens and videos.
+"""
+
+import mimetypes
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.dependencies import get_read_session, get_storage_service
+from src.backend.api.media import media_response
+from src.backend.api.v1.auth.dependencies import get_current_client
+from src.backend.api.v1.player.schemas import HeartbeatRequest, MediaURL, MediaURLRequest, MediaURLResponse
+from src.backend.database.hot_queries import PLAYLIST_VIDEOS, VIDEO_MEDIA
+from src.backend.storage.media import make_etag
+from src.backend.storage.storage_service import StorageService
+from src.backend.sync.heartbeat import heartbeat_buffer
+
+router = APIRouter(prefix="/player", tags=["player"])
+
+
+@router.post("/heartbeat", status_code=204)
+async def heartbeat(request: HeartbeatRequest, client_id: UUID = Depends(get_current_client)) -> Response:
+    """
+    Record a player heartbeat.
+    
+    Heartbeats are buffered and written in batches; only a screen coming
+    online (or first seen from this client) hits the database on the
+    request path. Screens of other clients are reported as not found.
+    """
+    if not await heartbeat_buffer.record(request.screen_code, request.health_metrics, client_id=client_id):
+        raise HTTPException(status_code=404, detail="Screen not found")
+    return Response(status_code=204)
+
+
+@router.post("/media-urls", response_model=MediaURLResponse)
+async def get_media_urls(
+    request: MediaURLRequest,
+    db: AsyncSession = Depends(get_read_session),
+    storage: StorageService = Depends(get_storage_service),
+    client_id: UUID = Depends(get_current_client),
+) -> MediaURLResponse:
+    """
+    Return download URLs for every video in a player's playlist.
+    
+    One query resolves the videos and one batch call signs the URLs (mostly
+    served from the presigned URL cache), so a sync needs a single round trip.
+    Videos of other clients are listed as missing.
+    """
+    result = await db.execute(PLAYLIST_VIDEOS, {"video_ids": request.video_ids, "client_id": client_id})
+    videos = result.all()
+    
+    urls = await storage.get_presigned_urls(
+        [v.file_path for v in videos], expires_in=request.expires_in
+    )
+    
+    found = {v.video_id for v in videos}
+    return MediaURLResponse(
+        expires_in=request.expires_in,
+        urls=[
+            MediaURL(
+                video_id=v.video_id,
+                url=urls[v.file_path],
+                hash_sha256=v.hash_sha256,
+                file_size_bytes=v.file_size_bytes,
+            )
+            for v in videos
+        ],
+        missing=[video_id for video_id in request.video_ids if video_id not in found],
+    )
+
+
+# HEAD is its own route: one GET+HEAD route gives both the same operation id
+@router.get("/media/{video_id}")
+@router.head("/media/{video_id}", name="stream_media_head")
+async def stream_media(
+    video_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_read_session),
+    storage: StorageService = Depends(get_storage_service),
+    client_id: UUID = Depends(get_current_client),
+) -> Response:
+    """
+    Serve a video with HTTP Range support so players can resume downloads.
+    
+    The ETag is the content hash and the size comes from the database, so no
+    stat round trip is needed; the body is streamed straight from the object
+    store. Honours Range (single range), If-Range and If-None-Match.
+    """
+    result = await db.execute(VIDEO_MEDIA, {"video_id": video_id, "client_id": client_id})
+    video = result.one_or_none()
+    if video is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    return media_response(
+        request,
+        storage,
+        video.file_path,
+        size=video.file_size_bytes,
+        etag=make_etag(video.hash_sha256),
+        last_modified=video.created_at,
+        media_type=mimetypes.guess_type(video.file_path)[0] or "video/mp4",
+        # A video's bytes never change (new content means a new video)
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
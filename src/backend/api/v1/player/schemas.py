@@ -0,0 +1,38 @@
+"""
+AVTech Platform - Player API Schemas
+====================================
+
+Request and response models for the player (screen) API.
+"""
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class MediaURLRequest(BaseModel):
+    """Videos a player needs download URLs for."""
+    video_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+    expires_in: int = Field(3600, ge=300, le=7 * 24 * 3600)
+
+
+class MediaURL(BaseModel):
+    """Download URL for one video."""
+    video_id: UUID
+    url: str
+    hash_sha256: str
+    file_size_bytes: int
+
+
+class MediaURLResponse(BaseModel):
+    """Download URLs for a whole playlist, signed in one batch."""
+    expires_in: int
+    urls: List[MediaURL]
+    missing: List[UUID] = []
+
+
+class HeartbeatRequest(BaseModel):
+    """Periodic liveness report from a player."""
+    screen_code: str = Field(..., min_length=1, max_length=100)
+    health_metrics: Optional[Dict[str, Any]] = None
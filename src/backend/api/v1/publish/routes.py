@@ -0,0 +1,55 @@
+"""
+AVTech Platform - Publish API Routes
+====================================
+
+Endpoints for publishing schedules to many screens at once. Every route
+requires the client's API key (X-API-Key) and only publishes to that
+client's screens.
+"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.audit import RequestAudit, get_request_audit
+from src.backend.api.dependencies import get_db_session
+from src.backend.api.v1.auth.dependencies import get_current_client
+from src.backend.api.v1.publish.schemas import PublishRequest, PublishResponse
+from src.backend.services.publish_service import PublishService
+
+router = APIRouter(prefix="/publish", tags=["publish"])
+
+
+@router.post("", response_model=PublishResponse)
+async def publish(
+    request: PublishRequest,
+    db: AsyncSession = Depends(get_db_session),
+    client_id: UUID = Depends(get_current_client),
+    audit: RequestAudit = Depends(get_request_audit),
+) -> PublishResponse:
+    """
+    Publish a client's schedule to its screens and notify their players.
+
+    Only players whose desired state changed are notified (every one with
+    `force`). Players that could not be notified are listed in `failed`;
+    they still pick the new version up on their next sync. `screen_ids` of
+    other clients are ignored.
+    """
+    if request.client_id != client_id:
+        raise HTTPException(status_code=403, detail="Not allowed for this client")
+    result = await PublishService(db).publish(request.client_id, request.screen_ids, request.force)
+    # A count, not the ids: a publish may list 100,000 screens
+    await audit.record("PUBLISH", "clients", client_id, new_values={
+        "screen_ids": None if request.screen_ids is None else len(request.screen_ids),
+        "force": request.force,
+        "targeted": result.targeted,
+        "notified": result.notified,
+    })
+    return PublishResponse(
+        targeted=result.targeted,
+        unchanged=result.unchanged,
+        notified=result.notified,
+        failed=result.failed,
+        duration_seconds=round(result.duration, 3),
+    )
@@ -0,0 +1,27 @@
+"""
+AVTech Platform - Publish API Schemas
+=====================================
+
+Request and response models for bulk publishing.
+"""
+
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class PublishRequest(BaseModel):
+    """Screens to publish to: all of the client's, or a subset."""
+    client_id: UUID
+    screen_ids: Optional[List[UUID]] = Field(None, max_length=100000)
+    force: bool = False  # Bump and notify every screen, changed or not
+
+
+class PublishResponse(BaseModel):
+    """Outcome of a bulk publish."""
+    targeted: int
+    unchanged: int
+    notified: int
+    failed: Dict[str, str] = {}  # {screen_code: last error}
+    duration_seconds: float
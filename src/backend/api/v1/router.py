@@ -0,0 +1,25 @@
+"""
+AVTech Platform - API v1 Router
+===============================
+
+Aggregates the v1 routers; mounted under /api/v1 by create_app().
+"""
+
+from fastapi import APIRouter
+
+from src.backend.api.v1.admin.routes import router as admin_router
+from src.backend.api.v1.content.routes import router as content_router
+from src.backend.api.v1.files.routes import router as files_router
+from src.backend.api.v1.player.routes import router as player_router
+from src.backend.api.v1.publish.routes import router as publish_router
+from src.backend.api.v1.schedule.routes import router as schedule_router
+from src.backend.api.v1.screens.routes import router as screens_router
+
+api_router = APIRouter()
+api_router.include_router(player_router)
+api_router.include_router(content_router)
+api_router.include_router(screens_router)
+api_router.include_router(schedule_router)
+api_router.include_router(publish_router)
+api_router.include_router(admin_router)
+api_router.include_router(files_router)
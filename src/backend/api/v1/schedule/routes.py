@@ -0,0 +1,161 @@
+"""
+AVTech Platform - Schedule API Routes
+=====================================
+
+Endpoints for a client's schedule rules. Every route requires the client's
+API key (X-API-Key); rules, screens and videos of other clients look missing.
+"""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.audit import RequestAudit, get_request_audit
+from src.backend.api.dependencies import get_db_session
+from src.backend.api.pagination import decode_keyset_cursor, encode_keyset_cursor
+from src.backend.api.serialization import json_response
+from src.backend.api.v1.auth.dependencies import get_current_client, require_client_access, require_owned
+from src.backend.config import settings
+from src.backend.database.repository import ScheduleRuleRepository, ScreenRepository, VideoRepository
+from src.backend.exceptions.validation_exceptions import ScheduleValidationException
+from src.backend.schedule.schemas import (
+    ActivePlaylist,
+    ScheduleConflict,
+    ScheduleRuleCreate,
+    ScheduleRulePage,
+    ScheduleRuleResponse,
+    ScheduleRuleUpdate,
+    ScheduleValidationReport,
+)
+from src.backend.services.schedule_service import ScheduleService
+
+router = APIRouter(prefix="/schedule", tags=["schedule"])
+
+
+async def _check_batch(db: AsyncSession, client_id: UUID, rules: List[ScheduleRuleCreate]) -> None:
+    """Reject a batch with rules of another client, or screens or videos that are not the caller's."""
+    if any(rule.client_id != client_id for rule in rules):
+        raise HTTPException(status_code=403, detail="Not allowed for this client")
+    await require_owned(
+        ScreenRepository(db), client_id, (screen_id for rule in rules for screen_id in rule.screen_ids), "Screen not found"
+    )
+    await require_owned(
+        VideoRepository(db), client_id, (slot.video_id for rule in rules for slot in rule.time_slots), "Video not found"
+    )
+
+
+@router.get("/clients/{client_id}/rules", response_model=ScheduleRulePage, dependencies=[Depends(require_client_access)])
+async def list_client_rules(
+    client_id: UUID,
+    rule_type: Optional[Literal["daily", "weekly", "date_range"]] = None,
+    limit: int = Query(settings.server.default_page_size, ge=1, le=settings.server.max_page_size),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    List a client's schedule rules with their slots, newest first.
+    
+    The page is validated once from the ORM rows and written straight to
+    JSON bytes.
+    """
+    rules, next_after = await ScheduleService(db).list_schedule_rules(
+        str(client_id), limit, decode_keyset_cursor(cursor), rule_type
+    )
+    return json_response(ScheduleRulePage(items=rules, next_cursor=encode_keyset_cursor(next_after)))
+
+
+@router.get("/rules/{rule_id}", response_model=ScheduleRuleResponse)
+async def get_rule(
+    rule_id: UUID,
+    db: AsyncSession = Depends(get_db_session),
+    client_id: UUID = Depends(get_current_client),
+) -> Response:
+    """Get one schedule rule with its slots."""
+    rule = await ScheduleService(db).get_schedule_rule(str(rule_id))
+    if rule is None or rule.client_id != client_id:
+        raise HTTPException(status_code=404, detail="Schedule rule not found")
+    return json_response(rule)
+
+
+@router.post("/rules/validate", response_model=ScheduleValidationReport)
+async def validate_rules(
+    rules: List[ScheduleRuleCreate],
+    db: AsyncSession = Depends(get_db_session),
+    client_id: UUID = Depends(get_current_client),
+) -> ScheduleValidationReport:
+    """
+    Check a batch of rules against each other and the rules on their
+    screens without writing anything: priority conflicts (errors), overlaps
+    and gaps (warnings).
+    """
+    await _check_batch(db, client_id, rules)
+    report = await ScheduleService(db).validate_schedule_rules(rules)
+    return ScheduleValidationReport(ok=report.ok, conflicts=ScheduleConflict.from_orm_list(report.conflicts))
+
+
+@router.post("/rules/batch", response_model=List[ScheduleRuleResponse], status_code=201)
+async def create_rules(
+    rules: List[ScheduleRuleCreate],
+    db: AsyncSession = Depends(get_db_session),
+    client_id: UUID = Depends(get_current_client),
+    audit: RequestAudit = Depends(get_request_audit),
+) -> List[ScheduleRuleResponse]:
+    """
+    Create a batch of rules in one transaction. Nothing is written if the
+    batch has priority conflicts; they are returned with status 409.
+    """
+    await _check_batch(db, client_id, rules)
+    try:
+        created = await ScheduleService(db).create_schedule_rules(rules)
+    except ScheduleValidationException as e:
+        if not e.conflicts:
+            raise
+        report = ScheduleValidationReport(ok=False, conflicts=ScheduleConflict.from_orm_list(e.conflicts))
+        raise HTTPException(status_code=409, detail=report.model_dump(mode="json"))
+    for rule in created:
+        await audit.record("CREATE", "schedule_rules", rule.rule_id, new_values=rule.model_dump(mode="json"))
+    return created
+
+
+@router.patch("/rules/{rule_id}", response_model=ScheduleRuleResponse)
+async def update_rule(
+    rule_id: UUID,
+    update_data: ScheduleRuleUpdate,
+    db: AsyncSession = Depends(get_db_session),
+    client_id: UUID = Depends(get_current_client),
+    audit: RequestAudit = Depends(get_request_audit),
+) -> Response:
+    """
+    Update a rule's editable fields; only its screens' cached schedules are
+    invalidated.
+
+    A new priority or active window is validated like a batch: priority
+    conflicts are rejected with 409 and the validation report.
+    """
+    await require_owned(ScheduleRuleRepository(db), client_id, [rule_id], "Schedule rule not found")
+    try:
+        rule = await ScheduleService(db).update_schedule_rule(str(rule_id), update_data)
+    except ScheduleValidationException as e:
+        if not e.conflicts:
+            raise
+        report = ScheduleValidationReport(ok=False, conflicts=ScheduleConflict.from_orm_list(e.conflicts))
+        raise HTTPException(status_code=409, detail=report.model_dump(mode="json"))
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Schedule rule not found")
+    await audit.record("UPDATE", "schedule_rules", rule_id, new_values=update_data.model_dump(mode="json", exclude_unset=True))
+    return json_response(rule)
+
+
+@router.get("/screens/{screen_id}/playing", response_model=ActivePlaylist)
+async def get_screen_playing(
+    screen_id: UUID,
+    at: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db_session),
+    client_id: UUID = Depends(get_current_client),
+) -> ActivePlaylist:
+    """What a screen plays at `at` (default: now), and the next change."""
+    await require_owned(ScreenRepository(db), client_id, [screen_id], "Screen not found")
+    return await ScheduleService(db).resolve_schedule_for_screen(str(screen_id), at)
@@ -0,0 +1,44 @@
+"""
+AVTech Platform - Screens API Routes
+====================================
+
+Endpoints for browsing a client's screens. Every route requires the
+client's API key (X-API-Key) and only serves that client.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.dependencies import get_db_session
+from src.backend.api.pagination import decode_keyset_cursor, encode_keyset_cursor
+from src.backend.api.serialization import dump_rows_json, json_response
+from src.backend.api.v1.auth.dependencies import require_client_access
+from src.backend.config import settings
+from src.backend.screens.schemas import ScreenPage, ScreenResponse, ScreenStatus
+from src.backend.services.screen_service import ScreenService
+
+router = APIRouter(prefix="/screens", tags=["screens"], dependencies=[Depends(require_client_access)])
+
+
+@router.get("/clients/{client_id}", response_model=ScreenPage)
+async def list_client_screens(
+    client_id: UUID,
+    status: Optional[ScreenStatus] = None,
+    location: Optional[str] = None,
+    limit: int = Query(settings.server.default_page_size, ge=1, le=settings.server.max_page_size),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    List a client's screens, newest first, one page at a time.
+    
+    Rows are written straight to JSON bytes, without building a model
+    per row.
+    """
+    screens, next_after = await ScreenService(db).list_screen_rows(
+        str(client_id), limit, decode_keyset_cursor(cursor), status.value if status else None, location
+    )
+    return json_response(dump_rows_json(ScreenResponse, screens, next_cursor=encode_keyset_cursor(next_after)))
@@ -8,6 +8,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from src.backend.config import settings
+from src.backend.api.serialization import DefaultResponse # Respuestas JSON con orjson
 from src.backend.api.v1.router import api_router # Importamos el router principal
 from src.backend.monitoring.health import health_router # Importamos router de health checks
 from src.backend.monitoring.metrics import metrics_router # Importamos router de métricas
@@ -22,6 +23,7 @@ def create_app(lifespan=None):
         description="API para la gestión de contenido y pantallas digitales.",
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=DefaultResponse, # orjson en lugar del json de la stdlib
         # Opcional: Documentación personalizada
         openapi_url="/api/v1/openapi.json",
         docs_url="/api/v1/docs", # URL para Swagger UI
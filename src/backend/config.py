@@ -9,17 +9,58 @@ class DatabaseSettings(BaseSettings):
     password: str = os.getenv("DB_PASSWORD", "avtech_password")
     database: str = os.getenv("DB_NAME", "avtech_db")
     echo: bool = os.getenv("DB_ECHO", "False").lower() == "true"
+    # Pool de conexiones
+    pool_size: int = int(os.getenv("DB_POOL_SIZE", 10))
+    max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", 1800)) # Segundos; renueva conexiones antes de que las corte un proxy/firewall
+    pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true" # Un round trip extra por checkout
+    # Caché de sentencias: SQL compilado por SQLAlchemy y sentencias preparadas por conexión en asyncpg
+    query_cache_size: int = int(os.getenv("DB_QUERY_CACHE_SIZE", 1200))
+    statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+    # PgBouncer en modo transaction: sin caché de sentencias preparadas y con nombres únicos
+    pgbouncer: bool = os.getenv("DB_PGBOUNCER", "False").lower() == "true"
+    # Réplica de solo lectura (DSN completo); sin definir, todo va al primario
+    replica_url: Optional[str] = os.getenv("DB_REPLICA_URL") or None
 
     @property
     def url(self) -> str:
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
 class StorageSettings(BaseSettings):
+    # Driver de almacenamiento: "minio" (S3) o "local" (sistema de ficheros, instalaciones de un solo equipo)
+    backend: str = os.getenv("STORAGE_BACKEND", "minio")
+    local_root: str = os.getenv("STORAGE_LOCAL_ROOT", "/var/lib/avtech/media")
+    local_public_url: str = os.getenv("STORAGE_LOCAL_PUBLIC_URL", "http://localhost:8000/api/v1/files")
+    # Firma HMAC de URLs locales; obligatoria con STORAGE_BACKEND=local (sin valor por defecto)
+    local_url_secret: Optional[str] = os.getenv("STORAGE_LOCAL_URL_SECRET") or os.getenv("SECRET_KEY") or None
     endpoint: str = os.getenv("MINIO_ENDPOINT", "localhost:9000")
     access_key: str = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
     secret_key: str = os.getenv("MINIO_SECRET_KEY", "minioadmin")
     secure: bool = os.getenv("MINIO_SECURE", "False").lower() == "true"
     bucket_name: str = os.getenv("MINIO_BUCKET_NAME", "avtech-media")
+    region: str = os.getenv("MINIO_REGION", "us-east-1") # Evita la consulta de región al firmar URLs
+    # Motor async: pool HTTP compartido, executor acotado y límites por operación
+    executor_workers: int = int(os.getenv("STORAGE_EXECUTOR_WORKERS", 16))
+    max_pool_connections: int = int(os.getenv("STORAGE_MAX_POOL_CONNECTIONS", 32))
+    connect_timeout: float = float(os.getenv("STORAGE_CONNECT_TIMEOUT", 5))
+    read_timeout: float = float(os.getenv("STORAGE_READ_TIMEOUT", 300))
+    upload_concurrency: int = int(os.getenv("STORAGE_UPLOAD_CONCURRENCY", 4))
+    download_concurrency: int = int(os.getenv("STORAGE_DOWNLOAD_CONCURRENCY", 8))
+    metadata_concurrency: int = int(os.getenv("STORAGE_METADATA_CONCURRENCY", 16))
+    # Subida multipart en streaming (S3 exige partes de al menos 5 MiB)
+    multipart_part_size: int = max(int(os.getenv("STORAGE_MULTIPART_PART_SIZE", 8 * 1024 * 1024)), 5 * 1024 * 1024)
+    multipart_max_inflight: int = int(os.getenv("STORAGE_MULTIPART_MAX_INFLIGHT", 4))
+    # Tamaño de bloque al servir medios en streaming (peticiones Range)
+    media_chunk_size: int = int(os.getenv("STORAGE_MEDIA_CHUNK_SIZE", 256 * 1024))
+    # Objetos direccionados por contenido (SHA-256) y deduplicados entre clientes
+    content_addressed: bool = os.getenv("STORAGE_CONTENT_ADDRESSED", "False").lower() == "true"
+    # Caché LRU de URLs prefirmadas
+    presign_cache_size: int = int(os.getenv("STORAGE_PRESIGN_CACHE_SIZE", 50000))
+    presign_safety_margin: int = int(os.getenv("STORAGE_PRESIGN_SAFETY_MARGIN", 300))
+    presign_expiry_granularity: int = int(os.getenv("STORAGE_PRESIGN_EXPIRY_GRANULARITY", 900))
+    # Reconciliación periódica de clients.storage_used_bytes contra el bucket
+    usage_reconcile_interval: float = float(os.getenv("STORAGE_USAGE_RECONCILE_INTERVAL", 3600))
 
 class RedisSettings(BaseSettings):
     host: str = os.getenv("REDIS_HOST", "localhost")
@@ -31,12 +72,66 @@ class ServerSettings(BaseSettings):
     port: int = int(os.getenv("SERVER_PORT", 8000))
     debug: bool = os.getenv("DEBUG", "False").lower() == "true"
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    # Paginación por cursor de los listados de la API
+    default_page_size: int = int(os.getenv("API_DEFAULT_PAGE_SIZE", 100))
+    max_page_size: int = int(os.getenv("API_MAX_PAGE_SIZE", 1000))
+
+class SecuritySettings(BaseSettings):
+    # Clave de los endpoints /admin (cabecera X-Admin-Key); sin ella, se rechazan todas las peticiones
+    admin_api_key: Optional[str] = os.getenv("ADMIN_API_KEY") or None
+    # Segundos que se recuerda una clave de cliente (X-API-Key) válida; una clave revocada deja de valer en este plazo
+    api_key_cache_ttl: float = float(os.getenv("API_KEY_CACHE_TTL", 60))
+
+class HealthSettings(BaseSettings):
+    # Sondeo en segundo plano: los endpoints de salud sirven la última instantánea
+    probe_interval: float = float(os.getenv("HEALTH_PROBE_INTERVAL", 10))
+    probe_timeout: float = float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))
+    max_staleness: float = float(os.getenv("HEALTH_MAX_STALENESS", 30))
+
+class PlayerSettings(BaseSettings):
+    # Heartbeats: se agrupan en memoria y se escriben en lote cada intervalo
+    heartbeat_flush_interval: float = float(os.getenv("PLAYER_HEARTBEAT_FLUSH_INTERVAL", 5))
+    heartbeat_offline_after: float = float(os.getenv("PLAYER_HEARTBEAT_OFFLINE_AFTER", 90)) # Segundos sin heartbeat para marcar offline
+    # Estado deseado: solo se recalculan las pantallas afectadas por un cambio, por lotes
+    state_batch_size: int = int(os.getenv("PLAYER_STATE_BATCH_SIZE", 500)) # Pantallas por consulta al recalcular
+    state_catchup_interval: float = float(os.getenv("PLAYER_STATE_CATCHUP_INTERVAL", 30)) # Segundos entre reintentos de recálculos fallidos
+
+class ScheduleSettings(BaseSettings):
+    # Caché de programaciones compiladas: LRU en proceso + Redis, por versión de pantalla
+    cache_size: int = int(os.getenv("SCHEDULE_CACHE_SIZE", 10000)) # Pantallas en el LRU de cada proceso
+    cache_ttl: int = int(os.getenv("SCHEDULE_CACHE_TTL", 86400)) # Segundos de vida de una entrada (ambos niveles)
+    cache_timeout: float = float(os.getenv("SCHEDULE_CACHE_TIMEOUT", 0.5)) # Sin respuesta de Redis, se compila desde la BD
+
+class PublishSettings(BaseSettings):
+    # Aviso a los players tras publicar: concurrencia adaptativa (AIMD) y reintentos por pantalla
+    notify_min_concurrency: int = int(os.getenv("PUBLISH_NOTIFY_MIN_CONCURRENCY", 4))
+    notify_max_concurrency: int = int(os.getenv("PUBLISH_NOTIFY_MAX_CONCURRENCY", 256))
+    notify_target_latency: float = float(os.getenv("PUBLISH_NOTIFY_TARGET_LATENCY", 0.25)) # Por encima, se reduce la concurrencia
+    notify_timeout: float = float(os.getenv("PUBLISH_NOTIFY_TIMEOUT", 2)) # Segundos por intento
+    notify_retries: int = int(os.getenv("PUBLISH_NOTIFY_RETRIES", 3)) # Reintentos por pantalla tras el primer intento
+    notify_backoff: float = float(os.getenv("PUBLISH_NOTIFY_BACKOFF", 0.5)) # Espera antes del primer reintento; se duplica en cada uno
+
+class AuditSettings(BaseSettings):
+    # Cola en memoria: las entradas se insertan en lote fuera de la petición
+    queue_size: int = int(os.getenv("AUDIT_QUEUE_SIZE", 10000)) # Llena, quien audita espera (back-pressure)
+    batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+    flush_interval: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", 1))
+    # Particiones mensuales: se crean por adelantado y se eliminan al caducar
+    partitions_ahead: int = int(os.getenv("AUDIT_PARTITIONS_AHEAD", 2))
+    retention_months: int = int(os.getenv("AUDIT_RETENTION_MONTHS", 12))
+    maintenance_interval: float = float(os.getenv("AUDIT_MAINTENANCE_INTERVAL", 3600))
 
 class Settings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()
     storage: StorageSettings = StorageSettings()
     redis: RedisSettings = RedisSettings()
     server: ServerSettings = ServerSettings()
+    security: SecuritySettings = SecuritySettings()
+    health: HealthSettings = HealthSettings()
+    player: PlayerSettings = PlayerSettings()
+    schedule: ScheduleSettings = ScheduleSettings()
+    publish: PublishSettings = PublishSettings()
+    audit: AuditSettings = AuditSettings()
 
     class Config:
         env_file = ".env" # Carga variables desde .env si existe
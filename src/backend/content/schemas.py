@@ -0,0 +1,60 @@
+"""
+AVTech Platform - Content Schemas
+=================================
+
+Request and response models for videos.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.backend.api.serialization import ORMModel
+
+
+class VideoStatus(str, Enum):
+    """Lifecycle of a video."""
+    UPLOADED = "uploaded"
+    PROCESSING = "processing"
+    READY = "ready"
+    ERROR = "error"
+
+
+class VideoCreate(BaseModel):
+    """Metadata sent with a video upload."""
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    duration_seconds: int = Field(..., ge=1, le=20)
+    file_size_bytes: int = Field(..., gt=0)
+    hash_sha256: str = Field(..., min_length=64, max_length=64)
+    client_id: UUID
+
+
+class VideoUpdate(BaseModel):
+    """Editable video fields; omitted fields are left unchanged."""
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    status: Optional[VideoStatus] = None
+
+
+class VideoResponse(ORMModel):
+    """A video as returned by the API."""
+    video_id: UUID
+    title: str
+    description: Optional[str] = None
+    duration_seconds: int
+    file_size_bytes: int
+    hash_sha256: str
+    status: Optional[str] = None
+    client_id: UUID
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class VideoPage(BaseModel):
+    """One page of a client's videos; pass next_cursor to get the next one."""
+    items: List[VideoResponse]
+    next_cursor: Optional[str] = None
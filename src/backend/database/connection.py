@@ -1,15 +1,64 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from src.backend.config import settings
+from src.backend.database.pool import instrument_engine, instrumented_pool_class
+from typing import Any, Dict
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
-# Crear el motor de base de datos async
-engine = create_async_engine(
-    settings.database.url,
-    echo=settings.database.echo, # Log de SQL si está habilitado
-    pool_pre_ping=True, # Verifica la conexión antes de usarla
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+def statement_cache_args(pgbouncer: bool, cache_size: int) -> Dict[str, Any]:
+    """
+    Argumentos de conexión de asyncpg para la caché de sentencias preparadas.
+
+    Cada conexión guarda hasta `cache_size` sentencias preparadas, así que
+    las consultas repetidas se ejecutan sin volver a parsearlas ni
+    planificarlas. Detrás de PgBouncer en modo transaction una conexión del
+    pool puede ir a otro backend en cada transacción: se desactiva la caché
+    y cada sentencia se prepara con un nombre único para que no choque con
+    las de otros clientes. (PgBouncer >= 1.21 con max_prepared_statements
+    soporta sentencias preparadas y no necesita este modo.)
+    """
+    if pgbouncer:
+        return {
+            "statement_cache_size": 0, # Caché interna de asyncpg
+            "prepared_statement_cache_size": 0, # Caché del dialecto de SQLAlchemy
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {"prepared_statement_cache_size": cache_size}
+
+def build_engine(url: str, label: str) -> AsyncEngine:
+    """
+    Crea un motor async con el pool configurado en DatabaseSettings e
+    instrumentado en Prometheus bajo `label` ("primary", "replica").
+    """
+    db = settings.database
+    new_engine = create_async_engine(
+        url,
+        echo=db.echo, # Log de SQL si está habilitado
+        poolclass=instrumented_pool_class(label),
+        pool_size=db.pool_size,
+        max_overflow=db.max_overflow,
+        pool_recycle=db.pool_recycle, # Sustituye al pre-ping para conexiones viejas
+        pool_timeout=db.pool_timeout,
+        pool_pre_ping=db.pool_pre_ping, # Desactivado por defecto: un round trip por checkout
+        query_cache_size=db.query_cache_size, # SQL compilado, compartido por todas las conexiones
+        connect_args=statement_cache_args(db.pgbouncer, db.statement_cache_size),
+    )
+    instrument_engine(new_engine, label)
+    return new_engine
+
+# Motor del primario (escrituras y lecturas por defecto)
+engine = build_engine(settings.database.url, "primary")
+
+# Motor de la réplica de lectura; sin réplica configurada se usa el primario
+replica_engine = (
+    build_engine(settings.database.replica_url, "replica")
+    if settings.database.replica_url else engine
 )
 
 # Crear la clase de sesión asincrónica
@@ -0,0 +1,270 @@
+"""
+AVTech Platform - Hot Queries
+=============================
+
+The statements players run on every sync, media request and heartbeat,
+built once at import time.
+
+Statement objects memoize their cache key, so executing a prebuilt
+statement skips constructing the query and computing its key on every call.
+Each statement renders to one SQL string regardless of its arguments: lists
+go in a single array parameter (``= ANY(...)``, ``unnest(...)``), not one
+placeholder per element. So each query has exactly one entry in
+SQLAlchemy's compiled cache and one server-side prepared statement per
+connection. After the first call Postgres neither re-parses nor re-plans it.
+
+The statements use Core tables rather than ORM entities: the callers only
+need a few columns, and the ORM adds per-row overhead on these paths.
+
+Execute them with the named parameters listed on each one, e.g.::
+
+    await session.execute(VIDEO_MEDIA, {"video_id": video_id, "client_id": client_id})
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, String, Text, any_, bindparam, cast, column, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, UUID, insert
+
+from src.backend.database.models import DesiredStatePending, PlayerSyncStatus, ScheduleRule, Screen, TimeSlot, Video
+
+videos = Video.__table__
+screens = Screen.__table__
+sync_status = PlayerSyncStatus.__table__
+time_slots = TimeSlot.__table__
+schedule_rules = ScheduleRule.__table__
+pending_states = DesiredStatePending.__table__
+
+# Media lookup for one video of a client (file streaming). Params: video_id, client_id
+VIDEO_MEDIA = (
+    select(videos.c.file_path, videos.c.hash_sha256, videos.c.file_size_bytes, videos.c.created_at)
+    .where(videos.c.video_id == bindparam("video_id"), videos.c.client_id == bindparam("client_id"))
+)
+
+# Media lookup for a whole playlist of a client (download URLs). Params: video_ids (list), client_id
+PLAYLIST_VIDEOS = (
+    select(videos.c.video_id, videos.c.file_path, videos.c.hash_sha256, videos.c.file_size_bytes)
+    .where(
+        videos.c.video_id == any_(bindparam("video_ids", type_=ARRAY(UUID(as_uuid=True)))),
+        videos.c.client_id == bindparam("client_id"),
+    )
+)
+
+# Current status and owner of a screen. Params: screen_code
+SCREEN_STATUS = select(screens.c.status, screens.c.client_id).where(screens.c.screen_code == bindparam("screen_code"))
+
+# Bring a screen online with a heartbeat. Params: code, at
+SCREEN_MARK_ONLINE = (
+    update(screens)
+    .where(screens.c.screen_code == bindparam("code"))
+    .values(status="online", last_heartbeat=func.greatest(screens.c.last_heartbeat, bindparam("at", type_=DateTime)))
+)
+
+# Desired vs applied state of a player. Params: screen_code
+SYNC_STATE = (
+    select(
+        sync_status.c.desired_state_version,
+        sync_status.c.applied_state_version,
+        sync_status.c.sync_status,
+        sync_status.c.last_successful_sync,
+    )
+    .where(sync_status.c.screen_code == bindparam("screen_code"))
+)
+
+# Desired state recomputation reads a batch of screens at a time (see
+# sync.state_manager); the batches are the same size every time.
+
+# Codes of many screens. Params: screen_ids (list)
+SCREEN_CODES = (
+    select(screens.c.screen_id, screens.c.screen_code)
+    .where(screens.c.screen_id == any_(bindparam("screen_ids", type_=ARRAY(UUID(as_uuid=True)))))
+)
+
+# Slots of many screens, in resolver order within each. Params: screen_ids (list)
+SCREENS_SLOTS = (
+    select(time_slots.c.start_minute, time_slots.c.end_minute, time_slots.c.video_id,
+           time_slots.c.schedule_rule_id, time_slots.c.screen_id)
+    .where(time_slots.c.screen_id == any_(bindparam("screen_ids", type_=ARRAY(UUID(as_uuid=True)))))
+    .order_by(time_slots.c.start_minute, time_slots.c.slot_id)
+)
+
+# Rules of those slots not expired by `since`. Params: rule_ids (list), since
+ACTIVE_RULES = (
+    select(schedule_rules.c.rule_id, schedule_rules.c.priority, schedule_rules.c.active_from,
+           schedule_rules.c.active_until, schedule_rules.c.created_at)
+    .where(
+        schedule_rules.c.rule_id == any_(bindparam("rule_ids", type_=ARRAY(UUID(as_uuid=True)))),
+        or_(schedule_rules.c.active_until.is_(None), schedule_rules.c.active_until > bindparam("since", type_=DateTime)),
+    )
+)
+
+# Content hash of many videos. Params: video_ids (list)
+VIDEO_HASHES = (
+    select(videos.c.video_id, videos.c.hash_sha256)
+    .where(videos.c.video_id == any_(bindparam("video_ids", type_=ARRAY(UUID(as_uuid=True)))))
+)
+
+_screen_beats = func.unnest(
+    cast(bindparam("screen_codes"), ARRAY(String)),
+    cast(bindparam("heartbeats"), ARRAY(DateTime)),
+).table_valued(column("screen_code", String), column("last_heartbeat", DateTime)).render_derived(name="v")
+
+# Latest heartbeat of many screens; only last_heartbeat is written (see
+# ScreenRepository.record_heartbeats). Params: screen_codes, heartbeats (parallel lists)
+SCREEN_HEARTBEATS = (
+    update(screens)
+    .where(screens.c.screen_code == _screen_beats.c.screen_code)
+    .values(
+        last_heartbeat=func.greatest(screens.c.last_heartbeat, _screen_beats.c.last_heartbeat),
+        # Keep onupdate from adding updated_at to the SET list
+        updated_at=screens.c.updated_at,
+    )
+    .returning(screens.c.screen_code, screens.c.status)
+)
+
+_sync_beats = func.unnest(
+    cast(bindparam("screen_codes"), ARRAY(String)),
+    cast(bindparam("heartbeats"), ARRAY(DateTime)),
+    cast(bindparam("health_metrics"), ARRAY(Text)),
+).table_valued(
+    column("screen_code", String), column("last_heartbeat", DateTime), column("health_metrics", Text)
+).render_derived(name="v")
+
+# Latest heartbeat and health metrics of many players.
+# Params: screen_codes, heartbeats, health_metrics (parallel lists; metrics as JSON text or None)
+SYNC_HEARTBEATS = (
+    update(sync_status)
+    .where(sync_status.c.screen_code == _sync_beats.c.screen_code)
+    .values(
+        last_heartbeat=func.greatest(sync_status.c.last_heartbeat, _sync_beats.c.last_heartbeat),
+        health_metrics=func.coalesce(cast(_sync_beats.c.health_metrics, JSON), sync_status.c.health_metrics),
+        updated_at=sync_status.c.updated_at,
+    )
+)
+
+_manifests = func.unnest(
+    cast(bindparam("screen_codes"), ARRAY(String)),
+    cast(bindparam("manifest_hashes"), ARRAY(String)),
+).table_valued(column("screen_code", String), column("desired_manifest_hash", String)).render_derived(name="v")
+
+
+def _advance_states(force: bool):
+    stmt = insert(sync_status).from_select(
+        ["sync_id", "screen_code", "desired_state_version", "desired_manifest_hash", "sync_status", "created_at", "updated_at"],
+        select(
+            func.gen_random_uuid(), _manifests.c.screen_code, literal(1), _manifests.c.desired_manifest_hash,
+            literal("pending"), bindparam("now", type_=DateTime), bindparam("now", type_=DateTime),
+        ),
+        include_defaults=False,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[sync_status.c.screen_code],
+        set_={
+            "desired_state_version": sync_status.c.desired_state_version + 1,
+            "desired_manifest_hash": stmt.excluded.desired_manifest_hash,
+            "sync_status": "pending",
+            "error_message": None,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=None if force else sync_status.c.desired_manifest_hash.is_distinct_from(stmt.excluded.desired_manifest_hash),
+    ).returning(sync_status.c.screen_code, sync_status.c.desired_state_version)
+
+
+# Record recomputed manifests, bumping the version of players whose hash
+# changed (see PlayerSyncStatusRepository.advance_desired_states), or of
+# every player (FORCE). Params: screen_codes, manifest_hashes (parallel lists), now
+SYNC_ADVANCE_STATES = _advance_states(force=False)
+SYNC_FORCE_STATES = _advance_states(force=True)
+
+_failures = func.unnest(
+    cast(bindparam("screen_codes"), ARRAY(String)),
+    cast(bindparam("versions"), ARRAY(Integer)),
+    cast(bindparam("errors"), ARRAY(Text)),
+).table_valued(
+    column("screen_code", String), column("desired_state_version", Integer), column("error_message", Text)
+).render_derived(name="v")
+
+# Mark players failed unless their desired version moved on since.
+# Params: screen_codes, versions, errors (parallel lists)
+SYNC_MARK_FAILED = (
+    update(sync_status)
+    .where(
+        sync_status.c.screen_code == _failures.c.screen_code,
+        sync_status.c.desired_state_version == _failures.c.desired_state_version,
+    )
+    .values(sync_status="failed", error_message=_failures.c.error_message)
+)
+
+
+_pending = func.unnest(
+    cast(bindparam("screen_ids"), ARRAY(UUID(as_uuid=True)))
+).table_valued(column("screen_id", UUID(as_uuid=True))).render_derived(name="v")
+
+# Queue screens for recomputation; a queued screen gets the new time (and
+# its row stays locked until the caller commits). Params: screen_ids (list, sorted), now
+_queue_pending = insert(pending_states).from_select(
+    ["screen_id", "queued_at"], select(_pending.c.screen_id, bindparam("now", type_=DateTime))
+)
+PENDING_QUEUE = _queue_pending.on_conflict_do_update(
+    index_elements=[pending_states.c.screen_id], set_={"queued_at": _queue_pending.excluded.queued_at}
+)
+
+# Take screens off the queue. Params: screen_ids (list)
+PENDING_CLAIM = pending_states.delete().where(
+    pending_states.c.screen_id == any_(bindparam("screen_ids", type_=ARRAY(UUID(as_uuid=True))))
+)
+
+# Take the longest-queued screens off the queue, skipping rows other
+# workers hold. Params: limit
+PENDING_CLAIM_OLDEST = (
+    pending_states.delete()
+    .where(pending_states.c.screen_id.in_(
+        select(pending_states.c.screen_id)
+        .order_by(pending_states.c.queued_at)
+        .limit(bindparam("limit", type_=Integer))
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    ))
+    .returning(pending_states.c.screen_id)
+)
+
+
+def heartbeat_params(beats: Dict[str, datetime]) -> Dict[str, List[Any]]:
+    """Parameters of SCREEN_HEARTBEATS, sorted by code so concurrent flushes lock rows in the same order."""
+    ordered = sorted(beats.items())
+    return {
+        "screen_codes": [code for code, _ in ordered],
+        "heartbeats": [at for _, at in ordered],
+    }
+
+
+def sync_heartbeat_params(beats: Dict[str, Tuple[datetime, Optional[Dict[str, Any]]]]) -> Dict[str, List[Any]]:
+    """Parameters of SYNC_HEARTBEATS, sorted by code."""
+    ordered = sorted(beats.items())
+    return {
+        "screen_codes": [code for code, _ in ordered],
+        "heartbeats": [at for _, (at, _) in ordered],
+        "health_metrics": [None if metrics is None else json.dumps(metrics) for _, (_, metrics) in ordered],
+    }
+
+
+def advance_params(manifest_hashes: Dict[str, str], now: datetime) -> Dict[str, Any]:
+    """Parameters of SYNC_ADVANCE_STATES / SYNC_FORCE_STATES, sorted by code so concurrent recomputations lock rows in the same order."""
+    ordered = sorted(manifest_hashes.items())
+    return {
+        "screen_codes": [code for code, _ in ordered],
+        "manifest_hashes": [manifest_hash for _, manifest_hash in ordered],
+        "now": now,
+    }
+
+
+def failure_params(failures: Dict[str, Tuple[int, str]]) -> Dict[str, List[Any]]:
+    """Parameters of SYNC_MARK_FAILED, sorted by code."""
+    ordered = sorted(failures.items())
+    return {
+        "screen_codes": [code for code, _ in ordered],
+        "versions": [version for _, (version, _) in ordered],
+        "errors": [error for _, (_, error) in ordered],
+    }
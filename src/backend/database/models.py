@@ -5,13 +5,15 @@ AVTech Platform - Database Models
 SQLAlchemy models for the AVTech Platform database.
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Boolean, Text, ForeignKey, JSON, Computed, CheckConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import INT4RANGE, TSVECTOR, UUID
 from datetime import datetime
 import uuid
 
+from src.backend.schedule.week import from_week_range
+
 Base = declarative_base()
 
 
@@ -23,8 +25,8 @@ class Client(Base):
     name = Column(String(255), nullable=False)
     contact_email = Column(String(255), nullable=False, unique=True)
     api_key = Column(String(255), nullable=False, unique=True)
-    storage_limit_bytes = Column(Integer, default=1073741824)  # 1GB default
-    storage_used_bytes = Column(Integer, default=0)
+    storage_limit_bytes = Column(BigInteger, default=1073741824)  # 1GB default
+    storage_used_bytes = Column(BigInteger, nullable=False, default=0)  # Maintained with video create/delete
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -45,9 +47,11 @@ class Video(Base):
     duration_seconds = Column(Integer, nullable=False)
     file_size_bytes = Column(Integer, nullable=False)
     file_path = Column(String(500), nullable=False)
-    hash_sha256 = Column(String(64), nullable=False, unique=True)
+    hash_sha256 = Column(String(64), nullable=False)  # Not unique: identical bytes share a StorageBlob
     status = Column(String(20), default="uploaded")  # uploaded, processing, ready, error
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.client_id"), nullable=False)
+    # Title and description words, maintained by a trigger; only read by search queries
+    search_vector = deferred(Column(TSVECTOR))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -56,6 +60,18 @@ class Video(Base):
     time_slots = relationship("TimeSlot", back_populates="video")
 
 
+class StorageBlob(Base):
+    """Content-addressed storage object shared by every Video with the same hash."""
+    __tablename__ = "storage_blobs"
+    
+    hash_sha256 = Column(String(64), primary_key=True)
+    object_name = Column(String(500), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    ref_count = Column(Integer, nullable=False, default=0)  # Videos pointing at this blob
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class Screen(Base):
     """Screen model for device management."""
     __tablename__ = "screens"
@@ -82,6 +98,7 @@ class ScheduleRule(Base):
     rule_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     rule_type = Column(String(20), nullable=False)  # daily, weekly, date_range
+    priority = Column(Integer, nullable=False, default=0)  # Higher wins where rules overlap on a screen
     active_from = Column(DateTime, nullable=False)
     active_until = Column(DateTime)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.client_id"), nullable=False)
@@ -91,16 +108,24 @@ class ScheduleRule(Base):
     # Relationships
     client = relationship("Client", back_populates="schedule_rules")
     time_slots = relationship("TimeSlot", back_populates="schedule_rule")
+    
+    @property
+    def screen_ids(self) -> list:
+        """Screens the rule's slots are on (time_slots must be loaded)."""
+        return list(dict.fromkeys(slot.screen_id for slot in self.time_slots))
 
 
 class TimeSlot(Base):
     """Time slot model for scheduling."""
     __tablename__ = "time_slots"
+    __table_args__ = (
+        CheckConstraint("start_minute >= 0 AND start_minute < end_minute AND end_minute <= 10080", name="ck_time_slots_minutes"),
+    )
     
     slot_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    day_of_week = Column(Integer)  # 0=Monday, 6=Sunday
-    start_time = Column(String(5), nullable=False)  # HH:MM format
-    end_time = Column(String(5), nullable=False)    # HH:MM format
+    start_minute = Column(Integer, nullable=False)  # Minutes since Monday 00:00
+    end_minute = Column(Integer, nullable=False)    # Exclusive, at most 10080 (7 * 1440)
+    minutes = Column(INT4RANGE, Computed("int4range(start_minute, end_minute)", persisted=True))  # GiST-indexed with screen_id
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.video_id"), nullable=False)
     screen_id = Column(UUID(as_uuid=True), ForeignKey("screens.screen_id"), nullable=False)
     schedule_rule_id = Column(UUID(as_uuid=True), ForeignKey("schedule_rules.rule_id"), nullable=False)
@@ -110,6 +135,21 @@ class TimeSlot(Base):
     video = relationship("Video", back_populates="time_slots")
     screen = relationship("Screen", back_populates="time_slots")
     schedule_rule = relationship("ScheduleRule", back_populates="time_slots")
+    
+    @property
+    def day_of_week(self) -> int:
+        """0=Monday, 6=Sunday."""
+        return from_week_range(self.start_minute, self.end_minute)[0]
+    
+    @property
+    def start_time(self) -> str:
+        """HH:MM format."""
+        return from_week_range(self.start_minute, self.end_minute)[1]
+    
+    @property
+    def end_time(self) -> str:
+        """HH:MM format (past midnight when not after start_time)."""
+        return from_week_range(self.start_minute, self.end_minute)[2]
 
 
 class PlayerSyncStatus(Base):
@@ -119,6 +159,7 @@ class PlayerSyncStatus(Base):
     sync_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     screen_code = Column(String(100), nullable=False, unique=True)
     desired_state_version = Column(Integer, nullable=False)
+    desired_manifest_hash = Column(String(64))  # SHA-256 of the manifest desired_state_version points at
     applied_state_version = Column(Integer)
     last_sync_attempt = Column(DateTime)
     last_successful_sync = Column(DateTime)
@@ -130,6 +171,14 @@ class PlayerSyncStatus(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class DesiredStatePending(Base):
+    """Screen whose desired state still has to be recomputed after a committed change."""
+    __tablename__ = "desired_state_pending"
+    
+    screen_id = Column(UUID(as_uuid=True), ForeignKey("screens.screen_id", ondelete="CASCADE"), primary_key=True)
+    queued_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 class User(Base):
     """User model for authentication."""
     __tablename__ = "users"
@@ -149,8 +198,9 @@ class User(Base):
 
 
 class AuditLog(Base):
-    """Audit log model for tracking changes."""
+    """Audit log model for tracking changes (partitioned by month on created_at)."""
     __tablename__ = "audit_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
     log_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"))
@@ -161,7 +211,7 @@ class AuditLog(Base):
     new_values = Column(JSON)
     ip_address = Column(String(45))  # IPv6 compatible
     user_agent = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key
     
     # Relationships
     user = relationship("User")
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+AVTech Platform - Instrumented Connection Pool
+==============================================
+
+Queue pool that reports checkout wait time, checkouts/checkins and active
+connections to Prometheus, labelled by pool ("primary", "replica").
+"""
+
+import time
+from typing import Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.backend.monitoring.metrics import record_db_checkin, record_db_checkout, record_db_pool_wait
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long checkouts wait."""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            record_db_pool_wait(self.metrics_label, time.perf_counter() - start, timed_out=True)
+            raise
+        record_db_pool_wait(self.metrics_label, time.perf_counter() - start)
+        return connection
+
+
+def instrumented_pool_class(label: str) -> Type[InstrumentedAsyncPool]:
+    """
+    Pool class reporting under a given label.
+
+    The label is a class attribute so it survives pool.recreate()
+    (engine.dispose()), which builds a new instance of the same class.
+    """
+    return type(f"InstrumentedAsyncPool_{label}", (InstrumentedAsyncPool,), {"metrics_label": label})
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    """Feed checkout / checkin events of an engine's pool into Prometheus."""
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        record_db_checkout(label)
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        record_db_checkin(label)
@@ -0,0 +1,1253 @@
+"""
+AVTech Platform - Repositories
+==============================
+
+Data access layer over the SQLAlchemy models. Repositories flush but never
+commit: the calling service owns the transaction.
+
+Besides single-row access, every repository supports set-based writes so
+large imports take a handful of round trips:
+
+* ``bulk_insert``  multi-row ``INSERT ... VALUES``, or ``COPY`` for very
+  large batches
+* ``bulk_upsert``  multi-row ``INSERT ... ON CONFLICT DO UPDATE``
+* ``bulk_update``  ``UPDATE ... FROM (VALUES ...)`` keyed by a column
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, Set, Tuple, Type, TypeVar
+
+from sqlalchemy import REAL, Row, Select, column, delete, false, inspect, literal, or_, select, text, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import func
+
+from src.backend.database import hot_queries
+from src.backend.database.models import (
+    AuditLog,
+    Client,
+    DesiredStatePending,
+    PlayerSyncStatus,
+    ScheduleRule,
+    Screen,
+    StorageBlob,
+    TimeSlot,
+    Video,
+)
+from src.backend.schedule.resolver import ScreenSlotRow
+from src.backend.schedule.week import minute_of_week, to_week_ranges
+
+ModelT = TypeVar("ModelT")
+
+# PostgreSQL accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+# Batches at least this large are loaded with COPY instead of INSERT
+COPY_THRESHOLD = 5000
+
+# Text search configuration of videos.search_vector (see migration 010)
+SEARCH_CONFIG = "simple"
+
+# Words of a search string; everything else (tsquery operators included) is dropped
+SEARCH_WORD = re.compile(r"[^\W_]+")
+
+# Shortest search word matched as a prefix, and shortest string matched by similarity
+SEARCH_MIN_PREFIX = 3
+
+# First key of the per-screen advisory locks (the second is the screen's
+# hash); two-key locks never collide with the single-key ones of workers
+SCREEN_LOCK_NAMESPACE = 0x415654
+
+
+class BaseRepository(Generic[ModelT]):
+    """Single-row and bulk access to one model's table."""
+
+    model: Type[ModelT]
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @property
+    def table(self):
+        return self.model.__table__
+
+    @property
+    def primary_key(self):
+        return inspect(self.model).primary_key[0]
+
+    async def get_by_id(self, id_) -> Optional[ModelT]:
+        """Get a row by its primary key."""
+        return await self.session.get(self.model, id_)
+
+    async def create(self, values_: Dict[str, Any]) -> ModelT:
+        """
+        Insert one row from a dict of column values.
+
+        Keys that are not columns of the table are ignored.
+        """
+        obj = self.model(**{k: v for k, v in values_.items() if k in self.table.c})
+        self.session.add(obj)
+        await self.session.flush()
+        return obj
+
+    async def get_owned_ids(self, client_id, ids: Sequence[Any]) -> Set[Any]:
+        """Those of `ids` that exist and belong to a client (models with a client_id)."""
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(self.primary_key).where(self.model.client_id == client_id, self.primary_key.in_(ids))
+        )
+        return set(result.scalars())
+
+    async def delete(self, id_) -> bool:
+        """Delete a row by its primary key; True if it existed."""
+        result = await self.session.execute(
+            delete(self.model).where(self.primary_key == id_)
+        )
+        return result.rowcount == 1
+
+    def keyset_query(
+        self,
+        criteria: Sequence[Any],
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None
+    ) -> Select:
+        """
+        Newest-first page query seeking past a (created_at, id) position.
+
+        Uses a row comparison instead of OFFSET, so every page costs the same
+        however deep the client paginates. One extra row is fetched to tell
+        whether another page follows.
+        """
+        created_at = self.table.c.created_at
+        stmt = select(self.model).where(*criteria)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(created_at, self.primary_key)
+                < tuple_(literal(after[0], created_at.type), literal(after[1], self.primary_key.type))
+            )
+        return stmt.order_by(created_at.desc(), self.primary_key.desc()).limit(limit + 1)
+
+    async def keyset_page(
+        self,
+        stmt: Select,
+        limit: int
+    ) -> Tuple[List[ModelT], Optional[Tuple[datetime, Any]]]:
+        """
+        Run a keyset_query.
+
+        Returns:
+            Tuple (rows, next position or None on the last page)
+        """
+        rows = list((await self.session.execute(stmt)).scalars())
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last.created_at, getattr(last, self.primary_key.name))
+
+    def _prepare(self, rows: Sequence[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Normalize rows to the same column set, filling client-side defaults.
+
+        Multi-row VALUES and COPY need every row to carry every column, and
+        COPY does not evaluate SQLAlchemy defaults.
+        """
+        names = [c.name for c in self.table.c if any(c.name in row for row in rows) or c.default is not None]
+        prepared = []
+        for row in rows:
+            full = {}
+            for name in names:
+                if name in row:
+                    full[name] = row[name]
+                else:
+                    default = self.table.c[name].default
+                    if default is None:
+                        full[name] = None
+                    elif default.is_callable:
+                        full[name] = default.arg(None)
+                    else:
+                        full[name] = default.arg
+            prepared.append(full)
+        return names, prepared
+
+    def _values(self, names: Sequence[str], rows: Sequence[Dict[str, Any]]):
+        """Typed ``(VALUES ...) AS v (names)`` relation for UPDATE ... FROM."""
+        return values(
+            *[column(name, self.table.c[name].type) for name in names],
+            name="v"
+        ).data([tuple(row[name] for name in names) for row in rows])
+
+    @staticmethod
+    def _chunks(rows: List[Any], columns: int) -> List[List[Any]]:
+        size = max(1, MAX_BIND_PARAMS // max(1, columns))
+        return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+    async def bulk_insert(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        returning: bool = False,
+        use_copy: Optional[bool] = None
+    ) -> List[Any]:
+        """
+        Insert many rows with multi-row VALUES statements.
+
+        Args:
+            rows: Column values per row
+            returning: Whether to return the primary keys of the new rows
+            use_copy: Force (True) or forbid (False) COPY; by default COPY
+                is used for batches of COPY_THRESHOLD rows or more when no
+                keys are requested
+
+        Returns:
+            Primary keys of the inserted rows, in order (empty unless returning)
+        """
+        if not rows:
+            return []
+        if use_copy is None:
+            use_copy = not returning and len(rows) >= COPY_THRESHOLD
+        if use_copy:
+            await self.copy_insert(rows)
+            return []
+
+        names, prepared = self._prepare(rows)
+        keys: List[Any] = []
+        for chunk in self._chunks(prepared, len(names)):
+            stmt = insert(self.table).values(chunk)
+            if returning:
+                result = await self.session.execute(stmt.returning(self.primary_key))
+                keys.extend(result.scalars())
+            else:
+                await self.session.execute(stmt)
+        return keys
+
+    async def copy_insert(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Load rows with PostgreSQL COPY (asyncpg binary protocol).
+
+        COPY runs on the session's connection, inside its transaction, and
+        bypasses SQL defaults, so client-side defaults are filled first.
+
+        Returns:
+            Number of rows copied
+        """
+        if not rows:
+            return 0
+        names, prepared = self._prepare(rows)
+        connection = await self.session.connection()
+        # Same value conversion as a bound parameter (e.g. JSON to text)
+        processors = [
+            self.table.c[name].type.dialect_impl(connection.dialect).bind_processor(connection.dialect)
+            for name in names
+        ]
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            self.table.name,
+            records=[
+                tuple(
+                    row[name] if process is None or row[name] is None else process(row[name])
+                    for name, process in zip(names, processors)
+                )
+                for row in prepared
+            ],
+            columns=names,
+            schema_name=self.table.schema,
+        )
+        return len(prepared)
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        returning: bool = False
+    ) -> List[Any]:
+        """
+        Insert many rows, updating those that conflict on a unique key.
+
+        Args:
+            rows: Column values per row
+            conflict_columns: Unique columns identifying existing rows
+            update_columns: Columns overwritten on conflict; defaults to every
+                provided column except the key and the primary key. An empty
+                list turns the upsert into INSERT ... ON CONFLICT DO NOTHING.
+            returning: Whether to return primary keys of inserted/updated rows
+
+        Returns:
+            Primary keys (empty unless returning)
+        """
+        if not rows:
+            return []
+        names, prepared = self._prepare(rows)
+        if update_columns is None:
+            protected = set(conflict_columns) | {self.primary_key.name, "created_at"}
+            update_columns = [n for n in names if n not in protected and any(n in row for row in rows)]
+
+        keys: List[Any] = []
+        for chunk in self._chunks(prepared, len(names)):
+            stmt = insert(self.table).values(chunk)
+            if update_columns:
+                set_ = {name: stmt.excluded[name] for name in update_columns}
+                if "updated_at" in names and "updated_at" not in set_:
+                    # The prepared row carries the column's client-side default
+                    set_["updated_at"] = stmt.excluded["updated_at"]
+                stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+            if returning:
+                result = await self.session.execute(stmt.returning(self.primary_key))
+                keys.extend(result.scalars())
+            else:
+                await self.session.execute(stmt)
+        return keys
+
+    async def bulk_update(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        key: Optional[str] = None
+    ) -> int:
+        """
+        Update many rows with different values in one statement per chunk:
+        ``UPDATE t SET c = v.c FROM (VALUES ...) AS v WHERE t.key = v.key``.
+
+        Args:
+            rows: Key plus the columns to set, the same columns in every row
+            key: Column identifying rows (defaults to the primary key)
+
+        Returns:
+            Number of rows updated
+        """
+        if not rows:
+            return 0
+        key = key or self.primary_key.name
+        names = [key] + [name for name in rows[0] if name != key]
+        set_names = names[1:]
+        updated = 0
+        for chunk in self._chunks(list(rows), len(names)):
+            data = self._values(names, chunk)
+            # updated_at is filled by the column's onupdate
+            result = await self.session.execute(
+                update(self.table)
+                .where(self.table.c[key] == data.c[key])
+                .values({name: data.c[name] for name in set_names})
+            )
+            updated += result.rowcount
+        return updated
+
+
+class ClientRepository(BaseRepository[Client]):
+    """Client rows, including the incrementally maintained storage counter."""
+
+    model = Client
+
+    async def get_id_by_api_key(self, api_key: str) -> Optional[Any]:
+        """Id of the active client owning an API key, or None."""
+        result = await self.session.execute(
+            select(Client.client_id).where(Client.api_key == api_key, Client.is_active.is_(True))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_storage_usage(self, client_id) -> Optional[Tuple[int, int]]:
+        """
+        Single-row read of a client's storage counter.
+
+        Returns:
+            Tuple (used_bytes, limit_bytes), or None if the client does not exist
+        """
+        result = await self.session.execute(
+            select(Client.storage_used_bytes, Client.storage_limit_bytes)
+            .where(Client.client_id == client_id)
+        )
+        row = result.one_or_none()
+        return None if row is None else (row.storage_used_bytes or 0, row.storage_limit_bytes or 0)
+
+    async def add_storage_used(self, client_id, delta: int, enforce_limit: bool = True) -> Optional[int]:
+        """
+        Adjust a client's storage counter atomically.
+
+        Increments are refused (None) if they would exceed the client's
+        limit; decrements never go below zero.
+
+        Args:
+            client_id: Client ID
+            delta: Bytes to add (negative to release)
+            enforce_limit: Whether to refuse increments over the limit
+
+        Returns:
+            New used bytes, or None if the increment was refused
+        """
+        stmt = (
+            update(Client)
+            .where(Client.client_id == client_id)
+            .values(storage_used_bytes=func.greatest(Client.storage_used_bytes + delta, 0))
+            .returning(Client.storage_used_bytes)
+        )
+        if enforce_limit and delta > 0:
+            stmt = stmt.where(Client.storage_used_bytes + delta <= Client.storage_limit_bytes)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_all_storage_used(self) -> Dict:
+        """Storage counters of every client (reconciliation snapshot)."""
+        result = await self.session.execute(select(Client.client_id, Client.storage_used_bytes))
+        return {row.client_id: row.storage_used_bytes or 0 for row in result}
+
+    async def correct_storage_used(self, client_id, expected: int, actual: int) -> bool:
+        """
+        Replace a drifted counter, unless it changed since it was read.
+
+        Returns:
+            True if the counter was corrected
+        """
+        result = await self.session.execute(
+            update(Client)
+            .where(Client.client_id == client_id, Client.storage_used_bytes == expected)
+            .values(storage_used_bytes=actual)
+        )
+        return result.rowcount == 1
+
+
+class BlobRepository(BaseRepository[StorageBlob]):
+    """Reference counts for content-addressed storage blobs."""
+
+    model = StorageBlob
+
+    async def acquire(self, hash_sha256: str, object_name: str, size_bytes: int) -> Tuple[int, int]:
+        """
+        Take a reference on a blob, creating its row if needed.
+
+        The row stays locked until the transaction ends, so concurrent
+        uploads of the same hash wait here and then reuse the blob.
+
+        Args:
+            hash_sha256: Content hash
+            object_name: Object name to record if the blob is new
+            size_bytes: Expected size to record if the blob is new
+
+        Returns:
+            Tuple (ref_count, size_bytes) after the increment. A ref_count of
+            1 means the object must be (re)uploaded by the caller.
+        """
+        stmt = insert(StorageBlob).values(
+            hash_sha256=hash_sha256,
+            object_name=object_name,
+            size_bytes=size_bytes,
+            ref_count=1,
+            created_at=func.now(),
+            updated_at=func.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StorageBlob.hash_sha256],
+            set_={
+                "ref_count": StorageBlob.ref_count + 1,
+                "updated_at": func.now(),
+            },
+        ).returning(StorageBlob.ref_count, StorageBlob.size_bytes)
+        row = (await self.session.execute(stmt)).one()
+        return row.ref_count, row.size_bytes
+
+    async def set_size(self, hash_sha256: str, size_bytes: int) -> None:
+        """Record the actual size once the upload has completed."""
+        await self.session.execute(
+            update(StorageBlob)
+            .where(StorageBlob.hash_sha256 == hash_sha256)
+            .values(size_bytes=size_bytes)
+        )
+
+    async def release(self, hash_sha256: str) -> Optional[int]:
+        """
+        Drop a reference on a blob.
+
+        Returns:
+            Remaining reference count, or None if the blob is not tracked
+        """
+        result = await self.session.execute(
+            update(StorageBlob)
+            .where(StorageBlob.hash_sha256 == hash_sha256, StorageBlob.ref_count > 0)
+            .values(ref_count=StorageBlob.ref_count - 1, updated_at=func.now())
+            .returning(StorageBlob.ref_count)
+        )
+        return result.scalar_one_or_none()
+
+    async def lock_unreferenced(self, hash_sha256: str) -> Optional[Tuple[str, int]]:
+        """
+        Lock a blob row if it has no references left.
+
+        Returns:
+            Tuple (object_name, size_bytes) to remove, or None if the blob
+            was re-acquired
+        """
+        result = await self.session.execute(
+            select(StorageBlob.object_name, StorageBlob.size_bytes)
+            .where(StorageBlob.hash_sha256 == hash_sha256, StorageBlob.ref_count == 0)
+            .with_for_update()
+        )
+        row = result.one_or_none()
+        return None if row is None else (row.object_name, row.size_bytes)
+
+    async def list_unreferenced(self, limit: int = 100) -> list:
+        """List hashes of blobs with no references (garbage collection)."""
+        result = await self.session.execute(
+            select(StorageBlob.hash_sha256)
+            .where(StorageBlob.ref_count == 0)
+            .order_by(StorageBlob.updated_at)
+            .limit(limit)
+        )
+        return list(result.scalars())
+
+
+class VideoRepository(BaseRepository[Video]):
+    """Video metadata rows."""
+
+    model = Video
+
+    async def get_by_client_id(self, client_id) -> List[Video]:
+        """List a client's videos, newest first."""
+        result = await self.session.execute(
+            select(Video)
+            .where(Video.client_id == client_id)
+            .order_by(Video.created_at.desc())
+        )
+        return list(result.scalars())
+
+    def page_query(
+        self,
+        client_id,
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None
+    ) -> Select:
+        """Keyset page query over a client's videos, optionally by status."""
+        criteria = [Video.client_id == client_id]
+        if status is not None:
+            criteria.append(Video.status == status)
+        return self.keyset_query(criteria, limit, after)
+
+    async def list_page(
+        self,
+        client_id,
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List[Video], Optional[Tuple[datetime, Any]]]:
+        """One page of a client's videos, newest first."""
+        return await self.keyset_page(self.page_query(client_id, limit, after, status), limit)
+
+    def search_query(
+        self,
+        client_id,
+        terms: str,
+        limit: int,
+        after: Optional[Tuple[float, datetime, Any]] = None,
+        status: Optional[str] = None
+    ) -> Select:
+        """
+        Best-first page query over a client's videos matching `terms`.
+
+        A video matches when every word starts a word of its title or
+        description (GIN on search_vector), or when its title is close to
+        the whole string (pg_trgm word similarity, which tolerates typos).
+        Words shorter than SEARCH_MIN_PREFIX only match whole words, and a
+        string that short is not matched fuzzily: both would hit most of a
+        large library. Results are ranked by the sum of both scores, then
+        newest first, and paginated by seeking past a (score, created_at,
+        video_id) position.
+        """
+        matches, scores = [], []
+        if len(terms) >= SEARCH_MIN_PREFIX:
+            # title %> terms: word_similarity(terms, title) above pg_trgm's threshold
+            matches.append(Video.title.op("%>")(terms))
+            scores.append(func.word_similarity(terms, Video.title))
+        words = SEARCH_WORD.findall(terms.lower())
+        if words:
+            query = func.to_tsquery(
+                SEARCH_CONFIG,
+                " & ".join(f"{word}:*" if len(word) >= SEARCH_MIN_PREFIX else word for word in words),
+            )
+            matches.append(Video.search_vector.op("@@")(query))
+            scores.append(func.ts_rank(Video.search_vector, query))
+        # Both signals add up: full matches with a close title come first
+        score = literal(0.0, REAL)
+        for signal in scores:
+            score = score + signal
+        score = score.label("score")
+
+        stmt = select(Video, score).where(Video.client_id == client_id, or_(false(), *matches))
+        if status is not None:
+            stmt = stmt.where(Video.status == status)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(score.element, Video.created_at, Video.video_id)
+                < tuple_(
+                    literal(after[0], REAL),
+                    literal(after[1], Video.created_at.type),
+                    literal(after[2], Video.video_id.type),
+                )
+            )
+        return stmt.order_by(score.desc(), Video.created_at.desc(), Video.video_id.desc()).limit(limit + 1)
+
+    async def search_page(
+        self,
+        client_id,
+        terms: str,
+        limit: int,
+        after: Optional[Tuple[float, datetime, Any]] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List[Video], Optional[Tuple[float, datetime, Any]]]:
+        """
+        One page of a client's videos matching `terms`, best match first.
+
+        Returns:
+            Tuple (videos, next position or None on the last page)
+        """
+        rows = (await self.session.execute(self.search_query(client_id, terms, limit, after, status))).all()
+        videos = [video for video, _ in rows[:limit]]
+        if len(rows) <= limit:
+            return videos, None
+        last, score = rows[limit - 1]
+        return videos, (score, last.created_at, last.video_id)
+
+    async def update_statuses(self, statuses: Dict[Any, str]) -> int:
+        """
+        Set the status of many videos in one round trip.
+
+        Args:
+            statuses: {video_id: status}
+
+        Returns:
+            Number of videos updated
+        """
+        return await self.bulk_update(
+            [{"video_id": video_id, "status": status} for video_id, status in statuses.items()]
+        )
+
+    async def get_hashes(self, video_ids: Sequence[Any]) -> Dict[Any, str]:
+        """Content hash of many videos as {video_id: hash_sha256}."""
+        if not video_ids:
+            return {}
+        result = await self.session.execute(hot_queries.VIDEO_HASHES, {"video_ids": list(video_ids)})
+        return dict(result.all())
+
+
+class ScreenRepository(BaseRepository[Screen]):
+    """Screen rows."""
+
+    model = Screen
+
+    async def get_by_client_id(self, client_id) -> List[Screen]:
+        """List a client's screens."""
+        result = await self.session.execute(
+            select(Screen)
+            .where(Screen.client_id == client_id)
+            .order_by(Screen.screen_code)
+        )
+        return list(result.scalars())
+
+    async def get_by_code(self, screen_code: str) -> Optional[Screen]:
+        """Get a screen by its unique code."""
+        result = await self.session.execute(
+            select(Screen).where(Screen.screen_code == screen_code)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_client_codes(self, client_id, screen_ids: Optional[Sequence[Any]] = None) -> Dict[Any, str]:
+        """
+        Codes of a client's screens as {screen_id: screen_code}, in one
+        query: all of them, or those of `screen_ids` that belong to it.
+        """
+        stmt = select(Screen.screen_id, Screen.screen_code).where(Screen.client_id == client_id)
+        if screen_ids is not None:
+            if not screen_ids:
+                return {}
+            stmt = stmt.where(Screen.screen_id.in_(screen_ids))
+        return dict((await self.session.execute(stmt)).all())
+
+    async def get_codes(self, screen_ids: Sequence[Any]) -> Dict[Any, str]:
+        """Codes of many screens as {screen_id: screen_code}; unknown ids are left out."""
+        if not screen_ids:
+            return {}
+        result = await self.session.execute(hot_queries.SCREEN_CODES, {"screen_ids": list(screen_ids)})
+        return dict(result.all())
+
+    def page_query(
+        self,
+        client_id,
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None,
+        location: Optional[str] = None
+    ) -> Select:
+        """Keyset page query over a client's screens, optionally filtered."""
+        criteria = [Screen.client_id == client_id]
+        if status is not None:
+            criteria.append(Screen.status == status)
+        if location is not None:
+            criteria.append(Screen.location == location)
+        return self.keyset_query(criteria, limit, after)
+
+    async def list_page(
+        self,
+        client_id,
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None,
+        location: Optional[str] = None
+    ) -> Tuple[List[Screen], Optional[Tuple[datetime, Any]]]:
+        """One page of a client's screens, newest first."""
+        return await self.keyset_page(
+            self.page_query(client_id, limit, after, status, location), limit
+        )
+
+    async def mark_online(self, screen_code: str, at: datetime, client_id=None) -> Optional[str]:
+        """
+        Record a heartbeat that may bring a screen online.
+
+        Args:
+            screen_code: Reporting screen
+            at: Heartbeat time
+            client_id: If given, screens of other clients count as unknown
+
+        Returns:
+            Status before the heartbeat, or None if the screen is unknown
+        """
+        row = (await self.session.execute(
+            hot_queries.SCREEN_STATUS, {"screen_code": screen_code}
+        )).one_or_none()
+        if row is None or (client_id is not None and row.client_id != client_id):
+            return None
+        previous = row.status or "offline"
+        if previous != "online":
+            await self.session.execute(
+                hot_queries.SCREEN_MARK_ONLINE, {"code": screen_code, "at": at}
+            )
+        return previous
+
+    async def record_heartbeats(self, beats: Dict[str, datetime]) -> List[str]:
+        """
+        Store the latest heartbeat of many screens in one statement.
+
+        Only last_heartbeat is written, so the updated_at trigger (which
+        ignores that column) does not fire; GREATEST keeps the newest value
+        when several workers flush out of order. The batch travels as two
+        arrays, so every flush reuses the same prepared statement whatever
+        its size.
+
+        Args:
+            beats: {screen_code: heartbeat time}
+
+        Returns:
+            Codes of the screens that are not marked online (e.g. swept
+            offline by another worker) and need a status transition
+        """
+        if not beats:
+            return []
+        result = await self.session.execute(hot_queries.SCREEN_HEARTBEATS, hot_queries.heartbeat_params(beats))
+        return [row.screen_code for row in result if row.status != "online"]
+
+    async def mark_offline_before(self, cutoff: datetime) -> List[str]:
+        """
+        Mark online screens without a heartbeat since cutoff as offline.
+
+        Returns:
+            Codes of the screens that went offline
+        """
+        result = await self.session.execute(
+            update(Screen)
+            .where(Screen.status == "online", Screen.last_heartbeat < cutoff)
+            .values(status="offline")
+            .returning(Screen.screen_code)
+        )
+        return list(result.scalars())
+
+    async def upsert_many(self, screens: Sequence[Dict[str, Any]]) -> List[Any]:
+        """
+        Register or refresh many screens keyed by screen_code.
+
+        Returns:
+            screen_id of every inserted or updated screen
+        """
+        return await self.bulk_upsert(screens, conflict_columns=["screen_code"], returning=True)
+
+    async def update_statuses(self, statuses: Dict[str, str]) -> int:
+        """
+        Set the status of many screens in one round trip.
+
+        Args:
+            statuses: {screen_code: status}
+
+        Returns:
+            Number of screens updated
+        """
+        return await self.bulk_update(
+            [{"screen_code": code, "status": status} for code, status in statuses.items()],
+            key="screen_code",
+        )
+
+
+class ScheduleRuleRepository(BaseRepository[ScheduleRule]):
+    """Schedule rules and the time slots they expand to."""
+
+    model = ScheduleRule
+
+    async def create(self, values_: Dict[str, Any]) -> ScheduleRule:
+        """
+        Insert a rule and its time slots.
+
+        Each entry of ``values_["time_slots"]`` is created once per screen
+        in ``values_["screen_ids"]``, all in a single multi-row INSERT.
+        """
+        values_ = dict(values_)
+        time_slots = values_.pop("time_slots", None) or []
+        screen_ids = values_.pop("screen_ids", None) or []
+        rule = await super().create(values_)
+        await self.add_time_slots(rule.rule_id, time_slots, screen_ids)
+        return rule
+
+    async def add_time_slots(
+        self,
+        rule_id,
+        time_slots: Sequence[Dict[str, Any]],
+        screen_ids: Sequence[Any]
+    ) -> int:
+        """
+        Attach time slots to a rule for every given screen.
+
+        Slots come in API form (day_of_week, "HH:MM" start_time/end_time,
+        video_id) and are stored as minute-of-week ranges; a daily slot
+        becomes seven rows.
+
+        Returns:
+            Number of time slot rows inserted
+        """
+        ranges = [
+            (range_, slot["video_id"])
+            for slot in time_slots
+            for range_ in to_week_ranges(slot.get("day_of_week"), slot["start_time"], slot["end_time"])
+        ]
+        rows = [
+            {
+                "start_minute": start,
+                "end_minute": end,
+                "video_id": video_id,
+                "screen_id": screen_id,
+                "schedule_rule_id": rule_id,
+            }
+            for screen_id in screen_ids
+            for (start, end), video_id in ranges
+        ]
+        await TimeSlotRepository(self.session).bulk_insert(rows)
+        return len(rows)
+
+    async def get_with_slots(self, rule_id) -> Optional[ScheduleRule]:
+        """Get a rule with its time slots loaded."""
+        result = await self.session.execute(
+            select(ScheduleRule)
+            .where(ScheduleRule.rule_id == rule_id)
+            .options(selectinload(ScheduleRule.time_slots))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_many_with_slots(self, rule_ids: Sequence[Any]) -> List[ScheduleRule]:
+        """Get rules with their time slots loaded, in the order of `rule_ids`."""
+        if not rule_ids:
+            return []
+        result = await self.session.execute(
+            select(ScheduleRule)
+            .where(ScheduleRule.rule_id.in_(rule_ids))
+            .options(selectinload(ScheduleRule.time_slots))
+        )
+        rules = {rule.rule_id: rule for rule in result.scalars()}
+        return [rules[rule_id] for rule_id in rule_ids if rule_id in rules]
+
+    async def get_by_client_id(self, client_id) -> List[ScheduleRule]:
+        """List a client's schedule rules."""
+        result = await self.session.execute(
+            select(ScheduleRule)
+            .where(ScheduleRule.client_id == client_id)
+            .order_by(ScheduleRule.active_from)
+        )
+        return list(result.scalars())
+
+    def page_query(
+        self,
+        client_id,
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None,
+        rule_type: Optional[str] = None
+    ) -> Select:
+        """Keyset page query over a client's rules, optionally by type."""
+        criteria = [ScheduleRule.client_id == client_id]
+        if rule_type is not None:
+            criteria.append(ScheduleRule.rule_type == rule_type)
+        return self.keyset_query(criteria, limit, after)
+
+    async def list_page(
+        self,
+        client_id,
+        limit: int,
+        after: Optional[Tuple[datetime, Any]] = None,
+        rule_type: Optional[str] = None
+    ) -> Tuple[List[ScheduleRule], Optional[Tuple[datetime, Any]]]:
+        """
+        One page of a client's rules, newest first, with their time slots
+        loaded in a single extra query.
+        """
+        stmt = self.page_query(client_id, limit, after, rule_type)
+        return await self.keyset_page(stmt.options(selectinload(ScheduleRule.time_slots)), limit)
+
+
+class TimeSlotRepository(BaseRepository[TimeSlot]):
+    """Time slots as minute-of-week ranges, GiST-indexed by (screen_id, minutes)."""
+
+    model = TimeSlot
+
+    def playing_at_query(self, screen_id, at: datetime) -> Select:
+        """Slots of a screen covering a point in time, from rules active then."""
+        return (
+            select(TimeSlot)
+            .join(ScheduleRule, ScheduleRule.rule_id == TimeSlot.schedule_rule_id)
+            .where(
+                TimeSlot.screen_id == screen_id,
+                TimeSlot.minutes.contains(minute_of_week(at)),
+                ScheduleRule.active_from <= at,
+                (ScheduleRule.active_until.is_(None)) | (ScheduleRule.active_until > at),
+            )
+        )
+
+    async def playing_at(self, screen_id, at: datetime) -> List[TimeSlot]:
+        """What is scheduled on a screen at a point in time (one index probe)."""
+        return list((await self.session.execute(self.playing_at_query(screen_id, at))).scalars())
+
+    def schedule_query(self, since: datetime, *criteria: Any) -> Select:
+        """Slots with the fields of their rules, for rules not expired by `since`."""
+        return (
+            select(
+                TimeSlot.start_minute,
+                TimeSlot.end_minute,
+                TimeSlot.video_id,
+                TimeSlot.schedule_rule_id.label("rule_id"),
+                ScheduleRule.priority,
+                ScheduleRule.active_from,
+                ScheduleRule.active_until,
+                ScheduleRule.created_at,
+            )
+            .join(ScheduleRule, ScheduleRule.rule_id == TimeSlot.schedule_rule_id)
+            .where(
+                *criteria,
+                (ScheduleRule.active_until.is_(None)) | (ScheduleRule.active_until > since),
+            )
+            # slot_id breaks ties, so playlists (and manifest hashes) do not
+            # depend on the order Postgres happens to return equal starts in
+            .order_by(TimeSlot.start_minute, TimeSlot.slot_id)
+        )
+
+    def screen_schedule_query(self, screen_id, since: datetime) -> Select:
+        """schedule_query for one screen."""
+        return self.schedule_query(since, TimeSlot.screen_id == screen_id)
+
+    async def get_screen_schedule(self, screen_id, since: datetime) -> List[Row]:
+        """
+        Everything the resolver needs to compile a screen's schedule, in one
+        query (rows shaped like schedule.resolver.SlotRow).
+        """
+        return list((await self.session.execute(self.screen_schedule_query(screen_id, since))).all())
+
+    async def get_screens_schedule(self, screen_ids: Sequence[Any], since: datetime) -> List[ScreenSlotRow]:
+        """
+        get_screen_schedule for many screens (rows also carry screen_id),
+        e.g. to validate a batch of rules or recompute desired states.
+
+        Slots and rules are read in two queries and joined here. The screens
+        of a batch share few rules, so each is read once by primary key;
+        joined in SQL, a batch of a few hundred slots already makes the
+        planner hash the whole rules table.
+        """
+        if not screen_ids:
+            return []
+        slots = (await self.session.execute(hot_queries.SCREENS_SLOTS, {"screen_ids": list(screen_ids)})).all()
+        if not slots:
+            return []
+        rule_ids = list({slot.schedule_rule_id for slot in slots})
+        rules = {
+            rule_id: fields
+            for rule_id, *fields in (await self.session.execute(
+                hot_queries.ACTIVE_RULES, {"rule_ids": rule_ids, "since": since}
+            )).all()
+        }
+        rows = []
+        for start_minute, end_minute, video_id, rule_id, screen_id in slots:
+            rule = rules.get(rule_id)
+            if rule is not None:  # Expired by `since`
+                rows.append(ScreenSlotRow(start_minute, end_minute, video_id, rule_id, *rule, screen_id))
+        return rows
+
+    async def lock_screens(self, screen_ids: Sequence[Any]) -> None:
+        """
+        Take a transaction-level advisory lock on each screen, so writers of
+        rules on the same screens validate and write one after another.
+
+        Locks are taken in key order: batches sharing screens cannot
+        deadlock. They are released on commit or rollback.
+        """
+        if not screen_ids:
+            return
+        await self.session.execute(
+            text(
+                "SELECT pg_advisory_xact_lock(:namespace, key) FROM ("
+                " SELECT DISTINCT hashtext(CAST(screen_id AS text)) AS key"
+                " FROM unnest(CAST(:screen_ids AS uuid[])) AS screen_id ORDER BY key"
+                ") AS keys"
+            ),
+            {"namespace": SCREEN_LOCK_NAMESPACE, "screen_ids": list(screen_ids)},
+        )
+
+    def screen_ids_query(self, column, ids: Sequence[Any]) -> Select:
+        """Distinct screens with a slot whose `column` is in `ids`."""
+        return select(TimeSlot.screen_id).where(column.in_(ids)).distinct()
+
+    async def get_screen_ids_for_rules(self, rule_ids: Sequence[Any]) -> List[Any]:
+        """
+        Screens the given rules are scheduled on: what a change to them
+        invalidates (index-only scan of idx_time_slots_rule_screen).
+        """
+        if not rule_ids:
+            return []
+        stmt = self.screen_ids_query(TimeSlot.schedule_rule_id, rule_ids)
+        return list((await self.session.execute(stmt)).scalars())
+
+    async def get_screen_ids_for_videos(self, video_ids: Sequence[Any]) -> List[Any]:
+        """
+        Screens the given videos are scheduled on (index-only scan of
+        idx_time_slots_video_screen).
+        """
+        if not video_ids:
+            return []
+        stmt = self.screen_ids_query(TimeSlot.video_id, video_ids)
+        return list((await self.session.execute(stmt)).scalars())
+
+    async def get_screen_ids_for_slots(self, slot_ids: Sequence[Any]) -> List[Any]:
+        """Screens of the given slots (primary key lookups; deleted slots are not found)."""
+        if not slot_ids:
+            return []
+        stmt = self.screen_ids_query(TimeSlot.slot_id, slot_ids)
+        return list((await self.session.execute(stmt)).scalars())
+
+    def overlapping_query(
+        self,
+        screen_id,
+        start_minute: int,
+        end_minute: int,
+        exclude_rule_id=None
+    ) -> Select:
+        """Slots of a screen overlapping a minute-of-week range."""
+        stmt = select(TimeSlot).where(
+            TimeSlot.screen_id == screen_id,
+            TimeSlot.minutes.overlaps(func.int4range(start_minute, end_minute)),
+        )
+        if exclude_rule_id is not None:
+            stmt = stmt.where(TimeSlot.schedule_rule_id != exclude_rule_id)
+        return stmt
+
+    async def overlapping(
+        self,
+        screen_id,
+        start_minute: int,
+        end_minute: int,
+        exclude_rule_id=None
+    ) -> List[TimeSlot]:
+        """
+        Slots of a screen overlapping [start_minute, end_minute), for
+        conflict checks (one index probe).
+
+        Args:
+            screen_id: Screen to check
+            start_minute: Range start, minutes since Monday 00:00
+            end_minute: Range end (exclusive)
+            exclude_rule_id: Ignore the slots of this rule (when editing it)
+        """
+        stmt = self.overlapping_query(screen_id, start_minute, end_minute, exclude_rule_id)
+        return list((await self.session.execute(stmt)).scalars())
+
+
+class PlayerSyncStatusRepository(BaseRepository[PlayerSyncStatus]):
+    """Per-player synchronization state."""
+
+    model = PlayerSyncStatus
+
+    async def get_state(self, screen_code: str) -> Optional[Row]:
+        """Desired and applied state version of a player, or None if it has no row yet."""
+        result = await self.session.execute(hot_queries.SYNC_STATE, {"screen_code": screen_code})
+        return result.one_or_none()
+
+    async def set_desired_versions(self, versions: Dict[str, int]) -> None:
+        """
+        Record the desired state version of many players, creating their
+        rows on first use.
+
+        Args:
+            versions: {screen_code: desired_state_version}
+        """
+        await self.bulk_upsert(
+            [
+                {"screen_code": code, "desired_state_version": version}
+                for code, version in versions.items()
+            ],
+            conflict_columns=["screen_code"],
+            update_columns=["desired_state_version"],
+        )
+
+    async def advance_desired_states(self, manifest_hashes: Dict[str, str], force: bool = False) -> Dict[str, int]:
+        """
+        Record recomputed manifests, moving desired_state_version only for
+        players whose manifest hash changed. A moved version puts the
+        player back to pending until it reports the new state applied.
+
+        The comparison happens in the upsert itself (ON CONFLICT ... WHERE
+        hash IS DISTINCT FROM), so concurrent recomputations of the same
+        player cannot both bump it from the same version, and unchanged rows
+        are not written at all. Players without a row start at version 1.
+        The batch goes in array parameters of a prebuilt statement
+        (hot_queries), so any batch size reuses one compiled statement.
+
+        Args:
+            manifest_hashes: {screen_code: manifest hash}
+            force: Move every version, changed or not (republish)
+
+        Returns:
+            {screen_code: new desired_state_version} of the players that changed
+        """
+        if not manifest_hashes:
+            return {}
+        stmt = hot_queries.SYNC_FORCE_STATES if force else hot_queries.SYNC_ADVANCE_STATES
+        result = await self.session.execute(stmt, hot_queries.advance_params(manifest_hashes, datetime.utcnow()))
+        return dict(result.all())
+
+    async def mark_failed(self, failures: Dict[str, Tuple[int, str]]) -> int:
+        """
+        Mark many players failed with their error, in one statement. A
+        player whose desired version moved on since (a newer publish) is
+        left alone.
+
+        Args:
+            failures: {screen_code: (desired_state_version, error message)}
+
+        Returns:
+            Number of players marked
+        """
+        if not failures:
+            return 0
+        result = await self.session.execute(hot_queries.SYNC_MARK_FAILED, hot_queries.failure_params(failures))
+        return result.rowcount
+
+    async def record_heartbeats(self, beats: Dict[str, Tuple[datetime, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Store the latest heartbeat and health metrics of many players.
+
+        Like ScreenRepository.record_heartbeats, this leaves updated_at alone;
+        players that reported no metrics keep their previous ones.
+
+        Args:
+            beats: {screen_code: (heartbeat time, health metrics or None)}
+
+        Returns:
+            Number of rows updated
+        """
+        if not beats:
+            return 0
+        result = await self.session.execute(hot_queries.SYNC_HEARTBEATS, hot_queries.sync_heartbeat_params(beats))
+        return result.rowcount
+
+
+class DesiredStatePendingRepository(BaseRepository[DesiredStatePending]):
+    """
+    Screens whose desired state has not been recomputed since a change.
+
+    A change queues its screens in its own transaction; the recomputation
+    claims (deletes) them in its transaction, so they stay queued until a
+    recomputation commits.
+    """
+
+    model = DesiredStatePending
+
+    async def queue(self, screen_ids: Sequence[Any]) -> None:
+        """
+        Queue screens, in the caller's transaction.
+
+        An already queued screen is updated rather than skipped: its row stays
+        locked until the caller commits, so a recomputation claiming it waits
+        and then reads the change. Rows are written in id order, so
+        concurrent changes lock them in the same order.
+        """
+        if not screen_ids:
+            return
+        await self.session.execute(
+            hot_queries.PENDING_QUEUE,
+            {"screen_ids": sorted(set(screen_ids), key=str), "now": datetime.utcnow()},
+        )
+
+    async def claim(self, screen_ids: Sequence[Any]) -> None:
+        """Take screens off the queue before recomputing them."""
+        if not screen_ids:
+            return
+        await self.session.execute(hot_queries.PENDING_CLAIM, {"screen_ids": list(screen_ids)})
+
+    async def claim_oldest(self, limit: int) -> List[Any]:
+        """
+        Take the longest-queued screens off the queue. Rows another worker
+        is claiming are skipped, not waited for.
+        """
+        result = await self.session.execute(hot_queries.PENDING_CLAIM_OLDEST, {"limit": limit})
+        return list(result.scalars())
+
+
+class AuditLogRepository(BaseRepository[AuditLog]):
+    """Audit trail rows and the monthly partitions that hold them."""
+
+    model = AuditLog
+
+    async def ensure_partitions(self, from_month: date, to_month: date) -> int:
+        """
+        Create any missing monthly partitions between two months (inclusive).
+
+        Returns:
+            Number of partitions created
+        """
+        return await self.session.scalar(
+            text("SELECT audit_logs_ensure_partitions(:from_month, :to_month)"),
+            {"from_month": from_month, "to_month": to_month}
+        )
+
+    async def list_partitions(self) -> Dict[str, date]:
+        """Monthly partitions as {name: first day of the month}."""
+        result = await self.session.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'audit_logs'::regclass
+        """))
+        partitions = {}
+        for name in result.scalars():
+            try:
+                partitions[name] = datetime.strptime(name[len("audit_logs_"):], "%Y_%m").date()
+            except ValueError:
+                continue  # Not created by audit_logs_ensure_partitions
+        return partitions
+
+    async def drop_partitions_before(self, month: date) -> List[str]:
+        """
+        Drop every monthly partition older than month (retention).
+
+        Whole partitions are dropped instead of deleting rows: no dead
+        tuples, no vacuum debt, and the space goes back to the OS at once.
+
+        Returns:
+            Names of the dropped partitions
+        """
+        dropped = []
+        for name, start in sorted((await self.list_partitions()).items()):
+            if start < month:
+                await self.session.execute(text(f'DROP TABLE "{name}"'))
+                dropped.append(name)
+        return dropped
@@ -0,0 +1,92 @@
+"""
+AVTech Platform - Session Routing
+=================================
+
+Sessions that send read-only work to the read replica (DB_REPLICA_URL) and
+everything else to the primary.
+
+Routing is opt-in: a session reads from the replica only while a
+``replica_reads`` service method (``list_*``, ``get_*``) is running, or for
+its whole life when created by ``get_read_session``. Once a session has
+written, it reads from the primary for the rest of its life so it always
+sees its own writes. ``SELECT ... FOR UPDATE`` always goes to the primary.
+"""
+
+import functools
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.backend.database.connection import engine, replica_engine
+
+T = TypeVar("T")
+
+# Keys in Session.info
+_READ_ONLY = "replica_reads"
+_WROTE = "wrote"
+
+
+class RoutingSession(Session):
+    """Session that picks the primary or the replica per statement."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        plain_select = isinstance(clause, Select) and clause._for_update_arg is None
+        if self._flushing or not plain_select:
+            # Writes, locking reads and raw SQL: primary, and stay there
+            self.info[_WROTE] = True
+            return engine.sync_engine
+        if self.info.get(_READ_ONLY) and not self.info.get(_WROTE):
+            return replica_engine.sync_engine
+        return engine.sync_engine
+
+
+# Fábrica de sesiones con enrutado primario/réplica
+SessionLocal = sessionmaker(
+    class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
+
+
+def replica_reads(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Run a read-only service method against the replica.
+
+    The service must keep its session in ``self.db_session``. Calls nest.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs) -> T:
+        info = self.db_session.info
+        depth = info.get(_READ_ONLY, 0)
+        info[_READ_ONLY] = depth + 1
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info[_READ_ONLY] = depth
+    return wrapper
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    Routed session for the request (primary unless a replica_reads method runs).
+    Se usa como dependencia en FastAPI.
+    """
+    async with SessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Session whose plain SELECTs all go to the replica (read-only endpoints).
+    Se usa como dependencia en FastAPI.
+    """
+    async with SessionLocal() as session:
+        session.info[_READ_ONLY] = 1
+        try:
+            yield session
+        finally:
+            await session.rollback()
@@ -0,0 +1,21 @@
+"""
+AVTech Platform - Content Exceptions
+====================================
+
+Exceptions raised by the content (video) services.
+"""
+
+
+class ContentException(Exception):
+    """Base exception for content errors."""
+
+
+class VideoUploadException(ContentException):
+    """A video could not be validated, stored or registered."""
+
+
+class StorageLimitExceededException(ContentException):
+    """The client has no storage quota left for the upload."""
+
+    def __init__(self, message: str = "Límite de almacenamiento del cliente excedido."):
+        super().__init__(message)
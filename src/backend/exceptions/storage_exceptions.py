@@ -0,0 +1,18 @@
+"""
+AVTech Platform - Storage Exceptions
+====================================
+
+Exceptions raised by the storage layer.
+"""
+
+
+class StorageException(Exception):
+    """Base exception for storage errors."""
+
+
+class StorageIntegrityException(StorageException):
+    """Uploaded content does not match its expected SHA-256 hash."""
+
+
+class RangeNotSatisfiableException(StorageException):
+    """Requested byte range lies outside the object."""
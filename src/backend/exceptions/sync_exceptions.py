@@ -0,0 +1,14 @@
+"""
+AVTech Platform - Sync Exceptions
+=================================
+
+Exceptions raised by the screen and player synchronization services.
+"""
+
+
+class SyncException(Exception):
+    """Base exception for screen and sync errors."""
+
+
+class ScreenProvisioningException(SyncException):
+    """A screen could not be registered or provisioned."""
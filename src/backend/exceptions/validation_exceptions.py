@@ -0,0 +1,21 @@
+"""
+AVTech Platform - Validation Exceptions
+=======================================
+
+Exceptions raised when business rules reject input.
+"""
+
+from typing import Any, List, Optional
+
+
+class ValidationException(Exception):
+    """Base exception for business rule violations."""
+
+
+class ScheduleValidationException(ValidationException):
+    """A schedule rule is invalid or could not be registered."""
+
+    def __init__(self, message: str, conflicts: Optional[List[Any]] = None):
+        super().__init__(message)
+        # schedule.validation.Conflict entries that rejected the rules, if any
+        self.conflicts = conflicts or []
@@ -10,6 +10,16 @@ from fastapi import FastAPI
 from src.backend.config import settings
 from src.backend.app import create_app
 from src.backend.database.connection import init_db
+from src.backend.storage.minio_client import shutdown_storage_engine
+from src.backend.monitoring.health_check import health_checker
+from src.backend.storage.usage_reconciler import StorageUsageReconciler
+from src.backend.sync.heartbeat import heartbeat_buffer
+from src.backend.sync.state_catchup import desired_state_catchup
+from src.backend.monitoring.audit import audit_writer
+from src.backend.schedule.cache import schedule_cache
+from src.backend.publish.bulk import player_notifier
+
+usage_reconciler = StorageUsageReconciler()
 
 # Configurar logging básico
 logging.basicConfig(level=settings.server.log_level.upper())
@@ -24,10 +34,23 @@ async def lifespan(app: FastAPI):
     # Inicializar recursos al inicio
     await init_db() # Inicializar conexión a la base de datos
     print("Conexión a la base de datos inicializada.")
+    await health_checker.start() # Sondeo de dependencias en segundo plano
+    await usage_reconciler.start() # Corrige deriva de los contadores de almacenamiento
+    await heartbeat_buffer.start() # Escritura en lote de heartbeats de players
+    await desired_state_catchup.start() # Reintenta recálculos de estado deseado fallidos
+    await audit_writer.start() # Auditoría asíncrona en lote y mantenimiento de particiones
     yield # Aquí corre la aplicación
     print("Cerrando aplicación AVTech Backend...")
     # Cerrar recursos al apagado si es necesario
     # await close_db_resources()
+    await health_checker.stop()
+    await usage_reconciler.stop()
+    await heartbeat_buffer.stop() # Vuelca los heartbeats pendientes
+    await desired_state_catchup.stop()
+    await audit_writer.stop() # Escribe las entradas de auditoría pendientes
+    await shutdown_storage_engine() # Liberar executor y pool HTTP de almacenamiento
+    await schedule_cache.close() # Conexión a Redis de la caché de programaciones
+    await player_notifier.close() # Conexión a Redis de los avisos a players
 
 def main():
     """Función principal para ejecutar la aplicación."""
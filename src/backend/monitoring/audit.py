@@ -0,0 +1,223 @@
+"""
+AVTech Platform - Audit Log Writer
+==================================
+
+Asynchronous, batched writer for the audit trail.
+
+Request handlers hand entries to an in-process queue and return; a
+background task inserts them in multi-row batches. The queue is bounded:
+when the database falls behind, ``record()`` waits for room instead of
+letting memory grow (back-pressure). On shutdown everything still queued is
+written before the task exits.
+
+``audit_logs`` is partitioned by month. A maintenance pass creates the
+upcoming partitions ahead of time and enforces retention by dropping whole
+partitions.
+"""
+
+import asyncio
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from src.backend.config import settings
+from src.backend.database.connection import AsyncSessionLocal
+from src.backend.database.repository import AuditLogRepository
+from src.backend.monitoring.logger import get_logger
+from src.backend.monitoring.metrics import record_audit_entries
+
+logger = get_logger(__name__)
+
+# Advisory lock key: only one worker maintains partitions at a time
+PARTITION_LOCK_KEY = 0x415654_02
+
+# Attempts per batch before its entries are dropped
+WRITE_ATTEMPTS = 3
+
+# Queue marker telling the writer to finish
+_STOP = object()
+
+
+def _add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) month."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class AuditLogWriter:
+    """Bounded queue of audit entries, written in batches off the request path."""
+
+    def __init__(
+        self,
+        queue_size: int = settings.audit.queue_size,
+        batch_size: int = settings.audit.batch_size,
+        flush_interval: float = settings.audit.flush_interval,
+        partitions_ahead: int = settings.audit.partitions_ahead,
+        retention_months: int = settings.audit.retention_months,
+        maintenance_interval: float = settings.audit.maintenance_interval,
+        session_factory=AsyncSessionLocal
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.partitions_ahead = partitions_ahead
+        self.retention_months = retention_months
+        self.maintenance_interval = maintenance_interval
+        self.session_factory = session_factory
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Entries waiting to be written."""
+        return self._queue.qsize()
+
+    async def record(
+        self,
+        action: str,
+        table_name: str,
+        record_id: Any,
+        user_id: Optional[uuid.UUID] = None,
+        old_values: Optional[Dict[str, Any]] = None,
+        new_values: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """
+        Queue one audit entry.
+
+        Returns as soon as the entry is queued; waits only while the queue
+        is full.
+
+        Args:
+            action: CREATE, UPDATE, DELETE...
+            table_name: Table of the affected record
+            record_id: Primary key of the affected record
+            user_id: Acting user, if any
+            old_values: Values before the change
+            new_values: Values after the change
+            ip_address: Client address of the request
+            user_agent: Client user agent of the request
+        """
+        await self._queue.put({
+            "log_id": uuid.uuid4(),
+            "user_id": user_id,
+            "action": action,
+            "table_name": table_name,
+            "record_id": str(record_id),
+            "old_values": old_values,
+            "new_values": new_values,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.utcnow(),
+        })
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insert one batch, retrying transient failures."""
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                async with self.session_factory() as session:
+                    # Idempotent, so a retry after a lost commit acknowledgement is safe
+                    await AuditLogRepository(session).bulk_upsert(
+                        batch, conflict_columns=["log_id", "created_at"], update_columns=[]
+                    )
+                    await session.commit()
+                record_audit_entries("written", len(batch), self.pending)
+                return
+            except Exception as e:
+                if attempt == WRITE_ATTEMPTS:
+                    logger.error(f"Dropping {len(batch)} audit entries after {attempt} attempts: {e}")
+                    record_audit_entries("dropped", len(batch), self.pending)
+                    return
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+    async def _run(self):
+        """Batch loop: write when the batch is full or flush_interval passed."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                break
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            await self._write(batch)
+
+    async def maintain_partitions(self, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        Create the coming monthly partitions and drop expired ones.
+
+        Returns:
+            Summary with created and dropped partitions, or None if another
+            worker is already doing it
+        """
+        month = (today or datetime.utcnow().date()).replace(day=1)
+        async with self.session_factory() as session:
+            locked = await session.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY}
+            )
+            if not locked:
+                return None
+            repo = AuditLogRepository(session)
+            created = await repo.ensure_partitions(month, _add_months(month, self.partitions_ahead))
+            dropped = await repo.drop_partitions_before(_add_months(month, -self.retention_months))
+            await session.commit()
+
+        if created or dropped:
+            logger.info(f"Audit partitions: {created} created, dropped {dropped}")
+        return {"created": created, "dropped": dropped}
+
+    async def _maintain(self):
+        """Partition maintenance loop; a failing pass never stops the loop."""
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self.maintain_partitions()
+            except Exception as e:
+                logger.error(f"Audit partition maintenance failed: {e}")
+
+    async def start(self):
+        """Ensure partitions exist, then start writing (idempotent)."""
+        try:
+            await self.maintain_partitions()
+        except Exception as e:
+            logger.error(f"Audit partition maintenance failed: {e}")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audit-writer")
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintain(), name="audit-partitions")
+
+    async def stop(self):
+        """Write everything still queued, then stop."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+
+
+# Global audit writer instance
+audit_writer = AuditLogWriter()
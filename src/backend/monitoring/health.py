@@ -0,0 +1,44 @@
+"""
+AVTech Platform - Health Routes
+===============================
+
+Health endpoints. They serve the snapshot kept by the background prober in
+health_check.py and never touch the dependencies themselves.
+"""
+
+from typing import Dict, Any
+
+from fastapi import APIRouter
+
+from src.backend.monitoring.health_check import (
+    get_health,
+    get_detailed_health,
+    get_readiness,
+    get_liveness,
+)
+
+health_router = APIRouter(prefix="/health", tags=["health"])
+
+
+@health_router.get("")
+async def health() -> Dict[str, Any]:
+    """Overall status with per-dependency checks."""
+    return await get_health()
+
+
+@health_router.get("/detailed")
+async def health_detailed() -> Dict[str, Any]:
+    """Status plus uptime and prober configuration."""
+    return await get_detailed_health()
+
+
+@health_router.get("/ready")
+async def readiness() -> Dict[str, Any]:
+    """Kubernetes readiness probe (503 unless the last snapshot is healthy)."""
+    return await get_readiness()
+
+
+@health_router.get("/live")
+async def liveness() -> Dict[str, Any]:
+    """Kubernetes liveness probe."""
+    return await get_liveness()
@@ -3,143 +3,189 @@ AVTech Platform - Health Check
 ==============================
 
 Health check endpoints and monitoring for the AVTech Platform backend.
+
+Dependencies are probed concurrently by a background task on a fixed
+interval, each check bounded by a timeout and reusing long-lived clients.
+Endpoints only read the latest snapshot, so probe storms (Kubernetes,
+load balancers) never reach Postgres, Redis or MinIO.
 """
 
 import asyncio
 import time
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable, Awaitable
+from datetime import datetime
 
 from fastapi import HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.backend.database.connection import get_db_session
+from src.backend.database.connection import engine
 from src.backend.config import settings
+from src.backend.monitoring.logger import get_logger
 import redis.asyncio as redis
 
+logger = get_logger(__name__)
+
 
 class HealthChecker:
-    """Health check manager for various services."""
-    
-    def __init__(self):
+    """Background health prober for the backend dependencies."""
+
+    def __init__(
+        self,
+        interval: float = settings.health.probe_interval,
+        timeout: float = settings.health.probe_timeout,
+        max_staleness: float = settings.health.max_staleness
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_staleness = max_staleness
         self.redis_client: Optional[redis.Redis] = None
-        self._last_checks: Dict[str, Dict[str, Any]] = {}
-    
+        self.storage_client = None
+        self.started_at = time.time()
+        self._task: Optional[asyncio.Task] = None
+        self._last_probe: Optional[float] = None
+        self._snapshot: Dict[str, Any] = {
+            "status": "starting",
+            "timestamp": datetime.utcnow().isoformat(),
+            "checks": {},
+            "version": "0.1.0",
+            "service": "avtech-backend"
+        }
+
     async def check_database(self) -> Dict[str, Any]:
         """Check database connectivity and performance."""
-        try:
-            start_time = time.time()
-            
-            async with get_db_session() as session:
-                # Simple query to test connectivity
-                result = await session.execute(text("SELECT 1"))
-                result.fetchone()
-                
-                response_time = time.time() - start_time
-                
-                return {
-                    "status": "healthy",
-                    "response_time_ms": round(response_time * 1000, 2),
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-        except Exception as e:
-            return {
-                "status": "unhealthy",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-    
+        # Uses a pooled connection; no session or ORM machinery needed
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT 1"))
+            result.fetchone()
+        return {"status": "healthy"}
+
     async def check_redis(self) -> Dict[str, Any]:
         """Check Redis connectivity and performance."""
-        try:
-            if not self.redis_client:
-                self.redis_client = redis.Redis(
-                    host=settings.redis.host,
-                    port=settings.redis.port,
-                    password=settings.redis.password,
-                    decode_responses=True
-                )
-            
-            start_time = time.time()
-            
-            # Test Redis connection
-            await self.redis_client.ping()
-            
-            response_time = time.time() - start_time
-            
-            return {
-                "status": "healthy",
-                "response_time_ms": round(response_time * 1000, 2),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        except Exception as e:
-            return {
-                "status": "unhealthy",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-    
+        if not self.redis_client:
+            self.redis_client = redis.Redis(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                password=settings.redis.password,
+                decode_responses=True,
+                socket_connect_timeout=self.timeout,
+                socket_timeout=self.timeout
+            )
+
+        # Test Redis connection
+        await self.redis_client.ping()
+        return {"status": "healthy"}
+
     async def check_storage(self) -> Dict[str, Any]:
-        """Check MinIO storage connectivity."""
+        """Check object storage connectivity."""
+        if self.storage_client is None:
+            from src.backend.storage.backend import get_health_probe_backend
+            self.storage_client = get_health_probe_backend(self.timeout)
+
+        # Test storage backend connection
+        if not await self.storage_client.health_check():
+            return {"status": "unhealthy", "error": f"{settings.storage.backend} health check failed"}
+        return {"status": "healthy"}
+
+    async def _timed_check(
+        self,
+        check: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Run a check with a timeout, recording its response time."""
+        start_time = time.time()
         try:
-            from src.backend.storage.minio_client import MinIOClient
-            
-            start_time = time.time()
-            
-            # Test MinIO connection
-            client = MinIOClient()
-            await client.health_check()
-            
-            response_time = time.time() - start_time
-            
-            return {
-                "status": "healthy",
-                "response_time_ms": round(response_time * 1000, 2),
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            result = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "error": f"timeout after {self.timeout}s"}
         except Exception as e:
-            return {
-                "status": "unhealthy",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-    
-    async def get_system_health(self) -> Dict[str, Any]:
-        """Get overall system health status."""
-        checks = {
-            "database": await self.check_database(),
-            "redis": await self.check_redis(),
-            "storage": await self.check_storage()
-        }
-        
+            result = {"status": "unhealthy", "error": str(e)}
+
+        result["response_time_ms"] = round((time.time() - start_time) * 1000, 2)
+        result["timestamp"] = datetime.utcnow().isoformat()
+        return result
+
+    async def probe(self) -> Dict[str, Any]:
+        """Probe every dependency concurrently and publish a new snapshot."""
+        names = ("database", "redis", "storage")
+        results = await asyncio.gather(
+            self._timed_check(self.check_database),
+            self._timed_check(self.check_redis),
+            self._timed_check(self.check_storage)
+        )
+        checks = dict(zip(names, results))
+
         # Determine overall health
         all_healthy = all(
-            check["status"] == "healthy" 
+            check["status"] == "healthy"
             for check in checks.values()
         )
-        
-        overall_status = "healthy" if all_healthy else "degraded"
-        
-        return {
-            "status": overall_status,
+
+        self._last_probe = time.time()
+        self._snapshot = {
+            "status": "healthy" if all_healthy else "degraded",
             "timestamp": datetime.utcnow().isoformat(),
             "checks": checks,
             "version": "0.1.0",
             "service": "avtech-backend"
         }
-    
-    async def get_detailed_health(self) -> Dict[str, Any]:
+        return self._snapshot
+
+    async def _run(self):
+        """Probe loop; a failing probe never stops the loop."""
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Start the background prober (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="health-prober")
+            logger.info(f"Health prober started (interval={self.interval}s)")
+
+    async def stop(self):
+        """Stop the background prober and close its clients."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.redis_client is not None:
+            await self.redis_client.close()
+            self.redis_client = None
+        close = getattr(self.storage_client, "close", None)
+        if close is not None:
+            close()
+        self.storage_client = None
+
+    def get_system_health(self) -> Dict[str, Any]:
+        """Get overall system health status from the latest snapshot."""
+        health = dict(self._snapshot)
+        age = None if self._last_probe is None else time.time() - self._last_probe
+        health["snapshot_age_seconds"] = None if age is None else round(age, 2)
+
+        # A prober that stopped reporting must not keep the service "healthy"
+        if age is not None and age > self.max_staleness:
+            health["status"] = "stale"
+
+        return health
+
+    def get_detailed_health(self) -> Dict[str, Any]:
         """Get detailed health information including metrics."""
-        health = await self.get_system_health()
-        
+        health = self.get_system_health()
+
         # Add additional system information
         health.update({
-            "uptime_seconds": time.time() - start_time if 'start_time' in globals() else 0,
+            "uptime_seconds": round(time.time() - self.started_at, 2),
+            "probe_interval_seconds": self.interval,
+            "probe_timeout_seconds": self.timeout,
             "environment": "development" if settings.server.debug else "production",
             "log_level": settings.server.log_level
         })
-        
+
         return health
 
 
@@ -149,18 +195,18 @@ health_checker = HealthChecker()
 
 async def get_health() -> Dict[str, Any]:
     """Get basic health status."""
-    return await health_checker.get_system_health()
+    return health_checker.get_system_health()
 
 
 async def get_detailed_health() -> Dict[str, Any]:
     """Get detailed health status."""
-    return await health_checker.get_detailed_health()
+    return health_checker.get_detailed_health()
 
 
 async def get_readiness() -> Dict[str, Any]:
     """Get readiness status for Kubernetes."""
-    health = await health_checker.get_system_health()
-    
+    health = health_checker.get_system_health()
+
     if health["status"] == "healthy":
         return {"status": "ready"}
     else:
@@ -5,7 +5,8 @@ AVTech Platform - Metrics Configuration
 Prometheus metrics configuration for the AVTech Platform backend.
 """
 
-from prometheus_client import Counter, Histogram, Gauge, Info, generate_latest
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, Gauge, Info, generate_latest
 from typing import Dict, Any
 
 
@@ -33,7 +34,33 @@ http_request_duration_seconds = Histogram(
 # Database Metrics
 db_connections_active = Gauge(
     'db_connections_active',
-    'Active database connections'
+    'Database connections checked out of the pool',
+    ['pool']
+)
+
+db_pool_checkouts_total = Counter(
+    'db_pool_checkouts_total',
+    'Total database connection checkouts',
+    ['pool']
+)
+
+db_pool_checkins_total = Counter(
+    'db_pool_checkins_total',
+    'Total database connections returned to the pool',
+    ['pool']
+)
+
+db_pool_wait_seconds = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent waiting for a pooled database connection',
+    ['pool'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+db_pool_timeouts_total = Counter(
+    'db_pool_timeouts_total',
+    'Checkouts that timed out waiting for a pooled connection',
+    ['pool']
 )
 
 db_query_duration_seconds = Histogram(
@@ -78,6 +105,28 @@ screens_total = Gauge(
     'Total number of screens'
 )
 
+screen_status_transitions_total = Counter(
+    'screen_status_transitions_total',
+    'Screen online/offline transitions',
+    ['status']
+)
+
+heartbeats_received_total = Counter(
+    'heartbeats_received_total',
+    'Player heartbeats received'
+)
+
+heartbeat_flush_rows = Histogram(
+    'heartbeat_flush_rows',
+    'Screens written per heartbeat flush',
+    buckets=(0, 10, 100, 500, 1000, 2500, 5000, 10000, 25000)
+)
+
+heartbeat_flush_duration_seconds = Histogram(
+    'heartbeat_flush_duration_seconds',
+    'Duration of a batched heartbeat flush in seconds'
+)
+
 # Sync Metrics
 sync_operations_total = Counter(
     'sync_operations_total',
@@ -91,6 +140,59 @@ sync_duration_seconds = Histogram(
     ['screen_id']
 )
 
+desired_state_recomputes_total = Counter(
+    'desired_state_recomputes_total',
+    'Player desired states recomputed after a change, by whether the manifest changed',
+    ['result']
+)
+
+# Publish Metrics
+publish_screens_total = Counter(
+    'publish_screens_total',
+    'Screens targeted by bulk publishes, by outcome',
+    ['result']
+)
+
+publish_duration_seconds = Histogram(
+    'publish_duration_seconds',
+    'Duration of a bulk publish in seconds, notification included'
+)
+
+publish_notifications_total = Counter(
+    'publish_notifications_total',
+    'Player notification attempts by result',
+    ['result']
+)
+
+publish_notify_concurrency = Gauge(
+    'publish_notify_concurrency',
+    'Current adaptive concurrency limit of the player notification fan-out'
+)
+
+# Schedule Cache Metrics
+schedule_cache_requests_total = Counter(
+    'schedule_cache_requests_total',
+    'Resolved schedule cache lookups by tier and result',
+    ['tier', 'result']
+)
+
+schedule_cache_invalidations_total = Counter(
+    'schedule_cache_invalidations_total',
+    'Screens whose schedule version was bumped'
+)
+
+# Audit Metrics
+audit_entries_total = Counter(
+    'audit_entries_total',
+    'Audit log entries by outcome',
+    ['status']
+)
+
+audit_queue_size = Gauge(
+    'audit_queue_size',
+    'Audit log entries waiting to be written'
+)
+
 # Error Metrics
 errors_total = Counter(
     'errors_total',
@@ -104,6 +206,15 @@ def get_metrics() -> str:
     return generate_latest()
 
 
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(content=get_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 def record_http_request(method: str, endpoint: str, status_code: int, duration: float):
     """Record HTTP request metrics."""
     http_requests_total.labels(
@@ -123,15 +234,45 @@ def record_db_query(query_type: str, duration: float):
     db_query_duration_seconds.labels(query_type=query_type).observe(duration)
 
 
+def record_db_checkout(pool: str):
+    """Record a connection leaving the pool."""
+    db_pool_checkouts_total.labels(pool=pool).inc()
+    db_connections_active.labels(pool=pool).inc()
+
+
+def record_db_checkin(pool: str):
+    """Record a connection returning to the pool."""
+    db_pool_checkins_total.labels(pool=pool).inc()
+    db_connections_active.labels(pool=pool).dec()
+
+
+def record_db_pool_wait(pool: str, duration: float, timed_out: bool = False):
+    """Record how long a checkout waited for a connection."""
+    db_pool_wait_seconds.labels(pool=pool).observe(duration)
+    if timed_out:
+        db_pool_timeouts_total.labels(pool=pool).inc()
+
+
 def record_storage_operation(operation: str, status: str, bytes_used: int = 0, bucket: str = ""):
-    """Record storage operation metrics."""
+    """
+    Record storage operation metrics.
+    
+    ``bytes_used`` is the change in stored bytes caused by the operation
+    (negative for deletions); the bucket total is adjusted by it and
+    periodically reset to the real value by record_storage_usage().
+    """
     storage_operations_total.labels(
         operation=operation,
         status=status
     ).inc()
     
-    if bytes_used > 0 and bucket:
-        storage_bytes_total.labels(bucket=bucket).set(bytes_used)
+    if bytes_used and bucket:
+        storage_bytes_total.labels(bucket=bucket).inc(bytes_used)
+
+
+def record_storage_usage(bucket: str, total_bytes: int):
+    """Record the measured total size of a bucket."""
+    storage_bytes_total.labels(bucket=bucket).set(total_bytes)
 
 
 def record_video_upload(status: str, duration: float = 0):
@@ -148,6 +289,23 @@ def record_screen_status(online_count: int, total_count: int):
     screens_total.set(total_count)
 
 
+def record_screen_transition(status: str, count: int = 1):
+    """Record screens going online or offline."""
+    if count:
+        screen_status_transitions_total.labels(status=status).inc(count)
+
+
+def record_heartbeat():
+    """Record one received player heartbeat."""
+    heartbeats_received_total.inc()
+
+
+def record_heartbeat_flush(rows: int, duration: float):
+    """Record one batched heartbeat flush."""
+    heartbeat_flush_rows.observe(rows)
+    heartbeat_flush_duration_seconds.observe(duration)
+
+
 def record_sync_operation(screen_id: str, status: str, duration: float = 0):
     """Record sync operation metrics."""
     sync_operations_total.labels(
@@ -159,6 +317,46 @@ def record_sync_operation(screen_id: str, status: str, duration: float = 0):
         sync_duration_seconds.labels(screen_id=screen_id).observe(duration)
 
 
+def record_desired_states(changed: int, unchanged: int):
+    """Record recomputed desired states (changed: version bumped)."""
+    if changed:
+        desired_state_recomputes_total.labels(result="changed").inc(changed)
+    if unchanged:
+        desired_state_recomputes_total.labels(result="unchanged").inc(unchanged)
+
+
+def record_publish(results: Dict[str, int], duration: float):
+    """Record one bulk publish ({result: screens}, result: unchanged/notified/failed)."""
+    for result, count in results.items():
+        if count:
+            publish_screens_total.labels(result=result).inc(count)
+    publish_duration_seconds.observe(duration)
+
+
+def record_publish_notification(result: str, limit: float):
+    """Record one notification attempt (delivered/retried/failed) and the concurrency limit after it."""
+    publish_notifications_total.labels(result=result).inc()
+    publish_notify_concurrency.set(limit)
+
+
+def record_schedule_cache(tier: str, result: str):
+    """Record one schedule cache lookup (tier: local/redis, result: hit/miss/error)."""
+    schedule_cache_requests_total.labels(tier=tier, result=result).inc()
+
+
+def record_schedule_invalidation(screens: int):
+    """Record screens whose cached schedules were invalidated."""
+    if screens:
+        schedule_cache_invalidations_total.inc(screens)
+
+
+def record_audit_entries(status: str, count: int, queued: int):
+    """Record audit entries written or dropped, and the current queue size."""
+    if count:
+        audit_entries_total.labels(status=status).inc(count)
+    audit_queue_size.set(queued)
+
+
 def record_error(error_type: str, component: str):
     """Record error metrics."""
     errors_total.labels(
@@ -0,0 +1,219 @@
+"""
+AVTech Platform - Bulk Publish Fan-out
+======================================
+
+Tells many players that their desired state version moved.
+
+A fixed semaphore is the wrong limit for tens of thousands of players: too
+low and healthy players wait behind slow ones, too high and a struggling
+notification backend gets buried. ``AdaptiveLimiter`` moves the limit with
+what it observes, like TCP congestion control:
+
+* slow start: the limit grows by one per success (doubling every round)
+  until the first sign of trouble
+* additive increase: afterwards, by one per round of successes
+* multiplicative decrease: an attempt slower than the target latency
+  (timeouts included) halves it, at most once per round
+
+Only latency counts as congestion. An error that comes back fast is the
+player's or the network's, not a sign of load: with a few percent of
+unreachable players, halving on every error would pin the limit near its
+minimum. Those errors spend the player's retry budget instead.
+
+Each player has its own retry budget. A failed attempt is put back on the
+queue after an exponential backoff with jitter and does not hold a slot
+while it waits, so retries never stall healthy players. A fixed pool of
+workers drains the queue, so a publish to 20,000 screens does not create
+20,000 tasks.
+
+Notifiers are ``async (screen_code, version) -> None`` callables that raise
+on failure; ``RedisNotifier`` is the default.
+"""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+import orjson
+import redis.asyncio as redis
+
+from src.backend.config import settings
+from src.backend.monitoring.logger import get_logger
+from src.backend.monitoring.metrics import record_publish_notification
+
+logger = get_logger(__name__)
+
+Notify = Callable[[str, int], Awaitable[None]]
+
+# Channel a player (or the gateway holding its connection) listens on
+CHANNEL = "player:{}:state"
+
+
+class AdaptiveLimiter:
+    """Concurrency limit driven by latency and errors (AIMD)."""
+
+    def __init__(self, minimum: int, maximum: int, target_latency: float):
+        """
+        Args:
+            minimum: Lowest limit; also the starting one
+            maximum: Highest limit
+            target_latency: Successful attempts slower than this (seconds)
+                count as congestion
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.limit = float(minimum)
+        self.in_flight = 0
+        self._slow_start = True
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot.
+
+        Returns:
+            Start time of the attempt (loop time), to pass to release()
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return asyncio.get_running_loop().time()
+
+    async def release(self, started: float, ok: bool) -> None:
+        """Free a slot and adjust the limit with the attempt's latency and outcome."""
+        now = asyncio.get_running_loop().time()
+        async with self._condition:
+            self.in_flight -= 1
+            if now - started <= self.target_latency:
+                if ok:
+                    step = 1 if self._slow_start else 1 / self.limit
+                    self.limit = min(self.maximum, self.limit + step)
+            elif started > self._last_decrease:
+                # Attempts already in flight saw the old limit: one decrease per round
+                self._slow_start = False
+                self._last_decrease = now
+                self.limit = max(self.minimum, self.limit / 2)
+            self._condition.notify(max(1, int(self.limit) - self.in_flight))
+
+
+class FanOutResult(NamedTuple):
+    """Outcome of notifying a set of players."""
+    delivered: Dict[str, int]  # {screen_code: attempts}
+    failed: Dict[str, Tuple[int, str]]  # {screen_code: (version, last error)}
+    limit: float  # Concurrency limit reached at the end
+
+
+async def fan_out(
+    versions: Dict[str, int],
+    notify: Notify,
+    limiter: Optional[AdaptiveLimiter] = None,
+    retries: int = settings.publish.notify_retries,
+    backoff: float = settings.publish.notify_backoff,
+    timeout: float = settings.publish.notify_timeout
+) -> FanOutResult:
+    """
+    Notify every player of its new desired state version.
+
+    Args:
+        versions: {screen_code: desired_state_version}
+        notify: Notifier; raising (or exceeding `timeout`) fails an attempt
+        limiter: Concurrency limiter (default: one from settings)
+        retries: Attempts per player after the first
+        backoff: Delay before the first retry in seconds, doubled on each
+
+    Returns:
+        Delivered and failed players
+    """
+    limiter = limiter or AdaptiveLimiter(
+        settings.publish.notify_min_concurrency,
+        settings.publish.notify_max_concurrency,
+        settings.publish.notify_target_latency,
+    )
+    delivered: Dict[str, int] = {}
+    failed: Dict[str, Tuple[int, str]] = {}
+    if not versions:
+        return FanOutResult(delivered, failed, limiter.limit)
+
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Tuple[str, int, int]]" = asyncio.Queue()
+    for code, version in versions.items():
+        queue.put_nowait((code, version, 0))
+    remaining = len(versions)
+    finished = asyncio.Event()
+
+    async def worker() -> None:
+        nonlocal remaining
+        while True:
+            code, version, attempt = await queue.get()
+            started = await limiter.acquire()
+            try:
+                await asyncio.wait_for(notify(code, version), timeout)
+            except Exception as e:
+                await limiter.release(started, ok=False)
+                if attempt < retries:
+                    record_publish_notification("retried", limiter.limit)
+                    delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                    loop.call_later(delay, queue.put_nowait, (code, version, attempt + 1))
+                    continue
+                record_publish_notification("failed", limiter.limit)
+                failed[code] = (version, str(e) or type(e).__name__)
+            else:
+                await limiter.release(started, ok=True)
+                record_publish_notification("delivered", limiter.limit)
+                delivered[code] = attempt + 1
+            remaining -= 1
+            if not remaining:
+                finished.set()
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(limiter.maximum, len(versions)))]
+    try:
+        await finished.wait()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    if failed:
+        logger.warning(f"{len(failed)} of {len(versions)} players could not be notified")
+    return FanOutResult(delivered, failed, limiter.limit)
+
+
+class RedisNotifier:
+    """
+    Publishes ``{"version": n}`` on ``player:{screen_code}:state``.
+
+    Players (or the gateway holding their connections) subscribe to their
+    channel. A player that is not listening picks the version up on its
+    next sync, so no subscriber is not an error; an unreachable Redis is.
+    """
+
+    def __init__(self, timeout: float = settings.publish.notify_timeout, client: Optional[redis.Redis] = None):
+        self.timeout = timeout
+        self._client = client
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                password=settings.redis.password,
+                socket_connect_timeout=self.timeout,
+                socket_timeout=self.timeout,
+            )
+        return self._client
+
+    async def __call__(self, screen_code: str, version: int) -> None:
+        await self.client.publish(CHANNEL.format(screen_code), orjson.dumps({"version": version}))
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# Process-wide notifier shared by every PublishService
+player_notifier = RedisNotifier()
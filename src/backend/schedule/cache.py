@@ -0,0 +1,259 @@
+"""
+AVTech Platform - Resolved Schedule Cache
+=========================================
+
+Two-tier cache of compiled screen schedules (see schedule.resolver), so a
+player sync does not re-read rules and slots from Postgres.
+
+Entries are keyed by screen and the screen's schedule version, a counter in
+Redis bumped after every committed change to the rules, slots or videos of
+the screen (``bump``). Nothing is ever deleted or overwritten on a change:
+readers stop finding an entry for the new version and compile a fresh one.
+Every worker sees a change as soon as the counter moves, and an entry built
+for an older version can never be served again.
+
+* Local tier: per-process LRU of {screen: (version, entry)}
+* Redis tier: the encoded schedule under ``schedule:entry:{screen}:{version}``,
+  shared by all workers
+
+Both tiers expire entries after ``ttl`` seconds, which bounds how long a
+change is missed if bumping its version failed.
+
+A schedule compiled at ``since`` leaves out rules that had already expired,
+so an entry only answers lookups at or after ``since``.
+
+If Redis is unreachable, lookups compile from the database and nothing is
+cached: without the version an entry could not be trusted.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from src.backend.config import settings
+from src.backend.monitoring.logger import get_logger
+from src.backend.monitoring.metrics import record_schedule_cache, record_schedule_invalidation
+from src.backend.schedule.resolver import ScreenSchedule, Segment, compile_schedule
+
+logger = get_logger(__name__)
+
+VERSION_KEY = "schedule:version:{}"
+ENTRY_KEY = "schedule:entry:{}:{}"
+
+
+class CachedSchedule(NamedTuple):
+    """A compiled schedule and the version of the screen it was built for."""
+    version: int
+    since: datetime  # Valid for lookups at or after this moment
+    schedule: ScreenSchedule
+    expires: float  # time.monotonic() deadline in the local tier
+
+
+def encode_schedule(since: datetime, schedule: ScreenSchedule) -> bytes:
+    """
+    JSON bytes of a compiled schedule. Videos and the playlists shared by
+    segments are stored once and referred to by index.
+    """
+    videos: Dict[UUID, int] = {}
+    playlists: Dict[int, Tuple[int, List[int]]] = {}
+    segments = []
+    for segment in schedule.segments:
+        candidates = []
+        for rule, video_ids in segment.candidates:
+            playlist = playlists.get(id(video_ids))
+            if playlist is None:
+                indexes = [videos.setdefault(video_id, len(videos)) for video_id in video_ids]
+                playlist = playlists[id(video_ids)] = (len(playlists), indexes)
+            candidates += (rule, playlist[0])
+        segments.append((segment.start, segment.end, candidates))
+    return orjson.dumps({
+        "since": since,
+        "rules": [str(rule_id) for rule_id in schedule.rule_ids],
+        "windows": schedule.windows,
+        "videos": [str(video_id) for video_id in videos],
+        "playlists": [indexes for _, indexes in playlists.values()],
+        "segments": segments,
+    })
+
+
+def decode_schedule(data: bytes) -> Tuple[datetime, ScreenSchedule]:
+    """Inverse of encode_schedule."""
+    raw = orjson.loads(data)
+    videos = [UUID(video_id) for video_id in raw["videos"]]
+    playlists = [tuple([videos[index] for index in indexes]) for indexes in raw["playlists"]]
+    segments = [
+        Segment(start, end, tuple(zip(candidates[::2], [playlists[index] for index in candidates[1::2]])))
+        for start, end, candidates in raw["segments"]
+    ]
+    windows = [
+        (datetime.fromisoformat(active_from), datetime.fromisoformat(active_until) if active_until else None)
+        for active_from, active_until in raw["windows"]
+    ]
+    schedule = ScreenSchedule([UUID(rule_id) for rule_id in raw["rules"]], windows, segments)
+    return datetime.fromisoformat(raw["since"]), schedule
+
+
+class ScheduleCache:
+    """Compiled schedules by (screen, schedule version), in process and in Redis."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: int,
+        timeout: float,
+        client: Optional[redis.Redis] = None
+    ):
+        """
+        Args:
+            max_entries: Screens kept in the local LRU before eviction
+            ttl: Seconds an entry lives in either tier
+            timeout: Redis socket timeout in seconds; past it lookups
+                compile from the database
+            client: Redis client (default: one built from settings on first use)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.timeout = timeout
+        self._client = client
+        self._entries: "OrderedDict[str, CachedSchedule]" = OrderedDict()
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis(
+                host=settings.redis.host,
+                port=settings.redis.port,
+                password=settings.redis.password,
+                socket_connect_timeout=self.timeout,
+                socket_timeout=self.timeout,
+            )
+        return self._client
+
+    async def version(self, screen_id: str) -> int:
+        """
+        Current schedule version of a screen.
+
+        A missing counter (new screen, or Redis lost its data) starts at the
+        current time in nanoseconds, above any version handed out before.
+        """
+        key = VERSION_KEY.format(screen_id)
+        value = await self.client.get(key)
+        if value is None:
+            await self.client.set(key, time.time_ns(), nx=True)
+            value = await self.client.get(key)
+        return int(value)
+
+    async def get_schedule(
+        self,
+        screen_id: Any,
+        at: datetime,
+        load: Callable[[], Awaitable[Iterable[Any]]]
+    ) -> ScreenSchedule:
+        """
+        Compiled schedule of a screen, valid at `at`.
+
+        Args:
+            screen_id: Screen
+            at: Moment the schedule will be resolved at (naive UTC)
+            load: Reads the screen's slots (TimeSlotRepository.get_screen_schedule
+                since `at`) on a miss. It must read the primary: a lagging
+                replica could cache pre-change slots under the new version.
+
+        Returns:
+            The compiled schedule
+        """
+        screen_id = str(screen_id)
+        try:
+            version = await self.version(screen_id)
+        except RedisError as e:
+            record_schedule_cache("redis", "error")
+            logger.error(f"Schedule cache unavailable, compiling {screen_id}: {e}")
+            return compile_schedule(await load())
+
+        entry = self._entries.get(screen_id)
+        if (
+            entry is not None
+            and entry.version == version
+            and entry.since <= at
+            and time.monotonic() < entry.expires
+        ):
+            self._entries.move_to_end(screen_id)
+            record_schedule_cache("local", "hit")
+            return entry.schedule
+        record_schedule_cache("local", "miss")
+
+        key = ENTRY_KEY.format(screen_id, version)
+        try:
+            data = await self.client.get(key)
+        except RedisError as e:
+            record_schedule_cache("redis", "error")
+            logger.error(f"Schedule cache read failed for {screen_id}: {e}")
+            data = None
+        if data is not None:
+            since, schedule = decode_schedule(data)
+            if since <= at:
+                record_schedule_cache("redis", "hit")
+                self._store(screen_id, version, since, schedule)
+                return schedule
+        record_schedule_cache("redis", "miss")
+
+        schedule = compile_schedule(await load())
+        if entry is not None and entry.version == version and at < entry.since:
+            return schedule  # Lookup in the past: keep the entry that serves the present
+        self._store(screen_id, version, at, schedule)
+        try:
+            await self.client.set(key, encode_schedule(at, schedule), ex=self.ttl)
+        except RedisError as e:
+            record_schedule_cache("redis", "error")
+            logger.error(f"Schedule cache write failed for {screen_id}: {e}")
+        return schedule
+
+    def _store(self, screen_id: str, version: int, since: datetime, schedule: ScreenSchedule) -> None:
+        self._entries[screen_id] = CachedSchedule(version, since, schedule, time.monotonic() + self.ttl)
+        self._entries.move_to_end(screen_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def bump(self, screen_ids: Iterable[Any]) -> None:
+        """
+        Invalidate the cached schedules of some screens by moving their
+        versions. Call it after the change is committed, or a worker could
+        cache the old slots under the new version.
+        """
+        keys = list(dict.fromkeys(str(screen_id) for screen_id in screen_ids))
+        if not keys:
+            return
+        for screen_id in keys:
+            self._entries.pop(screen_id, None)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for screen_id in keys:
+                    pipe.set(VERSION_KEY.format(screen_id), time.time_ns(), nx=True)
+                    pipe.incr(VERSION_KEY.format(screen_id))
+                await pipe.execute()
+        except RedisError as e:
+            # Other workers keep serving their entries until they expire
+            record_schedule_cache("redis", "error")
+            logger.error(f"Schedule version bump failed for {len(keys)} screens: {e}")
+            return
+        record_schedule_invalidation(len(keys))
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# Process-wide cache shared by every ScheduleService
+schedule_cache = ScheduleCache(
+    max_entries=settings.schedule.cache_size,
+    ttl=settings.schedule.cache_ttl,
+    timeout=settings.schedule.cache_timeout
+)
@@ -0,0 +1,307 @@
+"""
+AVTech Platform - Schedule Resolver
+===================================
+
+Compiles a screen's schedule rules into a weekly timeline and answers
+"what plays now" and "what plays next" with binary searches instead of
+evaluating every rule and slot on each request.
+
+Compilation has two stages:
+
+1. ``compile_schedule`` cuts the week at every slot boundary into
+   non-overlapping segments. Each segment lists the rules scheduled in it,
+   best first (higher priority, then the most recently created rule), with
+   the videos each of them plays there. This only depends on the rules, so
+   a ``ScreenSchedule`` stays valid until they change.
+2. Rules are only active between their ``active_from`` and
+   ``active_until``. Between two consecutive such boundaries (an epoch) the
+   set of active rules is fixed, so ``ScreenSchedule.timeline`` picks the
+   winning rule of every segment once per epoch and merges neighbours into
+   a ``Timeline`` of runs. Timelines are built lazily and kept.
+
+A lookup is then a bisect over the run starts of one timeline: O(log n) in
+the number of segments.
+
+Overlapping slots of the same rule form a playlist: the run lists all
+their videos. Times are naive UTC datetimes, like the rest of the models.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from src.backend.schedule.week import MINUTES_PER_WEEK, minute_of_week
+
+# How far ahead next() looks for a change
+LOOKAHEAD = timedelta(weeks=1)
+
+WEEK = timedelta(minutes=MINUTES_PER_WEEK)
+
+
+class SlotRow(NamedTuple):
+    """
+    One stored slot of a screen with the fields of its rule, as read by
+    TimeSlotRepository.get_screen_schedule.
+    """
+    start_minute: int
+    end_minute: int
+    video_id: UUID
+    rule_id: UUID
+    priority: int
+    active_from: datetime
+    active_until: Optional[datetime]
+    created_at: Optional[datetime]
+
+
+class ScreenSlotRow(NamedTuple):
+    """A SlotRow with its screen, as read by TimeSlotRepository.get_screens_schedule."""
+    start_minute: int
+    end_minute: int
+    video_id: UUID
+    rule_id: UUID
+    priority: int
+    active_from: datetime
+    active_until: Optional[datetime]
+    created_at: Optional[datetime]
+    screen_id: UUID
+
+
+class Segment(NamedTuple):
+    """A stretch of the week with the same rules scheduled, best first."""
+    start: int  # Minute of the week, inclusive
+    end: int  # Exclusive
+    candidates: Tuple[Tuple[int, Tuple[UUID, ...]], ...]  # (rule index, video_ids)
+
+
+class Run(NamedTuple):
+    """A stretch of the week during which one rule plays the same videos."""
+    start: int
+    end: int
+    rule: int  # Rule index
+    video_ids: Tuple[UUID, ...]
+
+
+class Playing(NamedTuple):
+    """A run placed in time."""
+    rule_id: UUID
+    video_ids: Tuple[UUID, ...]
+    starts_at: datetime
+    ends_at: datetime
+
+
+def week_start(at: datetime) -> datetime:
+    """Monday 00:00 of the week of `at`."""
+    return (at - timedelta(days=at.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class Timeline:
+    """Runs of one epoch, sorted and non-overlapping."""
+
+    __slots__ = ("runs", "starts", "valid_from", "valid_until")
+
+    def __init__(self, runs: List[Run], valid_from: Optional[datetime], valid_until: Optional[datetime]):
+        self.runs = runs
+        self.starts = [run.start for run in runs]
+        self.valid_from = valid_from
+        self.valid_until = valid_until
+
+    def index_at(self, minute: int) -> int:
+        """Index of the run covering `minute`, or of the next one (len(runs) if none)."""
+        index = bisect_right(self.starts, minute) - 1
+        if index >= 0 and minute < self.runs[index].end:
+            return index
+        return index + 1
+
+
+class ScreenSchedule:
+    """A screen's rules compiled into weekly segments; see the module docstring."""
+
+    def __init__(
+        self,
+        rule_ids: List[UUID],
+        windows: List[Tuple[datetime, Optional[datetime]]],
+        segments: List[Segment]
+    ):
+        """
+        Args:
+            rule_ids: Rules of the screen; segments refer to them by index
+            windows: (active_from, active_until or None) of each rule
+            segments: Sorted, non-overlapping segments with at least one rule
+        """
+        self.rule_ids = rule_ids
+        self.windows = windows
+        self.segments = segments
+        self.boundaries = sorted({edge for window in windows for edge in window if edge is not None})
+        self._timelines: Dict[int, Timeline] = {}
+
+    def timeline(self, at: datetime) -> Timeline:
+        """Timeline of the epoch containing `at`."""
+        epoch = bisect_right(self.boundaries, at)
+        timeline = self._timelines.get(epoch)
+        if timeline is None:
+            timeline = self._timelines[epoch] = self._compile_epoch(epoch, at)
+        return timeline
+
+    def _compile_epoch(self, epoch: int, at: datetime) -> Timeline:
+        active = [
+            active_from <= at and (active_until is None or at < active_until)
+            for active_from, active_until in self.windows
+        ]
+        runs: List[Run] = []
+        start = end = rule = video_ids = None
+        for segment in self.segments:
+            for candidate, candidate_videos in segment.candidates:
+                if not active[candidate]:
+                    continue
+                if end == segment.start and rule == candidate and video_ids == candidate_videos:
+                    end = segment.end
+                else:
+                    if rule is not None:
+                        runs.append(Run(start, end, rule, video_ids))
+                    start, end, rule, video_ids = segment.start, segment.end, candidate, candidate_videos
+                break
+        if rule is not None:
+            runs.append(Run(start, end, rule, video_ids))
+        return Timeline(
+            runs,
+            self.boundaries[epoch - 1] if epoch > 0 else None,
+            self.boundaries[epoch] if epoch < len(self.boundaries) else None,
+        )
+
+    def _runs(self, at: datetime, until: datetime) -> Iterator[Playing]:
+        """Runs in time order from the one covering `at` (or the next) up to `until`."""
+        moment = at
+        while moment < until:
+            timeline = self.timeline(moment)
+            monday = week_start(moment)
+            index = timeline.index_at(minute_of_week(moment))
+            # Walk this epoch week by week, then move on to the next epoch
+            epoch_end = min(until, timeline.valid_until) if timeline.valid_until else until
+            while True:
+                if index == len(timeline.runs):
+                    monday += WEEK
+                    index = 0
+                    if not timeline.runs or monday >= epoch_end:
+                        break
+                run = timeline.runs[index]
+                starts_at = monday + timedelta(minutes=run.start)
+                if starts_at >= epoch_end:
+                    break
+                if timeline.valid_from and starts_at < timeline.valid_from:
+                    starts_at = timeline.valid_from
+                yield Playing(
+                    self.rule_ids[run.rule], run.video_ids, starts_at, min(monday + timedelta(minutes=run.end), epoch_end)
+                )
+                index += 1
+            if timeline.valid_until is None or timeline.valid_until >= until:
+                return
+            moment = timeline.valid_until
+
+    def _merged(self, at: datetime, until: datetime) -> Iterator[Playing]:
+        """_runs with back-to-back runs of the same rule and videos joined."""
+        current = None
+        for run in self._runs(at, until):
+            if (
+                current
+                and run.starts_at == current.ends_at
+                and run.rule_id == current.rule_id
+                and run.video_ids == current.video_ids
+            ):
+                current = Playing(current.rule_id, current.video_ids, current.starts_at, run.ends_at)
+                continue
+            if current:
+                yield current
+            current = run
+        if current:
+            yield current
+
+    def playing(self, at: datetime, lookahead: timedelta = LOOKAHEAD) -> Optional[Playing]:
+        """
+        What plays at `at`, or None.
+
+        ``ends_at`` is when it stops (at most `lookahead` away); ``starts_at``
+        is no earlier than the start of the current week or epoch.
+        """
+        first = next(self._merged(at, at + lookahead), None)
+        if first is None or first.starts_at > at:
+            return None
+        return first
+
+    def next(self, at: datetime, lookahead: timedelta = LOOKAHEAD) -> Optional[Playing]:
+        """
+        What plays after the run playing at `at` (or the first run after
+        `at` when nothing plays), within `lookahead`; None if nothing does.
+        """
+        runs = self._merged(at, at + lookahead)
+        first = next(runs, None)
+        if first is None or first.starts_at > at:
+            return first
+        return next(runs, None)
+
+
+def compile_schedule(slots: Iterable[Any]) -> ScreenSchedule:
+    """
+    Compile a screen's slots into weekly segments.
+
+    Rules and videos are numbered first, so the per-segment work hashes
+    small ints instead of UUIDs.
+
+    Args:
+        slots: SlotRow-like rows (attribute access), one per stored slot of
+            the screen
+
+    Returns:
+        The compiled schedule
+    """
+    rule_index: Dict[UUID, int] = {}
+    rule_ids: List[UUID] = []
+    windows: List[Tuple[datetime, Optional[datetime]]] = []
+    ranks: List[Tuple[int, datetime, str]] = []
+    video_index: Dict[UUID, int] = {}
+    video_ids: List[UUID] = []
+    numbered = []
+    for slot in slots:
+        rule = rule_index.get(slot.rule_id)
+        if rule is None:
+            rule = rule_index[slot.rule_id] = len(rule_ids)
+            rule_ids.append(slot.rule_id)
+            windows.append((slot.active_from, slot.active_until))
+            ranks.append((slot.priority, slot.created_at or datetime.min, str(slot.rule_id)))
+        video = video_index.get(slot.video_id)
+        if video is None:
+            video = video_index[slot.video_id] = len(video_ids)
+            video_ids.append(slot.video_id)
+        numbered.append((slot.start_minute, slot.end_minute, rule, video))
+    # Playlists list videos in start order, whatever order the slots came in
+    numbered.sort(key=itemgetter(0))
+
+    # Best rule first: position of each rule in rank order
+    order = sorted(range(len(rule_ids)), key=ranks.__getitem__, reverse=True)
+    position = [0] * len(rule_ids)
+    for place, rule in enumerate(order):
+        position[rule] = place
+
+    bounds = sorted({edge for start, end, _, _ in numbered for edge in (start, end)})
+    # Per elementary segment: {rule: {video: None}}, videos in slot order
+    scheduled: List[Dict[int, Dict[int, None]]] = [{} for _ in range(max(len(bounds) - 1, 0))]
+    for start, end, rule, video in numbered:
+        for index in range(bisect_left(bounds, start), bisect_left(bounds, end)):
+            scheduled[index].setdefault(rule, {})[video] = None
+
+    # Playlists shared between segments, so runs can be merged by identity
+    playlists: Dict[Tuple[int, ...], Tuple[UUID, ...]] = {}
+    segments = []
+    for index, rules in enumerate(scheduled):
+        if not rules:
+            continue
+        candidates = []
+        for rule in sorted(rules, key=position.__getitem__):
+            key = (rule, *rules[rule])
+            playlist = playlists.get(key)
+            if playlist is None:
+                playlist = playlists[key] = tuple(video_ids[video] for video in rules[rule])
+            candidates.append((rule, playlist))
+        segments.append(Segment(bounds[index], bounds[index + 1], tuple(candidates)))
+    return ScreenSchedule(rule_ids, windows, segments)
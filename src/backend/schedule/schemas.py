@@ -0,0 +1,118 @@
+"""
+AVTech Platform - Schedule Schemas
+==================================
+
+Request and response models for schedule rules and resolved playlists.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.backend.api.serialization import ORMModel
+from src.backend.schedule.week import parse_hhmm
+
+
+class TimeSlot(BaseModel):
+    """A recurring slot in API form, as sent when creating a rule."""
+    day_of_week: Optional[int] = Field(None, ge=0, le=6)  # 0=Monday ... 6=Sunday, None = every day
+    start_time: str  # "HH:MM"
+    end_time: str  # "HH:MM"; at or before start_time runs past midnight
+    video_id: UUID
+
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def _check_time(cls, value: str) -> str:
+        parse_hhmm(value)
+        return value
+
+
+class TimeSlotResponse(ORMModel):
+    """A stored slot: one screen, one day."""
+    slot_id: UUID
+    screen_id: UUID
+    video_id: UUID
+    day_of_week: int
+    start_time: str
+    end_time: str
+
+
+class ScheduleRuleCreate(BaseModel):
+    """A rule and the slots it plays on the given screens."""
+    name: str = Field(..., min_length=1, max_length=255)
+    rule_type: str = Field(..., pattern="^(daily|weekly|date_range)$")
+    priority: int = Field(0, ge=0, le=1000)  # Higher wins where rules overlap on a screen
+    active_from: datetime
+    active_until: Optional[datetime] = None
+    time_slots: List[TimeSlot] = []
+    client_id: UUID
+    screen_ids: List[UUID] = []
+
+
+class ScheduleRuleUpdate(BaseModel):
+    """Editable rule fields; omitted fields are left unchanged."""
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    priority: Optional[int] = Field(None, ge=0, le=1000)
+    active_from: Optional[datetime] = None
+    active_until: Optional[datetime] = None
+
+
+class ScheduleRuleResponse(ORMModel):
+    """A rule with its stored slots, as returned by the API."""
+    rule_id: UUID
+    name: str
+    rule_type: str
+    priority: int = 0
+    active_from: datetime
+    active_until: Optional[datetime] = None
+    client_id: UUID
+    time_slots: List[TimeSlotResponse] = []
+    screen_ids: List[UUID] = []
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ScheduleRulePage(BaseModel):
+    """One page of a client's rules; pass next_cursor to get the next one."""
+    items: List[ScheduleRuleResponse]
+    next_cursor: Optional[str] = None
+
+
+class ActiveVideo(BaseModel):
+    """A video playing on a screen, and the rule that put it there."""
+    video_id: UUID
+    rule_id: UUID
+    starts_at: datetime
+    ends_at: datetime
+
+
+class ActivePlaylist(BaseModel):
+    """What a screen plays at a given moment, and what comes next."""
+    screen_id: UUID
+    at: datetime
+    videos: List[ActiveVideo] = []  # Empty when nothing is scheduled at `at`
+    upcoming: List[ActiveVideo] = []  # The next change, within a week
+
+
+class ScheduleRuleRef(ORMModel):
+    """A rule in a validation finding: by position in the batch, or by id if stored."""
+    batch_index: Optional[int] = None
+    rule_id: Optional[UUID] = None
+
+
+class ScheduleConflict(ORMModel):
+    """One validation finding on one screen, as a minute-of-week range."""
+    kind: str  # priority_conflict, overlap, gap
+    severity: str  # error (blocks the batch) or warning
+    screen_id: UUID
+    start_minute: int
+    end_minute: int
+    rules: List[ScheduleRuleRef] = []  # Winner first for overlaps
+
+
+class ScheduleValidationReport(BaseModel):
+    """Findings for a batch of rules; ok is False when any finding is an error."""
+    ok: bool
+    conflicts: List[ScheduleConflict] = []
@@ -0,0 +1,246 @@
+"""
+AVTech Platform - Schedule Validation
+=====================================
+
+Checks a batch of new schedule rules against each other and against the
+rules already stored on their screens, before anything is written.
+
+Per screen, every slot becomes two events (start and end minute of the
+week). One sort and one sweep over the events walk the week as elementary
+segments, each with the set of rules scheduled in it, so a batch of n slots
+costs O(n log n) plus the size of the report, instead of comparing every
+new slot with every other slot.
+
+Findings:
+
+* ``priority_conflict`` (error): two rules with the same priority overlap
+  while both are active. Only creation order would decide which plays.
+* ``overlap`` (warning): rules with different priorities overlap; the
+  lower one is shadowed there.
+* ``gap`` (warning): minutes of the week with nothing scheduled on a
+  screen the batch touches.
+
+Only findings involving at least one rule of the batch (or a stored rule
+being updated, see ``changed``) are reported, so conflicts already stored
+do not block an import. Overlapping slots of the
+same rule are a playlist (see schedule.resolver), not a conflict. Like time
+slots, findings are half-open minute-of-week ranges; one crossing Sunday
+midnight is reported as two.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Collection, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+from src.backend.schedule.schemas import ScheduleRuleCreate
+from src.backend.schedule.week import MINUTES_PER_WEEK, to_week_ranges
+
+ERROR = "error"
+WARNING = "warning"
+
+SEVERITY = {
+    "priority_conflict": ERROR,
+    "overlap": WARNING,
+    "gap": WARNING,
+}
+
+
+class RuleRef(NamedTuple):
+    """A rule of the batch (by position) or a stored rule (by id)."""
+    batch_index: Optional[int] = None
+    rule_id: Optional[UUID] = None
+
+
+class Conflict(NamedTuple):
+    """One finding on one screen."""
+    kind: str  # priority_conflict, overlap, gap
+    screen_id: Any
+    start_minute: int
+    end_minute: int  # Exclusive
+    rules: Tuple[RuleRef, ...]  # Winner first for overlaps; empty for gaps
+
+    @property
+    def severity(self) -> str:
+        return SEVERITY[self.kind]
+
+
+class ValidationReport:
+    """Findings of a validation run, sorted by screen and minute."""
+
+    def __init__(self, conflicts: List[Conflict]):
+        self.conflicts = conflicts
+
+    @property
+    def errors(self) -> List[Conflict]:
+        return [c for c in self.conflicts if c.severity == ERROR]
+
+    @property
+    def warnings(self) -> List[Conflict]:
+        return [c for c in self.conflicts if c.severity == WARNING]
+
+    @property
+    def ok(self) -> bool:
+        """True when nothing blocks writing the batch."""
+        return not self.errors
+
+
+class _Rule(NamedTuple):
+    ref: RuleRef
+    rank: Tuple[int, datetime, int, str]  # Winner is the highest
+    priority: int
+    active_from: datetime
+    active_until: Optional[datetime]
+    new: bool
+
+
+def _overlap_in_time(a: _Rule, b: _Rule) -> bool:
+    """Whether the activation windows of two rules intersect."""
+    return (
+        (b.active_until is None or a.active_from < b.active_until)
+        and (a.active_until is None or b.active_from < a.active_until)
+    )
+
+
+def validate_schedule(
+    rules: Sequence[ScheduleRuleCreate],
+    existing: Iterable[Any] = (),
+    now: Optional[datetime] = None,
+    min_gap: int = 1,
+    changed: Collection[Any] = ()
+) -> ValidationReport:
+    """
+    Validate a batch of rules in one pass.
+
+    Args:
+        rules: New rules, in the order they would be created
+        existing: Stored slots on the batch's screens, with the fields of
+            their rules (TimeSlotRepository.get_screens_schedule rows:
+            screen_id, start_minute, end_minute, rule_id, priority,
+            active_from, active_until, created_at)
+        now: Creation time of the batch (default: utcnow); new rules rank
+            after every stored one on equal priority
+        min_gap: Shortest gap reported, in minutes
+        changed: Ids of stored rules being updated; their rows in
+            `existing` carry the new fields, their screens are validated and
+            findings involving them are reported like the batch's
+
+    Returns:
+        The report; ``report.ok`` tells whether the batch can be written
+    """
+    now = now or datetime.utcnow()
+    catalog: Dict[Any, _Rule] = {}
+    # {screen_id: [(start, end, rule key)]}
+    intervals: Dict[Any, List[Tuple[int, int, Any]]] = defaultdict(list)
+
+    for index, rule in enumerate(rules):
+        catalog[index] = _Rule(
+            RuleRef(batch_index=index), (rule.priority, now, index, ""),
+            rule.priority, rule.active_from, rule.active_until, True,
+        )
+        ranges = [
+            range_
+            for slot in rule.time_slots
+            for range_ in to_week_ranges(slot.day_of_week, slot.start_time, slot.end_time)
+        ]
+        for screen_id in rule.screen_ids:
+            intervals[screen_id] += [(start, end, index) for start, end in ranges]
+
+    existing = list(existing)
+    screens = set(intervals) | {row.screen_id for row in existing if row.rule_id in changed}
+    for row in existing:
+        if row.screen_id not in screens:
+            continue
+        if row.rule_id not in catalog:
+            # Stored rules rank by creation time, before the batch (index -1),
+            # then by id like in schedule.resolver
+            catalog[row.rule_id] = _Rule(
+                RuleRef(rule_id=row.rule_id), (row.priority, row.created_at or datetime.min, -1, str(row.rule_id)),
+                row.priority, row.active_from, row.active_until, row.rule_id in changed,
+            )
+        intervals[row.screen_id].append((row.start_minute, row.end_minute, row.rule_id))
+
+    conflicts: List[Conflict] = []
+    for screen_id in sorted(intervals, key=str):
+        screen_conflicts = _sweep(screen_id, intervals[screen_id], catalog, min_gap)
+        screen_conflicts.sort(key=lambda c: (c.start_minute, c.kind))
+        conflicts += screen_conflicts
+    return ValidationReport(conflicts)
+
+
+def _sweep(
+    screen_id: Any,
+    intervals: List[Tuple[int, int, Any]],
+    catalog: Dict[Any, _Rule],
+    min_gap: int
+) -> List[Conflict]:
+    """Findings of one screen: one sorted sweep over its slot boundaries."""
+    events = sorted(
+        [(start, 1, key) for start, _, key in intervals] + [(end, -1, key) for _, end, key in intervals],
+        key=lambda event: event[0],
+    )
+    conflicts: List[Conflict] = []
+    active: Dict[Any, int] = {}  # Rule key -> slots of it covering the sweep position
+    # Overlapping pairs still open: (kind, winner, loser) -> start
+    open_pairs: Dict[Tuple[str, Any, Any], int] = {}
+    position = 0
+    i = 0
+    while position < MINUTES_PER_WEEK:
+        touched: Dict[Any, bool] = {}  # Rule key -> whether it was active before
+        while i < len(events) and events[i][0] == position:
+            _, delta, key = events[i]
+            touched.setdefault(key, key in active)
+            count = active.get(key, 0) + delta
+            if count:
+                active[key] = count
+            else:
+                del active[key]
+            i += 1
+        following = events[i][0] if i < len(events) else MINUTES_PER_WEEK
+
+        if not active and following - position >= min_gap:
+            conflicts.append(Conflict("gap", screen_id, position, following, ()))
+
+        # Pairs only change where one of their rules starts or stops playing,
+        # so a slot boundary costs O(active rules), not O(active rules ^ 2)
+        left = [key for key, was_active in touched.items() if was_active and key not in active]
+        entered = [key for key, was_active in touched.items() if not was_active and key in active]
+        if left:
+            before = (active.keys() - entered) | set(left)
+            for key in left:
+                for other in before:
+                    pair = _pair(key, other, catalog)
+                    if pair in open_pairs:
+                        conflicts.append(_pair_conflict(screen_id, open_pairs.pop(pair), position, pair, catalog))
+        for key in entered:
+            for other in active:
+                pair = _pair(key, other, catalog)
+                if pair is not None:
+                    open_pairs.setdefault(pair, position)
+        position = following
+
+    for pair, start in open_pairs.items():
+        conflicts.append(_pair_conflict(screen_id, start, MINUTES_PER_WEEK, pair, catalog))
+    return conflicts
+
+
+def _pair(a: Any, b: Any, catalog: Dict[Any, _Rule]) -> Optional[Tuple[str, Any, Any]]:
+    """(kind, winner, loser) if rules a and b conflict when overlapping, else None."""
+    if a == b:
+        return None
+    rule_a, rule_b = catalog[a], catalog[b]
+    if not (rule_a.new or rule_b.new) or not _overlap_in_time(rule_a, rule_b):
+        return None
+    kind = "priority_conflict" if rule_a.priority == rule_b.priority else "overlap"
+    return (kind, a, b) if rule_a.rank > rule_b.rank else (kind, b, a)
+
+
+def _pair_conflict(
+    screen_id: Any,
+    start: int,
+    end: int,
+    pair: Tuple[str, Any, Any],
+    catalog: Dict[Any, _Rule]
+) -> Conflict:
+    kind, winner, loser = pair
+    return Conflict(kind, screen_id, start, end, (catalog[winner].ref, catalog[loser].ref))
@@ -0,0 +1,86 @@
+"""
+AVTech Platform - Minutes of the Week
+=====================================
+
+Time slots are stored as half-open ``[start, end)`` ranges of minutes since
+Monday 00:00, so "what plays at 14:32 on Tuesday" and overlap checks are
+integer range comparisons served by one GiST index.
+
+This module converts between that representation and the API's
+day-of-week + "HH:MM" form.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def parse_hhmm(value: str) -> int:
+    """
+    Minutes since midnight of an "HH:MM" string ("24:00" is end of day).
+
+    Raises:
+        ValueError: If the string is not a valid time of day
+    """
+    hours, _, minutes = value.partition(":")
+    if not (hours.isdigit() and minutes.isdigit() and len(minutes) == 2):
+        raise ValueError(f"Invalid time of day: {value!r}")
+    total = int(hours) * 60 + int(minutes)
+    if int(minutes) > 59 or total > MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time of day: {value!r}")
+    return total
+
+
+def format_hhmm(minute_of_day: int) -> str:
+    """Format minutes since midnight as "HH:MM" (1440 gives "24:00")."""
+    return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+def minute_of_week(at: datetime) -> int:
+    """Minutes since Monday 00:00 of a point in time."""
+    return at.weekday() * MINUTES_PER_DAY + at.hour * 60 + at.minute
+
+
+def to_week_ranges(day_of_week: Optional[int], start_time: str, end_time: str) -> List[Tuple[int, int]]:
+    """
+    Minute-of-week ranges covered by a slot in API form.
+
+    Args:
+        day_of_week: 0=Monday ... 6=Sunday, or None for every day
+        start_time: "HH:MM" start
+        end_time: "HH:MM" end; at or before start means the slot runs past
+            midnight into the next day
+
+    Returns:
+        Half-open (start, end) ranges; a slot wrapping past Sunday midnight
+        is split in two
+
+    Raises:
+        ValueError: On an invalid day or time
+    """
+    if day_of_week is not None and not 0 <= day_of_week <= 6:
+        raise ValueError(f"Invalid day of week: {day_of_week}")
+    start = parse_hhmm(start_time)
+    end = parse_hhmm(end_time)
+    if end <= start:
+        end += MINUTES_PER_DAY
+
+    ranges = []
+    for day in range(7) if day_of_week is None else (day_of_week,):
+        offset = day * MINUTES_PER_DAY
+        if offset + end > MINUTES_PER_WEEK:
+            ranges.append((offset + start, MINUTES_PER_WEEK))
+            ranges.append((0, offset + end - MINUTES_PER_WEEK))
+        else:
+            ranges.append((offset + start, offset + end))
+    return ranges
+
+
+def from_week_range(start_minute: int, end_minute: int) -> Tuple[int, str, str]:
+    """(day_of_week, "HH:MM" start, "HH:MM" end) of a minute-of-week range."""
+    day = start_minute // MINUTES_PER_DAY
+    start = start_minute - day * MINUTES_PER_DAY
+    end = end_minute - day * MINUTES_PER_DAY
+    return day, format_hhmm(start), format_hhmm(end if end <= MINUTES_PER_DAY else end - MINUTES_PER_DAY)
@@ -0,0 +1,58 @@
+"""
+AVTech Platform - Screen Schemas
+================================
+
+Request and response models for screens.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.backend.api.serialization import ORMModel
+
+
+class ScreenStatus(str, Enum):
+    """Connectivity of a screen, driven by its heartbeats."""
+    ONLINE = "online"
+    OFFLINE = "offline"
+    ERROR = "error"
+
+
+class ScreenCreate(BaseModel):
+    """A screen to register."""
+    name: str = Field(..., min_length=1, max_length=255)
+    location: Optional[str] = Field(None, max_length=500)
+    screen_code: str = Field(..., min_length=1, max_length=100)
+    client_id: UUID
+    status: ScreenStatus = ScreenStatus.OFFLINE
+    last_heartbeat: Optional[datetime] = None
+
+
+class ScreenUpdate(BaseModel):
+    """Editable screen fields; omitted fields are left unchanged."""
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    location: Optional[str] = Field(None, max_length=500)
+    status: Optional[ScreenStatus] = None
+
+
+class ScreenResponse(ORMModel):
+    """A screen as returned by the API."""
+    screen_id: UUID
+    name: str
+    location: Optional[str] = None
+    screen_code: str
+    client_id: UUID
+    status: Optional[str] = None
+    last_heartbeat: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ScreenPage(BaseModel):
+    """One page of a client's screens; pass next_cursor to get the next one."""
+    items: List[ScreenResponse]
+    next_cursor: Optional[str] = None
@@ -3,12 +3,16 @@
 Servicio de negocio para la gestión de contenido (videos).
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.backend.database.models import VideoCreate, VideoResponse, VideoUpdate, VideoStatus
+from src.backend.database.models import Video
+from src.backend.content.schemas import VideoCreate, VideoResponse, VideoUpdate, VideoStatus
 from src.backend.storage.storage_service import StorageService # Asumimos que se creará
 from src.backend.exceptions.content_exceptions import VideoUploadException, StorageLimitExceededException
-from src.backend.database.repository import VideoRepository # Asumimos que se creará
+from src.backend.exceptions.storage_exceptions import StorageIntegrityException
+from src.backend.database.repository import VideoRepository, BlobRepository, ClientRepository
+from src.backend.database.session import replica_reads
 from src.backend.config import settings
 import logging
 
@@ -19,10 +23,16 @@ class ContentService:
         self.db_session = db_session
         self.storage_service = storage_service
         self.video_repo = VideoRepository(db_session)
+        self.blob_repo = BlobRepository(db_session)
+        self.client_repo = ClientRepository(db_session)
 
-    async def upload_video(self, video_data: VideoCreate, file_data: bytes) -> VideoResponse:
+    async def upload_video(self, video_data: VideoCreate, file_stream: AsyncIterator[bytes]) -> VideoResponse:
         """
         Sube un video, lo valida (duración 1-20s), lo almacena y lo registra en la base de datos.
+
+        `file_stream` es el cuerpo de la petición como iterador asíncrono de bytes
+        (p. ej. `request.stream()`): se lee una sola vez, se hashea al vuelo y se
+        sube por partes, sin cargar el video completo en memoria.
         """
         logger.info(f"Procesando subida de video: {video_data.title}")
 
@@ -33,27 +43,39 @@ class ContentService:
         if not (1 <= duration <= 20):
             raise VideoUploadException(f"La duración del video ({duration}s) no está entre 1 y 20 segundos.")
 
-        # --- Corrección Crítica 2: Validación de Hash ---
-        # Opcional: Verificar el hash del archivo recibido contra el proporcionado
-        # Calculamos hash del file_data y lo comparamos con video_data.hash_sha256
-        import hashlib
-        calculated_hash = hashlib.sha256(file_data).hexdigest()
-        if calculated_hash.lower() != video_data.hash_sha256.lower():
-             raise VideoUploadException("El hash del archivo no coincide con el hash proporcionado.")
-
         # --- Corrección Crítica 3: Gestión de Almacenamiento ---
-        # Verificar límite de almacenamiento del cliente (simulado aquí)
-        # En un sistema real, esto se haría contra la base de datos o un servicio de límites
-        client_storage_used = await self.get_client_storage_used(video_data.client_id)
-        if client_storage_used + video_data.file_size_bytes > settings.client_storage_limit_bytes: # Asumimos que settings.client_storage_limit_bytes existe
+        # Verificar límite de almacenamiento del cliente: lectura de una sola fila
+        # (clients.storage_used_bytes se mantiene al crear/eliminar videos)
+        usage = await self.client_repo.get_storage_usage(video_data.client_id)
+        if usage is None:
+            raise VideoUploadException(f"Cliente no encontrado: {video_data.client_id}")
+        client_storage_used, client_storage_limit = usage
+        if client_storage_used + video_data.file_size_bytes > client_storage_limit:
              raise StorageLimitExceededException()
 
         # Almacenar el archivo en MinIO/S3
+        # --- Corrección Crítica 2: Validación de Hash ---
+        # El hash se calcula durante la subida y se verifica al completarla contra
+        # video_data.hash_sha256; si no coincide, la subida multipart se aborta.
         try:
-            storage_path = await self.storage_service.save_video(video_data.video_id, file_data)
+            upload_result = await self.storage_service.upload_video_stream(
+                chunks=file_stream,
+                client_id=str(video_data.client_id),
+                title=video_data.title,
+                description=video_data.description,
+                expected_sha256=video_data.hash_sha256,
+                blob_repo=self.blob_repo, # Modo direccionado por contenido (si está activo)
+                size_hint=video_data.file_size_bytes,
+            )
+        except StorageIntegrityException:
+            # Deshace la referencia al blob tomada antes de comprobar el contenido
+            await self.db_session.rollback()
+            raise VideoUploadException("El hash del archivo no coincide con el hash proporcionado.")
         except Exception as e:
-            logger.error(f"Error al almacenar video {video_data.video_id}: {e}")
+            logger.error(f"Error al almacenar video {video_data.title}: {e}")
+            await self.db_session.rollback()
             raise VideoUploadException(f"Error al almacenar el video: {str(e)}")
+        storage_path = upload_result["object_name"]
 
         # Crear el objeto Video para la base de datos
         # Aquí se asume que video_data no incluye video_id, que debe generarse
@@ -64,89 +86,146 @@ class ContentService:
             "title": video_data.title,
             "description": video_data.description,
             "duration_seconds": video_data.duration_seconds,
-            "file_size_bytes": video_data.file_size_bytes,
-            "hash_sha256": video_data.hash_sha256,
-            "storage_path": storage_path, # Ruta donde se guardó
+            "file_size_bytes": upload_result["size"], # Tamaño real recibido
+            "hash_sha256": upload_result["hash_sha256"],
+            "file_path": storage_path, # Ruta donde se guardó
             "status": VideoStatus.PROCESSING, # O READY si no hay procesamiento adicional
             "client_id": video_data.client_id,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
         }
 
-        # Guardar en la base de datos
+        # Guardar en la base de datos (en la misma transacción que la referencia al blob
+        # y el contador de uso del cliente)
         try:
             created_video_db = await self.video_repo.create(db_video)
+            # Incremento condicional: vuelve a validar la cuota frente a subidas concurrentes
+            if await self.client_repo.add_storage_used(video_data.client_id, upload_result["size"]) is None:
+                raise StorageLimitExceededException()
+            await self.db_session.commit()
         except Exception as e:
-            logger.error(f"Error al guardar video {video_data.video_id} en DB: {e}")
-            # Opcional: Eliminar el archivo subido si la DB falla
-            try:
-                await self.storage_service.delete_video(video_data.video_id)
-            except:
-                pass # No hacer nada si la eliminación falla
+            logger.error(f"Error al guardar video {video_data.title} en DB: {e}")
+            # El objeto subido se elimina antes del rollback. Si es un blob nuevo, su
+            # fila (sin confirmar) sigue bloqueada: una subida concurrente del mismo
+            # hash espera y lo vuelve a subir. Tras el rollback la fila ya no existe
+            # y la recolección de blobs no vería el objeto. Un blob deduplicado es de
+            # otros videos: el rollback deshace solo nuestra referencia.
+            if not upload_result["deduplicated"]:
+                try:
+                    await self.storage_service.delete_file(storage_path, upload_result["size"])
+                except Exception as cleanup_error:
+                    logger.error(f"No se pudo eliminar {storage_path} tras el fallo de la subida: {cleanup_error}")
+            await self.db_session.rollback()
+            if isinstance(e, StorageLimitExceededException):
+                raise
             raise VideoUploadException(f"Error al registrar el video: {str(e)}")
 
         # Convertir a VideoResponse
-        response_video = VideoResponse(
-            video_id=created_video_db.id, # Asumiendo que el modelo de DB tiene .id
-            title=created_video_db.title,
-            description=created_video_db.description,
-            duration_seconds=created_video_db.duration_seconds,
-            file_size_bytes=created_video_db.file_size_bytes,
-            hash_sha256=created_video_db.hash_sha256,
-            status=created_video_db.status,
-            client_id=created_video_db.client_id,
-            created_at=created_video_db.created_at,
-            updated_at=created_video_db.updated_at,
-        )
+        response_video = VideoResponse.model_validate(created_video_db)
         logger.info(f"Video subido exitosamente: {response_video.video_id}")
         return response_video
 
+    @replica_reads
     async def get_video(self, video_id: str) -> Optional[VideoResponse]:
         """Obtiene un video por su ID."""
         db_video = await self.video_repo.get_by_id(video_id)
         if not db_video:
             return None
-        return VideoResponse(
-            video_id=db_video.id,
-            title=db_video.title,
-            description=db_video.description,
-            duration_seconds=db_video.duration_seconds,
-            file_size_bytes=db_video.file_size_bytes,
-            hash_sha256=db_video.hash_sha256,
-            status=db_video.status,
-            client_id=db_video.client_id,
-            created_at=db_video.created_at,
-            updated_at=db_video.updated_at,
-        )
+        return VideoResponse.model_validate(db_video)
 
-    async def list_videos(self, client_id: str) -> List[VideoResponse]:
-        """Lista videos filtrados por cliente."""
-        db_videos = await self.video_repo.get_by_client_id(client_id)
-        return [
-            VideoResponse(
-                video_id=v.id,
-                title=v.title,
-                description=v.description,
-                duration_seconds=v.duration_seconds,
-                file_size_bytes=v.file_size_bytes,
-                hash_sha256=v.hash_sha256,
-                status=v.status,
-                client_id=v.client_id,
-                created_at=v.created_at,
-                updated_at=v.updated_at,
-            )
-            for v in db_videos
-        ]
+    @replica_reads
+    async def list_video_rows(
+        self,
+        client_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[Video], Optional[Tuple[datetime, Any]]]:
+        """
+        Lista una página de videos del cliente, de más reciente a más antiguo,
+        como objetos ORM (para serializarlos directamente con dump_rows_json).
+
+        Paginación por clave (created_at, video_id): `after` es la posición
+        devuelta por la página anterior, y se devuelve None en la última.
+        """
+        limit = min(limit or settings.server.default_page_size, settings.server.max_page_size)
+        return await self.video_repo.list_page(client_id, limit, after, status)
+
+    @replica_reads
+    async def search_video_rows(
+        self,
+        client_id: str,
+        terms: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, datetime, Any]] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[Video], Optional[Tuple[float, datetime, Any]]]:
+        """
+        Busca videos del cliente por título y descripción, de mejor a peor
+        coincidencia, como objetos ORM.
+
+        Cada palabra se busca como prefijo (búsqueda de texto completo) y el
+        título también admite errores de escritura (trigramas). Paginación por
+        clave (puntuación, created_at, video_id): `after` es la posición
+        devuelta por la página anterior, y se devuelve None en la última.
+        """
+        limit = min(limit or settings.server.default_page_size, settings.server.max_page_size)
+        return await self.video_repo.search_page(client_id, terms.strip(), limit, after, status)
 
+    @replica_reads
+    async def list_videos(
+        self,
+        client_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[VideoResponse], Optional[Tuple[datetime, Any]]]:
+        """Como list_video_rows, pero con cada video como VideoResponse."""
+        db_videos, next_after = await self.list_video_rows(client_id, limit, after, status)
+        return VideoResponse.from_orm_list(db_videos), next_after
+
+    @replica_reads
     async def get_client_storage_used(self, client_id: str) -> int:
-        """Obtiene el espacio de almacenamiento usado por un cliente."""
-        # Simulación: En la realidad, esto sería una consulta a la base de datos
-        # sumando los file_size_bytes de todos los videos del cliente.
-        # O podría haber un servicio dedicado a límites/uso de almacenamiento.
-        # Por ahora, devolvemos 0 para simplificar.
-        # TODO: Implementar lógica real de cálculo de uso de almacenamiento
-        return 0 # Placeholder
-
-    # Otros métodos como update_video, delete_video irían aquí
+        """
+        Obtiene el espacio de almacenamiento usado por un cliente.
+
+        Lee el contador `clients.storage_used_bytes`, que se actualiza en la misma
+        transacción que la creación/eliminación de videos y que el job de
+        reconciliación corrige periódicamente.
+        """
+        usage = await self.client_repo.get_storage_usage(client_id)
+        return 0 if usage is None else usage[0]
+
+    async def delete_video(self, video_id: str) -> bool:
+        """
+        Elimina un video y libera su objeto almacenado.
+
+        Con almacenamiento direccionado por contenido solo se decrementa la
+        referencia al blob; el objeto se borra cuando ningún video lo usa.
+        """
+        db_video = await self.video_repo.get_by_id(video_id)
+        if not db_video:
+            return False
+
+        await self.video_repo.delete(video_id)
+        await self.client_repo.add_storage_used(db_video.client_id, -db_video.file_size_bytes)
+        remaining = await self.storage_service.release_video(
+            db_video.file_path, db_video.hash_sha256, self.blob_repo
+        )
+        await self.db_session.commit()
+
+        # Los objetos se borran solo tras el commit: un rollback no deja
+        # videos apuntando a objetos eliminados
+        if remaining is None:
+            # Objeto propio del video (almacenamiento no direccionado)
+            await self.storage_service.delete_file(db_video.file_path, db_video.file_size_bytes)
+        elif remaining == 0:
+            # Último video que usaba el blob: eliminarlo (reintentable por GC si falla)
+            await self.storage_service.collect_blob(db_video.hash_sha256, self.blob_repo)
+            await self.db_session.commit()
+
+        logger.info(f"Video eliminado: {video_id}")
+        return True
+
+    # Otros métodos como update_video irían aquí
     # async def update_video(self, video_id: str, update_data: VideoUpdate) -> Optional[VideoResponse]: ...
-    # async def delete_video(self, video_id: str) -> bool: ...
@@ -0,0 +1,90 @@
+# src/backend/services/publish_service.py
+"""
+Servicio de negocio para publicar la programación en muchas pantallas a la vez.
+"""
+
+import time
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.backend.database.repository import PlayerSyncStatusRepository, ScreenRepository
+from src.backend.monitoring.metrics import record_publish
+from src.backend.publish.bulk import AdaptiveLimiter, Notify, fan_out, player_notifier
+from src.backend.sync.state_manager import DesiredStateManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PublishResult(NamedTuple):
+    """Resultado de una publicación masiva."""
+    targeted: int  # Pantallas del cliente incluidas
+    unchanged: int  # Sin cambios en el manifiesto: nada que notificar
+    notified: int
+    failed: Dict[str, str]  # {screen_code: último error}
+    duration: float  # Segundos, notificación incluida
+
+
+class PublishService:
+    def __init__(self, db_session: AsyncSession, notify: Notify = player_notifier):
+        self.db_session = db_session
+        self.notify = notify
+        self.screen_repo = ScreenRepository(db_session)
+        self.sync_repo = PlayerSyncStatusRepository(db_session)
+        self.state_manager = DesiredStateManager(db_session)
+
+    async def publish(
+        self,
+        client_id: Any,
+        screen_ids: Optional[Sequence[Any]] = None,
+        force: bool = False,
+        limiter: Optional[AdaptiveLimiter] = None
+    ) -> PublishResult:
+        """
+        Publica la programación en las pantallas de un cliente (todas o
+        `screen_ids`) y avisa a sus players.
+
+        Todo va por lotes: las pantallas salen de una consulta, las versiones
+        se mueven con un upsert por lote (que compara el hash del manifiesto
+        en la propia sentencia, así que no hacen falta locks por pantalla) y
+        los fallos se escriben en una sentencia. Solo se avisa a los players
+        cuya versión cambió; con `force`, a todos.
+
+        Un player que no recibe el aviso queda en ``failed`` con el error,
+        pero su versión ya está confirmada: la recoge en su siguiente
+        sincronización.
+        """
+        started = time.perf_counter()
+        codes = await self.screen_repo.get_client_codes(client_id, screen_ids)
+        logger.info(f"Publicando en {len(codes)} pantallas del cliente {client_id}")
+
+        # Las versiones se confirman antes de avisar: un player avisado debe ver la versión nueva
+        versions = await self.state_manager.recompute(list(codes), force=force)
+        await self.db_session.commit()
+
+        delivery = await fan_out(versions, self.notify, limiter)
+        failed = {code: error for code, (_, error) in delivery.failed.items()}
+        if delivery.failed:
+            try:
+                await self.sync_repo.mark_failed(delivery.failed)
+                await self.db_session.commit()
+            except Exception as e:
+                await self.db_session.rollback()
+                logger.error(f"Error al registrar {len(failed)} avisos fallidos: {e}")
+
+        result = PublishResult(
+            targeted=len(codes),
+            unchanged=len(codes) - len(versions),
+            notified=len(delivery.delivered),
+            failed=failed,
+            duration=time.perf_counter() - started,
+        )
+        record_publish(
+            {"unchanged": result.unchanged, "notified": result.notified, "failed": len(failed)},
+            result.duration,
+        )
+        logger.info(
+            f"Publicación del cliente {client_id}: {result.notified} avisados, "
+            f"{result.unchanged} sin cambios, {len(failed)} fallidos en {result.duration:.2f}s"
+        )
+        return result
+
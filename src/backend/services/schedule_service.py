@@ -3,111 +3,259 @@
 Servicio de negocio para la gestión de programación de contenido.
 """
 
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.backend.database.models import (
+from src.backend.schedule.schemas import (
     ScheduleRuleCreate, ScheduleRuleResponse, ScheduleRuleUpdate,
-    TimeSlot, ActivePlaylist, ActiveVideo # Asumiendo que ActivePlaylist/ActiveVideo estén en models
+    TimeSlot, ActivePlaylist, ActiveVideo
 )
-from src.backend.database.repository import ScheduleRuleRepository # Asumimos que se creará
+from src.backend.database.repository import ScheduleRuleRepository, TimeSlotRepository
+from src.backend.schedule.cache import ScheduleCache, schedule_cache
+from src.backend.schedule.resolver import Playing, ScreenSlotRow
+from src.backend.schedule.validation import ValidationReport, validate_schedule
+from src.backend.sync.state_manager import ChangeSet, DesiredStateManager
+from src.backend.database.session import replica_reads
+from src.backend.config import settings
 from src.backend.exceptions.validation_exceptions import ScheduleValidationException # Asumimos que se creará
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
 class ScheduleService:
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, cache: ScheduleCache = schedule_cache):
         self.db_session = db_session
         self.schedule_repo = ScheduleRuleRepository(db_session)
+        self.slot_repo = TimeSlotRepository(db_session)
+        self.cache = cache
+        self.state_manager = DesiredStateManager(db_session)
 
     async def create_schedule_rule(self, rule_data: ScheduleRuleCreate) -> ScheduleRuleResponse:
         """Crea una nueva regla de programación."""
-        logger.info(f"Creando regla de programación: {rule_data.name}")
-        # Validar regla (horarios, conflictos, etc.) - Pendiente de implementar
-        # await self._validate_schedule_rule(rule_data)
-
-        # Tambien se asume que created_at, updated_at se manejan en la DB o aquí.
-        db_rule = {
-            "name": rule_data.name,
-            "rule_type": rule_data.rule_type,
-            "active_from": rule_data.active_from,
-            "active_until": rule_data.active_until,
-            "time_slots": [ts.dict() for ts in rule_data.time_slots], # Serializar TimeSlot
-            "client_id": rule_data.client_id,
-            "screen_ids": rule_data.screen_ids,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
-        }
+        return (await self.create_schedule_rules([rule_data]))[0]
 
-        try:
-            created_rule_db = await self.schedule_repo.create(db_rule)
-        except Exception as e:
-            logger.error(f"Error al crear regla de programación {rule_data.name}: {e}")
-            raise ScheduleValidationException(f"Error al registrar la regla de programación: {str(e)}")
-
-        response_rule = ScheduleRuleResponse(
-            rule_id=created_rule_db.id,
-            name=created_rule_db.name,
-            rule_type=created_rule_db.rule_type,
-            active_from=created_rule_db.active_from,
-            active_until=created_rule_db.active_until,
-            time_slots=[TimeSlot(**ts) for ts in created_rule_db.time_slots], # Deserializar TimeSlot
-            client_id=created_rule_db.client_id,
-            screen_ids=created_rule_db.screen_ids,
-            created_at=created_rule_db.created_at,
-            updated_at=created_rule_db.updated_at,
+    async def create_schedule_rules(self, rules_data: List[ScheduleRuleCreate]) -> List[ScheduleRuleResponse]:
+        """
+        Crea un lote de reglas (p. ej. una campaña importada) en una sola
+        transacción. El lote se valida entero antes de escribir nada: con un
+        conflicto de prioridad no se crea ninguna regla.
+
+        Validación y escritura van bajo un advisory lock por pantalla: dos
+        lotes concurrentes sobre las mismas pantallas no pueden validarse
+        cada uno sin ver al otro.
+
+        Raises:
+            ScheduleValidationException: Si la validación rechaza el lote
+                (``conflicts`` lleva los hallazgos) o falla la escritura
+        """
+        logger.info(f"Creando {len(rules_data)} reglas de programación")
+        now = datetime.utcnow()
+        await self.slot_repo.lock_screens([screen_id for rule_data in rules_data for screen_id in rule_data.screen_ids])
+        report = await self.validate_schedule_rules(rules_data, now)
+        if not report.ok:
+            await self.db_session.rollback()
+            logger.warning(f"Lote de reglas rechazado: {len(report.errors)} conflictos de prioridad")
+            raise ScheduleValidationException(
+                f"El lote tiene {len(report.errors)} conflictos de prioridad", report.errors
+            )
+        if report.warnings:
+            logger.info(f"Lote de reglas con {len(report.warnings)} avisos (solapamientos o huecos)")
+
+        rule_ids = []
+        for rule_data in rules_data:
+            db_rule = {
+                "name": rule_data.name,
+                "rule_type": rule_data.rule_type,
+                "priority": rule_data.priority,
+                "active_from": rule_data.active_from,
+                "active_until": rule_data.active_until,
+                "time_slots": [ts.model_dump() for ts in rule_data.time_slots], # Serializar TimeSlot
+                "client_id": rule_data.client_id,
+                "screen_ids": rule_data.screen_ids,
+                "created_at": now,
+                "updated_at": now,
+            }
+            try:
+                created_rule_db = await self.schedule_repo.create(db_rule)
+            except Exception as e:
+                logger.error(f"Error al crear regla de programación {rule_data.name}: {e}")
+                raise ScheduleValidationException(f"Error al registrar la regla de programación: {str(e)}")
+            rule_ids.append(created_rule_db.rule_id)
+        affected = await self.state_manager.queue(
+            ChangeSet(screen_ids=[screen_id for rule_data in rules_data for screen_id in rule_data.screen_ids])
         )
-        logger.info(f"Regla de programación creada exitosamente: {response_rule.rule_id}")
-        return response_rule
+        await self.db_session.commit()
+        # Solo después del commit: antes, otro proceso podría cachear los slots viejos con la versión nueva
+        await self.invalidate(affected)
+
+        # Los slots se insertaron en bloque: se cargan con las reglas para la respuesta
+        responses = ScheduleRuleResponse.from_orm_list(await self.schedule_repo.get_many_with_slots(rule_ids))
+        logger.info(f"Reglas de programación creadas exitosamente: {len(responses)}")
+        return responses
 
+    async def validate_schedule_rules(
+        self,
+        rules_data: List[ScheduleRuleCreate],
+        now: Optional[datetime] = None
+    ) -> ValidationReport:
+        """
+        Valida un lote de reglas entre sí y contra las reglas guardadas en sus
+        pantallas, sin escribir nada (ver schedule/validation.py).
+
+        Lee del primario: la validación precede a una escritura.
+        """
+        now = now or datetime.utcnow()
+        screen_ids = list(dict.fromkeys(screen_id for rule_data in rules_data for screen_id in rule_data.screen_ids))
+        existing = await self.slot_repo.get_screens_schedule(screen_ids, now)
+        return validate_schedule(rules_data, existing, now)
+
+    @replica_reads
     async def get_schedule_rule(self, rule_id: str) -> Optional[ScheduleRuleResponse]:
         """Obtiene una regla de programación por su ID."""
-        db_rule = await self.schedule_repo.get_by_id(rule_id)
+        db_rule = await self.schedule_repo.get_with_slots(rule_id)
         if not db_rule:
             return None
-        return ScheduleRuleResponse(
-            rule_id=db_rule.id,
-            name=db_rule.name,
-            rule_type=db_rule.rule_type,
-            active_from=db_rule.active_from,
-            active_until=db_rule.active_until,
-            time_slots=[TimeSlot(**ts) for ts in db_rule.time_slots],
-            client_id=db_rule.client_id,
-            screen_ids=db_rule.screen_ids,
-            created_at=db_rule.created_at,
-            updated_at=db_rule.updated_at,
-        )
+        return ScheduleRuleResponse.model_validate(db_rule)
 
-    async def list_schedule_rules(self, client_id: str) -> List[ScheduleRuleResponse]:
-        """Lista reglas de programación filtradas por cliente."""
-        db_rules = await self.schedule_repo.get_by_client_id(client_id)
-        return [
-            ScheduleRuleResponse(
-                rule_id=r.id,
-                name=r.name,
-                rule_type=r.rule_type,
-                active_from=r.active_from,
-                active_until=r.active_until,
-                time_slots=[TimeSlot(**ts) for ts in r.time_slots],
-                client_id=r.client_id,
-                screen_ids=r.screen_ids,
-                created_at=r.created_at,
-                updated_at=r.updated_at,
-            )
-            for r in db_rules
+    @replica_reads
+    async def list_schedule_rules(
+        self,
+        client_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, Any]] = None,
+        rule_type: Optional[str] = None,
+    ) -> Tuple[List[ScheduleRuleResponse], Optional[Tuple[datetime, Any]]]:
+        """
+        Lista una página de reglas de programación del cliente, de más reciente
+        a más antigua; `after` es la posición devuelta por la página anterior.
+        """
+        limit = min(limit or settings.server.default_page_size, settings.server.max_page_size)
+        db_rules, next_after = await self.schedule_repo.list_page(client_id, limit, after, rule_type)
+        # Reglas y slots (objetos ORM) se validan en una sola llamada, sin copiar campo a campo
+        return ScheduleRuleResponse.from_orm_list(db_rules), next_after
+
+    async def update_schedule_rule(self, rule_id: str, update_data: ScheduleRuleUpdate) -> Optional[ScheduleRuleResponse]:
+        """
+        Actualiza los campos editables de una regla e invalida la programación
+        cacheada solo de las pantallas en las que está la regla.
+
+        Si cambia la prioridad o la ventana de actividad, la regla se valida
+        de nuevo contra las de sus pantallas, bajo el mismo advisory lock por
+        pantalla que la creación.
+
+        Raises:
+            ScheduleValidationException: Si el cambio crea conflictos de
+                prioridad (``conflicts`` lleva los hallazgos)
+        """
+        db_rule = await self.schedule_repo.get_with_slots(rule_id)
+        if not db_rule:
+            return None
+        changes = update_data.model_dump(exclude_unset=True)
+        revalidate = bool(changes.keys() & {"priority", "active_from", "active_until"})
+        if revalidate:
+            await self.slot_repo.lock_screens(db_rule.screen_ids)
+        for field, value in changes.items():
+            setattr(db_rule, field, value)
+        if revalidate:
+            report = await self._validate_update(db_rule)
+            if not report.ok:
+                await self.db_session.rollback()
+                logger.warning(f"Cambio de la regla {rule_id} rechazado: {len(report.errors)} conflictos de prioridad")
+                raise ScheduleValidationException(
+                    f"El cambio tiene {len(report.errors)} conflictos de prioridad", report.errors
+                )
+        await self.db_session.flush()
+        affected = await self.state_manager.queue(ChangeSet(rule_ids=[rule_id]))
+        await self.db_session.commit()
+        await self.invalidate(affected)
+
+        db_rule = await self.schedule_repo.get_with_slots(rule_id)
+        return ScheduleRuleResponse.model_validate(db_rule)
+
+    async def _validate_update(self, db_rule: Any) -> ValidationReport:
+        """
+        Valida una regla guardada con sus campos nuevos contra las demás
+        reglas de sus pantallas. Sus slots se toman de la regla cargada: si
+        estaba caducada, get_screens_schedule no los devolvería.
+        """
+        now = datetime.utcnow()
+        existing = [
+            row for row in await self.slot_repo.get_screens_schedule(db_rule.screen_ids, now)
+            if row.rule_id != db_rule.rule_id
         ]
+        if db_rule.active_until is None or db_rule.active_until > now:
+            existing += [
+                ScreenSlotRow(
+                    slot.start_minute, slot.end_minute, slot.video_id, db_rule.rule_id, db_rule.priority,
+                    db_rule.active_from, db_rule.active_until, db_rule.created_at, slot.screen_id,
+                )
+                for slot in db_rule.time_slots
+            ]
+        return validate_schedule([], existing, now, changed={db_rule.rule_id})
+
+    async def invalidate(self, affected: List[Any]) -> None:
+        """
+        Invalida la programación cacheada de las pantallas afectadas por un
+        cambio ya confirmado en reglas, slots o videos, y recalcula el estado
+        deseado de sus players (ver sync/state_manager.py).
+
+        `affected` es lo que devolvió DesiredStateManager.queue() en la
+        transacción del cambio: las pantallas salen de los índices de
+        dependencias de time_slots (regla -> pantallas, video -> pantallas),
+        no de todo el cliente, y quedan en cola hasta que un recálculo
+        confirma. Solo cambia desired_state_version donde cambia el
+        manifiesto.
+        """
+        await self.cache.bump(affected)
+        try:
+            await self.state_manager.recompute_queued(affected)
+            await self.db_session.commit()
+        except Exception as e:
+            # El cambio ya está confirmado: no se falla la petición por el
+            # recálculo; las pantallas siguen en cola para sync/state_catchup.py
+            await self.db_session.rollback()
+            logger.error(
+                f"Error al recalcular el estado deseado de {len(affected)} pantallas "
+                f"(quedan en cola para reintentar): {e}"
+            )
+
+    async def resolve_schedule_for_screen(self, screen_id: str, timestamp: Optional[datetime] = None) -> ActivePlaylist:
+        """
+        Resuelve qué reproduce una pantalla en un instante (por defecto, ahora)
+        y cuál es el siguiente cambio.
+
+        Una sola consulta trae los slots de la pantalla con los datos de sus
+        reglas; el resolver los compila en una línea de tiempo semanal y las
+        búsquedas son bisecciones (ver schedule/resolver.py). La programación
+        compilada se cachea por versión de la pantalla (ver schedule/cache.py).
+
+        Los fallos de caché leen del primario, no de la réplica: con retraso
+        de replicación se cachearían los slots anteriores a un cambio con la
+        versión nueva.
+        """
+        at = timestamp or datetime.utcnow()
+        if at.tzinfo is not None:
+            # Las fechas de las reglas se guardan en UTC sin zona horaria
+            at = at.astimezone(timezone.utc).replace(tzinfo=None)
+        schedule = await self.cache.get_schedule(
+            screen_id, at, lambda: self.slot_repo.get_screen_schedule(screen_id, at)
+        )
+        return ActivePlaylist(
+            screen_id=screen_id,
+            at=at,
+            videos=_active_videos(schedule.playing(at)),
+            upcoming=_active_videos(schedule.next(at)),
+        )
 
-    # async def _validate_schedule_rule(self, rule_data: ScheduleRuleCreate):
-    #     # Lógica de validación de horarios y conflictos
-    #     # Pendiente de implementar según validation.py
-    #     pass
+    # Otros métodos como delete_schedule_rule irían aquí
+    # async def delete_schedule_rule(self, rule_id: str) -> bool: ...
 
-    # async def resolve_schedule_for_screen(self, screen_id: str, timestamp: datetime) -> ActivePlaylist:
-    #     # Lógica para resolver las reglas activas a una playlist específica
-    #     # Pendiente de implementar según resolver.py
-    #     pass
 
-    # Otros métodos como update_schedule_rule, delete_schedule_rule irían aquí
-    # async def update_schedule_rule(self, rule_id: str, update_data: ScheduleRuleUpdate) -> Optional[ScheduleRuleResponse]: ...
-    # async def delete_schedule_rule(self, rule_id: str) -> bool: ...
\ No newline at end of file
+def _active_videos(playing: Optional[Playing]) -> List[ActiveVideo]:
+    """Un ActiveVideo por video del tramo resuelto (vacío si no hay ninguno)."""
+    if playing is None:
+        return []
+    return [
+        ActiveVideo(video_id=video_id, rule_id=playing.rule_id, starts_at=playing.starts_at, ends_at=playing.ends_at)
+        for video_id in playing.video_ids
+    ]
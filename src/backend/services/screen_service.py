@@ -3,10 +3,13 @@
 Servicio de negocio para la gestión de pantallas.
 """
 
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.backend.database.models import ScreenCreate, ScreenResponse, ScreenUpdate, ScreenStatus
+from src.backend.database.models import Screen
+from src.backend.screens.schemas import ScreenCreate, ScreenResponse, ScreenUpdate, ScreenStatus
 from src.backend.database.repository import ScreenRepository # Asumimos que se creará
+from src.backend.database.session import replica_reads
+from src.backend.config import settings
 from src.backend.exceptions.sync_exceptions import ScreenProvisioningException # Asumimos que se creará
 import logging
 from datetime import datetime
@@ -27,6 +30,7 @@ class ScreenService:
         db_screen = {
             "name": screen_data.name,
             "location": screen_data.location,
+            "screen_code": screen_data.screen_code,
             "client_id": screen_data.client_id,
             "status": screen_data.status,
             "last_heartbeat": screen_data.last_heartbeat,
@@ -40,51 +44,50 @@ class ScreenService:
             logger.error(f"Error al crear pantalla {screen_data.name}: {e}")
             raise ScreenProvisioningException(f"Error al registrar la pantalla: {str(e)}")
 
-        response_screen = ScreenResponse(
-            screen_id=created_screen_db.id,
-            name=created_screen_db.name,
-            location=created_screen_db.location,
-            client_id=created_screen_db.client_id,
-            status=created_screen_db.status,
-            last_heartbeat=created_screen_db.last_heartbeat,
-            created_at=created_screen_db.created_at,
-            updated_at=created_screen_db.updated_at,
-        )
+        response_screen = ScreenResponse.model_validate(created_screen_db)
         logger.info(f"Pantalla creada exitosamente: {response_screen.screen_id}")
         return response_screen
 
+    @replica_reads
     async def get_screen(self, screen_id: str) -> Optional[ScreenResponse]:
         """Obtiene una pantalla por su ID."""
         db_screen = await self.screen_repo.get_by_id(screen_id)
         if not db_screen:
             return None
-        return ScreenResponse(
-            screen_id=db_screen.id,
-            name=db_screen.name,
-            location=db_screen.location,
-            client_id=db_screen.client_id,
-            status=db_screen.status,
-            last_heartbeat=db_screen.last_heartbeat,
-            created_at=db_screen.created_at,
-            updated_at=db_screen.updated_at,
-        )
+        return ScreenResponse.model_validate(db_screen)
 
-    async def list_screens(self, client_id: str) -> List[ScreenResponse]:
-        """Lista pantallas filtradas por cliente."""
-        db_screens = await self.screen_repo.get_by_client_id(client_id)
-        return [
-            ScreenResponse(
-                screen_id=s.id,
-                name=s.name,
-                location=s.location,
-                client_id=s.client_id,
-                status=s.status,
-                last_heartbeat=s.last_heartbeat,
-                created_at=s.created_at,
-                updated_at=s.updated_at,
-            )
-            for s in db_screens
-        ]
+    @replica_reads
+    async def list_screen_rows(
+        self,
+        client_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> Tuple[List[Screen], Optional[Tuple[datetime, Any]]]:
+        """
+        Lista una página de pantallas del cliente, de más reciente a más antigua,
+        como objetos ORM (para serializarlos directamente con dump_rows_json).
+
+        Los filtros de estado y ubicación se aplican en la consulta; `after`
+        es la posición devuelta por la página anterior (None en la última).
+        """
+        limit = min(limit or settings.server.default_page_size, settings.server.max_page_size)
+        return await self.screen_repo.list_page(client_id, limit, after, status, location)
+
+    @replica_reads
+    async def list_screens(
+        self,
+        client_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, Any]] = None,
+        status: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> Tuple[List[ScreenResponse], Optional[Tuple[datetime, Any]]]:
+        """Como list_screen_rows, pero con cada pantalla como ScreenResponse."""
+        db_screens, next_after = await self.list_screen_rows(client_id, limit, after, status, location)
+        # Toda la página se valida en una sola llamada (atributos leídos del ORM)
+        return ScreenResponse.from_orm_list(db_screens), next_after
 
     # Otros métodos como update_screen, delete_screen irían aquí
     # async def update_screen(self, screen_id: str, update_data: ScreenUpdate) -> Optional[ScreenResponse]: ...
@@ -0,0 +1,207 @@
+"""
+AVTech Platform - Storage Backend
+=================================
+
+Interface implemented by every storage driver (MinIO / S3, local
+filesystem) and the factory that picks one from settings.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from src.backend.config import settings
+from src.backend.storage.executor import offload
+
+
+class StorageBackend(ABC):
+    """Object storage driver used by StorageService."""
+    
+    # Bucket (or namespace) name, used to label metrics
+    bucket_name: str
+    
+    @abstractmethod
+    async def ensure_bucket_exists(self):
+        """Ensure the bucket exists, create if it doesn't."""
+    
+    @abstractmethod
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        metadata: Optional[Dict[str, str]] = None,
+        expected_sha256: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload a stream of chunks with inline SHA-256.
+        
+        The object only becomes visible once fully written and verified.
+        
+        Args:
+            chunks: Async iterator of raw bytes
+            object_name: Object name in bucket
+            content_type: MIME type
+            metadata: Optional metadata
+            expected_sha256: Optional hash; on mismatch nothing is stored
+            
+        Returns:
+            Upload result (object_name, etag, size, hash_sha256, content_type)
+            
+        Raises:
+            StorageIntegrityException: If the computed hash does not match
+        """
+    
+    @abstractmethod
+    async def download_file(self, object_name: str, file_path: str) -> bool:
+        """Download an object to a local path; True if successful."""
+    
+    @abstractmethod
+    def stream_file(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = settings.storage.media_chunk_size
+    ) -> AsyncIterator[bytes]:
+        """Stream an object, or ``length`` bytes of it from ``offset`` (0 = to the end)."""
+    
+    @abstractmethod
+    async def delete_file(self, object_name: str) -> bool:
+        """Delete an object; True if successful."""
+    
+    @abstractmethod
+    async def get_file_info(self, object_name: str) -> Optional[Dict[str, Any]]:
+        """Object info (size, etag, content_type, last_modified, metadata) or None."""
+    
+    @abstractmethod
+    def iter_files(
+        self,
+        prefix: str = "",
+        recursive: bool = True,
+        start_after: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over objects in key order, strictly after ``start_after``."""
+    
+    @abstractmethod
+    def get_presigned_url(self, object_name: str, expires_in: int = 3600) -> str:
+        """Download URL valid for at least ``expires_in`` seconds."""
+    
+    @abstractmethod
+    async def get_presigned_urls(
+        self,
+        object_names: List[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """Download URLs for many objects at once, keyed by object name."""
+    
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Whether the backend is reachable and usable."""
+    
+    async def upload_file(
+        self,
+        file_path: str,
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        metadata: Optional[Dict[str, str]] = None,
+        expected_sha256: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload a local file.
+        
+        The file is read once: each chunk is hashed and uploaded in the
+        same pass (see upload_stream).
+        
+        Args:
+            file_path: Local file path
+            object_name: Object name in bucket
+            content_type: MIME type
+            metadata: Optional metadata
+            expected_sha256: Optional hash to verify before completing
+            
+        Returns:
+            Upload result with file info
+        """
+        return await self.upload_stream(
+            chunks=self._iter_file(file_path),
+            object_name=object_name,
+            content_type=content_type,
+            metadata=metadata,
+            expected_sha256=expected_sha256
+        )
+    
+    async def _iter_file(self, file_path: str) -> AsyncIterator[bytes]:
+        """Read a local file in part-sized chunks off the event loop."""
+        part_size = settings.storage.multipart_part_size
+        f = await offload(open, file_path, "rb")
+        try:
+            while chunk := await offload(f.read, part_size):
+                yield chunk
+        finally:
+            f.close()
+    
+    async def list_page(
+        self,
+        prefix: str = "",
+        limit: int = 100,
+        start_after: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List one page of files in key order.
+        
+        Args:
+            prefix: Object name prefix
+            limit: Maximum files in the page
+            start_after: Object name the previous page ended at
+            
+        Returns:
+            Tuple (files, last object name), the latter None on the last page
+        """
+        files: List[Dict[str, Any]] = []
+        has_more = False
+        # One extra object tells whether another page exists
+        async for file in self.iter_files(prefix=prefix, start_after=start_after, batch_size=limit + 1):
+            if len(files) == limit:
+                has_more = True
+                break
+            files.append(file)
+        
+        return files, (files[-1]["object_name"] if has_more else None)
+
+
+def get_storage_backend() -> StorageBackend:
+    """
+    Create the storage backend selected by ``STORAGE_BACKEND``.
+    
+    Returns:
+        MinIO client ("minio", default) or local filesystem backend ("local")
+    """
+    backend = settings.storage.backend.lower()
+    if backend == "local":
+        from src.backend.storage.local_backend import LocalFilesystemBackend
+        return LocalFilesystemBackend()
+    if backend == "minio":
+        from src.backend.storage.minio_client import MinIOClient
+        return MinIOClient()
+    raise ValueError(f"Unknown storage backend: {settings.storage.backend}")
+
+
+def get_health_probe_backend(timeout: float) -> StorageBackend:
+    """
+    Create the storage backend used by the health prober.
+    
+    MinIO gets a client of its own (see ``MinIOClient.for_health_probe``),
+    so probes never take workers of the shared storage executor; the local
+    backend's check is a single ``os.access`` and uses the regular one.
+    
+    Args:
+        timeout: Probe timeout in seconds
+        
+    Returns:
+        Storage backend for health checks
+    """
+    if settings.storage.backend.lower() == "minio":
+        from src.backend.storage.minio_client import MinIOClient
+        return MinIOClient.for_health_probe(timeout)
+    return get_storage_backend()
@@ -0,0 +1,81 @@
+"""
+AVTech Platform - Storage Executor
+==================================
+
+Bounded thread pool and per-operation concurrency limits shared by every
+storage backend. Blocking work (SDK calls, file I/O, hashing) runs here so
+it never stalls the event loop.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+from src.backend.config import settings
+
+T = TypeVar("T")
+
+# Operation classes with their own concurrency limit
+UPLOAD = "upload"
+DOWNLOAD = "download"
+METADATA = "metadata"
+
+# Process-wide state, shared by every backend instance
+_executor: Optional[ThreadPoolExecutor] = None
+_limiters: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_storage_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded executor that runs blocking storage work.
+    
+    Returns:
+        Thread pool executor sized from storage settings
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.storage.executor_workers,
+            thread_name_prefix="avtech-storage"
+        )
+    return _executor
+
+
+def _get_limiter(operation: str) -> asyncio.Semaphore:
+    """Get the concurrency limiter for an operation class."""
+    limiter = _limiters.get(operation)
+    if limiter is None:
+        limits = {
+            UPLOAD: settings.storage.upload_concurrency,
+            DOWNLOAD: settings.storage.download_concurrency,
+            METADATA: settings.storage.metadata_concurrency,
+        }
+        limiter = asyncio.Semaphore(limits[operation])
+        _limiters[operation] = limiter
+    return limiter
+
+
+async def run_blocking(operation: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking storage call in the executor under its operation limit."""
+    async with _get_limiter(operation):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_storage_executor(),
+            functools.partial(func, *args, **kwargs)
+        )
+
+
+async def offload(func: Callable[..., T], *args) -> T:
+    """Run CPU-bound work (hashing) in the executor without a limit."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_storage_executor(), func, *args)
+
+
+def shutdown_storage_executor() -> None:
+    """Release the shared executor and limiters."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    _limiters.clear()
@@ -0,0 +1,451 @@
+"""
+AVTech Platform - Local Filesystem Backend
+==========================================
+
+Storage driver for single-box installations that keeps objects on a local
+filesystem instead of MinIO.
+
+Layout under ``STORAGE_LOCAL_ROOT``::
+
+    objects/<object_name>        object content
+    meta/<object_name>.json      sidecar metadata (sha256, content_type, ...)
+    tmp/                         in-progress uploads, renamed into place
+
+Uploads are written to ``tmp/`` and published with an atomic rename, so
+readers never see partial objects. Downloads to local paths use
+``os.sendfile`` (zero-copy) and download URLs are HMAC-signed links to the
+files API.
+"""
+
+import functools
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from urllib.parse import quote, urlencode
+
+from src.backend.config import settings
+from src.backend.exceptions.storage_exceptions import StorageException, StorageIntegrityException
+from src.backend.monitoring.logger import get_logger
+from src.backend.storage.backend import StorageBackend
+from src.backend.storage.executor import DOWNLOAD, METADATA, UPLOAD, offload, run_blocking
+
+logger = get_logger(__name__)
+
+# Bytes buffered before each write to the temporary file
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Sample values from env.example; anyone can forge URLs signed with them
+PLACEHOLDER_SECRETS = {"change-me", "your-secret-key-here-change-in-production"}
+
+
+class LocalFilesystemBackend(StorageBackend):
+    """Filesystem storage driver with atomic writes and sidecar metadata."""
+
+    def __init__(
+        self,
+        root: str = settings.storage.local_root,
+        public_url: str = settings.storage.local_public_url,
+        url_secret: Optional[str] = settings.storage.local_url_secret
+    ):
+        """
+        Args:
+            root: Directory holding objects, metadata and temporary files
+            public_url: Base URL of the files API serving signed links
+            url_secret: Key used to sign download URLs
+
+        Raises:
+            StorageException: No secret (or a sample one) is configured, so
+                signed URLs could be forged
+        """
+        if not url_secret or url_secret in PLACEHOLDER_SECRETS:
+            raise StorageException(
+                "STORAGE_LOCAL_URL_SECRET (or SECRET_KEY) must be set to a private value "
+                "to sign local download URLs"
+            )
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.meta_dir = os.path.join(self.root, "meta")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        self.public_url = public_url.rstrip("/")
+        self.url_secret = url_secret.encode()
+        self.bucket_name = settings.storage.bucket_name
+        self._bucket_ready = False
+
+    def _path(self, object_name: str) -> str:
+        """Absolute path of an object, refusing names that escape the root."""
+        path = os.path.normpath(os.path.join(self.objects_dir, object_name))
+        if not path.startswith(self.objects_dir + os.sep):
+            raise StorageException(f"Invalid object name: {object_name}")
+        return path
+
+    def _meta_path(self, object_name: str) -> str:
+        """Absolute path of an object's sidecar metadata."""
+        return os.path.join(self.meta_dir, os.path.relpath(self._path(object_name), self.objects_dir) + ".json")
+
+    async def ensure_bucket_exists(self):
+        """Create the storage directories if they don't exist."""
+        if self._bucket_ready:
+            return
+        for directory in (self.objects_dir, self.meta_dir, self.tmp_dir):
+            await offload(functools.partial(os.makedirs, directory, exist_ok=True))
+        self._bucket_ready = True
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        metadata: Optional[Dict[str, str]] = None,
+        expected_sha256: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Write a stream of chunks to a temporary file, hashing it inline,
+        then atomically rename it into place.
+
+        Args:
+            chunks: Async iterator of raw bytes
+            object_name: Object name
+            content_type: MIME type
+            metadata: Optional metadata
+            expected_sha256: Optional hash; on mismatch nothing is stored
+
+        Returns:
+            Upload result with file info
+
+        Raises:
+            StorageIntegrityException: If the computed hash does not match
+        """
+        await self.ensure_bucket_exists()
+        path = self._path(object_name)
+
+        hash_sha256 = hashlib.sha256()
+        buffer = bytearray()
+        size = 0
+        fd, tmp_path = await offload(tempfile.mkstemp, "", "upload-", self.tmp_dir)
+        f = os.fdopen(fd, "wb")
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    size += len(buffer)
+                    await run_blocking(UPLOAD, _write_hashed, f, hash_sha256, bytes(buffer))
+                    buffer.clear()
+            size += len(buffer)
+            await run_blocking(UPLOAD, _write_hashed, f, hash_sha256, bytes(buffer))
+            buffer.clear()
+            await run_blocking(UPLOAD, _close_synced, f)
+
+            file_hash = hash_sha256.hexdigest()
+            if expected_sha256 and file_hash != expected_sha256.lower():
+                logger.error(f"Hash mismatch uploading {object_name}")
+                raise StorageIntegrityException(
+                    f"SHA-256 mismatch for {object_name}: expected {expected_sha256}, got {file_hash}"
+                )
+
+            sidecar = {
+                "content_type": content_type,
+                "sha256": file_hash,
+                "size": size,
+                "metadata": dict(metadata or {}),
+            }
+            await run_blocking(UPLOAD, self._publish, tmp_path, path, self._meta_path(object_name), sidecar)
+
+            logger.info(f"File uploaded successfully: {object_name}")
+
+            return {
+                "object_name": object_name,
+                "etag": file_hash,
+                "size": size,
+                "hash_sha256": file_hash,
+                "content_type": content_type
+            }
+
+        except BaseException:
+            f.close()
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _publish(self, tmp_path: str, path: str, meta_path: str, sidecar: Dict[str, Any]):
+        """Rename the finished upload into place, then write its sidecar."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        fd, tmp_meta = tempfile.mkstemp("", "meta-", self.tmp_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(sidecar, f)
+        os.replace(tmp_meta, meta_path)
+
+    def _read_sidecar(self, object_name: str) -> Dict[str, Any]:
+        """Sidecar metadata of an object, empty if missing or unreadable."""
+        try:
+            with open(self._meta_path(object_name)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    async def download_file(self, object_name: str, file_path: str) -> bool:
+        """
+        Copy an object to a local path with os.sendfile (zero-copy).
+
+        Args:
+            object_name: Object name
+            file_path: Local file path to save
+
+        Returns:
+            True if successful
+        """
+        try:
+            await run_blocking(DOWNLOAD, _sendfile_copy, self._path(object_name), file_path)
+            logger.info(f"File downloaded successfully: {object_name}")
+            return True
+
+        except OSError as e:
+            logger.error(f"Error downloading file {object_name}: {e}")
+            return False
+
+    async def stream_file(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = settings.storage.media_chunk_size
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an object (or a byte range of it) with positional reads.
+
+        Args:
+            object_name: Object name
+            offset: First byte to read
+            length: Bytes to read, 0 for the rest of the object
+            chunk_size: Bytes per chunk
+
+        Yields:
+            Object content chunks
+        """
+        fd = await run_blocking(DOWNLOAD, os.open, self._path(object_name), os.O_RDONLY)
+        try:
+            position = offset
+            remaining = length or None
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await run_blocking(DOWNLOAD, os.pread, fd, size, position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            os.close(fd)
+
+    async def delete_file(self, object_name: str) -> bool:
+        """
+        Delete an object and its sidecar.
+
+        Args:
+            object_name: Object name
+
+        Returns:
+            True if successful (also when the object did not exist)
+        """
+        def _delete():
+            for path in (self._path(object_name), self._meta_path(object_name)):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+        try:
+            await run_blocking(METADATA, _delete)
+            logger.info(f"File deleted successfully: {object_name}")
+            return True
+
+        except OSError as e:
+            logger.error(f"Error deleting file {object_name}: {e}")
+            return False
+
+    async def get_file_info(self, object_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get object information from the filesystem and its sidecar.
+
+        Args:
+            object_name: Object name
+
+        Returns:
+            File info or None if not found
+        """
+        def _info() -> Dict[str, Any]:
+            st = os.stat(self._path(object_name))
+            sidecar = self._read_sidecar(object_name)
+            # Same shape as the S3 user metadata returned by MinIO
+            metadata = {f"x-amz-meta-{k}": v for k, v in sidecar.get("metadata", {}).items()}
+            if sidecar.get("sha256"):
+                metadata["x-amz-meta-sha256"] = sidecar["sha256"]
+            return {
+                "object_name": object_name,
+                "size": st.st_size,
+                "etag": _etag(st),
+                "content_type": sidecar.get("content_type", "application/octet-stream"),
+                "last_modified": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+                "metadata": metadata
+            }
+
+        try:
+            return await run_blocking(METADATA, _info)
+
+        except OSError as e:
+            logger.error(f"Error getting file info {object_name}: {e}")
+            return None
+
+    async def iter_files(
+        self,
+        prefix: str = "",
+        recursive: bool = True,
+        start_after: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over objects in key order, like an S3 listing.
+
+        Args:
+            prefix: Object name prefix
+            recursive: Whether to descend into "directories"
+            start_after: Only list object names strictly after this one
+            batch_size: Objects fetched per executor round trip
+
+        Yields:
+            File objects
+        """
+        # Walk from the deepest directory fully covered by the prefix
+        base = prefix.rsplit("/", 1)[0] + "/" if "/" in prefix else ""
+        objects = (
+            entry for entry in self._walk(base, start_after or "", recursive)
+            if entry["object_name"].startswith(prefix)
+        )
+
+        def _next_batch() -> List[Dict[str, Any]]:
+            return list(itertools.islice(objects, batch_size))
+
+        while True:
+            batch = await run_blocking(METADATA, _next_batch)
+            for file in batch:
+                yield file
+            if len(batch) < batch_size:
+                return
+
+    def _walk(self, key_prefix: str, start_after: str, recursive: bool) -> Iterator[Dict[str, Any]]:
+        """Yield objects under a key prefix ("" or ending in "/") in key order."""
+        directory = os.path.join(self.objects_dir, key_prefix) if key_prefix else self.objects_dir
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        # Sorting by full key ("dir/" for directories) gives S3 listing order
+        keyed = sorted(
+            (key_prefix + entry.name + ("/" if entry.is_dir(follow_symlinks=False) else ""), entry)
+            for entry in entries
+        )
+        for key, entry in keyed:
+            if key.endswith("/"):
+                if not recursive:
+                    continue
+                # Skip subtrees whose keys all sort before start_after
+                if start_after >= key and not start_after.startswith(key):
+                    continue
+                yield from self._walk(key, start_after, recursive)
+            elif key > start_after:
+                st = entry.stat(follow_symlinks=False)
+                yield {
+                    "object_name": key,
+                    "size": st.st_size,
+                    "etag": _etag(st),
+                    "last_modified": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+                }
+
+    def get_presigned_url(self, object_name: str, expires_in: int = 3600) -> str:
+        """
+        Get an HMAC-signed download URL served by the files API.
+
+        Args:
+            object_name: Object name
+            expires_in: URL expiration time in seconds
+
+        Returns:
+            Signed URL
+        """
+        expires = int(time.time()) + expires_in
+        query = urlencode({"expires": expires, "signature": self.sign(object_name, expires)})
+        return f"{self.public_url}/{quote(object_name)}?{query}"
+
+    async def get_presigned_urls(
+        self,
+        object_names: List[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """Get signed URLs for many objects (HMAC only, no I/O)."""
+        return {name: self.get_presigned_url(name, expires_in) for name in dict.fromkeys(object_names)}
+
+    def sign(self, object_name: str, expires: int) -> str:
+        """Signature of a download URL for an object and expiry (epoch seconds)."""
+        message = f"{object_name}\n{expires}".encode()
+        return hmac.new(self.url_secret, message, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, object_name: str, expires: int, signature: str) -> bool:
+        """Whether a download URL signature is valid and not expired."""
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.sign(object_name, expires), signature)
+
+    async def health_check(self) -> bool:
+        """
+        Check that the storage root is present and writable.
+
+        Returns:
+            True if healthy
+        """
+        try:
+            return await offload(os.access, self.objects_dir, os.W_OK)
+        except Exception as e:
+            logger.error(f"Storage health check failed: {e}")
+            return False
+
+
+def _write_hashed(f, hash_sha256, data: bytes) -> None:
+    """Hash and write one buffered block."""
+    hash_sha256.update(data)
+    f.write(data)
+
+
+def _close_synced(f) -> None:
+    """Flush a file to disk before it is published."""
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+
+def _sendfile_copy(source: str, destination: str) -> None:
+    """Copy a file in the kernel with os.sendfile."""
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+
+
+def _etag(st: os.stat_result) -> str:
+    """Cheap validator from modification time and size (objects are replaced, never edited)."""
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
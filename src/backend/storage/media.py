@@ -0,0 +1,120 @@
+"""
+AVTech Platform - Media Ranges
+==============================
+
+HTTP Range / If-Range / If-None-Match handling for media served from the
+object store. Kept free of framework imports so it can be reused by any
+serving path (API proxy, benchmarks).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from src.backend.exceptions.storage_exceptions import RangeNotSatisfiableException
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """Inclusive byte range within an object."""
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def content_range(self, size: int) -> str:
+        """Value of the Content-Range header for this range."""
+        return f"bytes {self.start}-{self.end}/{size}"
+
+
+def make_etag(hash_sha256: str) -> str:
+    """Strong ETag of a video, derived from its content hash."""
+    return f'"{hash_sha256}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a (naive UTC) datetime as an HTTP date."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[ByteRange]:
+    """
+    Parse a Range header against an object of the given size.
+    
+    Only single byte ranges are served; multi-range and malformed headers
+    are ignored, which RFC 9110 allows (the full object is sent instead).
+    
+    Args:
+        header: Range header value, or None
+        size: Object size in bytes
+        
+    Returns:
+        Byte range to serve, or None for the whole object
+        
+    Raises:
+        RangeNotSatisfiableException: If the range starts past the end
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else max(start, size - 1)
+            if start < 0 or end < start:
+                return None
+        else:
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiableException(f"Empty suffix range for {size} bytes")
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiableException(f"Range starts at {start} of {size} bytes")
+    return ByteRange(start=start, end=min(end, size - 1))
+
+
+def if_range_allows(if_range: Optional[str], etag: str, last_modified: datetime) -> bool:
+    """
+    Whether a Range request may be honoured under its If-Range precondition.
+    
+    Args:
+        if_range: If-Range header value, or None
+        etag: Current strong ETag of the object
+        last_modified: Current modification time of the object
+        
+    Returns:
+        True if the range applies, False if the whole object must be sent
+    """
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Strong comparison; weak validators never match
+        return if_range == etag
+    try:
+        since = parsedate_to_datetime(if_range)
+    except (TypeError, ValueError):
+        return False
+    return http_date(last_modified) == http_date(since)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
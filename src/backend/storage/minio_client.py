@@ -6,94 +6,271 @@ MinIO client for object storage operations.
 """
 
 import asyncio
-from typing import Optional, BinaryIO, Dict, Any
+import functools
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, BinaryIO, Dict, Any, AsyncIterator, Callable, List, TypeVar
 from minio import Minio
+from minio.datatypes import Part
 from minio.error import S3Error
-import aiofiles
+import certifi
 import hashlib
+import io
 import os
+import time
+import urllib3
+from datetime import timedelta
 from pathlib import Path
 
 from src.backend.config import settings
+from src.backend.exceptions.storage_exceptions import StorageIntegrityException
 from src.backend.monitoring.logger import get_logger
+from src.backend.storage.backend import StorageBackend
+from src.backend.storage.executor import (
+    DOWNLOAD,
+    METADATA,
+    UPLOAD,
+    offload,
+    run_blocking,
+    shutdown_storage_executor,
+)
+from src.backend.storage.presign_cache import presigned_url_cache
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
 
-class MinIOClient:
+# Process-wide HTTP pool, shared by every MinIOClient instance
+_http_pool: Optional[urllib3.PoolManager] = None
+
+
+def get_http_pool() -> urllib3.PoolManager:
+    """
+    Get the HTTP connection pool shared by all MinIO clients in the process.
+    
+    Returns:
+        urllib3 pool manager sized from storage settings
+    """
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=settings.storage.max_pool_connections,
+            block=True,
+            timeout=urllib3.Timeout(
+                connect=settings.storage.connect_timeout,
+                read=settings.storage.read_timeout
+            ),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=5,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504]
+            )
+        )
+    return _http_pool
+
+
+async def shutdown_storage_engine() -> None:
+    """Release the shared executor and HTTP pool (call on application shutdown)."""
+    global _http_pool
+    shutdown_storage_executor()
+    if _http_pool is not None:
+        _http_pool.clear()
+        _http_pool = None
+
+
+class MinIOClient(StorageBackend):
     """MinIO client for storage operations."""
     
-    def __init__(self):
-        self.client = Minio(
+    def __init__(self, client: Optional[Minio] = None, executor: Optional[ThreadPoolExecutor] = None):
+        # The SDK is synchronous: every call goes through _run(), which
+        # offloads it to the shared executor under a per-operation limit,
+        # or to `executor` when the client has its own (health probes).
+        self.client = client or Minio(
             endpoint=settings.storage.endpoint,
             access_key=settings.storage.access_key,
             secret_key=settings.storage.secret_key,
-            secure=settings.storage.secure
+            secure=settings.storage.secure,
+            region=settings.storage.region,
+            http_client=get_http_pool()
         )
         self.bucket_name = settings.storage.bucket_name
-        self._ensure_bucket_exists()
+        self._bucket_ready = False
+        self._executor = executor
+        self._pending: Optional[Future] = None
+    
+    @classmethod
+    def for_health_probe(cls, timeout: float) -> "MinIOClient":
+        """
+        Create a client for health probes, isolated from the data path.
+        
+        Cancelling an await does not stop the SDK call running in its thread,
+        so a probe against a hung MinIO would hold a worker for up to the
+        read timeout. This client has its own single-thread executor and a
+        one-connection pool whose connect and read timeouts are `timeout`,
+        without retries: a stuck probe ties up only its own thread, and only
+        for `timeout` seconds.
+        
+        Args:
+            timeout: Connect and read timeout in seconds
+            
+        Returns:
+            MinIO client for health_check()
+        """
+        client = Minio(
+            endpoint=settings.storage.endpoint,
+            access_key=settings.storage.access_key,
+            secret_key=settings.storage.secret_key,
+            secure=settings.storage.secure,
+            region=settings.storage.region,
+            http_client=urllib3.PoolManager(
+                num_pools=1,
+                maxsize=1,
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                cert_reqs="CERT_REQUIRED",
+                ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+                retries=False
+            )
+        )
+        return cls(client, executor=ThreadPoolExecutor(max_workers=1, thread_name_prefix="avtech-storage-probe"))
+    
+    async def _run(self, operation: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking SDK call in the storage executor (or the client's own)."""
+        if self._executor is None:
+            return await run_blocking(operation, func, *args, **kwargs)
+        self._pending = self._executor.submit(functools.partial(func, *args, **kwargs))
+        return await asyncio.wrap_future(self._pending)
     
-    def _ensure_bucket_exists(self):
+    def close(self) -> None:
+        """Release the client's own executor, if it has one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    async def ensure_bucket_exists(self):
         """Ensure the bucket exists, create if it doesn't."""
+        if self._bucket_ready:
+            return
         try:
-            if not self.client.bucket_exists(self.bucket_name):
-                self.client.make_bucket(self.bucket_name)
+            if not await self._run(METADATA, self.client.bucket_exists, self.bucket_name):
+                await self._run(METADATA, self.client.make_bucket, self.bucket_name)
                 logger.info(f"Created bucket: {self.bucket_name}")
+            self._bucket_ready = True
         except S3Error as e:
             logger.error(f"Error creating bucket: {e}")
             raise
     
-    async def upload_file(
+    async def upload_stream(
         self,
-        file_path: str,
+        chunks: AsyncIterator[bytes],
         object_name: str,
         content_type: str = "application/octet-stream",
-        metadata: Optional[Dict[str, str]] = None
+        metadata: Optional[Dict[str, str]] = None,
+        expected_sha256: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Upload a file to MinIO.
+        Upload a stream of chunks (e.g. a request body) with inline SHA-256.
+        
+        Chunks are re-cut into parts of ``multipart_part_size`` bytes, hashed
+        and uploaded in parallel, with at most ``multipart_max_inflight``
+        parts in flight. Reading pauses while that limit is reached, so
+        memory per upload is bounded regardless of the file size. Streams
+        that fit in a single part are sent with one PUT.
         
         Args:
-            file_path: Local file path
+            chunks: Async iterator of raw bytes
             object_name: Object name in bucket
             content_type: MIME type
             metadata: Optional metadata
+            expected_sha256: Optional hash; on mismatch the upload is aborted
             
         Returns:
             Upload result with file info
+            
+        Raises:
+            StorageIntegrityException: If the computed hash does not match
         """
+        await self.ensure_bucket_exists()
+        
+        part_size = settings.storage.multipart_part_size
+        hash_sha256 = hashlib.sha256()
+        buffer = bytearray()
+        size = 0
+        upload = None
+        
+        # Prepare metadata
+        metadata = dict(metadata or {})
+        if expected_sha256:
+            metadata["sha256"] = expected_sha256.lower()
+        
         try:
-            # Calculate file hash
-            file_hash = await self._calculate_file_hash(file_path)
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= part_size:
+                    part = bytes(buffer[:part_size])
+                    del buffer[:part_size]
+                    await offload(hash_sha256.update, part)
+                    size += len(part)
+                    if upload is None:
+                        upload = _MultipartUpload(self, object_name, content_type, metadata)
+                        await upload.start()
+                    await upload.add_part(part)
             
-            # Prepare metadata
-            if metadata is None:
-                metadata = {}
-            metadata["sha256"] = file_hash
+            tail = bytes(buffer)
+            buffer.clear()
+            await offload(hash_sha256.update, tail)
+            size += len(tail)
+            file_hash = hash_sha256.hexdigest()
             
-            # Upload file
-            result = self.client.fput_object(
-                bucket_name=self.bucket_name,
-                object_name=object_name,
-                file_path=file_path,
-                content_type=content_type,
-                metadata=metadata
-            )
+            if upload is None:
+                # Single part: verify before sending anything
+                self._verify_hash(object_name, file_hash, expected_sha256)
+                metadata["sha256"] = file_hash
+                result = await self._run(
+                    UPLOAD,
+                    self.client.put_object,
+                    bucket_name=self.bucket_name,
+                    object_name=object_name,
+                    data=io.BytesIO(tail),
+                    length=len(tail),
+                    content_type=content_type,
+                    metadata=metadata
+                )
+                etag = result.etag
+            else:
+                if tail:
+                    await upload.add_part(tail)
+                await upload.wait()
+                self._verify_hash(object_name, file_hash, expected_sha256)
+                etag = await upload.complete()
             
             logger.info(f"File uploaded successfully: {object_name}")
             
             return {
                 "object_name": object_name,
-                "etag": result.etag,
-                "size": result.size,
+                "etag": etag,
+                "size": size,
                 "hash_sha256": file_hash,
                 "content_type": content_type
             }
             
-        except S3Error as e:
-            logger.error(f"Error uploading file {object_name}: {e}")
+        except BaseException as e:
+            if upload is not None:
+                await upload.abort()
+            if isinstance(e, S3Error):
+                logger.error(f"Error uploading file {object_name}: {e}")
             raise
     
+    def _verify_hash(self, object_name: str, file_hash: str, expected_sha256: Optional[str]):
+        """Raise if the computed hash differs from the expected one."""
+        if expected_sha256 and file_hash != expected_sha256.lower():
+            logger.error(f"Hash mismatch uploading {object_name}")
+            raise StorageIntegrityException(
+                f"SHA-256 mismatch for {object_name}: expected {expected_sha256}, got {file_hash}"
+            )
+    
     async def download_file(
         self,
         object_name: str,
@@ -110,7 +287,9 @@ class MinIOClient:
             True if successful
         """
         try:
-            self.client.fget_object(
+            await self._run(
+                DOWNLOAD,
+                self.client.fget_object,
                 bucket_name=self.bucket_name,
                 object_name=object_name,
                 file_path=file_path
@@ -123,6 +302,44 @@ class MinIOClient:
             logger.error(f"Error downloading file {object_name}: {e}")
             return False
     
+    async def stream_file(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = settings.storage.media_chunk_size
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an object (or a byte range of it) without buffering it.
+        
+        Chunks are read from the object store response one at a time, so a
+        slow consumer applies back-pressure instead of filling memory. The
+        pooled connection is released when the iterator is closed.
+        
+        Args:
+            object_name: Object name in bucket
+            offset: First byte to read
+            length: Bytes to read, 0 for the rest of the object
+            chunk_size: Bytes per chunk
+            
+        Yields:
+            Object content chunks
+        """
+        response = await self._run(
+            DOWNLOAD,
+            self.client.get_object,
+            bucket_name=self.bucket_name,
+            object_name=object_name,
+            offset=offset,
+            length=length
+        )
+        try:
+            while chunk := await self._run(DOWNLOAD, response.read, chunk_size):
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+    
     async def delete_file(self, object_name: str) -> bool:
         """
         Delete a file from MinIO.
@@ -134,11 +351,14 @@ class MinIOClient:
             True if successful
         """
         try:
-            self.client.remove_object(
+            await self._run(
+                METADATA,
+                self.client.remove_object,
                 bucket_name=self.bucket_name,
                 object_name=object_name
             )
             
+            presigned_url_cache.invalidate(object_name)
             logger.info(f"File deleted successfully: {object_name}")
             return True
             
@@ -157,7 +377,9 @@ class MinIOClient:
             File info or None if not found
         """
         try:
-            stat = self.client.stat_object(
+            stat = await self._run(
+                METADATA,
+                self.client.stat_object,
                 bucket_name=self.bucket_name,
                 object_name=object_name
             )
@@ -175,68 +397,76 @@ class MinIOClient:
             logger.error(f"Error getting file info {object_name}: {e}")
             return None
     
-    async def list_files(
+    async def iter_files(
         self,
         prefix: str = "",
-        recursive: bool = True
-    ) -> list:
+        recursive: bool = True,
+        start_after: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List files in the bucket.
+        Iterate over the files in the bucket in key order.
+        
+        The SDK listing generator is advanced one batch at a time on the
+        storage executor, so memory stays bounded by batch_size however many
+        objects share the prefix.
         
         Args:
             prefix: Object name prefix
             recursive: Whether to list recursively
+            start_after: Only list object names strictly after this one
+            batch_size: Objects fetched per executor round trip
             
-        Returns:
-            List of file objects
+        Yields:
+            File objects
         """
-        try:
-            objects = self.client.list_objects(
-                bucket_name=self.bucket_name,
-                prefix=prefix,
-                recursive=recursive
-            )
-            
-            files = []
-            for obj in objects:
-                files.append({
+        objects = self.client.list_objects(
+            bucket_name=self.bucket_name,
+            prefix=prefix,
+            recursive=recursive,
+            start_after=start_after
+        )
+        
+        def _next_batch() -> List[Dict[str, Any]]:
+            return [
+                {
                     "object_name": obj.object_name,
                     "size": obj.size,
                     "etag": obj.etag,
                     "last_modified": obj.last_modified
-                })
-            
-            return files
-            
-        except S3Error as e:
-            logger.error(f"Error listing files: {e}")
-            return []
+                }
+                for obj in itertools.islice(objects, batch_size)
+            ]
+        
+        while True:
+            batch = await self._run(METADATA, _next_batch)
+            for file in batch:
+                yield file
+            if len(batch) < batch_size:
+                return
     
     async def health_check(self) -> bool:
         """
         Check MinIO service health.
         
+        With its own executor, a check is skipped (unhealthy) while the
+        previous one is still running, so a hung MinIO does not queue a
+        call per probe behind the stuck one.
+        
         Returns:
             True if healthy
         """
+        if self._pending is not None and not self._pending.done():
+            logger.warning("MinIO health check skipped: the previous one is still running")
+            return False
         try:
             # Try to list buckets
-            self.client.list_buckets()
+            await self._run(METADATA, self.client.list_buckets)
             return True
         except S3Error as e:
             logger.error(f"MinIO health check failed: {e}")
             return False
     
-    async def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate SHA256 hash of a file."""
-        hash_sha256 = hashlib.sha256()
-        
-        async with aiofiles.open(file_path, "rb") as f:
-            while chunk := await f.read(8192):
-                hash_sha256.update(chunk)
-        
-        return hash_sha256.hexdigest()
-    
     def get_presigned_url(
         self,
         object_name: str,
@@ -245,6 +475,9 @@ class MinIOClient:
         """
         Get a presigned URL for file access.
         
+        URLs are cached per (object, expiry bucket) and reused while they
+        remain valid for at least ``expires_in`` seconds.
+        
         Args:
             object_name: Object name in bucket
             expires_in: URL expiration time in seconds
@@ -252,13 +485,150 @@ class MinIOClient:
         Returns:
             Presigned URL
         """
+        bucket = presigned_url_cache.expiry_bucket(expires_in)
+        url = presigned_url_cache.get(object_name, bucket)
+        if url is not None:
+            return url
+        return self._sign(object_name, bucket)
+    
+    async def get_presigned_urls(
+        self,
+        object_names: List[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """
+        Get presigned URLs for many objects at once.
+        
+        Cached URLs are returned directly; the rest are signed together in
+        a single executor call.
+        
+        Args:
+            object_names: Object names in bucket
+            expires_in: URL expiration time in seconds
+            
+        Returns:
+            Mapping of object name to presigned URL
+        """
+        bucket = presigned_url_cache.expiry_bucket(expires_in)
+        urls: Dict[str, str] = {}
+        missing = []
+        for object_name in dict.fromkeys(object_names):
+            url = presigned_url_cache.get(object_name, bucket)
+            if url is None:
+                missing.append(object_name)
+            else:
+                urls[object_name] = url
+        
+        if missing:
+            signed = await offload(
+                lambda: {name: self._sign(name, bucket) for name in missing}
+            )
+            urls.update(signed)
+        
+        return urls
+    
+    def _sign(self, object_name: str, bucket: int) -> str:
+        """Sign a URL (CPU only, the region is configured) and cache it."""
         try:
+            signed_at = time.time()
             url = self.client.presigned_get_object(
                 bucket_name=self.bucket_name,
                 object_name=object_name,
-                expires=expires_in
+                expires=timedelta(seconds=presigned_url_cache.signing_expiry(bucket))
             )
+            presigned_url_cache.put(object_name, bucket, url, signed_at)
             return url
         except S3Error as e:
             logger.error(f"Error generating presigned URL: {e}")
             raise
+
+
+class _MultipartUpload:
+    """Parallel S3 multipart upload with a bounded number of parts in flight."""
+    
+    def __init__(
+        self,
+        owner: MinIOClient,
+        object_name: str,
+        content_type: str,
+        metadata: Dict[str, str]
+    ):
+        self.owner = owner
+        self.object_name = object_name
+        self.headers = {"Content-Type": content_type}
+        self.headers.update({f"x-amz-meta-{k}": v for k, v in metadata.items()})
+        self.upload_id: Optional[str] = None
+        self.parts: List[Part] = []
+        self._next_part = 1
+        self._inflight = asyncio.Semaphore(settings.storage.multipart_max_inflight)
+        self._tasks: List[asyncio.Task] = []
+    
+    async def start(self):
+        self.upload_id = await self.owner._run(
+            UPLOAD,
+            self.owner.client._create_multipart_upload,
+            self.owner.bucket_name,
+            self.object_name,
+            self.headers
+        )
+    
+    async def add_part(self, data: bytes):
+        """Schedule a part upload, waiting while too many are in flight."""
+        await self._inflight.acquire()
+        # Fail fast instead of queueing more parts behind a failed one
+        for task in self._tasks:
+            if task.done() and task.exception():
+                self._inflight.release()
+                raise task.exception()
+        part_number = self._next_part
+        self._next_part += 1
+        self._tasks.append(asyncio.create_task(self._upload_part(part_number, data)))
+    
+    async def _upload_part(self, part_number: int, data: bytes):
+        try:
+            etag = await self.owner._run(
+                UPLOAD,
+                self.owner.client._upload_part,
+                self.owner.bucket_name,
+                self.object_name,
+                data,
+                None,
+                self.upload_id,
+                part_number
+            )
+            self.parts.append(Part(part_number, etag))
+        finally:
+            self._inflight.release()
+    
+    async def wait(self):
+        await asyncio.gather(*self._tasks)
+    
+    async def complete(self) -> str:
+        result = await self.owner._run(
+            UPLOAD,
+            self.owner.client._complete_multipart_upload,
+            self.owner.bucket_name,
+            self.object_name,
+            self.upload_id,
+            sorted(self.parts, key=lambda p: p.part_number)
+        )
+        return result.etag
+    
+    async def abort(self):
+        """Abort the upload so the store discards all uploaded parts."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.upload_id is None:
+            return
+        try:
+            await self.owner._run(
+                UPLOAD,
+                self.owner.client._abort_multipart_upload,
+                self.owner.bucket_name,
+                self.object_name,
+                self.upload_id
+            )
+            logger.warning(f"Multipart upload aborted: {self.object_name}")
+        except S3Error as e:
+            logger.error(f"Error aborting multipart upload {self.object_name}: {e}")
@@ -0,0 +1,117 @@
+"""
+AVTech Platform - Presigned URL Cache
+=====================================
+
+LRU cache of presigned download URLs. Requested expiries are rounded up to
+a bucket and URLs are signed with one extra granularity window (plus a
+safety margin), so every request for the same object and bucket shares one
+signature for that window while still getting at least the validity it
+asked for.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from src.backend.config import settings
+
+# S3 SigV4 presigned URLs cannot outlive 7 days
+MAX_PRESIGN_EXPIRY = 7 * 24 * 3600
+
+
+class PresignedURLCache:
+    """Thread-safe LRU cache keyed by (object name, expiry bucket)."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        safety_margin: int,
+        expiry_granularity: int
+    ):
+        """
+        Args:
+            max_entries: Maximum cached URLs before LRU eviction
+            safety_margin: Seconds of validity a returned URL must still have
+            expiry_granularity: Expiry bucket size in seconds
+        """
+        self.max_entries = max_entries
+        self.safety_margin = safety_margin
+        self.expiry_granularity = max(1, expiry_granularity)
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def expiry_bucket(self, expires_in: int) -> int:
+        """Requested expiry rounded up to the bucket (part of the cache key)."""
+        bucket = math.ceil(expires_in / self.expiry_granularity) * self.expiry_granularity
+        return min(bucket, MAX_PRESIGN_EXPIRY)
+
+    def signing_expiry(self, bucket: int) -> int:
+        """Expiry actually signed: the bucket plus one reuse window and the margin."""
+        return min(bucket + self.expiry_granularity + self.safety_margin, MAX_PRESIGN_EXPIRY)
+
+    def get(self, object_name: str, bucket: int) -> Optional[str]:
+        """
+        Get a cached URL still valid for the whole bucket plus the margin.
+
+        Args:
+            object_name: Object name in bucket
+            bucket: Expiry bucket (see expiry_bucket)
+
+        Returns:
+            Cached URL or None
+        """
+        key = (object_name, bucket)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                url, usable_until = entry
+                if time.time() < usable_until:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return url
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, object_name: str, bucket: int, url: str, signed_at: float) -> None:
+        """
+        Store a freshly signed URL.
+
+        Args:
+            object_name: Object name in bucket
+            bucket: Expiry bucket the URL was requested for
+            url: URL signed with signing_expiry(bucket)
+            signed_at: Epoch seconds when the URL was signed
+        """
+        usable_until = signed_at + self.signing_expiry(bucket) - bucket - self.safety_margin
+        if usable_until <= signed_at:
+            return  # No reuse window left (expiry capped at 7 days)
+        key = (object_name, bucket)
+        with self._lock:
+            self._entries[key] = (url, usable_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, object_name: str) -> None:
+        """Drop every cached URL for an object (e.g. after deletion)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == object_name]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide cache shared by every MinIOClient instance
+presigned_url_cache = PresignedURLCache(
+    max_entries=settings.storage.presign_cache_size,
+    safety_margin=settings.storage.presign_safety_margin,
+    expiry_granularity=settings.storage.presign_expiry_granularity
+)
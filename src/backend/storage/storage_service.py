@@ -5,25 +5,47 @@ AVTech Platform - Storage Service
 High-level storage service for managing files and media.
 """
 
+import hashlib
 import os
 import uuid
-from typing import Optional, Dict, Any, BinaryIO
+from typing import Optional, Dict, Any, AsyncIterator, BinaryIO, List, Tuple
 from pathlib import Path
 from datetime import datetime
 
-from src.backend.storage.minio_client import MinIOClient
+from src.backend.config import settings
+from src.backend.database.repository import BlobRepository
+from src.backend.exceptions.storage_exceptions import StorageIntegrityException
+from src.backend.storage.backend import StorageBackend, get_storage_backend
+from src.backend.storage.executor import offload
 from src.backend.monitoring.logger import get_logger
 from src.backend.monitoring.metrics import record_storage_operation
 
 logger = get_logger(__name__)
 
+# Bytes of a deduplicated upload hashed per executor call
+HASH_BUFFER_SIZE = 1024 * 1024
+
 
 class StorageService:
     """High-level storage service for file management."""
     
-    def __init__(self):
-        self.minio_client = MinIOClient()
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        """
+        Args:
+            backend: Storage driver; defaults to the one selected by STORAGE_BACKEND
+        """
+        self.backend = backend or get_storage_backend()
         self.base_path = "avtech-media"
+        self.content_addressed = settings.storage.content_addressed
+    
+    def blob_object_name(self, hash_sha256: str) -> str:
+        """Object name of a content-addressed blob."""
+        h = hash_sha256.lower()
+        return f"{self.base_path}/blobs/sha256/{h[:2]}/{h[2:4]}/{h}"
+    
+    def is_blob(self, object_name: str, hash_sha256: str) -> bool:
+        """Whether an object name is the shared blob for a hash (vs. a legacy per-video object)."""
+        return object_name == self.blob_object_name(hash_sha256)
     
     async def upload_video(
         self,
@@ -59,7 +81,7 @@ class StorageService:
             }
             
             # Upload file
-            result = await self.minio_client.upload_file(
+            result = await self.backend.upload_file(
                 file_path=file_path,
                 object_name=object_name,
                 content_type="video/mp4",
@@ -71,14 +93,14 @@ class StorageService:
                 operation="upload_video",
                 status="success",
                 bytes_used=result["size"],
-                bucket=self.minio_client.bucket_name
+                bucket=self.backend.bucket_name
             )
             
             logger.info(f"Video uploaded successfully: {object_name}")
             
             return {
                 "object_name": object_name,
-                "file_path": result["file_path"],
+                "file_path": object_name,
                 "size": result["size"],
                 "hash_sha256": result["hash_sha256"],
                 "content_type": result["content_type"],
@@ -95,6 +117,254 @@ class StorageService:
             logger.error(f"Error uploading video: {e}")
             raise
     
+    async def upload_video_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        client_id: str,
+        title: str,
+        description: Optional[str] = None,
+        expected_sha256: Optional[str] = None,
+        file_extension: str = ".mp4",
+        blob_repo: Optional[BlobRepository] = None,
+        size_hint: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Upload a video from a byte stream (e.g. ``request.stream()``).
+        
+        The body is read once, hashed inline and pushed as a parallel
+        multipart upload; it is never held in memory as a whole.
+        
+        In content-addressed mode (with ``blob_repo`` and ``expected_sha256``)
+        the object is keyed by its hash and reference-counted. An upload whose
+        blob already exists is still read and hashed, but not stored: a
+        declared hash alone must not grant access to another client's blob.
+        
+        Args:
+            chunks: Async iterator of raw bytes
+            client_id: Client ID
+            title: Video title
+            description: Video description
+            expected_sha256: Hash declared by the client, verified on completion
+            file_extension: Extension for the object name
+            blob_repo: Blob reference counts, in the caller's transaction
+            size_hint: Declared size, recorded until the upload completes
+            
+        Returns:
+            Upload result with file info
+        """
+        if self.content_addressed and blob_repo is not None and expected_sha256:
+            return await self._upload_video_blob(
+                chunks, client_id, title, description, expected_sha256, blob_repo, size_hint
+            )
+        
+        try:
+            # Generate unique object name
+            object_name = f"{self.base_path}/clients/{client_id}/videos/{uuid.uuid4()}{file_extension}"
+            
+            # Prepare metadata
+            metadata = {
+                "client_id": client_id,
+                "title": title,
+                "description": description or "",
+                "upload_date": datetime.utcnow().isoformat(),
+                "file_type": "video"
+            }
+            
+            # Upload stream
+            result = await self.backend.upload_stream(
+                chunks=chunks,
+                object_name=object_name,
+                content_type="video/mp4",
+                metadata=metadata,
+                expected_sha256=expected_sha256
+            )
+            
+            # Record metrics
+            record_storage_operation(
+                operation="upload_video",
+                status="success",
+                bytes_used=result["size"],
+                bucket=self.backend.bucket_name
+            )
+            
+            logger.info(f"Video uploaded successfully: {object_name}")
+            
+            return {
+                "object_name": object_name,
+                "file_path": object_name,
+                "size": result["size"],
+                "hash_sha256": result["hash_sha256"],
+                "content_type": result["content_type"],
+                "metadata": metadata,
+                "deduplicated": False
+            }
+            
+        except Exception as e:
+            # Record error metrics
+            record_storage_operation(
+                operation="upload_video",
+                status="error"
+            )
+            
+            logger.error(f"Error uploading video: {e}")
+            raise
+    
+    async def _upload_video_blob(
+        self,
+        chunks: AsyncIterator[bytes],
+        client_id: str,
+        title: str,
+        description: Optional[str],
+        expected_sha256: str,
+        blob_repo: BlobRepository,
+        size_hint: int
+    ) -> Dict[str, Any]:
+        """
+        Content-addressed upload: reference an existing blob or upload a new one.
+        
+        The reference is taken first, so the blob row stays locked (and cannot
+        be collected) while the body is checked. On a hash mismatch the
+        caller rolls back, which drops the reference again.
+        """
+        hash_sha256 = expected_sha256.lower()
+        object_name = self.blob_object_name(hash_sha256)
+        metadata = {
+            "client_id": client_id,
+            "title": title,
+            "description": description or "",
+            "upload_date": datetime.utcnow().isoformat(),
+            "file_type": "video"
+        }
+        
+        try:
+            ref_count, size = await blob_repo.acquire(hash_sha256, object_name, size_hint)
+            deduplicated = ref_count > 1
+            
+            if deduplicated:
+                await self._verify_stream(chunks, hash_sha256)
+            else:
+                # First reference (or a blob pending garbage collection): upload it
+                result = await self.backend.upload_stream(
+                    chunks=chunks,
+                    object_name=object_name,
+                    content_type="video/mp4",
+                    metadata={"file_type": "video"},
+                    expected_sha256=hash_sha256
+                )
+                size = result["size"]
+                await blob_repo.set_size(hash_sha256, size)
+            
+            record_storage_operation(
+                operation="upload_video",
+                status="deduplicated" if deduplicated else "success",
+                bytes_used=0 if deduplicated else size,
+                bucket=self.backend.bucket_name
+            )
+            
+            logger.info(
+                f"Video blob {'referenced' if deduplicated else 'uploaded'}: {object_name} "
+                f"(refs={ref_count})"
+            )
+            
+            return {
+                "object_name": object_name,
+                "file_path": object_name,
+                "size": size,
+                "hash_sha256": hash_sha256,
+                "content_type": "video/mp4",
+                "metadata": metadata,
+                "deduplicated": deduplicated
+            }
+            
+        except Exception as e:
+            record_storage_operation(
+                operation="upload_video",
+                status="error"
+            )
+            
+            logger.error(f"Error uploading video blob: {e}")
+            raise
+    
+    async def _verify_stream(self, chunks: AsyncIterator[bytes], hash_sha256: str) -> int:
+        """
+        Read a whole upload and check its hash, without storing it.
+        
+        Returns:
+            Bytes read
+        
+        Raises:
+            StorageIntegrityException: If the content does not match the hash
+        """
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= HASH_BUFFER_SIZE:
+                await offload(digest.update, bytes(buffer))
+                size += len(buffer)
+                buffer.clear()
+        await offload(digest.update, bytes(buffer))
+        size += len(buffer)
+        if digest.hexdigest() != hash_sha256:
+            raise StorageIntegrityException(
+                f"SHA-256 mismatch: expected {hash_sha256}, got {digest.hexdigest()}"
+            )
+        return size
+    
+    async def release_video(
+        self,
+        object_name: str,
+        hash_sha256: str,
+        blob_repo: Optional[BlobRepository] = None
+    ) -> Optional[int]:
+        """
+        Drop a video's reference on its stored object.
+        
+        Nothing is deleted here, so a rolled-back transaction never leaves
+        a video row without its object. Shared blobs are decremented and the
+        caller commits and then calls collect_blob() when the count reaches
+        zero; for legacy per-video objects the caller commits and then calls
+        delete_file().
+        
+        Args:
+            object_name: Object name stored on the video
+            hash_sha256: Video hash
+            blob_repo: Blob reference counts, in the caller's transaction
+            
+        Returns:
+            Remaining references for shared blobs, None for legacy objects
+        """
+        if blob_repo is not None and self.is_blob(object_name, hash_sha256):
+            return await blob_repo.release(hash_sha256.lower())
+        return None
+    
+    async def collect_blob(self, hash_sha256: str, blob_repo: BlobRepository) -> bool:
+        """
+        Remove an unreferenced blob and its row.
+        
+        The row is locked while the object is removed, so a concurrent upload
+        of the same hash waits and then re-creates the blob. The caller
+        commits.
+        
+        Args:
+            hash_sha256: Blob hash
+            blob_repo: Blob reference counts, in the caller's transaction
+            
+        Returns:
+            True if the blob was removed
+        """
+        blob = await blob_repo.lock_unreferenced(hash_sha256)
+        if blob is None:
+            return False  # Re-acquired in the meantime
+        
+        object_name, size_bytes = blob
+        if not await self.delete_file(object_name, size_bytes):
+            return False  # Left at ref_count 0 for the next collection
+        
+        await blob_repo.delete(hash_sha256)
+        return True
+    
     async def upload_thumbnail(
         self,
         file_path: str,
@@ -126,7 +396,7 @@ class StorageService:
             }
             
             # Upload file
-            result = await self.minio_client.upload_file(
+            result = await self.backend.upload_file(
                 file_path=file_path,
                 object_name=object_name,
                 content_type="image/jpeg",
@@ -138,14 +408,14 @@ class StorageService:
                 operation="upload_thumbnail",
                 status="success",
                 bytes_used=result["size"],
-                bucket=self.minio_client.bucket_name
+                bucket=self.backend.bucket_name
             )
             
             logger.info(f"Thumbnail uploaded successfully: {object_name}")
             
             return {
                 "object_name": object_name,
-                "file_path": result["file_path"],
+                "file_path": object_name,
                 "size": result["size"],
                 "hash_sha256": result["hash_sha256"],
                 "content_type": result["content_type"],
@@ -182,7 +452,7 @@ class StorageService:
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
             # Download file
-            success = await self.minio_client.download_file(
+            success = await self.backend.download_file(
                 object_name=object_name,
                 file_path=local_path
             )
@@ -214,24 +484,68 @@ class StorageService:
             logger.error(f"Error downloading file: {e}")
             return False
     
-    async def delete_file(self, object_name: str) -> bool:
+    async def stream_file(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a file (or a byte range of it) straight from storage.
+        
+        Args:
+            object_name: Object name in storage
+            offset: First byte to read
+            length: Bytes to read, 0 for the rest of the file
+            
+        Yields:
+            File content chunks
+        """
+        # Stays "aborted" if the client disconnects and the iterator is closed
+        status = "aborted"
+        try:
+            # Closed explicitly (contextlib.aclosing needs Python 3.10) so an
+            # abandoned download releases its storage connection right away
+            chunks = self.backend.stream_file(object_name, offset=offset, length=length)
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+            status = "success"
+            
+        except Exception as e:
+            status = "error"
+            logger.error(f"Error streaming file {object_name}: {e}")
+            raise
+            
+        finally:
+            record_storage_operation(
+                operation="stream_file",
+                status=status
+            )
+    
+    async def delete_file(self, object_name: str, size_bytes: int = 0) -> bool:
         """
         Delete a file from storage.
         
         Args:
             object_name: Object name in storage
+            size_bytes: Object size if known, to keep the bucket gauge current
             
         Returns:
             True if successful
         """
         try:
-            success = await self.minio_client.delete_file(object_name)
+            success = await self.backend.delete_file(object_name)
             
             if success:
                 # Record metrics
                 record_storage_operation(
                     operation="delete_file",
-                    status="success"
+                    status="success",
+                    bytes_used=-size_bytes,
+                    bucket=self.backend.bucket_name
                 )
                 
                 logger.info(f"File deleted successfully: {object_name}")
@@ -265,7 +579,7 @@ class StorageService:
             File info or None if not found
         """
         try:
-            info = await self.minio_client.get_file_info(object_name)
+            info = await self.backend.get_file_info(object_name)
             
             if info:
                 # Record metrics
@@ -292,27 +606,91 @@ class StorageService:
             logger.error(f"Error getting file info: {e}")
             return None
     
-    async def list_client_files(
+    def client_prefix(self, client_id: str, file_type: Optional[str] = None) -> str:
+        """
+        Object name prefix of a client's files, optionally of one type.
+        
+        Content-addressed videos (STORAGE_CONTENT_ADDRESSED) are shared
+        blobs under ``{base}/blobs/sha256/``, not under this prefix: the
+        client listings below do not include them. A client's videos,
+        with their object names, are the rows of its ``videos`` table.
+        """
+        prefix = f"{self.base_path}/clients/{client_id}/"
+        if file_type:
+            prefix += f"{file_type}/"
+        return prefix
+    
+    async def iter_client_files(
         self,
         client_id: str,
-        file_type: Optional[str] = None
-    ) -> list:
+        file_type: Optional[str] = None,
+        start_after: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        List files for a specific client.
+        Stream the files of a specific client in key order.
+        
+        Only objects under ``client_prefix``: content-addressed video blobs
+        are excluded.
         
         Args:
             client_id: Client ID
             file_type: Optional file type filter (videos, thumbnails)
+            start_after: Only list object names strictly after this one
             
-        Returns:
-            List of file objects
+        Yields:
+            File objects
         """
         try:
-            prefix = f"{self.base_path}/clients/{client_id}/"
-            if file_type:
-                prefix += f"{file_type}/"
+            async for file in self.backend.iter_files(
+                prefix=self.client_prefix(client_id, file_type),
+                start_after=start_after
+            ):
+                yield file
+            
+            # Record metrics
+            record_storage_operation(
+                operation="list_files",
+                status="success"
+            )
             
-            files = await self.minio_client.list_files(prefix=prefix)
+        except Exception as e:
+            # Record error metrics
+            record_storage_operation(
+                operation="list_files",
+                status="error"
+            )
+            
+            logger.error(f"Error listing files: {e}")
+            raise
+    
+    async def list_client_files_page(
+        self,
+        client_id: str,
+        file_type: Optional[str] = None,
+        limit: int = 100,
+        start_after: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List one page of a specific client's files.
+        
+        Only objects under ``client_prefix``: content-addressed video blobs
+        are excluded.
+        
+        Args:
+            client_id: Client ID
+            file_type: Optional file type filter (videos, thumbnails)
+            limit: Maximum files in the page
+            start_after: Object name the previous page ended at
+            
+        Returns:
+            Tuple (files, last object name), the latter None on the last page
+        """
+        try:
+            page = await self.backend.list_page(
+                prefix=self.client_prefix(client_id, file_type),
+                limit=limit,
+                start_after=start_after
+            )
             
             # Record metrics
             record_storage_operation(
@@ -320,7 +698,7 @@ class StorageService:
                 status="success"
             )
             
-            return files
+            return page
             
         except Exception as e:
             # Record error metrics
@@ -330,7 +708,7 @@ class StorageService:
             )
             
             logger.error(f"Error listing files: {e}")
-            return []
+            raise
     
     async def get_presigned_url(
         self,
@@ -348,7 +726,7 @@ class StorageService:
             Presigned URL
         """
         try:
-            url = self.minio_client.get_presigned_url(
+            url = self.backend.get_presigned_url(
                 object_name=object_name,
                 expires_in=expires_in
             )
@@ -371,6 +749,45 @@ class StorageService:
             logger.error(f"Error generating presigned URL: {e}")
             raise
     
+    async def get_presigned_urls(
+        self,
+        object_names: List[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """
+        Get presigned URLs for many objects in one call.
+        
+        Args:
+            object_names: Object names in storage
+            expires_in: URL expiration time in seconds
+            
+        Returns:
+            Mapping of object name to presigned URL
+        """
+        try:
+            urls = await self.backend.get_presigned_urls(
+                object_names=object_names,
+                expires_in=expires_in
+            )
+            
+            # Record metrics
+            record_storage_operation(
+                operation="get_presigned_urls",
+                status="success"
+            )
+            
+            return urls
+            
+        except Exception as e:
+            # Record error metrics
+            record_storage_operation(
+                operation="get_presigned_urls",
+                status="error"
+            )
+            
+            logger.error(f"Error generating presigned URLs: {e}")
+            raise
+    
     async def health_check(self) -> bool:
         """
         Check storage service health.
@@ -379,7 +796,7 @@ class StorageService:
             True if healthy
         """
         try:
-            return await self.minio_client.health_check()
+            return await self.backend.health_check()
         except Exception as e:
             logger.error(f"Storage health check failed: {e}")
             return False
@@ -0,0 +1,131 @@
+"""
+AVTech Platform - Storage Usage Reconciler
+==========================================
+
+Periodic job that corrects drift in the incrementally maintained
+``clients.storage_used_bytes`` counters and publishes the bucket total to
+the ``storage_bytes_total`` gauge.
+
+The counters are compared against the committed video rows, not against
+the bucket listing: an upload writes its object before it commits its
+video row and counter increment, so a listing would count bytes the
+upload is about to add itself.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select, text
+
+from src.backend.config import settings
+from src.backend.database.connection import AsyncSessionLocal
+from src.backend.database.models import Video
+from src.backend.database.repository import ClientRepository
+from src.backend.monitoring.logger import get_logger
+from src.backend.monitoring.metrics import record_storage_usage
+from src.backend.storage.storage_service import StorageService
+
+logger = get_logger(__name__)
+
+# Advisory lock key: only one worker reconciles at a time
+RECONCILE_LOCK_KEY = 0x415654_01
+
+
+class StorageUsageReconciler:
+    """Recomputes per-client usage from committed videos and fixes drift."""
+
+    def __init__(
+        self,
+        storage_service: Optional[StorageService] = None,
+        interval: float = settings.storage.usage_reconcile_interval
+    ):
+        self.storage_service = storage_service or StorageService()
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def reconcile(self) -> Optional[Dict[str, Any]]:
+        """
+        Run one reconciliation pass.
+
+        Each client's usage is the size of its committed videos, the same
+        bytes uploads and deletions add and subtract in the transaction that
+        writes the video row. A counter is only corrected if it did not
+        change during the pass, so a video committed meanwhile is never
+        counted twice. The bucket listing only feeds the gauge.
+
+        Returns:
+            Summary with bucket total and number of corrected clients, or
+            None if another worker is already reconciling
+        """
+        start_time = time.time()
+
+        async with AsyncSessionLocal() as session:
+            locked = await session.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+            )
+            if not locked:
+                return None
+
+            client_repo = ClientRepository(session)
+            snapshot = await client_repo.get_all_storage_used()
+
+            # Read after the snapshot: a video committed in between moves its
+            # client's counter, and the guarded correction below skips it
+            rows = await session.execute(
+                select(Video.client_id, func.sum(Video.file_size_bytes)).group_by(Video.client_id)
+            )
+            totals = {client_id: total or 0 for client_id, total in rows}
+            actual = {client_id: totals.get(client_id, 0) for client_id in snapshot}
+
+            corrected = 0
+            for client_id, used in actual.items():
+                if used != snapshot[client_id]:
+                    if await client_repo.correct_storage_used(client_id, snapshot[client_id], used):
+                        corrected += 1
+                        logger.warning(
+                            f"Storage usage drift for client {client_id}: "
+                            f"{snapshot[client_id]} -> {used} bytes"
+                        )
+            await session.commit()
+
+        bucket_total = 0
+        objects = 0
+        async for obj in self.storage_service.backend.iter_files(prefix=""):
+            objects += 1
+            bucket_total += obj["size"] or 0
+        record_storage_usage(self.storage_service.backend.bucket_name, bucket_total)
+
+        summary = {
+            "objects": objects,
+            "bucket_bytes": bucket_total,
+            "clients": len(actual),
+            "corrected": corrected,
+            "duration_seconds": round(time.time() - start_time, 2)
+        }
+        logger.info(f"Storage usage reconciled: {summary}")
+        return summary
+
+    async def _run(self):
+        """Reconciliation loop; a failing pass never stops the loop."""
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Storage usage reconciliation failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Start the periodic job (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="storage-usage-reconciler")
+
+    async def stop(self):
+        """Stop the periodic job."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,182 @@
+"""
+AVTech Platform - Heartbeat Buffer
+==================================
+
+Coalesces player heartbeats in memory and writes them to Postgres in one
+batched statement per table every few seconds, instead of one UPDATE (plus
+trigger, dead tuple and index churn) per heartbeat.
+
+Only the newest heartbeat per screen is kept, so the work per flush is
+bounded by the number of screens, not by the heartbeat rate. Status changes
+are not delayed: the first heartbeat a worker sees from a screen marks it
+online right away, and each flush sweeps screens that stopped reporting to
+offline. With several workers each keeps its own buffer; GREATEST in the
+flush makes the order in which they write irrelevant.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+from src.backend.config import settings
+from src.backend.database.connection import AsyncSessionLocal
+from src.backend.database.repository import PlayerSyncStatusRepository, ScreenRepository
+from src.backend.monitoring.logger import get_logger
+from src.backend.monitoring.metrics import (
+    record_heartbeat,
+    record_heartbeat_flush,
+    record_screen_transition,
+)
+
+logger = get_logger(__name__)
+
+
+class HeartbeatBuffer:
+    """Latest heartbeat per screen, flushed to the database periodically."""
+
+    def __init__(
+        self,
+        flush_interval: float = settings.player.heartbeat_flush_interval,
+        offline_after: float = settings.player.heartbeat_offline_after,
+        session_factory=AsyncSessionLocal
+    ):
+        self.flush_interval = flush_interval
+        self.offline_after = offline_after
+        self.session_factory = session_factory
+        # {screen_code: (heartbeat time, health metrics)}
+        self._pending: Dict[str, Tuple[datetime, Optional[Dict[str, Any]]]] = {}
+        # Screens this worker has seen online since they last went offline
+        self._online: Set[str] = set()
+        # {screen_code: client_id} checked against the database by record()
+        self._owners: Dict[str, Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Screens with a heartbeat waiting to be flushed."""
+        return len(self._pending)
+
+    async def record(
+        self,
+        screen_code: str,
+        health_metrics: Optional[Dict[str, Any]] = None,
+        at: Optional[datetime] = None,
+        client_id: Any = None
+    ) -> bool:
+        """
+        Accept one heartbeat.
+
+        Only touches the database when the screen is not known to be online
+        (first heartbeat seen by this worker, or back from offline), or its
+        owner has not been checked against `client_id` yet.
+
+        Args:
+            screen_code: Reporting screen
+            health_metrics: CPU, RAM, disk usage... reported by the player
+            at: Heartbeat time (defaults to now, UTC)
+            client_id: Client of the player; screens of other clients are
+                treated as unknown
+
+        Returns:
+            False if the screen does not exist (or is not the client's)
+        """
+        at = at or datetime.utcnow()
+        if screen_code not in self._online or (client_id is not None and self._owners.get(screen_code) != client_id):
+            async with self.session_factory() as session:
+                previous = await ScreenRepository(session).mark_online(screen_code, at, client_id)
+                await session.commit()
+            if previous is None:
+                return False
+            if previous != "online":
+                logger.info(f"Screen {screen_code} is online (was {previous})")
+                record_screen_transition("online")
+            self._online.add(screen_code)
+            if client_id is not None:
+                self._owners[screen_code] = client_id
+
+        current = self._pending.get(screen_code)
+        if current is None or at >= current[0]:
+            if health_metrics is None and current is not None:
+                health_metrics = current[1]
+            self._pending[screen_code] = (at, health_metrics)
+        record_heartbeat()
+        return True
+
+    async def flush(self) -> Dict[str, int]:
+        """
+        Write buffered heartbeats and sweep silent screens offline.
+
+        Heartbeats are taken out of the buffer first and put back if the
+        write fails, so none are lost and new ones keep arriving meanwhile.
+
+        Returns:
+            Summary with written, back-online and gone-offline counts
+        """
+        async with self._flush_lock:
+            beats, self._pending = self._pending, {}
+            start = time.perf_counter()
+            try:
+                async with self.session_factory() as session:
+                    screens = ScreenRepository(session)
+                    back_online = []
+                    if beats:
+                        stale = await screens.record_heartbeats({code: at for code, (at, _) in beats.items()})
+                        # Swept offline by another worker while still reporting here
+                        for code in stale:
+                            await screens.mark_online(code, beats[code][0])
+                            back_online.append(code)
+                        await PlayerSyncStatusRepository(session).record_heartbeats(beats)
+                    cutoff = datetime.utcnow() - timedelta(seconds=self.offline_after)
+                    offline = await screens.mark_offline_before(cutoff)
+                    await session.commit()
+            except Exception:
+                for code, beat in beats.items():
+                    current = self._pending.get(code)
+                    if current is None or beat[0] > current[0]:
+                        self._pending[code] = beat
+                raise
+
+            self._online.update(back_online)
+            self._online.difference_update(offline)
+            for code in offline:
+                self._owners.pop(code, None)
+            record_heartbeat_flush(len(beats), time.perf_counter() - start)
+            record_screen_transition("online", len(back_online))
+            record_screen_transition("offline", len(offline))
+            if offline:
+                logger.info(f"{len(offline)} screens went offline")
+            return {"written": len(beats), "online": len(back_online), "offline": len(offline)}
+
+    async def _run(self):
+        """Flush loop; a failing flush never stops the loop."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Heartbeat flush failed: {e}")
+
+    async def start(self):
+        """Start the periodic flush (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="heartbeat-buffer")
+
+    async def stop(self):
+        """Stop the periodic flush and write what is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final heartbeat flush failed: {e}")
+
+
+# Global heartbeat buffer instance
+heartbeat_buffer = HeartbeatBuffer()
@@ -0,0 +1,83 @@
+"""
+AVTech Platform - Desired State Catch-up
+========================================
+
+Periodic job that recomputes the desired state of screens left queued in
+desired_state_pending: a schedule change commits and queues its screens
+first, and only then recomputes them, so a recomputation that failed
+(database restart, deadlock, bug) is retried here instead of leaving
+players on a stale desired_state_version.
+"""
+
+import asyncio
+from typing import Optional
+
+from src.backend.config import settings
+from src.backend.database.connection import AsyncSessionLocal
+from src.backend.monitoring.logger import get_logger
+from src.backend.sync.state_manager import DesiredStateManager
+
+logger = get_logger(__name__)
+
+
+class DesiredStateCatchUp:
+    """Recomputes queued desired states, one committed batch at a time."""
+
+    def __init__(
+        self,
+        interval: float = settings.player.state_catchup_interval,
+        session_factory=AsyncSessionLocal
+    ):
+        self.interval = interval
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """
+        Drain the queue.
+
+        Each batch is claimed and recomputed in its own transaction; several
+        workers share the queue (claimed rows are skipped, not waited for).
+
+        Returns:
+            Screens recomputed
+        """
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                recomputed = await DesiredStateManager(session).catch_up()
+                await session.commit()
+            if not recomputed:
+                break
+            total += recomputed
+        if total:
+            logger.warning(f"Caught up {total} queued desired states")
+        return total
+
+    async def _run(self):
+        """Catch-up loop; a failing pass never stops the loop."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Desired state catch-up failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Start the periodic job (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="desired-state-catchup")
+
+    async def stop(self):
+        """Stop the periodic job."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global catch-up worker instance
+desired_state_catchup = DesiredStateCatchUp()
@@ -0,0 +1,212 @@
+"""
+AVTech Platform - Desired State Manager
+=======================================
+
+Recomputes the desired state of players incrementally from change sets.
+
+A change to rules, slots or videos only reaches the screens that depend on
+it: the dependency indexes of time_slots (rule -> screens, video -> screens,
+see migration 012) give the affected screens without touching the others.
+Each affected screen's slots are compiled (schedule.resolver) into a
+manifest: the weekly segments with the playlist of every rule, the rules'
+activation windows and the content hash of every video.
+
+The SHA-256 of the manifest is stored next to the player's
+``desired_state_version``, which only moves when the hash differs. Fixing a
+typo in the name of a campaign on 5,000 screens recomputes 5,000 manifests
+but bumps no version, so no player downloads anything.
+
+Recomputation reads the primary and runs after the change is committed:
+reading before, a player could get a version that points at the old state.
+So that a recomputation failing after that commit is not lost, the change
+queues its screens in desired_state_pending in its own transaction, and
+the recomputation takes them off in its transaction. Whatever stays queued
+is recomputed by the catch-up worker (sync/state_catchup.py).
+Like repositories, the manager flushes but never commits.
+"""
+
+import hashlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+from uuid import UUID
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database.repository import (
+    DesiredStatePendingRepository,
+    PlayerSyncStatusRepository,
+    ScreenRepository,
+    TimeSlotRepository,
+    VideoRepository,
+)
+from src.backend.monitoring.logger import get_logger
+from src.backend.monitoring.metrics import record_desired_states
+from src.backend.schedule.resolver import ScreenSchedule, compile_schedule
+
+logger = get_logger(__name__)
+
+
+class ChangeSet(NamedTuple):
+    """IDs touched by a committed change."""
+    rule_ids: Sequence[Any] = ()
+    slot_ids: Sequence[Any] = ()
+    video_ids: Sequence[Any] = ()
+    # Screens known to be affected, e.g. the screens of deleted slots,
+    # which can no longer be found through their slot ids
+    screen_ids: Sequence[Any] = ()
+
+    @property
+    def empty(self) -> bool:
+        return not (self.rule_ids or self.slot_ids or self.video_ids or self.screen_ids)
+
+
+def build_manifest(schedule: ScreenSchedule, video_hashes: Dict[UUID, str]) -> Dict[str, Any]:
+    """
+    Canonical desired state of a screen.
+
+    Rules and videos are referred to by id, not by the resolver's indexes,
+    so the manifest does not depend on the order the slots were read in.
+
+    Args:
+        schedule: The screen's compiled schedule
+        video_hashes: {video_id: hash_sha256} covering its videos
+
+    Returns:
+        JSON-serializable manifest
+    """
+    rule_ids = [str(rule_id) for rule_id in schedule.rule_ids]
+    videos: Dict[UUID, None] = {}
+    segments = []
+    for segment in schedule.segments:
+        candidates = []
+        for rule, video_ids in segment.candidates:
+            videos.update(dict.fromkeys(video_ids))
+            candidates.append([rule_ids[rule], [str(video_id) for video_id in video_ids]])
+        segments.append([segment.start, segment.end, candidates])
+    return {
+        "rules": {rule_id: list(window) for rule_id, window in zip(rule_ids, schedule.windows)},
+        "segments": segments,
+        "videos": {str(video_id): video_hashes.get(video_id) for video_id in videos},
+    }
+
+
+def manifest_hash(manifest: Dict[str, Any]) -> str:
+    """SHA-256 (hex) of a manifest, with keys sorted so equal manifests hash equally."""
+    return hashlib.sha256(orjson.dumps(manifest, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class DesiredStateManager:
+    """Recomputes players' desired states for the screens a change affects."""
+
+    def __init__(self, session: AsyncSession, batch_size: int = settings.player.state_batch_size):
+        """
+        Args:
+            session: Session on the primary; the caller commits
+            batch_size: Screens whose slots are read and compiled per query
+        """
+        self.session = session
+        self.batch_size = batch_size
+        self.slot_repo = TimeSlotRepository(session)
+        self.screen_repo = ScreenRepository(session)
+        self.video_repo = VideoRepository(session)
+        self.sync_repo = PlayerSyncStatusRepository(session)
+        self.pending_repo = DesiredStatePendingRepository(session)
+
+    async def affected_screens(self, changes: ChangeSet) -> List[Any]:
+        """Screens whose desired state may depend on a change (no duplicates)."""
+        screen_ids = list(changes.screen_ids)
+        screen_ids += await self.slot_repo.get_screen_ids_for_rules(list(changes.rule_ids))
+        screen_ids += await self.slot_repo.get_screen_ids_for_slots(list(changes.slot_ids))
+        screen_ids += await self.slot_repo.get_screen_ids_for_videos(list(changes.video_ids))
+        return list(dict.fromkeys(screen_ids))
+
+    async def queue(self, changes: ChangeSet) -> List[Any]:
+        """
+        Queue the screens a change affects, in the change's transaction.
+
+        Returns:
+            The queued screens, to pass to recompute_queued() after commit
+        """
+        screen_ids = await self.affected_screens(changes)
+        await self.pending_repo.queue(screen_ids)
+        return screen_ids
+
+    async def recompute_queued(self, screen_ids: Sequence[Any], at: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Take queued screens off the queue and recompute them; rolled back,
+        they stay queued.
+
+        Returns:
+            {screen_code: new desired_state_version} of the changed players
+        """
+        await self.pending_repo.claim(screen_ids)
+        return await self.recompute(screen_ids, at)
+
+    async def catch_up(self, at: Optional[datetime] = None) -> int:
+        """
+        Recompute one batch of the longest-queued screens.
+
+        Returns:
+            Screens recomputed (0 when the queue is empty)
+        """
+        screen_ids = await self.pending_repo.claim_oldest(self.batch_size)
+        await self.recompute(screen_ids, at)
+        return len(screen_ids)
+
+    async def apply(self, changes: ChangeSet, at: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Recompute the desired state of every screen affected by a change.
+
+        Returns:
+            {screen_code: new desired_state_version} of the players whose
+            manifest changed
+        """
+        if changes.empty:
+            return {}
+        return await self.recompute(await self.affected_screens(changes), at)
+
+    async def recompute(
+        self,
+        screen_ids: Iterable[Any],
+        at: Optional[datetime] = None,
+        force: bool = False
+    ) -> Dict[str, int]:
+        """
+        Rebuild the manifests of some screens and bump the version of those
+        that changed.
+
+        Args:
+            screen_ids: Screens to recompute
+            at: Rules expired by then are left out (default: utcnow)
+            force: Bump every version, changed or not (republish)
+
+        Returns:
+            {screen_code: new desired_state_version} of the changed players
+        """
+        at = at or datetime.utcnow()
+        screen_ids = list(dict.fromkeys(screen_ids))
+        changed: Dict[str, int] = {}
+        for i in range(0, len(screen_ids), self.batch_size):
+            batch = screen_ids[i:i + self.batch_size]
+            codes = await self.screen_repo.get_codes(batch)
+            rows = await self.slot_repo.get_screens_schedule(list(codes), at)
+            video_hashes = await self.video_repo.get_hashes(list({row.video_id for row in rows}))
+
+            # One query for the batch; rows keep their (start, slot) order per screen
+            slots = defaultdict(list)
+            for row in rows:
+                slots[row.screen_id].append(row)
+            hashes = {
+                code: manifest_hash(build_manifest(compile_schedule(slots.get(screen_id, ())), video_hashes))
+                for screen_id, code in codes.items()
+            }
+            advanced = await self.sync_repo.advance_desired_states(hashes, force)
+            changed.update(advanced)
+            record_desired_states(len(advanced), len(hashes) - len(advanced))
+
+        if screen_ids:
+            logger.info(f"Recomputed {len(screen_ids)} desired states, {len(changed)} changed")
+        return changed
@@ -0,0 +1,128 @@
+"""
+AVTech Platform - Resumable downloads under connection drops
+============================================================
+
+Simulates players downloading videos over a link that drops at random
+points and measures how many bytes the object store has to send, comparing
+restarting from zero with resuming through ``Range`` / ``If-Range``.
+
+Drops are exponentially distributed with a configurable mean distance in
+bytes; the random seed is fixed so both modes see the same drop points.
+
+Usage:
+    python -m tests.benchmarks.bench_range_resume --videos 20 --size-mb 8 --mean-drop-mb 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from datetime import datetime
+from typing import Dict
+
+from src.backend.storage.media import if_range_allows, make_etag, parse_range
+from src.backend.storage.minio_client import MinIOClient, shutdown_storage_engine
+from tests.benchmarks.fake_s3 import InMemoryS3
+
+
+async def _download(
+    client: MinIOClient,
+    object_name: str,
+    size: int,
+    etag: str,
+    resume: bool,
+    rng: random.Random,
+    mean_drop: float,
+    chunk_size: int,
+) -> Dict[str, int]:
+    """Download one object until complete, reconnecting after every drop."""
+    received = 0
+    transferred = 0
+    attempts = 0
+    modified = datetime.utcnow()
+    while received < size:
+        attempts += 1
+        if resume and received:
+            # What the media endpoint does with "Range: bytes=N-" + If-Range
+            byte_range = None
+            if if_range_allows(etag, etag, modified):
+                byte_range = parse_range(f"bytes={received}-", size)
+            offset = byte_range.start if byte_range else 0
+        else:
+            offset = 0
+        received = offset
+
+        budget = rng.expovariate(1 / mean_drop)
+        chunks = client.stream_file(object_name, offset=offset, chunk_size=chunk_size)
+        try:
+            async for chunk in chunks:
+                transferred += len(chunk)
+                if budget < len(chunk):
+                    # Connection lost mid-chunk: only the prefix made it
+                    received += int(budget)
+                    break
+                budget -= len(chunk)
+                received += len(chunk)
+        finally:
+            await chunks.aclose()
+    return {"attempts": attempts, "transferred": transferred}
+
+
+async def _once(payload: bytes):
+    yield payload
+
+
+async def _run(mode: str, args: argparse.Namespace, payload: bytes) -> Dict[str, float]:
+    store = InMemoryS3(latency=args.latency)
+    client = MinIOClient(client=store)
+    await client.ensure_bucket_exists()
+    await client.upload_stream(_once(payload), "bench/video.mp4")
+    etag = make_etag("bench")
+
+    rng = random.Random(args.seed)
+    attempts = 0
+    transferred = 0
+    for _ in range(args.videos):
+        stats = await _download(
+            client,
+            "bench/video.mp4",
+            len(payload),
+            etag,
+            resume=(mode == "resume"),
+            rng=rng,
+            mean_drop=args.mean_drop_mb * 1024 * 1024,
+            chunk_size=args.chunk_kb * 1024,
+        )
+        attempts += stats["attempts"]
+        transferred += stats["transferred"]
+
+    useful = len(payload) * args.videos
+    return {
+        "videos": args.videos,
+        "attempts": attempts,
+        "useful_mb": round(useful / 1024 / 1024, 2),
+        "transferred_mb": round(transferred / 1024 / 1024, 2),
+        "retransferred_mb": round((transferred - useful) / 1024 / 1024, 2),
+        "overhead_ratio": round(transferred / useful, 3),
+    }
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    results = {}
+    for mode in ("restart", "resume"):
+        results[mode] = await _run(mode, args, payload)
+    await shutdown_storage_engine()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--mean-drop-mb", type=float, default=8, help="Mean bytes between drops (MB)")
+    parser.add_argument("--chunk-kb", type=int, default=256)
+    parser.add_argument("--latency", type=float, default=0.005, help="Per-call latency (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
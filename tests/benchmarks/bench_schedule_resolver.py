@@ -0,0 +1,138 @@
+"""
+AVTech Platform - Schedule resolution
+=====================================
+
+Resolves what N screens (10k by default) play now and next, each with R
+schedule rules (50 by default), and compares:
+
+* ``naive``: the previous approach, evaluating every rule and slot of the
+  screen in Python on each lookup (run on a sample of screens: it is slow)
+* ``compile``: ``compile_schedule`` of each screen's slots
+* ``lookup``: ``playing`` + ``next`` on the compiled schedules, at several
+  moments of the week, as successive player syncs would
+
+Rules mix weekly and daily slots, priorities and activation windows, like
+the seasonal campaigns customers import. No database is involved.
+
+Usage:
+    python -m tests.benchmarks.bench_schedule_resolver --screens 10000 --rules 50
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.backend.schedule.resolver import SlotRow, compile_schedule, week_start
+from src.backend.schedule.week import MINUTES_PER_DAY, minute_of_week, to_week_ranges, format_hhmm
+from tests.benchmarks.harness import Scenario, build_report, emit
+
+
+def _screen_slots(rng: random.Random, rules: int, now: datetime) -> List[SlotRow]:
+    videos = [uuid.uuid4() for _ in range(20)]
+    slots = []
+    for _ in range(rules):
+        rule_id = uuid.uuid4()
+        active_from = now - timedelta(days=rng.randrange(0, 120))
+        active_until = None if rng.random() < 0.5 else now + timedelta(days=rng.randrange(-30, 90))
+        priority = rng.choice((0, 0, 0, 1, 2))
+        created_at = active_from - timedelta(days=1)
+        day_of_week = rng.randrange(7) if rng.random() < 0.7 else None  # None: every day
+        for _ in range(rng.randint(1, 3)):
+            start = rng.randrange(0, MINUTES_PER_DAY // 15) * 15
+            end = (start + rng.choice((15, 30, 60, 120, 240))) % MINUTES_PER_DAY
+            for start_minute, end_minute in to_week_ranges(day_of_week, format_hhmm(start), format_hhmm(end)):
+                slots.append(SlotRow(
+                    start_minute, end_minute, rng.choice(videos), rule_id,
+                    priority, active_from, active_until, created_at,
+                ))
+    # In start order, as TimeSlotRepository.get_screen_schedule returns them
+    slots.sort(key=lambda s: s.start_minute)
+    return slots
+
+
+def _naive_playing(slots: List[SlotRow], at: datetime) -> Optional[Tuple[Any, Tuple[Any, ...]]]:
+    # Previous approach: scan every slot and rule of the screen
+    minute = minute_of_week(at)
+    covering = [
+        s for s in slots
+        if s.start_minute <= minute < s.end_minute
+        and s.active_from <= at and (s.active_until is None or at < s.active_until)
+    ]
+    if not covering:
+        return None
+    best = max(covering, key=lambda s: (s.priority, s.created_at, str(s.rule_id)))
+    return best.rule_id, tuple(dict.fromkeys(s.video_id for s in covering if s.rule_id == best.rule_id))
+
+
+def _naive_next(slots: List[SlotRow], at: datetime) -> Optional[datetime]:
+    # ...and for "next", re-evaluate at every later slot or rule boundary
+    current = _naive_playing(slots, at)
+    monday = week_start(at)
+    edges = {monday + timedelta(weeks=k, minutes=m) for k in (0, 1) for s in slots for m in (s.start_minute, s.end_minute)}
+    edges |= {edge for s in slots for edge in (s.active_from, s.active_until) if edge is not None}
+    for edge in sorted(e for e in edges if at < e < at + timedelta(weeks=1)):
+        playing = _naive_playing(slots, edge)
+        if playing != current:
+            if playing is not None:
+                return edge
+            current = None
+    return None
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(3)
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    moments = [now + timedelta(minutes=rng.randrange(7 * MINUTES_PER_DAY)) for _ in range(args.lookups)]
+    screens = [_screen_slots(rng, args.rules, now) for _ in range(args.screens)]
+    slot_count = sum(len(slots) for slots in screens)
+
+    naive = Scenario("naive", {"screens": args.naive_screens, "lookups": args.lookups})
+    with naive.run():
+        for slots in screens[:args.naive_screens]:
+            with naive.timed():
+                for at in moments:
+                    _naive_playing(slots, at)
+                    _naive_next(slots, at)
+
+    compiled = []
+    compile_ = Scenario("compile", {"screens": args.screens, "rules": args.rules, "slots": slot_count})
+    with compile_.run():
+        for slots in screens:
+            with compile_.timed():
+                compiled.append(compile_schedule(slots))
+
+    lookup = Scenario("lookup", {"screens": args.screens, "lookups": args.lookups})
+    with lookup.run():
+        for schedule in compiled:
+            with lookup.timed():
+                for at in moments:
+                    schedule.playing(at)
+                    schedule.next(at)
+
+    # Same answers as the naive evaluation on the sample
+    for slots, schedule in zip(screens[:args.naive_screens], compiled):
+        for at in moments:
+            playing = schedule.playing(at)
+            assert ((playing.rule_id, playing.video_ids) if playing else None) == _naive_playing(slots, at)
+            upcoming = schedule.next(at)
+            assert (upcoming.starts_at if upcoming else None) == _naive_next(slots, at)
+
+    return build_report(
+        "schedule_resolver",
+        [naive, compile_, lookup],
+        {"screens": args.screens, "rules": args.rules, "lookups": args.lookups, "slots": slot_count},
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--screens", type=int, default=10000)
+    parser.add_argument("--rules", type=int, default=50, help="Rules per screen")
+    parser.add_argument("--lookups", type=int, default=10, help="Moments resolved per screen")
+    parser.add_argument("--naive-screens", type=int, default=200, help="Screens run through the naive evaluation")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    args = parser.parse_args()
+    emit(run(args), args.output, args.baseline)
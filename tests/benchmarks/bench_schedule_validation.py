@@ -0,0 +1,151 @@
+"""
+AVTech Platform - Schedule validation of imported campaigns
+===========================================================
+
+Validates a batch of R new rules (200 by default) spread over S screens
+(300 by default), on top of the rules already stored there, and compares:
+
+* ``pairwise``: the obvious approach, checking every new slot against every
+  other slot of the same screen (run on a sample of screens: it is O(n^2))
+* ``sweep``: ``validate_schedule`` on the whole batch, one sort and sweep
+  per screen
+
+Rules mix daily and weekly slots, priorities and activation windows, like
+the seasonal campaigns customers import. No database is involved.
+
+Usage:
+    python -m tests.benchmarks.bench_schedule_validation --rules 200 --screens 300
+"""
+
+import argparse
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Set, Tuple
+
+from src.backend.schedule.schemas import ScheduleRuleCreate, TimeSlot
+from src.backend.schedule.validation import validate_schedule
+from src.backend.schedule.week import MINUTES_PER_DAY, format_hhmm, to_week_ranges
+from src.backend.schedule.resolver import SlotRow
+from tests.benchmarks.harness import Scenario, build_report, emit
+
+
+def _slots(rng: random.Random, count: int) -> List[TimeSlot]:
+    slots = []
+    for _ in range(count):
+        start = rng.randrange(0, MINUTES_PER_DAY // 15) * 15
+        end = (start + rng.choice((15, 30, 60, 120))) % MINUTES_PER_DAY
+        slots.append(TimeSlot(
+            day_of_week=rng.randrange(7) if rng.random() < 0.7 else None,
+            start_time=format_hhmm(start), end_time=format_hhmm(end), video_id=uuid.uuid4(),
+        ))
+    return slots
+
+
+def _campaign(rng: random.Random, args: argparse.Namespace, now: datetime) -> Tuple[List[ScheduleRuleCreate], List[Any]]:
+    screens = [uuid.uuid4() for _ in range(args.screens)]
+    client_id = uuid.uuid4()
+    rules = []
+    for i in range(args.rules):
+        # Campaigns over the next year, a few weeks each
+        active_from = now + timedelta(days=rng.randrange(0, 365))
+        rules.append(ScheduleRuleCreate(
+            name=f"campaign {i}", rule_type="weekly", priority=rng.choice((1, 2, 3, 4, 5)),
+            active_from=active_from, active_until=active_from + timedelta(days=rng.randrange(7, 45)),
+            time_slots=_slots(rng, args.slots), client_id=client_id,
+            screen_ids=rng.sample(screens, args.screens_per_rule),
+        ))
+    # Stored rules: an always-on default loop per screen plus some others
+    existing = []
+    for screen_id in screens:
+        for priority in (0, 0, 1, 2):
+            rule_id = uuid.uuid4()
+            created_at = now - timedelta(days=rng.randrange(1, 365))
+            for slot in _slots(rng, 3):
+                for start, end in to_week_ranges(slot.day_of_week, slot.start_time, slot.end_time):
+                    row = SlotRow(start, end, slot.video_id, rule_id, priority, created_at, None, created_at)
+                    existing.append(_Stored(screen_id, row))
+    return rules, existing
+
+
+class _Stored:
+    """A get_screens_schedule row: a SlotRow plus its screen."""
+
+    __slots__ = ("screen_id", "start_minute", "end_minute", "rule_id", "priority", "active_from", "active_until", "created_at")
+
+    def __init__(self, screen_id: Any, row: SlotRow):
+        self.screen_id = screen_id
+        for name in self.__slots__[1:]:
+            setattr(self, name, getattr(row, name))
+
+
+def _pairwise(rules: List[ScheduleRuleCreate], existing: List[Any], screens: Set[Any]) -> Dict[Any, Set[Tuple[Any, Any]]]:
+    # Previous approach: every new slot against every other slot of the screen
+    windows = {}
+    by_screen = defaultdict(list)
+    for index, rule in enumerate(rules):
+        windows[index] = (rule.priority, rule.active_from, rule.active_until)
+        ranges = [r for slot in rule.time_slots for r in to_week_ranges(slot.day_of_week, slot.start_time, slot.end_time)]
+        for screen_id in rule.screen_ids:
+            if screen_id in screens:
+                by_screen[screen_id] += [(start, end, index, True) for start, end in ranges]
+    for row in existing:
+        if row.screen_id in by_screen:
+            windows[row.rule_id] = (row.priority, row.active_from, row.active_until)
+            by_screen[row.screen_id].append((row.start_minute, row.end_minute, row.rule_id, False))
+
+    found = defaultdict(set)
+    for screen_id, slots in by_screen.items():
+        for i, (start, end, rule, new) in enumerate(slots):
+            if not new:
+                continue
+            for j, (other_start, other_end, other, other_new) in enumerate(slots):
+                if other == rule or (other_new and j < i) or not (start < other_end and other_start < end):
+                    continue
+                _, from_a, until_a = windows[rule]
+                _, from_b, until_b = windows[other]
+                if (until_b is None or from_a < until_b) and (until_a is None or from_b < until_a):
+                    found[screen_id].add((rule, other))
+    return found
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(11)
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    rules, existing = _campaign(rng, args, now)
+    new_slots = sum(len(to_week_ranges(s.day_of_week, s.start_time, s.end_time)) * len(r.screen_ids) for r in rules for s in r.time_slots)
+    sample = {screen_id for rule in rules for screen_id in rule.screen_ids}
+    sample = set(sorted(sample, key=str)[:args.pairwise_screens])
+    params = {"rules": args.rules, "screens": args.screens, "new_slots": new_slots, "stored_slots": len(existing)}
+
+    pairwise = Scenario("pairwise", {"screens": len(sample)})
+    with pairwise.run():
+        with pairwise.timed():
+            _pairwise(rules, existing, sample)
+
+    sweep = Scenario("sweep", params)
+    with sweep.run():
+        for _ in range(args.repeat):
+            with sweep.timed():
+                report = validate_schedule(rules, existing, now)
+
+    report_data = build_report("schedule_validation", [pairwise, sweep], params)
+    report_data["findings"] = {
+        kind: sum(1 for c in report.conflicts if c.kind == kind) for kind in ("priority_conflict", "overlap", "gap")
+    }
+    return report_data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, default=200, help="Rules in the imported batch")
+    parser.add_argument("--screens", type=int, default=300)
+    parser.add_argument("--screens-per-rule", type=int, default=50)
+    parser.add_argument("--slots", type=int, default=10, help="Slots per rule")
+    parser.add_argument("--repeat", type=int, default=3, help="Validation runs of the whole batch")
+    parser.add_argument("--pairwise-screens", type=int, default=10, help="Screens run through the pairwise check")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    args = parser.parse_args()
+    emit(run(args), args.output, args.baseline)
@@ -0,0 +1,115 @@
+"""
+AVTech Platform - Response serialization of large listings
+==========================================================
+
+Serves a page of N screens (10k by default) from in-memory ORM objects
+through FastAPI and measures request latency for four paths:
+
+* ``legacy``: field-by-field copy into the schema, returned through
+  response_model (FastAPI re-validates it) and the stdlib JSONResponse
+* ``orjson``: ``from_attributes`` validation of the whole list, returned
+  through response_model with ORJSONResponse
+* ``direct``: ``from_attributes`` validation, serialized straight to bytes
+  with ``json_response`` (no second validation, no jsonable pass)
+* ``rows``: ORM rows written straight to bytes with ``dump_rows_json``, no
+  models at all (what the screen and video listings use)
+
+No database is involved: only conversion and encoding are measured.
+
+Usage:
+    python -m tests.benchmarks.bench_serialization --screens 10000 --requests 30
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from src.backend.api.serialization import DefaultResponse, dump_rows_json, json_response
+from src.backend.database.models import Screen
+from src.backend.screens.schemas import ScreenPage, ScreenResponse
+from tests.benchmarks.harness import Scenario, build_report, emit
+
+
+def _screens(count: int) -> List[Screen]:
+    now = datetime.utcnow()
+    client_id = uuid.uuid4()
+    return [
+        Screen(
+            screen_id=uuid.uuid4(), name=f"screen {i}", location=f"site {i % 50}",
+            screen_code=f"SCR-{i:06d}", client_id=client_id, status="online",
+            last_heartbeat=now - timedelta(seconds=i % 30),
+            created_at=now - timedelta(minutes=i), updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def _app(screens: List[Screen]) -> FastAPI:
+    app = FastAPI(default_response_class=DefaultResponse)
+
+    @app.get("/legacy", response_model=ScreenPage, response_class=JSONResponse)
+    async def legacy() -> ScreenPage:
+        # Previous service code: one keyword argument per field
+        items = [
+            ScreenResponse(
+                screen_id=s.screen_id, name=s.name, location=s.location,
+                screen_code=s.screen_code, client_id=s.client_id, status=s.status,
+                last_heartbeat=s.last_heartbeat, created_at=s.created_at, updated_at=s.updated_at,
+            )
+            for s in screens
+        ]
+        return ScreenPage(items=items, next_cursor=None)
+
+    @app.get("/orjson", response_model=ScreenPage)
+    async def orjson_path() -> ScreenPage:
+        return ScreenPage(items=ScreenResponse.from_orm_list(screens), next_cursor=None)
+
+    @app.get("/direct", response_model=ScreenPage)
+    async def direct():
+        return json_response(ScreenPage(items=ScreenResponse.from_orm_list(screens), next_cursor=None))
+
+    @app.get("/rows", response_model=ScreenPage)
+    async def rows():
+        return json_response(dump_rows_json(ScreenResponse, screens, next_cursor=None))
+
+    return app
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    screens = _screens(args.screens)
+    app = _app(screens)
+    scenarios = []
+    sizes = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for path in ("legacy", "orjson", "direct", "rows"):
+            for _ in range(args.warmup):
+                response = await client.get(f"/{path}")
+                response.raise_for_status()
+            sizes[path] = len(response.content)
+            scenario = Scenario(path, {"screens": args.screens})
+            with scenario.run():
+                for _ in range(args.requests):
+                    with scenario.timed(sizes[path]):
+                        (await client.get(f"/{path}")).raise_for_status()
+            scenarios.append(scenario)
+
+    report = build_report("serialization", scenarios, {"screens": args.screens, "requests": args.requests})
+    report["body_bytes"] = sizes
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--screens", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    args = parser.parse_args()
+    emit(asyncio.run(run(args)), args.output, args.baseline)
@@ -0,0 +1,195 @@
+"""
+AVTech Platform - Storage throughput benchmarks
+===============================================
+
+Drives ``StorageService`` and its backend against an in-process S3 stand-in
+(or the local filesystem driver) and reports throughput, p50/p99 latency and
+peak RSS per scenario:
+
+* ``hash_*``        SHA-256 cost per clip size
+* ``upload_*``      StorageService.upload_video for 1-20 s clips
+* ``concurrent_*``  concurrent streaming uploaders
+* ``download_*``    StorageService.download_file for the same clips
+* ``list_*``        full streaming listing and cursor pages of a large prefix
+* ``presign_*``     cold and cached presign bursts
+
+Save a run with ``--output`` and pass it back as ``--baseline`` on another
+commit to get per-metric deltas.
+
+Usage:
+    python -m tests.benchmarks.bench_storage --output before.json
+    python -m tests.benchmarks.bench_storage --baseline before.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Dict, List
+
+from src.backend.storage.backend import StorageBackend
+from src.backend.storage.local_backend import LocalFilesystemBackend
+from src.backend.storage.minio_client import MinIOClient, shutdown_storage_engine
+from src.backend.storage.storage_service import StorageService
+from tests.benchmarks.fake_s3 import InMemoryS3
+from tests.benchmarks.harness import Scenario, build_report, emit
+
+CLIP_SECONDS = (1, 5, 10, 20)
+
+
+def _make_backend(args: argparse.Namespace, workdir: str) -> StorageBackend:
+    if args.backend == "local":
+        return LocalFilesystemBackend(root=os.path.join(workdir, "store"), public_url="http://bench/files", url_secret="bench")
+    bandwidth = args.bandwidth_mb * 1024 * 1024 if args.bandwidth_mb else None
+    return MinIOClient(client=InMemoryS3(latency=args.latency, bandwidth=bandwidth))
+
+
+def _seed(backend: StorageBackend, prefix: str, count: int) -> None:
+    """Create count empty objects under prefix without going through uploads."""
+    names = [f"{prefix}{i:08d}.mp4" for i in range(count)]
+    if isinstance(backend, LocalFilesystemBackend):
+        directory = os.path.join(backend.objects_dir, prefix)
+        os.makedirs(directory, exist_ok=True)
+        for name in names:
+            open(os.path.join(backend.objects_dir, name), "wb").close()
+    else:
+        backend.client.seed(backend.bucket_name, names)
+
+
+async def _chunks(payload: bytes, chunk_size: int = 64 * 1024):
+    view = memoryview(payload)
+    for i in range(0, len(view), chunk_size):
+        yield bytes(view[i:i + chunk_size])
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="avtech-bench-")
+    storage = StorageService(backend=_make_backend(args, workdir))
+    await storage.backend.ensure_bucket_exists()
+    client_id = str(uuid.uuid4())
+    bytes_per_second = int(args.bitrate_mbps * 1_000_000 / 8)
+    scenarios: List[Scenario] = []
+
+    try:
+        clips: Dict[int, str] = {}
+        for seconds in CLIP_SECONDS:
+            path = os.path.join(workdir, f"clip-{seconds}s.mp4")
+            with open(path, "wb") as f:
+                f.write(os.urandom(seconds * bytes_per_second))
+            clips[seconds] = path
+
+        # Hashing cost per clip size
+        for seconds, path in clips.items():
+            with open(path, "rb") as f:
+                payload = f.read()
+            scenario = Scenario(f"hash_{seconds}s", {"size_mb": round(len(payload) / 1024 / 1024, 2)})
+            with scenario.run():
+                for _ in range(args.repeats):
+                    with scenario.timed(len(payload)):
+                        hashlib.sha256(payload).hexdigest()
+            scenarios.append(scenario)
+
+        # Sequential uploads, then downloads, per clip size
+        uploaded: Dict[int, str] = {}
+        for seconds, path in clips.items():
+            size = os.path.getsize(path)
+            scenario = Scenario(f"upload_{seconds}s", {"size_mb": round(size / 1024 / 1024, 2)})
+            with scenario.run():
+                for _ in range(args.repeats):
+                    with scenario.timed(size):
+                        result = await storage.upload_video(path, client_id, f"bench {seconds}s")
+            uploaded[seconds] = result["object_name"]
+            scenarios.append(scenario)
+
+        for seconds, object_name in uploaded.items():
+            size = os.path.getsize(clips[seconds])
+            target = os.path.join(workdir, "download", f"{seconds}s.mp4")
+            scenario = Scenario(f"download_{seconds}s", {"size_mb": round(size / 1024 / 1024, 2)})
+            with scenario.run():
+                for _ in range(args.repeats):
+                    with scenario.timed(size):
+                        await storage.download_file(object_name, target)
+            scenarios.append(scenario)
+
+        # Concurrent streaming uploaders (10 s clips)
+        with open(clips[10], "rb") as f:
+            payload = f.read()
+        for concurrency in args.concurrency:
+            scenario = Scenario(f"concurrent_{concurrency}", {"uploaders": concurrency, "clip_s": 10})
+
+            async def _upload_one() -> None:
+                with scenario.timed(len(payload)):
+                    await storage.upload_video_stream(_chunks(payload), client_id, "bench concurrent")
+
+            with scenario.run():
+                for _ in range(args.repeats):
+                    await asyncio.gather(*(_upload_one() for _ in range(concurrency)))
+            scenarios.append(scenario)
+
+        # Large listings: one streaming pass and cursor pages
+        list_client = str(uuid.uuid4())
+        _seed(storage.backend, storage.client_prefix(list_client, "videos"), args.objects)
+
+        scenario = Scenario("list_stream", {"objects": args.objects})
+        with scenario.run():
+            with scenario.timed():
+                count = 0
+                async for _ in storage.iter_client_files(list_client, "videos"):
+                    count += 1
+        assert count == args.objects, count
+        scenarios.append(scenario)
+
+        scenario = Scenario("list_pages", {"objects": args.objects, "page_size": args.page_size})
+        with scenario.run():
+            start_after = None
+            while True:
+                with scenario.timed():
+                    files, start_after = await storage.list_client_files_page(
+                        list_client, "videos", limit=args.page_size, start_after=start_after
+                    )
+                if start_after is None:
+                    break
+        scenarios.append(scenario)
+
+        # Presign bursts: a playlist-sized batch, cold and then cached
+        names = [f"{storage.client_prefix(list_client, 'videos')}{i:08d}.mp4" for i in range(args.presign)]
+        for phase in ("cold", "warm"):
+            scenario = Scenario(f"presign_batch_{phase}", {"urls": args.presign})
+            with scenario.run():
+                with scenario.timed():
+                    await storage.get_presigned_urls(names)
+            scenarios.append(scenario)
+
+        scenario = Scenario("presign_single", {"urls": args.presign})
+        with scenario.run():
+            for name in names:
+                with scenario.timed():
+                    await storage.get_presigned_url(name)
+        scenarios.append(scenario)
+
+    finally:
+        await shutdown_storage_engine()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "baseline")}
+    return build_report("storage", scenarios, config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("minio", "local"), default="minio")
+    parser.add_argument("--bitrate-mbps", type=float, default=8, help="Clip bitrate (Mbit/s)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--objects", type=int, default=20000, help="Objects in the listing prefix")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--presign", type=int, default=1000, help="URLs per presign burst")
+    parser.add_argument("--latency", type=float, default=0.002, help="Per-call latency of the S3 stand-in (s)")
+    parser.add_argument("--bandwidth-mb", type=float, default=0, help="Simulated MB/s, 0 for unlimited")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+    emit(asyncio.run(run(args)), output=args.output, baseline=args.baseline)
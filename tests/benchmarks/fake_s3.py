@@ -0,0 +1,247 @@
+"""
+AVTech Platform - In-process S3 stand-in
+========================================
+
+Minimal in-memory replacement for the ``minio.Minio`` SDK surface used by
+``MinIOClient``. Calls block the calling thread for a configurable latency
+(plus transfer time when a bandwidth is set), which mimics the synchronous
+SDK hitting a real object store without needing one.
+"""
+
+import hashlib
+import io
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional
+
+
+class FakeS3Error(Exception):
+    """Raised where the real SDK would raise ``S3Error``."""
+
+
+@dataclass
+class _StoredObject:
+    data: bytes
+    content_type: str
+    metadata: Dict[str, str]
+    etag: str
+    last_modified: datetime = field(default_factory=datetime.utcnow)
+
+
+class InMemoryS3:
+    """Thread-safe in-memory object store with a ``Minio``-compatible API."""
+
+    def __init__(self, latency: float = 0.0, bandwidth: Optional[float] = None):
+        """
+        Args:
+            latency: Seconds added to every call (round trip)
+            bandwidth: Bytes per second for payload transfer, None for unlimited
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.buckets: Dict[str, Dict[str, _StoredObject]] = {}
+        self.calls: Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.uploads: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _call(self, name: str, nbytes: int = 0) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        delay = self.latency
+        if self.bandwidth and nbytes:
+            delay += nbytes / self.bandwidth
+        if delay:
+            time.sleep(delay)
+
+    def _bucket(self, bucket_name: str) -> Dict[str, _StoredObject]:
+        try:
+            return self.buckets[bucket_name]
+        except KeyError:
+            raise FakeS3Error(f"NoSuchBucket: {bucket_name}")
+
+    def _object(self, bucket_name: str, object_name: str) -> _StoredObject:
+        try:
+            return self._bucket(bucket_name)[object_name]
+        except KeyError:
+            raise FakeS3Error(f"NoSuchKey: {object_name}")
+
+    def _store(self, bucket_name, object_name, data, content_type, metadata):
+        obj = _StoredObject(
+            data=data,
+            content_type=content_type,
+            metadata={f"x-amz-meta-{k}": v for k, v in (metadata or {}).items()},
+            etag=hashlib.md5(data).hexdigest(),
+        )
+        with self._lock:
+            self._bucket(bucket_name)[object_name] = obj
+            self.bytes_in += len(data)
+        return SimpleNamespace(
+            bucket_name=bucket_name, object_name=object_name, etag=obj.etag, version_id=None
+        )
+
+    # --- Buckets ---
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        self._call("bucket_exists")
+        return bucket_name in self.buckets
+
+    def make_bucket(self, bucket_name: str) -> None:
+        self._call("make_bucket")
+        self.buckets.setdefault(bucket_name, {})
+
+    def list_buckets(self):
+        self._call("list_buckets")
+        return [SimpleNamespace(name=name) for name in self.buckets]
+
+    def seed(self, bucket_name: str, object_names, data: bytes = b"") -> None:
+        """Insert objects directly, without simulated latency (benchmark setup)."""
+        etag = hashlib.md5(data).hexdigest()
+        bucket = self.buckets.setdefault(bucket_name, {})
+        with self._lock:
+            for name in object_names:
+                bucket[name] = _StoredObject(data, "application/octet-stream", {}, etag)
+
+    # --- Objects ---
+
+    def fput_object(self, bucket_name, object_name, file_path,
+                    content_type="application/octet-stream", metadata=None, **kwargs):
+        with open(file_path, "rb") as f:
+            data = f.read()
+        self._call("fput_object", len(data))
+        return self._store(bucket_name, object_name, data, content_type, metadata)
+
+    def put_object(self, bucket_name, object_name, data, length,
+                   content_type="application/octet-stream", metadata=None, **kwargs):
+        payload = data.read(length) if length >= 0 else data.read()
+        self._call("put_object", len(payload))
+        return self._store(bucket_name, object_name, payload, content_type, metadata)
+
+    # --- Multipart (private SDK methods used by MinIOClient.upload_stream) ---
+
+    def _create_multipart_upload(self, bucket_name, object_name, headers):
+        self._call("create_multipart_upload")
+        self._bucket(bucket_name)
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {"object_name": object_name, "headers": headers, "parts": {}}
+        return upload_id
+
+    def _upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+        self._call("upload_part", len(data))
+        with self._lock:
+            self.uploads[upload_id]["parts"][part_number] = bytes(data)
+            self.bytes_in += len(data)
+        return hashlib.md5(data).hexdigest()
+
+    def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        self._call("complete_multipart_upload")
+        with self._lock:
+            upload = self.uploads.pop(upload_id)
+        data = b"".join(upload["parts"][p.part_number] for p in parts)
+        headers = dict(upload["headers"])
+        content_type = headers.pop("Content-Type", "application/octet-stream")
+        metadata = {k[len("x-amz-meta-"):]: v for k, v in headers.items()}
+        with self._lock:
+            self.bytes_in -= len(data)  # already counted per part
+        return self._store(bucket_name, object_name, data, content_type, metadata)
+
+    def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        self._call("abort_multipart_upload")
+        with self._lock:
+            self.uploads.pop(upload_id, None)
+
+    def fget_object(self, bucket_name, object_name, file_path, **kwargs):
+        obj = self._object(bucket_name, object_name)
+        self._call("fget_object", len(obj.data))
+        with open(file_path, "wb") as f:
+            f.write(obj.data)
+        with self._lock:
+            self.bytes_out += len(obj.data)
+        return self.stat_object(bucket_name, object_name)
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0, **kwargs):
+        obj = self._object(bucket_name, object_name)
+        end = offset + length if length else len(obj.data)
+        payload = obj.data[offset:end]
+        self._call("get_object")
+        return _FakeResponse(self, payload)
+
+    def stat_object(self, bucket_name, object_name, **kwargs):
+        obj = self._object(bucket_name, object_name)
+        self._call("stat_object")
+        return SimpleNamespace(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            size=len(obj.data),
+            etag=obj.etag,
+            content_type=obj.content_type,
+            last_modified=obj.last_modified,
+            metadata=dict(obj.metadata),
+        )
+
+    def remove_object(self, bucket_name, object_name, **kwargs):
+        self._call("remove_object")
+        with self._lock:
+            self._bucket(bucket_name).pop(object_name, None)
+
+    def list_objects(self, bucket_name, prefix=None, recursive=False,
+                     start_after=None, **kwargs) -> Iterator[SimpleNamespace]:
+        self._call("list_objects")
+        with self._lock:
+            names = sorted(self._bucket(bucket_name))
+        for name in names:
+            if prefix and not name.startswith(prefix):
+                continue
+            if start_after and name <= start_after:
+                continue
+            obj = self.buckets[bucket_name].get(name)
+            if obj is None:
+                continue
+            yield SimpleNamespace(
+                object_name=name,
+                size=len(obj.data),
+                etag=obj.etag,
+                last_modified=obj.last_modified,
+            )
+
+    def presigned_get_object(self, bucket_name, object_name, expires=timedelta(days=7), **kwargs):
+        # Signing is CPU-only in the real SDK; emulate its HMAC cost
+        self._call("presigned_get_object")
+        seconds = int(expires.total_seconds()) if isinstance(expires, timedelta) else int(expires)
+        signature = hashlib.sha256(f"{bucket_name}/{object_name}/{seconds}/{time.time()}".encode())
+        return (
+            f"http://fake-s3/{bucket_name}/{object_name}"
+            f"?X-Amz-Expires={seconds}&X-Amz-Signature={signature.hexdigest()}"
+        )
+
+
+class _FakeResponse:
+    """Subset of ``urllib3.HTTPResponse`` returned by ``get_object``."""
+
+    def __init__(self, store: InMemoryS3, payload: bytes):
+        self._store = store
+        self._body = io.BytesIO(payload)
+
+    def stream(self, amt: int = 65536) -> Iterator[bytes]:
+        while chunk := self.read(amt):
+            yield chunk
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        chunk = self._body.read(amt)
+        if chunk:
+            self._store._call("get_object.read", len(chunk))
+            with self._store._lock:
+                self._store.bytes_out += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self._body.close()
+
+    def release_conn(self) -> None:
+        pass
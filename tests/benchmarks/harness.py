@@ -0,0 +1,176 @@
+"""
+AVTech Platform - Benchmark harness
+===================================
+
+Shared measurement helpers for the benchmark scripts: latency percentiles,
+throughput, peak RSS sampling and JSON reports that can be diffed between
+commits.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No procfs (macOS): fall back to the lifetime peak
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RSSSampler:
+    """Samples RSS on a background thread to find the peak of one scenario."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __enter__(self) -> "RSSSampler":
+        self.baseline = self.peak = _current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+
+class Scenario:
+    """Latency samples and byte counts of one benchmark scenario."""
+
+    def __init__(self, name: str, params: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.params = params or {}
+        self.samples_ms: List[float] = []
+        self.operations = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.rss: Optional[RSSSampler] = None
+
+    @contextmanager
+    def timed(self, nbytes: int = 0) -> Iterator[None]:
+        """Time one operation moving nbytes."""
+        start = time.perf_counter()
+        yield
+        self.samples_ms.append((time.perf_counter() - start) * 1000)
+        self.operations += 1
+        self.bytes += nbytes
+
+    @contextmanager
+    def run(self) -> Iterator["Scenario"]:
+        """Measure wall time and peak RSS around the whole scenario."""
+        with RSSSampler() as rss:
+            start = time.perf_counter()
+            yield self
+            self.elapsed = time.perf_counter() - start
+        self.rss = rss
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        return {
+            "params": self.params,
+            "operations": self.operations,
+            "elapsed_s": round(self.elapsed, 4),
+            "ops_per_s": round(self.operations / elapsed, 2),
+            "mb_per_s": round(self.bytes / 1024 / 1024 / elapsed, 2),
+            "p50_ms": round(percentile(self.samples_ms, 50), 3),
+            "p99_ms": round(percentile(self.samples_ms, 99), 3),
+            "max_ms": round(max(self.samples_ms, default=0.0), 3),
+            "peak_rss_mb": round(self.rss.peak / 1024 / 1024, 1) if self.rss else None,
+            "rss_growth_mb": round((self.rss.peak - self.rss.baseline) / 1024 / 1024, 1) if self.rss else None,
+        }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(suite: str, scenarios: List[Scenario], config: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON report for a suite run, tagged with the commit it ran on."""
+    return {
+        "suite": suite,
+        "commit": _git_revision(),
+        "python": sys.version.split()[0],
+        "config": config,
+        "results": {s.name: s.report() for s in scenarios},
+    }
+
+
+# Metrics where lower values are better; everything else is higher-is-better
+_LOWER_IS_BETTER = ("_ms", "_mb", "elapsed_s")
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    Relative change of every numeric metric against a baseline report.
+
+    Returns:
+        {scenario: {metric: "+12.3% (better|worse)"}}
+    """
+    diff: Dict[str, Dict[str, str]] = {}
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        for metric, value in result.items():
+            old = before.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old * 100
+            lower_better = metric.endswith(_LOWER_IS_BETTER)
+            verdict = "better" if (change < 0) == lower_better else "worse"
+            if abs(change) < 1:
+                verdict = "same"
+            diff.setdefault(name, {})[metric] = f"{change:+.1f}% ({verdict})"
+    return diff
+
+
+def emit(report: Dict[str, Any], output: Optional[str] = None, baseline: Optional[str] = None) -> None:
+    """Print (and optionally save) a report, with a diff against a baseline file."""
+    if baseline:
+        with open(baseline) as f:
+            previous = json.load(f)
+        report["comparison"] = {
+            "baseline_commit": previous.get("commit"),
+            "changes": compare(previous, report),
+        }
+    text = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    print(text)
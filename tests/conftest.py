@@ -0,0 +1,19 @@
+"""
+AVTech Platform - Test configuration
+====================================
+
+Markers used by the suite, registered here because the tests run from the
+repository root, where src/backend/pyproject.toml is not the pytest
+configuration.
+"""
+
+MARKERS = (
+    "integration: marks tests as integration tests",
+    "e2e: marks tests as end-to-end tests",
+    "slow: marks tests as slow",
+)
+
+
+def pytest_configure(config):
+    for marker in MARKERS:
+        config.addinivalue_line("markers", marker)
@@ -0,0 +1,194 @@
+"""
+AVTech Platform - Bulk publish fan-out tests
+============================================
+
+``AdaptiveLimiter`` driven by hand-made latencies, and ``fan_out`` against
+a fake notifier that fails, stalls or succeeds per player.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from src.backend.publish.bulk import AdaptiveLimiter, fan_out
+
+TARGET = 0.25
+
+
+class FakeNotifier:
+    """Records calls; each player fails its first `failures[code]` attempts."""
+
+    def __init__(self, failures: Optional[Dict[str, int]] = None, delay: float = 0, stall: Tuple[str, ...] = ()):
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.stall = stall
+        self.calls: List[Tuple[str, int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, screen_code: str, version: int) -> None:
+        self.calls.append((screen_code, version))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if screen_code in self.stall:
+                await asyncio.sleep(3600)
+            await asyncio.sleep(self.delay)
+            if self.failures.get(screen_code, 0) > 0:
+                self.failures[screen_code] -= 1
+                raise ConnectionError(f"{screen_code} unreachable")
+        finally:
+            self.in_flight -= 1
+
+
+def _run(versions: Dict[str, int], notify: FakeNotifier, limiter: Optional[AdaptiveLimiter] = None, **kwargs):
+    kwargs = {"retries": 2, "backoff": 0.001, "timeout": 1, **kwargs}
+
+    async def run():
+        return await fan_out(versions, notify, limiter or AdaptiveLimiter(2, 8, TARGET), **kwargs)
+
+    return asyncio.run(run())
+
+
+def _versions(count: int) -> Dict[str, int]:
+    return {f"screen-{i:03d}": i + 1 for i in range(count)}
+
+
+async def _attempt(limiter: AdaptiveLimiter, ok: bool = True, latency: float = 0) -> None:
+    started = await limiter.acquire()
+    await limiter.release(started - latency, ok)
+
+
+def test_limiter_slow_start_then_decrease():
+    async def run():
+        limiter = AdaptiveLimiter(2, 64, TARGET)
+        for _ in range(6):
+            await _attempt(limiter)
+        # Slow start: one more per success
+        assert limiter.limit == 8
+        await _attempt(limiter, latency=TARGET * 2)
+        assert limiter.limit == 4
+        # Additive increase afterwards: about one per round (limit successes)
+        for _ in range(4):
+            await _attempt(limiter)
+        assert 4.9 < limiter.limit < 5
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_limiter_bounds():
+    async def run():
+        limiter = AdaptiveLimiter(2, 4, TARGET)
+        for _ in range(10):
+            await _attempt(limiter)
+        assert limiter.limit == 4
+        for _ in range(10):
+            await _attempt(limiter, ok=False, latency=TARGET * 2)
+        assert limiter.limit == 2
+
+    asyncio.run(run())
+
+
+def test_limiter_fast_errors_are_not_congestion():
+    async def run():
+        limiter = AdaptiveLimiter(2, 64, TARGET)
+        for _ in range(20):
+            await _attempt(limiter, ok=False)
+        assert limiter.limit == 2
+        # Slow errors (timeouts) are
+        for _ in range(4):
+            await _attempt(limiter)
+        await _attempt(limiter, ok=False, latency=TARGET * 2)
+        assert limiter.limit == 3
+
+    asyncio.run(run())
+
+
+def test_limiter_decreases_once_per_round():
+    async def run():
+        limiter = AdaptiveLimiter(2, 64, 0.01)
+        for _ in range(14):
+            await _attempt(limiter)
+        assert limiter.limit == 16
+        # Attempts started before the decrease saw the old limit: one halving
+        started = [await limiter.acquire() for _ in range(4)]
+        await asyncio.sleep(0.02)
+        for start in started:
+            await limiter.release(start, ok=True)
+        assert limiter.limit == 8
+        # A slow attempt started after it halves again
+        start = await limiter.acquire()
+        await asyncio.sleep(0.02)
+        await limiter.release(start, ok=True)
+        assert limiter.limit == 4
+
+    asyncio.run(run())
+
+
+def test_limiter_blocks_at_the_limit():
+    async def run():
+        limiter = AdaptiveLimiter(2, 2, TARGET)
+        first = await limiter.acquire()
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiting.done() and limiter.in_flight == 2
+        await limiter.release(first, ok=True)
+        await asyncio.wait_for(waiting, 1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(run())
+
+
+def test_fan_out_delivers_every_player():
+    versions = _versions(50)
+    notify = FakeNotifier(delay=0.001)
+    limiter = AdaptiveLimiter(2, 8, TARGET)
+    result = _run(versions, notify, limiter)
+    assert result.delivered == {code: 1 for code in versions}
+    assert result.failed == {}
+    assert sorted(notify.calls) == sorted(versions.items())
+    # Never more attempts in flight than the limiter's maximum
+    assert notify.max_in_flight <= 8
+    assert result.limit == 8
+
+
+def test_fan_out_retries_then_gives_up():
+    versions = _versions(4)
+    codes = list(versions)
+    notify = FakeNotifier(failures={codes[0]: 2, codes[1]: 3, codes[2]: 1})
+    result = _run(versions, notify, retries=2)
+    assert result.delivered == {codes[0]: 3, codes[2]: 2, codes[3]: 1}
+    assert result.failed == {codes[1]: (versions[codes[1]], f"{codes[1]} unreachable")}
+    # First attempt and two retries, no more
+    assert notify.calls.count((codes[1], versions[codes[1]])) == 3
+
+
+def test_fan_out_times_out_stalled_players():
+    versions = _versions(6)
+    stalled = list(versions)[0]
+    notify = FakeNotifier(stall=(stalled,))
+    result = _run(versions, notify, retries=1, timeout=0.05)
+    assert set(result.delivered) == set(versions) - {stalled}
+    assert result.failed[stalled][0] == versions[stalled]
+    assert notify.calls.count((stalled, versions[stalled])) == 2
+    # A stalled player never blocks the others
+    assert notify.in_flight == 0
+
+
+def test_fan_out_nothing_to_notify():
+    notify = FakeNotifier()
+    result = _run({}, notify)
+    assert result.delivered == {} and result.failed == {} and notify.calls == []
+
+
+@pytest.mark.parametrize("retries", [0, 3])
+def test_fan_out_exhausts_the_retry_budget(retries):
+    versions = _versions(3)
+    notify = FakeNotifier(failures={code: 10 for code in versions})
+    result = _run(versions, notify, retries=retries)
+    assert result.delivered == {}
+    assert set(result.failed) == set(versions)
+    assert len(notify.calls) == 3 * (retries + 1)
@@ -0,0 +1,256 @@
+"""
+AVTech Platform - Query plan harness
+====================================
+
+Helpers for checking the plans of the repository queries against a real
+Postgres: build the schema from the Alembic migrations in a scratch schema,
+seed it with a realistic amount of data, capture the SQL a repository call
+emits and run ``EXPLAIN`` on it with the same parameters.
+"""
+
+import importlib.util
+import itertools
+import random
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.backend.database.repository import (
+    BlobRepository,
+    ClientRepository,
+    PlayerSyncStatusRepository,
+    ScheduleRuleRepository,
+    ScreenRepository,
+    TimeSlotRepository,
+    VideoRepository,
+)
+
+VERSIONS = Path(__file__).resolve().parents[2] / "src" / "backend" / "alembic" / "versions"
+
+# Vocabulary of the seeded video titles and descriptions: 2744 made-up
+# words, so each search term matches a realistic share of a library
+SYLLABLES = ("ba", "ca", "de", "fi", "go", "lu", "ma", "ne", "po", "ri", "sa", "te", "vo", "zu")
+WORDS = tuple("".join(word) for word in itertools.product(SYLLABLES, repeat=3))
+
+
+def migrate(sync_connection) -> None:
+    """Apply every migration in revision order, like ``alembic upgrade head``."""
+    context = MigrationContext.configure(sync_connection)
+    # A migration-managed transaction, so autocommit_block() (CONCURRENTLY) works
+    with Operations.context(context), context.begin_transaction():
+        for path in sorted(VERSIONS.glob("[0-9]*.py")):
+            spec = importlib.util.spec_from_file_location(path.stem, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade()
+
+
+@dataclass
+class Seeded:
+    """Keys of the seeded rows that the cases query by."""
+    client_ids: List[uuid.UUID]
+    screen_ids: Dict[uuid.UUID, List[uuid.UUID]]
+    screen_codes: List[str]
+    rule_ids: Dict[uuid.UUID, List[uuid.UUID]]
+    # Reference time of the data; cases query relative to it, not to the clock
+    now: datetime
+
+
+async def seed(session: AsyncSession, clients: int, rows: int, slots_per_screen: int = 4) -> Seeded:
+    """
+    Tenants with `rows` videos, screens and rules each (created over the
+    last year), a sync status row per screen, time slots on every screen
+    and a pool of shared blobs.
+    """
+    rng = random.Random(7)
+    now = datetime.utcnow()
+
+    def when() -> datetime:
+        return now - timedelta(seconds=rng.randrange(365 * 86400))
+
+    client_ids = await ClientRepository(session).bulk_insert(
+        [{"name": f"client {i}", "contact_email": f"c{i}@bench", "api_key": f"key-{i}"} for i in range(clients)],
+        returning=True,
+    )
+    seeded = Seeded(client_ids, {}, [], {}, now)
+    videos, screens, rules = [], [], []
+    for client_id in client_ids:
+        for i in range(rows):
+            videos.append({
+                "title": " ".join(rng.sample(WORDS, 3)),
+                "description": " ".join(rng.choices(WORDS, k=8)),
+                "duration_seconds": 10, "file_size_bytes": 1024,
+                "file_path": f"{client_id}/{i}.mp4", "hash_sha256": uuid.uuid4().hex * 2,
+                "status": rng.choice(("uploaded", "ready", "error")),
+                "client_id": client_id, "created_at": when(),
+            })
+            # Online players report every 30 s; a few screens have been off for a while
+            online = rng.random() < 0.99
+            screens.append({
+                "name": f"screen {i}", "screen_code": f"{client_id}-{i}",
+                "location": f"site {i % 20}", "status": "online" if online else "offline",
+                "last_heartbeat": now - timedelta(seconds=rng.uniform(0, 35) if online else rng.uniform(3600, 30 * 86400)),
+                "client_id": client_id, "created_at": when(),
+            })
+            rules.append({
+                "name": f"rule {i}", "rule_type": rng.choice(("daily", "weekly", "date_range")),
+                "active_from": when(), "client_id": client_id, "created_at": when(),
+            })
+
+    video_ids = await VideoRepository(session).bulk_insert(videos, returning=True)
+    screen_ids = await ScreenRepository(session).bulk_insert(screens, returning=True)
+    rule_ids = await ScheduleRuleRepository(session).bulk_insert(rules, returning=True)
+    for index, client_id in enumerate(client_ids):
+        seeded.screen_ids[client_id] = screen_ids[index * rows:(index + 1) * rows]
+        seeded.rule_ids[client_id] = rule_ids[index * rows:(index + 1) * rows]
+    seeded.screen_codes = [s["screen_code"] for s in screens]
+
+    await PlayerSyncStatusRepository(session).bulk_insert([
+        {
+            "screen_code": s["screen_code"], "desired_state_version": 1,
+            "sync_status": rng.choice(("pending", "success", "success", "success", "failed")),
+            "last_heartbeat": s["last_heartbeat"],
+        }
+        for s in screens
+    ])
+
+    slots = []
+    for index, screen_id in enumerate(screen_ids):
+        client_index = index // rows
+        for _ in range(slots_per_screen):
+            start = rng.randrange(0, 7 * 1440 - 60)
+            slots.append({
+                "start_minute": start, "end_minute": start + rng.choice((15, 30, 60)),
+                "video_id": video_ids[client_index * rows + rng.randrange(rows)],
+                "screen_id": screen_id,
+                "schedule_rule_id": rule_ids[client_index * rows + rng.randrange(rows)],
+            })
+    await TimeSlotRepository(session).bulk_insert(slots)
+
+    await BlobRepository(session).bulk_insert([
+        {
+            "hash_sha256": uuid.uuid4().hex * 2, "object_name": f"blobs/{i}",
+            "size_bytes": 1024, "ref_count": 0 if rng.random() < 0.02 else 1,
+            "updated_at": when(),
+        }
+        for i in range(clients * rows // 4)
+    ])
+    return seeded
+
+
+async def seed_library(session: AsyncSession, rows: int) -> uuid.UUID:
+    """One more tenant with a large content library of `rows` videos, for search."""
+    rng = random.Random(11)
+    now = datetime.utcnow()
+    [client_id] = await ClientRepository(session).bulk_insert(
+        [{"name": "library", "contact_email": "library@bench", "api_key": "key-library"}],
+        returning=True,
+    )
+    await VideoRepository(session).bulk_insert([
+        {
+            "title": " ".join(rng.sample(WORDS, 3)),
+            "description": " ".join(rng.choices(WORDS, k=8)),
+            "duration_seconds": 10, "file_size_bytes": 1024,
+            "file_path": f"{client_id}/{i}.mp4", "hash_sha256": uuid.uuid4().hex * 2,
+            "status": rng.choice(("uploaded", "ready", "error")),
+            "client_id": client_id, "created_at": now - timedelta(seconds=rng.randrange(365 * 86400)),
+        }
+        for i in range(rows)
+    ])
+    return client_id
+
+
+@asynccontextmanager
+async def capture(connection: AsyncConnection) -> AsyncIterator[List[Tuple[str, Any]]]:
+    """Collect (statement, parameters) of everything run on a connection."""
+    statements: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    sync_connection = connection.sync_connection
+    event.listen(sync_connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_connection, "before_cursor_execute", before_cursor_execute)
+
+
+def nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Every node of a JSON plan, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from nodes(child)
+
+
+@dataclass
+class Case:
+    """One repository call and what its plans must look like."""
+    name: str
+    call: Callable[[AsyncSession], Awaitable[Any]]
+    # Index that at least one statement must use
+    index: Optional[str] = None
+    # Forbid Sort nodes (pages must come ordered from the index)
+    no_sort: bool = False
+    # Tables a sequential scan is acceptable on (tiny or read whole)
+    seq_scan_ok: Tuple[str, ...] = ()
+    problems: List[str] = field(default_factory=list)
+
+
+async def explain_case(session: AsyncSession, case: Case) -> Dict[str, Any]:
+    """
+    Run a case in a rolled-back savepoint, EXPLAIN what it executed and
+    check the plans.
+
+    Returns:
+        Report entry for the case
+    """
+    connection = await session.connection()
+    savepoint = await session.begin_nested()
+    try:
+        async with capture(connection) as statements:
+            await case.call(session)
+    finally:
+        await savepoint.rollback()
+
+    plans = []
+    for statement, parameters in statements:
+        if statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            continue
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plans.append(result.scalar_one()[0]["Plan"])
+
+    used = set()
+    for plan in plans:
+        for node in nodes(plan):
+            if "Index Name" in node:
+                used.add(node["Index Name"])
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") not in case.seq_scan_ok:
+                case.problems.append(f"sequential scan on {node['Relation Name']}")
+            if node["Node Type"] in ("Sort", "Incremental Sort") and case.no_sort:
+                case.problems.append("sort")
+    if case.index and case.index not in used:
+        case.problems.append(f"{case.index} not used")
+
+    return {
+        "ok": not case.problems,
+        "problems": case.problems,
+        "statements": len(plans),
+        "indexes": sorted(used),
+        "nodes": [[node["Node Type"] for node in nodes(plan)] for plan in plans],
+    }
+
+
+async def reset_schema(connection: AsyncConnection, schema: str) -> None:
+    """Start from an empty scratch schema."""
+    await connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    await connection.execute(text(f"CREATE SCHEMA {schema}"))
+    await connection.commit()
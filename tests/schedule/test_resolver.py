@@ -0,0 +1,222 @@
+"""
+AVTech Platform - Schedule resolver tests
+=========================================
+
+``compile_schedule`` and ``ScreenSchedule.playing`` / ``.next`` checked
+against a brute force that evaluates every slot minute by minute: the best
+active rule covering a minute plays, with its covering slots' videos in
+start order. Random schedules make rules tie on priority, touch, cross
+Sunday midnight and start or stop being active mid-run (epoch boundaries).
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import pytest
+
+from src.backend.schedule.resolver import LOOKAHEAD, Playing, SlotRow, compile_schedule, week_start
+from src.backend.schedule.week import MINUTES_PER_WEEK, minute_of_week, to_week_ranges
+
+MINUTE = timedelta(minutes=1)
+# A Monday; queries fall in this week and the next
+BASE = datetime(2024, 1, 8)
+
+RULE_A = UUID(int=1)
+RULE_B = UUID(int=2)
+VIDEO_1 = UUID(int=101)
+VIDEO_2 = UUID(int=102)
+
+State = Optional[Tuple[UUID, Tuple[UUID, ...]]]
+
+
+def _slots(rule_id: UUID, video_id: UUID, day: Optional[int], start: str, end: str, priority: int = 0,
+           active_from: datetime = BASE - timedelta(weeks=4), active_until: Optional[datetime] = None,
+           created_at: Optional[datetime] = None) -> List[SlotRow]:
+    return [
+        SlotRow(start_minute, end_minute, video_id, rule_id, priority, active_from, active_until, created_at)
+        for start_minute, end_minute in to_week_ranges(day, start, end)
+    ]
+
+
+class BruteForce:
+    """What plays at each minute, from the slots alone."""
+
+    def __init__(self, slots: List[SlotRow]):
+        self.slots = slots
+        self.covering: List[List[SlotRow]] = [[] for _ in range(MINUTES_PER_WEEK)]
+        # Stable sort: a rule's videos play in start order, then slot order
+        for slot in sorted(slots, key=lambda slot: slot.start_minute):
+            for minute in range(slot.start_minute, slot.end_minute):
+                self.covering[minute].append(slot)
+        self.boundaries = sorted({
+            edge for slot in slots for edge in (slot.active_from, slot.active_until) if edge is not None
+        })
+        self._states: Dict[datetime, State] = {}
+
+    def state(self, at: datetime) -> State:
+        if at not in self._states:
+            active = [
+                slot for slot in self.covering[minute_of_week(at)]
+                if slot.active_from <= at and (slot.active_until is None or at < slot.active_until)
+            ]
+            if not active:
+                self._states[at] = None
+            else:
+                best = max(active, key=lambda s: (s.priority, s.created_at or datetime.min, str(s.rule_id)))
+                videos = dict.fromkeys(slot.video_id for slot in active if slot.rule_id == best.rule_id)
+                self._states[at] = (best.rule_id, tuple(videos))
+        return self._states[at]
+
+    def _end(self, start: datetime, until: datetime) -> datetime:
+        state = self.state(start)
+        end = start
+        while end < until and self.state(end) == state:
+            end += MINUTE
+        return end
+
+    def playing(self, at: datetime, lookahead: timedelta) -> Optional[Playing]:
+        state = self.state(at)
+        if state is None:
+            return None
+        # starts_at goes back no further than the week or the epoch
+        floor = max([week_start(at)] + [edge for edge in self.boundaries if edge <= at])
+        start = at
+        while start > floor and self.state(start - MINUTE) == state:
+            start -= MINUTE
+        return Playing(state[0], state[1], start, self._end(at, at + lookahead))
+
+    def next(self, at: datetime, lookahead: timedelta) -> Optional[Playing]:
+        until = at + lookahead
+        moment = self._end(at, until) if self.state(at) is not None else at
+        while moment < until and self.state(moment) is None:
+            moment += MINUTE
+        if moment >= until:
+            return None
+        state = self.state(moment)
+        return Playing(state[0], state[1], moment, self._end(moment, until))
+
+
+def _random_slots(rng: random.Random) -> List[SlotRow]:
+    videos = [UUID(int=rng.getrandbits(128)) for _ in range(3)]
+    slots = []
+    for _ in range(rng.randint(1, 4)):
+        rule_id = UUID(int=rng.getrandbits(128))
+        # Few priorities and creation times, so rules tie on both
+        priority = rng.randint(0, 2)
+        created_at = rng.choice([None, BASE - timedelta(days=30), BASE - timedelta(days=20)])
+        active_from = BASE + rng.randrange(-3 * 1440, 12 * 1440, 15) * MINUTE
+        active_until = rng.choice([None, active_from + rng.randrange(60, 7 * 1440, 15) * MINUTE])
+        for _ in range(rng.randint(1, 3)):
+            # Quarter hours, so slots often touch; end <= start runs past midnight
+            start = rng.randrange(0, 1440, 15)
+            end = rng.randrange(0, 1440, 15)
+            day = rng.choice([None, 0, 5, 6, rng.randint(0, 6)])
+            slots += _slots(
+                rule_id, rng.choice(videos), day, f"{start // 60:02d}:{start % 60:02d}",
+                f"{end // 60:02d}:{end % 60:02d}", priority, active_from, active_until, created_at,
+            )
+    rng.shuffle(slots)
+    return slots
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    slots = _random_slots(rng)
+    schedule = compile_schedule(slots)
+    brute = BruteForce(slots)
+
+    moments = [BASE + rng.randrange(0, 2 * MINUTES_PER_WEEK) * MINUTE for _ in range(6)]
+    # Week and epoch boundaries, and the minute before each
+    moments += [BASE + timedelta(weeks=1), BASE + timedelta(weeks=1) - MINUTE]
+    moments += [edge - delta for edge in brute.boundaries for delta in (timedelta(0), MINUTE)
+                if BASE <= edge - delta < BASE + timedelta(weeks=2)][:6]
+    for at in moments:
+        for lookahead in (timedelta(days=2), LOOKAHEAD):
+            assert schedule.playing(at, lookahead) == brute.playing(at, lookahead), at
+            assert schedule.next(at, lookahead) == brute.next(at, lookahead), at
+
+
+def test_empty_schedule():
+    schedule = compile_schedule([])
+    assert schedule.playing(BASE) is None
+    assert schedule.next(BASE) is None
+
+
+def test_higher_priority_wins_and_ties_go_to_newest_rule():
+    slots = (
+        _slots(RULE_A, VIDEO_1, None, "08:00", "12:00", priority=1, created_at=BASE - timedelta(days=2))
+        + _slots(RULE_B, VIDEO_2, None, "10:00", "14:00", priority=1, created_at=BASE - timedelta(days=1))
+    )
+    schedule = compile_schedule(slots)
+    # Same priority: the most recently created rule plays
+    assert schedule.playing(BASE + timedelta(hours=9)) == Playing(
+        RULE_A, (VIDEO_1,), BASE + timedelta(hours=8), BASE + timedelta(hours=10)
+    )
+    assert schedule.playing(BASE + timedelta(hours=11)).rule_id == RULE_B
+
+    slots = [slot._replace(priority=5) if slot.rule_id == RULE_A else slot for slot in slots]
+    assert compile_schedule(slots).playing(BASE + timedelta(hours=11)).rule_id == RULE_A
+
+
+def test_touching_slots_and_playlists():
+    slots = (
+        _slots(RULE_A, VIDEO_1, 0, "08:00", "09:00")
+        + _slots(RULE_A, VIDEO_2, 0, "09:00", "10:00")
+        + _slots(RULE_A, VIDEO_1, 0, "09:30", "10:00")
+    )
+    schedule = compile_schedule(slots)
+    assert schedule.playing(BASE + timedelta(hours=8, minutes=59)).ends_at == BASE + timedelta(hours=9)
+    # Overlapping slots of one rule play as a playlist, in start order
+    assert schedule.playing(BASE + timedelta(hours=9, minutes=45)) == Playing(
+        RULE_A, (VIDEO_2, VIDEO_1), BASE + timedelta(hours=9, minutes=30), BASE + timedelta(hours=10)
+    )
+    assert schedule.next(BASE + timedelta(hours=8)) == Playing(
+        RULE_A, (VIDEO_2,), BASE + timedelta(hours=9), BASE + timedelta(hours=9, minutes=30)
+    )
+    # End is exclusive
+    assert schedule.playing(BASE + timedelta(hours=10)) is None
+
+
+def test_week_wraparound():
+    # Sunday 22:00 to Monday 02:00, stored as two ranges
+    slots = _slots(RULE_A, VIDEO_1, 6, "22:00", "02:00")
+    assert len(slots) == 2
+    schedule = compile_schedule(slots)
+    sunday = BASE + timedelta(days=6)
+    assert schedule.playing(sunday + timedelta(hours=23)) == Playing(
+        RULE_A, (VIDEO_1,), sunday + timedelta(hours=22), sunday + timedelta(hours=26)
+    )
+    # From Monday, starts_at goes back no further than the start of the week
+    assert schedule.playing(BASE + timedelta(hours=1)) == Playing(RULE_A, (VIDEO_1,), BASE, BASE + timedelta(hours=2))
+    assert schedule.next(BASE + timedelta(hours=3)) == Playing(
+        RULE_A, (VIDEO_1,), sunday + timedelta(hours=22), sunday + timedelta(hours=26)
+    )
+
+
+def test_epoch_boundaries():
+    switch = BASE + timedelta(hours=10)
+    slots = (
+        _slots(RULE_A, VIDEO_1, None, "08:00", "12:00", priority=0)
+        + _slots(RULE_B, VIDEO_2, None, "08:00", "12:00", priority=1, active_from=switch,
+                 active_until=switch + timedelta(hours=1))
+    )
+    schedule = compile_schedule(slots)
+    assert schedule.playing(BASE + timedelta(hours=9)) == Playing(RULE_A, (VIDEO_1,), BASE + timedelta(hours=8), switch)
+    assert schedule.next(BASE + timedelta(hours=9)) == Playing(RULE_B, (VIDEO_2,), switch, switch + timedelta(hours=1))
+    # A rule becoming active mid-run starts playing at its activation, not at the slot start
+    assert schedule.playing(switch) == Playing(RULE_B, (VIDEO_2,), switch, switch + timedelta(hours=1))
+    assert schedule.playing(switch + timedelta(hours=1)) == Playing(
+        RULE_A, (VIDEO_1,), switch + timedelta(hours=1), BASE + timedelta(hours=12)
+    )
+    # Before a rule's active_from it does not play at all
+    assert schedule.playing(BASE - timedelta(days=1) + timedelta(hours=10, minutes=30)).rule_id == RULE_A
+
+
+def test_lookahead_caps_the_end():
+    schedule = compile_schedule(_slots(RULE_A, VIDEO_1, None, "00:00", "00:00"))
+    playing = schedule.playing(BASE, timedelta(hours=3))
+    assert playing.ends_at == BASE + timedelta(hours=3)
+    assert schedule.next(BASE, timedelta(hours=3)) is None
@@ -0,0 +1,253 @@
+"""
+AVTech Platform - Schedule validation tests
+===========================================
+
+``validate_schedule`` checked against a brute force that lists, for every
+minute of the week, the rules covering it on each screen: conflicts are the
+maximal runs of minutes where two rules (one of them new, with intersecting
+activation windows) both play, and gaps the maximal runs where nothing
+does. Random batches make slots overlap, touch, cross midnight and Sunday
+midnight, and tie on priority.
+"""
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import pytest
+
+from src.backend.schedule.resolver import ScreenSlotRow
+from src.backend.schedule.schemas import ScheduleRuleCreate, TimeSlot
+from src.backend.schedule.validation import Conflict, RuleRef, validate_schedule
+from src.backend.schedule.week import MINUTES_PER_DAY, MINUTES_PER_WEEK, format_hhmm, to_week_ranges
+
+NOW = datetime(2024, 1, 8)
+CLIENT = UUID(int=0)
+SCREEN = UUID(int=1)
+VIDEO = UUID(int=2)
+STORED = UUID(int=3)
+
+
+def _rule(slots: List[Tuple[Optional[int], str, str]], priority: int = 0, screens: Tuple[UUID, ...] = (SCREEN,),
+          active_from: datetime = NOW, active_until: Optional[datetime] = None) -> ScheduleRuleCreate:
+    return ScheduleRuleCreate(
+        name="rule", rule_type="weekly", priority=priority, active_from=active_from, active_until=active_until,
+        time_slots=[TimeSlot(day_of_week=day, start_time=start, end_time=end, video_id=VIDEO) for day, start, end in slots],
+        client_id=CLIENT, screen_ids=list(screens),
+    )
+
+
+def _stored(rule_id: UUID, day: Optional[int], start: str, end: str, priority: int = 0, screen_id: UUID = SCREEN,
+            created_at: datetime = NOW - timedelta(days=1)) -> List[ScreenSlotRow]:
+    return [
+        ScreenSlotRow(start_minute, end_minute, VIDEO, rule_id, priority, NOW - timedelta(days=7), None, created_at, screen_id)
+        for start_minute, end_minute in to_week_ranges(day, start, end)
+    ]
+
+
+def _conflicts(rules, existing=(), min_gap=MINUTES_PER_WEEK) -> List[Tuple[str, int, int, Tuple[RuleRef, ...]]]:
+    """(kind, start, end, rules) of every finding; gaps are left out unless min_gap allows them."""
+    report = validate_schedule(rules, existing, now=NOW, min_gap=min_gap)
+    return [(c.kind, c.start_minute, c.end_minute, c.rules) for c in report.conflicts]
+
+
+def brute_force(rules: List[ScheduleRuleCreate], existing: List[ScreenSlotRow], min_gap: int) -> List[Conflict]:
+    # (priority, creation, batch position) of every rule: the highest wins an overlap
+    ranks: Dict[Any, Tuple[int, datetime, int, str]] = {}
+    windows: Dict[Any, Tuple[datetime, Optional[datetime]]] = {}
+    refs: Dict[Any, RuleRef] = {}
+    cover: Dict[Any, List[Set[Any]]] = {}
+    for index, rule in enumerate(rules):
+        ranks[index] = (rule.priority, NOW, index, "")
+        windows[index] = (rule.active_from, rule.active_until)
+        refs[index] = RuleRef(batch_index=index)
+        for screen_id in rule.screen_ids:
+            minutes = cover.setdefault(screen_id, [set() for _ in range(MINUTES_PER_WEEK)])
+            for slot in rule.time_slots:
+                for start, end in to_week_ranges(slot.day_of_week, slot.start_time, slot.end_time):
+                    for minute in range(start, end):
+                        minutes[minute].add(index)
+    for row in existing:
+        if row.screen_id not in cover:
+            continue
+        ranks[row.rule_id] = (row.priority, row.created_at, -1, str(row.rule_id))
+        windows[row.rule_id] = (row.active_from, row.active_until)
+        refs[row.rule_id] = RuleRef(rule_id=row.rule_id)
+        for minute in range(row.start_minute, row.end_minute):
+            cover[row.screen_id][minute].add(row.rule_id)
+
+    def conflicting(a: Any, b: Any) -> bool:
+        (from_a, until_a), (from_b, until_b) = windows[a], windows[b]
+        new = isinstance(a, int) or isinstance(b, int)
+        return new and (until_a is None or from_b < until_a) and (until_b is None or from_a < until_b)
+
+    conflicts = []
+    for screen_id, minutes in cover.items():
+        # Per minute: "gap" when nothing plays, plus every conflicting pair (winner, loser)
+        findings = []
+        for keys in minutes:
+            found = set()
+            if not keys:
+                found.add(("gap",))
+            for a in keys:
+                for b in keys:
+                    if ranks[a] > ranks[b] and conflicting(a, b):
+                        kind = "priority_conflict" if ranks[a][0] == ranks[b][0] else "overlap"
+                        found.add((kind, a, b))
+            findings.append(found)
+        # Maximal runs of minutes with the same finding, cut at the end of the week
+        for minute, found in enumerate(findings):
+            for finding in found:
+                if minute and finding in findings[minute - 1]:
+                    continue
+                end = minute
+                while end < MINUTES_PER_WEEK and finding in findings[end]:
+                    end += 1
+                if finding == ("gap",):
+                    if end - minute >= min_gap:
+                        conflicts.append(Conflict("gap", screen_id, minute, end, ()))
+                else:
+                    kind, winner, loser = finding
+                    conflicts.append(Conflict(kind, screen_id, minute, end, (refs[winner], refs[loser])))
+    return conflicts
+
+
+def _random_time(rng: random.Random) -> str:
+    # Quarter hours, so slots often touch; "24:00" is the end of the day
+    return format_hhmm(rng.randrange(0, MINUTES_PER_DAY + 1, 15))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    screens = [UUID(int=rng.getrandbits(128)) for _ in range(rng.randint(1, 2))]
+    rules = []
+    for _ in range(rng.randint(1, 4)):
+        active_from = NOW + timedelta(days=rng.randint(0, 20))
+        rules.append(_rule(
+            [(rng.choice([None, 0, 6, rng.randint(0, 6)]), _random_time(rng), _random_time(rng))
+             for _ in range(rng.randint(1, 3))],
+            priority=rng.randint(0, 2),
+            screens=tuple(rng.sample(screens, rng.randint(1, len(screens)))),
+            active_from=active_from,
+            active_until=rng.choice([None, active_from + timedelta(days=rng.randint(1, 10))]),
+        ))
+    existing = []
+    for _ in range(rng.randint(0, 3)):
+        existing += _stored(
+            UUID(int=rng.getrandbits(128)), rng.choice([None, rng.randint(0, 6)]), _random_time(rng),
+            _random_time(rng), priority=rng.randint(0, 2),
+            screen_id=rng.choice(screens + [UUID(int=rng.getrandbits(128))]),
+            created_at=NOW - timedelta(days=rng.randint(1, 3)),
+        )
+    min_gap = rng.choice([1, 30, 240])
+
+    report = validate_schedule(rules, existing, now=NOW, min_gap=min_gap)
+    assert Counter(report.conflicts) == Counter(brute_force(rules, existing, min_gap))
+    assert report.conflicts == sorted(report.conflicts, key=lambda c: (str(c.screen_id), c.start_minute, c.kind))
+    assert report.ok == (not any(c.kind == "priority_conflict" for c in report.conflicts))
+
+
+def test_equal_priority_overlap_is_an_error():
+    rules = [_rule([(0, "08:00", "10:00")]), _rule([(0, "09:00", "11:00")])]
+    report = validate_schedule(rules, now=NOW, min_gap=MINUTES_PER_WEEK)
+    assert not report.ok
+    # On a tie the rule created last wins
+    assert [(c.kind, c.start_minute, c.end_minute, c.rules) for c in report.errors] == [
+        ("priority_conflict", 540, 600, (RuleRef(batch_index=1), RuleRef(batch_index=0))),
+    ]
+
+
+def test_different_priorities_overlap_is_a_warning():
+    rules = [_rule([(0, "08:00", "10:00")], priority=5), _rule([(0, "09:00", "11:00")], priority=1)]
+    report = validate_schedule(rules, now=NOW, min_gap=MINUTES_PER_WEEK)
+    assert report.ok
+    assert [(c.kind, c.rules) for c in report.warnings] == [
+        ("overlap", (RuleRef(batch_index=0), RuleRef(batch_index=1))),
+    ]
+
+
+def test_touching_slots_do_not_conflict():
+    rules = [_rule([(0, "08:00", "10:00")]), _rule([(0, "10:00", "12:00")]), _rule([(0, "06:00", "08:00")])]
+    assert _conflicts(rules) == []
+
+
+def test_slots_of_one_rule_are_a_playlist():
+    rules = [_rule([(0, "08:00", "10:00"), (0, "09:00", "11:00")])]
+    assert _conflicts(rules) == []
+
+
+def test_midnight_wraparound():
+    # Monday 22:00-02:00 runs into Tuesday
+    rules = [_rule([(0, "22:00", "02:00")]), _rule([(1, "01:00", "03:00")])]
+    assert _conflicts(rules) == [
+        ("priority_conflict", MINUTES_PER_DAY + 60, MINUTES_PER_DAY + 120,
+         (RuleRef(batch_index=1), RuleRef(batch_index=0))),
+    ]
+
+
+def test_week_wraparound_is_reported_in_two_parts():
+    rules = [_rule([(6, "23:00", "01:00")]), _rule([(6, "23:30", "00:30")])]
+    assert [finding[1:3] for finding in _conflicts(rules)] == [(0, 30), (MINUTES_PER_WEEK - 30, MINUTES_PER_WEEK)]
+    rules = [_rule([(6, "23:00", "01:00")]), _rule([(0, "00:30", "01:30")])]
+    assert [finding[1:3] for finding in _conflicts(rules)] == [(30, 60)]
+
+
+def test_disjoint_activation_windows_do_not_conflict():
+    rules = [
+        _rule([(0, "08:00", "10:00")], active_from=NOW, active_until=NOW + timedelta(days=7)),
+        _rule([(0, "08:00", "10:00")], active_from=NOW + timedelta(days=7)),
+    ]
+    assert _conflicts(rules) == []
+
+
+def test_stored_rules():
+    existing = (
+        _stored(STORED, 0, "08:00", "10:00")
+        # Stored conflicts that do not involve the batch are not reported
+        + _stored(UUID(int=4), 0, "08:00", "10:00")
+        # Other screens are ignored
+        + _stored(UUID(int=5), 0, "08:00", "10:00", screen_id=UUID(int=6))
+    )
+    findings = _conflicts([_rule([(0, "09:00", "09:30")])], [row for row in existing if row.rule_id != UUID(int=4)])
+    # New rules rank after every stored one on equal priority
+    assert findings == [("priority_conflict", 540, 570, (RuleRef(batch_index=0), RuleRef(rule_id=STORED)))]
+    assert len(_conflicts([_rule([(0, "09:00", "09:30")])], existing)) == 2
+
+
+def test_changed_stored_rule():
+    other = UUID(int=4)
+    existing = (
+        _stored(STORED, 0, "08:00", "10:00", priority=1)
+        + _stored(other, 0, "09:00", "11:00", created_at=NOW - timedelta(days=2))
+        + _stored(UUID(int=5), 0, "09:00", "11:00", screen_id=UUID(int=6))
+    )
+    # Stored conflicts only count when they involve a rule being updated
+    assert validate_schedule([], existing, now=NOW, min_gap=MINUTES_PER_WEEK).conflicts == []
+    report = validate_schedule([], existing, now=NOW, min_gap=MINUTES_PER_WEEK, changed={STORED})
+    assert [(c.kind, c.start_minute, c.end_minute, c.rules) for c in report.conflicts] == [
+        ("overlap", 540, 600, (RuleRef(rule_id=STORED), RuleRef(rule_id=other)))
+    ]
+    # Lowered to the other rule's priority it ties; stored rules rank by creation time
+    lowered = [row._replace(priority=0) if row.rule_id == STORED else row for row in existing]
+    report = validate_schedule([], lowered, now=NOW, min_gap=MINUTES_PER_WEEK, changed={STORED})
+    assert not report.ok
+    assert [c.rules for c in report.errors] == [(RuleRef(rule_id=STORED), RuleRef(rule_id=other))]
+    # Created together, they rank by id like in the resolver: one finding, not one per order
+    together = [row._replace(created_at=NOW) for row in lowered]
+    report = validate_schedule([], together, now=NOW, min_gap=MINUTES_PER_WEEK, changed={STORED})
+    assert [c.rules for c in report.errors] == [(RuleRef(rule_id=other), RuleRef(rule_id=STORED))]
+
+
+def test_gaps():
+    rules = [_rule([(None, "08:00", "20:00")])]
+    gaps = [finding[1:3] for finding in _conflicts(rules, min_gap=1)]
+    assert gaps[0] == (0, 480)
+    assert gaps[-1] == (6 * MINUTES_PER_DAY + 1200, MINUTES_PER_WEEK)
+    assert len(gaps) == 8
+    # Shorter gaps than min_gap are not reported
+    rules = [_rule([(None, "00:00", "23:45")])]
+    assert _conflicts(rules, min_gap=30) == []
+    assert len(_conflicts(rules, min_gap=15)) == 7
@@ -0,0 +1,181 @@
+"""
+AVTech Platform - Media range tests
+===================================
+
+Range, If-Range and If-None-Match parsing (storage.media) and the responses
+built from them (api.media), served from the local filesystem backend.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.backend.api.media import media_response
+from src.backend.exceptions.storage_exceptions import RangeNotSatisfiableException
+from src.backend.storage.local_backend import LocalFilesystemBackend
+from src.backend.storage.media import ByteRange, etag_matches, http_date, if_range_allows, make_etag, parse_range
+from src.backend.storage.storage_service import StorageService
+
+DATA = bytes(range(256)) * 40
+SIZE = len(DATA)
+ETAG = make_etag("ab" * 32)
+MODIFIED = datetime(2024, 1, 8, 12, 30, 15)
+OBJECT = "media/video.mp4"
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=0-99", ByteRange(0, 99)),
+    ("bytes=100-", ByteRange(100, SIZE - 1)),  # Open-ended
+    ("bytes=-100", ByteRange(SIZE - 100, SIZE - 1)),  # Suffix
+    ("bytes=-100000", ByteRange(0, SIZE - 1)),  # Suffix longer than the object
+    ("bytes=10-100000", ByteRange(10, SIZE - 1)),  # End clamped to the object
+    ("bytes=5-5", ByteRange(5, 5)),
+    (" BYTES = 1-2 ", ByteRange(1, 2)),
+    ("bytes=99-0", None),  # Reversed
+    ("bytes=0-1,5-6", None),  # Multi-range: the whole object
+    ("items=0-1", None),
+    ("bytes=abc-", None),
+    ("bytes=10", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize("header", [f"bytes={SIZE}-", f"bytes={SIZE + 10}-{SIZE + 20}", "bytes=-0"])
+def test_parse_range_not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiableException):
+        parse_range(header, SIZE)
+
+
+def test_parse_range_of_an_empty_object():
+    with pytest.raises(RangeNotSatisfiableException):
+        parse_range("bytes=0-", 0)
+
+
+def test_content_range():
+    assert ByteRange(10, 19).length == 10
+    assert ByteRange(10, 19).content_range(SIZE) == f"bytes 10-19/{SIZE}"
+
+
+def test_if_range_with_an_etag():
+    assert if_range_allows(None, ETAG, MODIFIED)
+    assert if_range_allows(ETAG, ETAG, MODIFIED)
+    assert not if_range_allows(make_etag("cd" * 32), ETAG, MODIFIED)
+    # Strong comparison: a weak validator never matches
+    assert not if_range_allows("W/" + ETAG, ETAG, MODIFIED)
+
+
+def test_if_range_with_a_date():
+    assert if_range_allows(http_date(MODIFIED), ETAG, MODIFIED)
+    # HTTP dates have second precision
+    assert if_range_allows(http_date(MODIFIED), ETAG, MODIFIED + timedelta(microseconds=500))
+    assert not if_range_allows(http_date(MODIFIED - timedelta(seconds=1)), ETAG, MODIFIED)
+    assert not if_range_allows("not a date", ETAG, MODIFIED)
+
+
+def test_etag_matches():
+    assert not etag_matches(None, ETAG)
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches("W/" + ETAG, ETAG)  # Weak comparison
+    assert etag_matches(f'"other", {ETAG}', ETAG)
+    assert etag_matches("*", ETAG)
+    assert not etag_matches('"other"', ETAG)
+
+
+@pytest.fixture
+def client(tmp_path):
+    storage = StorageService(LocalFilesystemBackend(root=str(tmp_path), public_url="http://test/files", url_secret="test"))
+    source = tmp_path / "source.mp4"
+    source.write_bytes(DATA)
+    asyncio.run(storage.backend.upload_file(str(source), OBJECT, "video/mp4"))
+
+    app = FastAPI()
+
+    @app.api_route("/media", methods=["GET", "HEAD"])
+    async def media(request: Request):
+        return media_response(
+            request, storage, OBJECT, SIZE, ETAG, MODIFIED, "video/mp4", {"Cache-Control": "private, max-age=60"}
+        )
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_whole_object(client):
+    response = client.get("/media")
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["content-length"] == str(SIZE)
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == ETAG
+    assert response.headers["last-modified"] == http_date(MODIFIED)
+    assert response.headers["cache-control"] == "private, max-age=60"
+    assert "content-range" not in response.headers
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, SIZE - 1),
+    ("bytes=-24", SIZE - 24, SIZE - 1),
+])
+def test_range(client, header, start, end):
+    response = client.get("/media", headers={"Range": header})
+    assert response.status_code == 206
+    assert response.content == DATA[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{SIZE}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+def test_ignored_ranges_send_the_whole_object(client):
+    for header in ("bytes=0-1,5-6", "bytes=9-1"):
+        response = client.get("/media", headers={"Range": header})
+        assert response.status_code == 200
+        assert response.content == DATA
+
+
+def test_range_past_the_end(client):
+    response = client.get("/media", headers={"Range": f"bytes={SIZE}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{SIZE}"
+
+
+def test_if_range(client):
+    for if_range in (ETAG, http_date(MODIFIED)):
+        response = client.get("/media", headers={"Range": "bytes=0-9", "If-Range": if_range})
+        assert response.status_code == 206 and response.content == DATA[:10]
+    # A stale validator gets the whole, current object
+    for if_range in (make_etag("cd" * 32), http_date(MODIFIED - timedelta(days=1))):
+        response = client.get("/media", headers={"Range": "bytes=0-9", "If-Range": if_range})
+        assert response.status_code == 200 and response.content == DATA
+    # The object changed: not even an unsatisfiable range is checked
+    response = client.get("/media", headers={"Range": f"bytes={SIZE}-", "If-Range": '"other"'})
+    assert response.status_code == 200
+
+
+def test_if_none_match(client):
+    response = client.get("/media", headers={"If-None-Match": ETAG, "Range": "bytes=0-9"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == ETAG
+
+
+def test_head(client):
+    response = client.head("/media")
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(SIZE)
+    assert response.headers["content-type"] == "video/mp4"
+
+    response = client.head("/media", headers={"Range": "bytes=-24"})
+    assert response.status_code == 206
+    assert response.content == b""
+    assert response.headers["content-length"] == "24"
+    assert response.headers["content-range"] == f"bytes {SIZE - 24}-{SIZE - 1}/{SIZE}"
+
+    assert client.head("/media", headers={"Range": f"bytes={SIZE}-"}).status_code == 416
+    assert client.head("/media", headers={"If-None-Match": ETAG}).status_code == 304
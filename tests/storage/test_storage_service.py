@@ -0,0 +1,117 @@
+"""
+AVTech Platform - Storage service tests
+=======================================
+
+Content-addressed uploads against the local filesystem backend and an
+in-memory blob reference table.
+"""
+
+import asyncio
+import hashlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import pytest
+
+from src.backend.exceptions.storage_exceptions import StorageIntegrityException
+from src.backend.storage.local_backend import LocalFilesystemBackend
+from src.backend.storage.storage_service import StorageService
+
+DATA = bytes(range(256)) * 10000
+HASH = hashlib.sha256(DATA).hexdigest()
+
+
+class FakeBlobRepository:
+    """BlobRepository.acquire/set_size over a dict; nothing is locked or rolled back."""
+
+    def __init__(self):
+        self.rows: Dict[str, List[int]] = {}  # {hash: [ref_count, size_bytes]}
+
+    async def acquire(self, hash_sha256: str, object_name: str, size_bytes: int) -> Tuple[int, int]:
+        row = self.rows.setdefault(hash_sha256, [0, size_bytes])
+        row[0] += 1
+        return row[0], row[1]
+
+    async def set_size(self, hash_sha256: str, size_bytes: int) -> None:
+        self.rows[hash_sha256][1] = size_bytes
+
+    async def release(self, hash_sha256: str) -> Optional[int]:
+        row = self.rows.get(hash_sha256)
+        if row is None or row[0] == 0:
+            return None
+        row[0] -= 1
+        return row[0]
+
+
+async def _chunks(data: bytes, size: int = 100000) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = StorageService(LocalFilesystemBackend(root=str(tmp_path), public_url="http://test/files", url_secret="test"))
+    service.content_addressed = True
+    return service
+
+
+def _upload(service: StorageService, repo: FakeBlobRepository, data: bytes, client_id: str) -> dict:
+    return asyncio.run(service.upload_video_stream(
+        _chunks(data), client_id, "title", expected_sha256=HASH, blob_repo=repo, size_hint=len(DATA)
+    ))
+
+
+def test_second_upload_of_a_blob_is_deduplicated(service):
+    repo = FakeBlobRepository()
+    first = _upload(service, repo, DATA, "client-a")
+    second = _upload(service, repo, DATA, "client-b")
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert first["object_name"] == second["object_name"] == service.blob_object_name(HASH)
+    assert second["size"] == len(DATA)
+    assert repo.rows[HASH] == [2, len(DATA)]
+
+
+def test_known_hash_without_the_content_is_refused(service):
+    repo = FakeBlobRepository()
+    _upload(service, repo, DATA, "client-a")
+    # Declaring another client's hash must not reference its blob
+    with pytest.raises(StorageIntegrityException):
+        _upload(service, repo, b"not the video", "client-b")
+    with pytest.raises(StorageIntegrityException):
+        _upload(service, repo, DATA[:-1], "client-b")
+
+
+def test_new_blob_with_a_wrong_hash_is_not_stored(service):
+    repo = FakeBlobRepository()
+    with pytest.raises(StorageIntegrityException):
+        _upload(service, repo, b"not the video", "client-a")
+    assert asyncio.run(service.get_file_info(service.blob_object_name(HASH))) is None
+
+
+def test_client_listings_exclude_shared_blobs(service, tmp_path):
+    thumbnail = tmp_path / "thumb.jpg"
+    thumbnail.write_bytes(b"jpeg")
+    asyncio.run(service.upload_thumbnail(str(thumbnail), "client-a", "video-1"))
+    blob = _upload(service, FakeBlobRepository(), DATA, "client-a")["object_name"]
+
+    async def listed() -> List[str]:
+        return [f["object_name"] async for f in service.iter_client_files("client-a")]
+
+    # Blobs are shared between clients; the client's videos rows reference them
+    names = asyncio.run(listed())
+    assert names == [service.client_prefix("client-a", "thumbnails") + "video-1.jpg"]
+    assert blob not in names
+    files, last_key = asyncio.run(service.list_client_files_page("client-a", file_type="videos"))
+    assert files == [] and last_key is None
+
+
+def test_release_video_never_deletes_the_object(service):
+    repo = FakeBlobRepository()
+    blob = _upload(service, repo, DATA, "client-a")["object_name"]
+    service.content_addressed = False
+    legacy = _upload(service, repo, DATA, "client-a")["object_name"]
+
+    # The caller deletes after committing: the rows may still be rolled back
+    assert asyncio.run(service.release_video(blob, HASH, repo)) == 0
+    assert asyncio.run(service.release_video(legacy, HASH, repo)) is None
+    assert asyncio.run(service.get_file_info(blob)) is not None
+    assert asyncio.run(service.get_file_info(legacy)) is not None
@@ -0,0 +1,213 @@
+"""
+AVTech Platform - Heartbeat buffer tests
+========================================
+
+``HeartbeatBuffer`` against a fake session factory: sessions stage their
+writes to an in-memory database and apply them on commit, and the
+repositories the buffer uses are replaced by fakes over that database.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from src.backend.sync import heartbeat
+from src.backend.sync.heartbeat import HeartbeatBuffer
+
+NOW = datetime.utcnow()
+CLIENT = "client-a"
+
+
+class FakeDatabase:
+    """Screens and player sync rows; `fail` makes the next heartbeat write raise."""
+
+    def __init__(self, codes: List[str]):
+        self.screens: Dict[str, Dict[str, Any]] = {
+            code: {"status": "offline", "last_heartbeat": None, "client_id": CLIENT} for code in codes
+        }
+        self.sync: Dict[str, Tuple[datetime, Optional[Dict[str, Any]]]] = {}
+        self.fail = False
+        self.commits = 0
+        # Set while a heartbeat write waits for `resume` (see test_heartbeats_recorded_during_a_failed_flush)
+        self.writing: Optional[asyncio.Event] = None
+        self.resume: Optional[asyncio.Event] = None
+
+
+class FakeSession:
+    """Stages writes and applies them to the database on commit only."""
+
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+        self.staged: List[Callable[[], None]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.staged = []  # Rolled back unless committed
+
+    async def commit(self):
+        for write in self.staged:
+            write()
+        self.staged = []
+        self.db.commits += 1
+
+
+class FakeScreenRepository:
+    def __init__(self, session: FakeSession):
+        self.session = session
+        self.db = session.db
+
+    async def mark_online(self, screen_code: str, at: datetime, client_id=None) -> Optional[str]:
+        screen = self.db.screens.get(screen_code)
+        if screen is None or (client_id is not None and screen["client_id"] != client_id):
+            return None
+        previous = screen["status"]
+        self.session.staged.append(lambda: screen.update(status="online", last_heartbeat=_latest(screen["last_heartbeat"], at)))
+        return previous
+
+    async def record_heartbeats(self, beats: Dict[str, datetime]) -> List[str]:
+        if self.db.writing is not None:
+            self.db.writing.set()
+            await self.db.resume.wait()
+        if self.db.fail:
+            self.db.fail = False
+            raise ConnectionError("database went away")
+
+        def write():
+            for code, at in beats.items():
+                self.db.screens[code]["last_heartbeat"] = _latest(self.db.screens[code]["last_heartbeat"], at)
+
+        self.session.staged.append(write)
+        return [code for code in beats if self.db.screens[code]["status"] != "online"]
+
+    async def mark_offline_before(self, cutoff: datetime) -> List[str]:
+        codes = [
+            code for code, screen in self.db.screens.items()
+            if screen["status"] == "online" and screen["last_heartbeat"] < cutoff
+        ]
+        self.session.staged.append(lambda: [self.db.screens[code].update(status="offline") for code in codes])
+        return codes
+
+
+class FakePlayerSyncStatusRepository:
+    def __init__(self, session: FakeSession):
+        self.session = session
+
+    async def record_heartbeats(self, beats: Dict[str, Tuple[datetime, Optional[Dict[str, Any]]]]) -> int:
+        self.session.staged.append(lambda: self.session.db.sync.update(beats))
+        return len(beats)
+
+
+def _latest(current: Optional[datetime], at: datetime) -> datetime:
+    return at if current is None else max(current, at)
+
+
+@pytest.fixture
+def db(monkeypatch) -> FakeDatabase:
+    monkeypatch.setattr(heartbeat, "ScreenRepository", FakeScreenRepository)
+    monkeypatch.setattr(heartbeat, "PlayerSyncStatusRepository", FakePlayerSyncStatusRepository)
+    return FakeDatabase(["s1", "s2", "s3"])
+
+
+def _buffer(db: FakeDatabase) -> HeartbeatBuffer:
+    return HeartbeatBuffer(flush_interval=3600, offline_after=90, session_factory=lambda: FakeSession(db))
+
+
+def test_flush_writes_the_latest_heartbeat(db):
+    async def run():
+        buffer = _buffer(db)
+        assert await buffer.record("s1", {"cpu": 10}, NOW, CLIENT)
+        assert await buffer.record("s1", None, NOW + timedelta(seconds=5), CLIENT)
+        # Out of order: an older heartbeat does not replace a newer one
+        assert await buffer.record("s1", {"cpu": 99}, NOW + timedelta(seconds=1), CLIENT)
+        assert await buffer.record("s2", None, NOW, CLIENT)
+        assert buffer.pending == 2
+        summary = await buffer.flush()
+        assert summary == {"written": 2, "online": 0, "offline": 0}
+        assert buffer.pending == 0
+
+    asyncio.run(run())
+    assert db.screens["s1"] == {"status": "online", "last_heartbeat": NOW + timedelta(seconds=5), "client_id": CLIENT}
+    # Metrics of an earlier heartbeat are kept when the newest has none
+    assert db.sync == {"s1": (NOW + timedelta(seconds=5), {"cpu": 10}), "s2": (NOW, None)}
+
+
+def test_unknown_and_foreign_screens_are_refused(db):
+    async def run():
+        buffer = _buffer(db)
+        assert not await buffer.record("missing", None, NOW, CLIENT)
+        assert not await buffer.record("s1", None, NOW, "client-b")
+        assert buffer.pending == 0
+
+    asyncio.run(run())
+
+
+def test_failed_flush_puts_heartbeats_back(db):
+    async def run():
+        buffer = _buffer(db)
+        await buffer.record("s1", {"cpu": 10}, NOW, CLIENT)
+        await buffer.record("s2", None, NOW, CLIENT)
+        commits = db.commits
+        db.fail = True
+        with pytest.raises(ConnectionError):
+            await buffer.flush()
+        # Nothing was committed and nothing was lost
+        assert db.commits == commits and db.sync == {}
+        assert buffer.pending == 2
+        assert await buffer.flush() == {"written": 2, "online": 0, "offline": 0}
+
+    asyncio.run(run())
+    assert db.sync == {"s1": (NOW, {"cpu": 10}), "s2": (NOW, None)}
+
+
+def test_heartbeats_recorded_during_a_failed_flush(db):
+    async def run():
+        buffer = _buffer(db)
+        await buffer.record("s1", {"cpu": 10}, NOW, CLIENT)
+        await buffer.record("s2", {"cpu": 20}, NOW, CLIENT)
+        db.writing, db.resume = asyncio.Event(), asyncio.Event()
+        db.fail = True
+        flush = asyncio.create_task(buffer.flush())
+        await db.writing.wait()
+        # New heartbeats keep arriving while the flush is in flight
+        await buffer.record("s1", {"cpu": 11}, NOW + timedelta(seconds=5), CLIENT)
+        await buffer.record("s3", None, NOW, CLIENT)
+        db.resume.set()
+        with pytest.raises(ConnectionError):
+            await flush
+        db.writing = None
+        # The newer heartbeat of s1 wins over the one put back
+        assert buffer.pending == 3
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert db.sync == {
+        "s1": (NOW + timedelta(seconds=5), {"cpu": 11}),
+        "s2": (NOW, {"cpu": 20}),
+        "s3": (NOW, None),
+    }
+
+
+def test_silent_screens_go_offline_and_come_back(db):
+    async def run():
+        buffer = _buffer(db)
+        old = datetime.utcnow() - timedelta(seconds=600)
+        await buffer.record("s1", None, old, CLIENT)
+        await buffer.record("s2", None, datetime.utcnow(), CLIENT)
+        assert await buffer.flush() == {"written": 2, "online": 0, "offline": 1}
+        assert db.screens["s1"]["status"] == "offline"
+        # Marked offline: its next heartbeat goes to the database right away
+        commits = db.commits
+        await buffer.record("s1", None, datetime.utcnow(), CLIENT)
+        assert db.commits == commits + 1 and db.screens["s1"]["status"] == "online"
+
+        # Swept offline by another worker while still reporting here
+        db.screens["s2"]["status"] = "offline"
+        await buffer.record("s2", None, datetime.utcnow(), CLIENT)
+        assert await buffer.flush() == {"written": 2, "online": 1, "offline": 0}
+        assert db.screens["s2"]["status"] == "online"
+
+    asyncio.run(run())